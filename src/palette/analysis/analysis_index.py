@@ -0,0 +1,283 @@
+"""
+Persistent, content-hashed analysis index for ProjectAnalyzer.
+
+The index remembers a fingerprint (mtime, size, content hash) for every file
+that can influence project analysis, together with the analysis sub-results
+computed from those files. On the next analysis only the sections whose input
+files actually changed are recomputed; everything else is served from disk.
+"""
+
+import hashlib
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .file_inventory import ProjectFileInventory
+
+# Bump when the layout of cached sections changes so stale indexes are dropped
+INDEX_VERSION = 3
+
+SOURCE_EXTENSIONS = {".tsx", ".jsx", ".ts", ".js", ".mjs", ".cjs", ".vue", ".html"}
+STYLE_EXTENSIONS = {".css"}
+MANIFEST_FILES = {
+    "package.json",
+    "tsconfig.json",
+    "tsconfig.app.json",
+    "tsconfig.build.json",
+    "components.json",
+}
+
+CONFIG_PREFIXES = ("tailwind.config.", "vite.config.", "next.config.", "webpack.config.")
+
+COMPONENT_DIRS = (
+    "components/",
+    "src/components/",
+    "lib/",
+    "src/lib/",
+)
+
+
+def _is_manifest(rel_path: str) -> bool:
+    """Root-level manifests and build configs."""
+    if "/" in rel_path:
+        return False
+    return rel_path in MANIFEST_FILES or rel_path.startswith(CONFIG_PREFIXES)
+
+
+def _is_style(rel_path: str) -> bool:
+    return os.path.splitext(rel_path)[1] in STYLE_EXTENSIONS
+
+
+def _is_source(rel_path: str) -> bool:
+    return os.path.splitext(rel_path)[1] in SOURCE_EXTENSIONS
+
+
+def _is_component_source(rel_path: str) -> bool:
+    return _is_source(rel_path) and rel_path.startswith(COMPONENT_DIRS)
+
+
+# Which files each cached analysis section depends on. A section is recomputed
+# only when the fingerprint of its dependency set changes. Cheap detections
+# (framework, styling system, project structure) are not cached at all.
+SECTION_DEPENDENCIES: Dict[str, Callable[[str], bool]] = {
+    "design_tokens": lambda p: _is_manifest(p) or _is_style(p) or _is_source(p),
+    "available_imports": lambda p: _is_manifest(p) or _is_component_source(p),
+    "ast_analysis": lambda p: _is_source(p),
+}
+
+
+@dataclass
+class FileFingerprint:
+    """Fingerprint of a single tracked file."""
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+class ProjectAnalysisIndex:
+    """
+    Per-project analysis index persisted under ``~/.palette/analysis_index``.
+
+    Usage::
+
+        index = ProjectAnalysisIndex(project_path)
+        dirty = index.refresh()          # sections whose inputs changed
+        if "design_tokens" in dirty:
+            index.store_section("design_tokens", compute())
+        tokens = index.get_section("design_tokens")
+        index.save()
+    """
+
+    def __init__(self, project_path: str, index_dir: Optional[str] = None):
+        self.project_path = os.path.abspath(project_path)
+        self.index_dir = Path(
+            index_dir or os.path.expanduser("~/.palette/analysis_index")
+        )
+        project_key = hashlib.sha1(self.project_path.encode("utf-8")).hexdigest()
+        self.index_file = self.index_dir / f"{project_key}.pkl"
+
+        self._files: Dict[str, FileFingerprint] = {}
+        self._section_digests: Dict[str, str] = {}
+        self._sections: Dict[str, Any] = {}
+        self._dirty_sections: Set[str] = set(SECTION_DEPENDENCIES)
+        self._modified = False
+
+        # Statistics from the last refresh, useful for diagnostics
+        self.last_refresh_stats: Dict[str, Any] = {}
+
+        self._load()
+
+    def refresh(self, inventory: Optional[ProjectFileInventory] = None) -> Set[str]:
+        """
+        Re-fingerprint the project and work out which sections are stale.
+
+        Only files whose mtime or size changed are re-read and re-hashed.
+
+        Args:
+            inventory: Shared file inventory to read stat results from;
+                a fresh one is built when omitted
+
+        Returns:
+            Names of sections that must be recomputed
+        """
+        start = time.perf_counter()
+        files: Dict[str, FileFingerprint] = {}
+        hashed = 0
+
+        for rel_path, stat in self._tracked_files(inventory):
+            previous = self._files.get(rel_path)
+            if (
+                previous is not None
+                and previous.mtime_ns == stat.st_mtime_ns
+                and previous.size == stat.st_size
+            ):
+                files[rel_path] = previous
+                continue
+
+            content_hash = self._hash_file(os.path.join(self.project_path, rel_path))
+            if content_hash is None:
+                continue
+            hashed += 1
+            files[rel_path] = FileFingerprint(
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                content_hash=content_hash,
+            )
+
+        if files != self._files:
+            self._modified = True
+        self._files = files
+
+        dirty = set()
+        tracked_paths = sorted(files)
+        for section, depends_on in SECTION_DEPENDENCIES.items():
+            digest = self._digest(tracked_paths, depends_on)
+            if (
+                self._section_digests.get(section) != digest
+                or section not in self._sections
+            ):
+                dirty.add(section)
+                self._section_digests[section] = digest
+                self._sections.pop(section, None)
+                self._modified = True
+
+        self._dirty_sections = dirty
+        self.last_refresh_stats = {
+            "tracked_files": len(files),
+            "hashed_files": hashed,
+            "dirty_sections": sorted(dirty),
+            "refresh_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        return dirty
+
+    def is_dirty(self, section: str) -> bool:
+        """Check whether a section must be recomputed."""
+        return section in self._dirty_sections or section not in self._sections
+
+    def get_section(self, section: str) -> Optional[Any]:
+        """Get a cached section result, or None if missing/stale."""
+        if self.is_dirty(section):
+            return None
+        return self._sections.get(section)
+
+    def store_section(self, section: str, value: Any):
+        """Store a freshly computed section result."""
+        self._sections[section] = value
+        self._dirty_sections.discard(section)
+        self._modified = True
+
+    def invalidate(self, section: Optional[str] = None):
+        """Drop one cached section, or all of them."""
+        sections = [section] if section else list(self._sections)
+        for name in sections:
+            self._sections.pop(name, None)
+            self._section_digests.pop(name, None)
+            self._dirty_sections.add(name)
+        self._modified = True
+
+    def save(self) -> bool:
+        """Persist the index if anything changed since it was loaded."""
+        if not self._modified:
+            return True
+
+        payload = {
+            "version": INDEX_VERSION,
+            "project_path": self.project_path,
+            "files": self._files,
+            "section_digests": self._section_digests,
+            "sections": self._sections,
+        }
+
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            # Write atomically so a concurrent reader never sees a partial file
+            tmp_file = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.index_file)
+            self._modified = False
+            return True
+        except Exception as e:
+            print(f"Warning: Could not save analysis index: {e}")
+            return False
+
+    def _load(self):
+        """Load a previously saved index, ignoring incompatible ones."""
+        if not self.index_file.exists():
+            return
+
+        try:
+            with open(self.index_file, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable analysis index: {e}")
+            return
+
+        if (
+            payload.get("version") != INDEX_VERSION
+            or payload.get("project_path") != self.project_path
+        ):
+            return
+
+        self._files = payload.get("files", {})
+        self._section_digests = payload.get("section_digests", {})
+        self._sections = payload.get("sections", {})
+
+    def _tracked_files(
+        self, inventory: Optional[ProjectFileInventory]
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """Tracked files and their stat results from the shared inventory."""
+        if inventory is None or inventory.project_path != self.project_path:
+            inventory = ProjectFileInventory(self.project_path)
+
+        for rel_path, stat in inventory.iter_files():
+            if self._is_tracked(rel_path):
+                yield rel_path, stat
+
+    def _is_tracked(self, rel_path: str) -> bool:
+        return any(depends_on(rel_path) for depends_on in SECTION_DEPENDENCIES.values())
+
+    def _digest(self, tracked_paths: List[str], depends_on: Callable[[str], bool]) -> str:
+        """Combined digest of all files a section depends on."""
+        digest = hashlib.sha1()
+        for rel_path in tracked_paths:
+            if depends_on(rel_path):
+                digest.update(rel_path.encode("utf-8"))
+                digest.update(b"\0")
+                digest.update(self._files[rel_path].content_hash.encode("ascii"))
+                digest.update(b"\n")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _hash_file(file_path: str) -> Optional[str]:
+        try:
+            digest = hashlib.sha1()
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except OSError:
+            return None
@@ -0,0 +1,488 @@
+"""
+Shared in-memory component graph.
+
+Every JS/TS source file of a project is parsed once into a ``ComponentNode``
+(exported name, imports, exports, props, hooks, contexts, rendered JSX
+components, doc comments and styling facts). Edges connect nodes by import,
+render and context relationships. ``refresh`` re-stats the project through a
+``ProjectFileInventory`` and re-parses only files whose mtime or size changed,
+so the component scanner, the relationship engine, the conversation
+relationship analyzer and ProjectAnalyzer all query one graph instead of each
+re-reading and regex-parsing the same files.
+
+Usage::
+
+    graph = get_component_graph(project_path)
+    for node in graph.nodes_under(["src/components"]):
+        ...
+    graph.dependents("src/components/Button.tsx", kind="render")
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .file_inventory import ProjectFileInventory
+
+COMPONENT_EXTENSIONS = (".tsx", ".jsx", ".ts", ".js")
+
+# Files larger than this are bundles or generated code, not components
+MAX_COMPONENT_FILE_BYTES = 1024 * 1024
+
+EDGE_IMPORT = "import"
+EDGE_RENDER = "render"
+EDGE_CONTEXT = "context"
+
+_DEFAULT_EXPORT_RE = re.compile(r"export\s+default\s+(?:function\s+)?(\w+)")
+_NAMED_EXPORT_RE = re.compile(r"export\s+(?:const|function)\s+(\w+)")
+_DECLARED_EXPORT_RE = re.compile(r"export\s+(?:const|function|class)\s+(\w+)")
+_REEXPORT_RE = re.compile(r"export\s+{([^}]+)}")
+_FORWARD_REF_RE = re.compile(r"const\s+(\w+)\s*=.*forwardRef")
+_FUNCTION_RE = re.compile(r"function\s+(\w+)\s*\(")
+_IMPORT_RE = re.compile(r"import\s+(?:{[^}]+}|\w+|[^;]+)\s+from\s+['\"]([^'\"]+)['\"]")
+_PROPS_BLOCK_RE = re.compile(r"(?:interface|type)\s+(\w*Props)\s*=?\s*{([^}]+)}", re.DOTALL)
+_PROP_MEMBER_RE = re.compile(r"(\w+)(\?)?\s*:\s*([^;,\n]+)")
+_DESTRUCTURED_RE = re.compile(r"(?:function\s+\w+|const\s+\w+\s*=)\s*\(\s*{\s*([^}]+)\s*}")
+_HOOK_RE = re.compile(r"\b(use[A-Z]\w*)\s*\(")
+_USE_CONTEXT_RE = re.compile(r"useContext\s*\(\s*(\w+)\s*\)")
+_CONSUMER_RE = re.compile(r"(\w+)\.Consumer")
+_JSX_COMPONENT_RE = re.compile(r"<([A-Z]\w*)[\s/>]")
+_JSDOC_SUMMARY_RE = re.compile(r"/\*\*\s*\n\s*\*\s*(.+?)(?:\n|\*/)")
+_JSDOC_BLOCK_RE = re.compile(r"/\*\*\s*\n((?:\s*\*[^\n]*\n)*)\s*\*/")
+_CLASS_NAME_RE = re.compile(r"className\s*=\s*['\"`]([^'\"`]+)['\"`]")
+_CLASS_TEMPLATE_RE = re.compile(r"className\s*=\s*`([^`]+)`")
+_CSS_MODULE_RE = re.compile(r"styles\.(\w+)")
+_STYLED_RE = re.compile(r"styled\.(\w+)`([^`]*)`", re.DOTALL)
+_CSS_VAR_RE = re.compile(r"var\(--([^)]+)\)")
+
+
+@dataclass
+class ComponentNode:
+    """Facts parsed from one source file."""
+
+    rel_path: str
+    name: Optional[str]  # Default or named export, None if the file exports neither
+    declared_name: Optional[str]  # forwardRef const or first function, for fallbacks
+    imports: List[str]  # Module specifiers in source order
+    exports: List[str]
+    props: List[Dict[str, Any]]  # name, type, required (from *Props, else destructuring)
+    hooks: List[str]
+    contexts: List[str]
+    rendered: List[str]  # Capitalized JSX tags
+    summary: Optional[str]  # First JSDoc line or leading // comment
+    description: Optional[str]  # Full leading JSDoc block
+    styling: Dict[str, Any]
+    mtime_ns: int = 0
+    size: int = 0
+
+    @property
+    def stem(self) -> str:
+        return os.path.splitext(self.rel_path.rsplit("/", 1)[-1])[0]
+
+    @property
+    def directory(self) -> str:
+        return self.rel_path.rsplit("/", 1)[0] if "/" in self.rel_path else ""
+
+    @property
+    def relative_imports(self) -> List[str]:
+        return [spec for spec in self.imports if spec.startswith(".")]
+
+    @property
+    def prop_names(self) -> List[str]:
+        return [prop["name"] for prop in self.props]
+
+
+@dataclass(frozen=True)
+class ComponentEdge:
+    """A relationship between two nodes (or a node and a context name)."""
+
+    source: str  # rel_path
+    target: str  # rel_path, or the context's name for context edges
+    kind: str  # "import", "render" or "context"
+
+
+def parse_component_source(rel_path: str, content: str) -> ComponentNode:
+    """Parse one file's source into a ComponentNode."""
+    default_export = _DEFAULT_EXPORT_RE.search(content)
+    named_export = _NAMED_EXPORT_RE.search(content)
+    name = (default_export or named_export).group(1) if (default_export or named_export) else None
+
+    declared = _FORWARD_REF_RE.search(content) or _FUNCTION_RE.search(content)
+
+    exports = set(_DECLARED_EXPORT_RE.findall(content))
+    if "export default" in content:
+        exports.add("default")
+    for reexport in _REEXPORT_RE.findall(content):
+        exports.update(e.strip() for e in reexport.split(",") if e.strip())
+
+    contexts = set(_USE_CONTEXT_RE.findall(content)) | set(_CONSUMER_RE.findall(content))
+
+    return ComponentNode(
+        rel_path=rel_path,
+        name=name,
+        declared_name=declared.group(1) if declared else None,
+        imports=_IMPORT_RE.findall(content),
+        exports=sorted(exports),
+        props=_parse_props(content),
+        hooks=sorted(set(_HOOK_RE.findall(content))),
+        contexts=sorted(contexts),
+        rendered=sorted(set(_JSX_COMPONENT_RE.findall(content))),
+        summary=_parse_summary(content[:500]),
+        description=_parse_description(content[:1000]),
+        styling=_parse_styling(content),
+    )
+
+
+def parse_component_file(file_path: str, rel_path: Optional[str] = None) -> Optional[ComponentNode]:
+    """Parse a file outside any graph (None if it cannot be read)."""
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    node = parse_component_source(rel_path or os.path.basename(file_path), content)
+    node.mtime_ns, node.size = stat.st_mtime_ns, stat.st_size
+    return node
+
+
+def _parse_props(content: str) -> List[Dict[str, Any]]:
+    props: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
+    for _, body in _PROPS_BLOCK_RE.findall(content):
+        for prop_name, optional, prop_type in _PROP_MEMBER_RE.findall(body):
+            if prop_name not in seen:
+                seen.add(prop_name)
+                props.append({"name": prop_name, "type": prop_type.strip(), "required": optional != "?"})
+    if props:
+        return props
+
+    # Fall back to destructured parameters
+    match = _DESTRUCTURED_RE.search(content)
+    if match:
+        for param in match.group(1).split(","):
+            prop_name = param.strip().split(":")[0].split("=")[0].strip()
+            if prop_name and prop_name not in seen:
+                seen.add(prop_name)
+                props.append({"name": prop_name, "type": "unknown", "required": True})
+    return props
+
+
+def _parse_summary(head: str) -> Optional[str]:
+    jsdoc_match = _JSDOC_SUMMARY_RE.search(head)
+    if jsdoc_match:
+        doc_line = jsdoc_match.group(1).strip()
+        return None if doc_line.startswith("@") else doc_line
+    if head.strip().startswith("//"):
+        comment_match = re.match(r"//\s*(.+)", head.strip())
+        if comment_match:
+            return comment_match.group(1).strip()
+    return None
+
+
+def _parse_description(head: str) -> Optional[str]:
+    match = _JSDOC_BLOCK_RE.search(head)
+    if not match:
+        return None
+    desc_lines = []
+    for line in match.group(1).split("\n"):
+        line = line.strip().lstrip("*").strip()
+        if line and not line.startswith("@"):
+            desc_lines.append(line)
+    return " ".join(desc_lines) or None
+
+
+def _parse_styling(content: str) -> Dict[str, Any]:
+    tailwind_classes: List[str] = []
+    for match in _CLASS_NAME_RE.findall(content):
+        tailwind_classes.extend(match.split())
+    for match in _CLASS_TEMPLATE_RE.findall(content):
+        tailwind_classes.extend(re.findall(r"[\w-]+", match))
+
+    return {
+        "tailwind_classes": tailwind_classes,
+        "css_modules": _CSS_MODULE_RE.findall(content),
+        "styled_components": [
+            {"element": element, "styles": styles.strip()}
+            for element, styles in _STYLED_RE.findall(content)
+        ],
+        "style_objects": [],
+        "css_variables": _CSS_VAR_RE.findall(content),
+    }
+
+
+@dataclass(frozen=True)
+class _GraphSnapshot:
+    """Nodes with their name index and edges; replaced, never mutated, by ``refresh``."""
+
+    nodes: Dict[str, ComponentNode]
+    by_name: Dict[str, List[str]]
+    edges: List[ComponentEdge]
+    outgoing: Dict[str, List[ComponentEdge]]
+    incoming: Dict[str, List[ComponentEdge]]
+
+
+_EMPTY_SNAPSHOT = _GraphSnapshot({}, {}, [], {}, {})
+
+
+class ComponentGraph:
+    """
+    Component nodes and edges of one project, refreshed incrementally.
+
+    Refreshes are serialized by a lock; readers take the current snapshot
+    without locking, so they never see a half-applied refresh.
+    """
+
+    def __init__(self, project_path: str):
+        self.project_path = os.path.abspath(project_path)
+        self.inventory: Optional[ProjectFileInventory] = None
+        # Bumped whenever any node is added, changed or removed
+        self.revision = 0
+
+        self._snapshot = _EMPTY_SNAPSHOT
+        self._lock = threading.RLock()
+        self._refreshed_at = 0.0
+
+        # Statistics from the last refresh
+        self.last_refresh_stats: Dict[str, Any] = {}
+
+    def refresh(self, inventory: Optional[ProjectFileInventory] = None) -> Set[str]:
+        """
+        Bring the graph up to date with the project's files.
+
+        Args:
+            inventory: Shared file inventory of the current analysis;
+                a fresh one is built when omitted
+
+        Returns:
+            Project-relative paths that were added, re-parsed or removed
+        """
+        start = time.perf_counter()
+        if inventory is None or inventory.project_path != self.project_path:
+            inventory = ProjectFileInventory(self.project_path)
+
+        with self._lock:
+            nodes = dict(self._snapshot.nodes)
+            changed: Set[str] = set()
+            seen: Set[str] = set()
+            for rel_path, stat in inventory.iter_files():
+                if not rel_path.endswith(COMPONENT_EXTENSIONS) or rel_path.endswith(".d.ts"):
+                    continue
+                if stat.st_size > MAX_COMPONENT_FILE_BYTES:
+                    continue
+                seen.add(rel_path)
+
+                node = nodes.get(rel_path)
+                if node is not None and node.mtime_ns == stat.st_mtime_ns and node.size == stat.st_size:
+                    continue
+                node = self._parse(rel_path, stat)
+                if node is None:
+                    nodes.pop(rel_path, None)
+                    seen.discard(rel_path)
+                else:
+                    nodes[rel_path] = node
+                changed.add(rel_path)
+
+            removed = set(nodes) - seen
+            for rel_path in removed:
+                del nodes[rel_path]
+            changed |= removed
+
+            self.inventory = inventory
+            if changed or not self._refreshed_at:
+                self.revision += 1
+                self._snapshot = self._build_snapshot(nodes)
+            self._refreshed_at = time.monotonic()
+
+            self.last_refresh_stats = {
+                "nodes": len(self._snapshot.nodes),
+                "edges": len(self._snapshot.edges),
+                "parsed_files": len(changed - removed),
+                "removed_files": len(removed),
+                "refresh_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+        return changed
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last refresh."""
+        return time.monotonic() - self._refreshed_at if self._refreshed_at else float("inf")
+
+    @property
+    def nodes(self) -> Dict[str, ComponentNode]:
+        """Nodes by project-relative path (a snapshot; do not mutate)."""
+        return self._snapshot.nodes
+
+    def get(self, rel_path: str) -> Optional[ComponentNode]:
+        return self._snapshot.nodes.get(rel_path)
+
+    def get_by_path(self, file_path: str) -> Optional[ComponentNode]:
+        """Node of an absolute (or project-relative) path, if it belongs to the graph."""
+        abs_path = os.path.normpath(os.path.join(self.project_path, file_path))
+        if not abs_path.startswith(self.project_path + os.sep):
+            return None
+        return self.nodes.get(abs_path[len(self.project_path) + 1:].replace(os.sep, "/"))
+
+    def by_name(self, name: str) -> List[ComponentNode]:
+        """Nodes whose exported name (or file stem) is ``name``."""
+        snapshot = self._snapshot
+        return [snapshot.nodes[rel_path] for rel_path in snapshot.by_name.get(name, [])]
+
+    def nodes_under(
+        self,
+        directories: Iterable[str],
+        exclude_dirs: Iterable[str] = (),
+    ) -> List[ComponentNode]:
+        """
+        Nodes below any of the project-relative directories, in path order.
+
+        Args:
+            directories: Directories to include (``""`` for the whole project)
+            exclude_dirs: Directory names to skip anywhere below them
+        """
+        prefixes = tuple("" if d in ("", ".") else d.strip("/") + "/" for d in directories)
+        excluded = set(exclude_dirs)
+        nodes = self._snapshot.nodes
+        matches = []
+        for rel_path in sorted(nodes):
+            prefix = next((p for p in prefixes if rel_path.startswith(p)), None)
+            if prefix is None:
+                continue
+            if excluded and excluded & set(rel_path[len(prefix):].split("/")[:-1]):
+                continue
+            matches.append(nodes[rel_path])
+        return matches
+
+    def edges(self, kind: Optional[str] = None) -> List[ComponentEdge]:
+        return [edge for edge in self._snapshot.edges if kind is None or edge.kind == kind]
+
+    def dependencies(self, rel_path: str, kind: Optional[str] = None) -> List[ComponentEdge]:
+        """Edges leaving a node (what it imports, renders or consumes)."""
+        return [e for e in self._snapshot.outgoing.get(rel_path, []) if kind is None or e.kind == kind]
+
+    def dependents(self, rel_path: str, kind: Optional[str] = None) -> List[ComponentEdge]:
+        """Edges arriving at a node (who imports or renders it)."""
+        return [e for e in self._snapshot.incoming.get(rel_path, []) if kind is None or e.kind == kind]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "project": self.project_path,
+            "revision": self.revision,
+            **self.last_refresh_stats,
+        }
+
+    def _parse(self, rel_path: str, stat: os.stat_result) -> Optional[ComponentNode]:
+        try:
+            with open(os.path.join(self.project_path, rel_path), "r", encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        node = parse_component_source(rel_path, content)
+        node.mtime_ns, node.size = stat.st_mtime_ns, stat.st_size
+        return node
+
+    def _build_snapshot(self, nodes: Dict[str, ComponentNode]) -> _GraphSnapshot:
+        """Name index and edges of ``nodes`` (cheap; no file access)."""
+        by_name: Dict[str, List[str]] = {}
+        for rel_path, node in sorted(nodes.items()):
+            names = {node.name or node.stem, node.stem}
+            for name in names:
+                by_name.setdefault(name, []).append(rel_path)
+
+        edges: List[ComponentEdge] = []
+        for rel_path, node in nodes.items():
+            imported: Set[str] = set()
+            for specifier in node.imports:
+                target = self._resolve_import(nodes, node, specifier)
+                if target is not None and target != rel_path:
+                    imported.add(target)
+                    edges.append(ComponentEdge(rel_path, target, EDGE_IMPORT))
+
+            for tag in node.rendered:
+                candidates = [c for c in by_name.get(tag, []) if c != rel_path]
+                # Prefer the definition this file actually imports
+                preferred = [c for c in candidates if c in imported] or candidates[:1]
+                for target in preferred:
+                    edges.append(ComponentEdge(rel_path, target, EDGE_RENDER))
+
+            for context in node.contexts:
+                edges.append(ComponentEdge(rel_path, context, EDGE_CONTEXT))
+
+        outgoing: Dict[str, List[ComponentEdge]] = {}
+        incoming: Dict[str, List[ComponentEdge]] = {}
+        for edge in edges:
+            outgoing.setdefault(edge.source, []).append(edge)
+            incoming.setdefault(edge.target, []).append(edge)
+        return _GraphSnapshot(nodes, by_name, edges, outgoing, incoming)
+
+    @staticmethod
+    def _resolve_import(
+        nodes: Dict[str, ComponentNode], node: ComponentNode, specifier: str
+    ) -> Optional[str]:
+        """Project file an import refers to (relative and ``@/`` imports only)."""
+        if specifier.startswith("."):
+            base = os.path.normpath(os.path.join(node.directory, specifier)).replace(os.sep, "/")
+            if base.startswith(".."):
+                return None
+            candidates = [base]
+        elif specifier.startswith("@/"):
+            candidates = [f"src/{specifier[2:]}", specifier[2:]]
+        else:
+            return None
+
+        for base in candidates:
+            base = "" if base == "." else base
+            if base in nodes:
+                return base
+            for extension in COMPONENT_EXTENSIONS:
+                for candidate in (f"{base}{extension}", f"{base}/index{extension}"):
+                    if candidate.lstrip("/") in nodes:
+                        return candidate.lstrip("/")
+        return None
+
+
+# Process-wide graphs, least recently used first
+_graphs: "OrderedDict[str, ComponentGraph]" = OrderedDict()
+_graphs_lock = threading.Lock()
+
+
+def get_component_graph(
+    project_path: str,
+    inventory: Optional[ProjectFileInventory] = None,
+    max_age: Optional[float] = None,
+) -> ComponentGraph:
+    """
+    Shared, up-to-date component graph of a project.
+
+    The graph is refreshed when an inventory of the current analysis is
+    passed, or when the last refresh is older than ``max_age`` seconds
+    (``PALETTE_COMPONENT_GRAPH_MAX_AGE``, default 2), so a burst of consumers
+    within one request walks the project once.
+    """
+    key = os.path.abspath(project_path)
+    max_graphs = int(os.getenv("PALETTE_MAX_COMPONENT_GRAPHS", "8"))
+    if max_age is None:
+        max_age = float(os.getenv("PALETTE_COMPONENT_GRAPH_MAX_AGE", "2"))
+
+    with _graphs_lock:
+        graph = _graphs.pop(key, None) or ComponentGraph(key)
+        _graphs[key] = graph
+        while len(_graphs) > max_graphs:
+            _graphs.popitem(last=False)
+
+    if inventory is not None or graph.age > max_age:
+        graph.refresh(inventory)
+    return graph
+
+
+def clear_component_graphs(project_path: Optional[str] = None):
+    """Forget one project's graph, or all of them."""
+    with _graphs_lock:
+        if project_path is None:
+            _graphs.clear()
+        else:
+            _graphs.pop(os.path.abspath(project_path), None)
@@ -4,16 +4,19 @@ Responsible for discovering and analyzing React components in the project.
 """
 
 import os
-import re
 from typing import List, Dict, Optional
-from pathlib import Path
 
 from ..interfaces import ComponentInfo
+from .component_graph import ComponentGraph, ComponentNode, get_component_graph, parse_component_file
 
 
 class ComponentScanner:
     """Scans and analyzes React components in the project."""
     
+    def __init__(self):
+        # Component graph of the scan in progress (see component_graph.py)
+        self._graph: Optional[ComponentGraph] = None
+    
     def scan(self, project_path: str) -> List[ComponentInfo]:
         """
         Scan for all components in the project.
@@ -25,6 +28,7 @@ class ComponentScanner:
             List of ComponentInfo objects
         """
         components = []
+        self._graph = get_component_graph(project_path)
         
         # Scan shadcn/ui components
         shadcn_components = self._scan_shadcn_ui_components(project_path)
@@ -89,51 +93,37 @@ class ComponentScanner:
             os.path.join(project_path, "src", "components"),
         ]
         
+        graph = self._graph or get_component_graph(project_path)
+        
         for comp_path in component_paths:
             if os.path.exists(comp_path):
-                for root, dirs, files in os.walk(comp_path):
-                    # Skip ui directory (handled separately)
-                    if "ui" in dirs:
-                        dirs.remove("ui")
+                rel_dir = os.path.relpath(comp_path, project_path).replace(os.sep, "/")
+                # Skip ui directories (handled separately)
+                for node in graph.nodes_under([rel_dir], exclude_dirs=["ui"]):
+                    component_name = node.stem
+                    
+                    # Build import path
+                    rel_path = node.directory.replace("/", os.sep)
+                    import_path = self._build_import_path(rel_path, component_name)
+                    
+                    file_path = os.path.join(project_path, *node.rel_path.split("/"))
+                    component_info = ComponentInfo(
+                        name=component_name,
+                        file_path=file_path,
+                        import_path=import_path,
+                        purpose=node.summary or self._infer_purpose_from_name(component_name),
+                        type=self._infer_component_type(component_name),
+                        is_shadcn=False
+                    )
+                    
+                    if node.props:
+                        component_info.props = list(node.props)
+                    if node.description:
+                        component_info.description = node.description
                     
-                    for file in files:
-                        if file.endswith((".tsx", ".ts", ".jsx", ".js")):
-                            component_name = (
-                                file.replace(".tsx", "")
-                                .replace(".ts", "")
-                                .replace(".jsx", "")
-                                .replace(".js", "")
-                            )
-                            
-                            # Build import path
-                            rel_path = os.path.relpath(root, project_path)
-                            import_path = self._build_import_path(rel_path, component_name)
-                            
-                            # Extract component info
-                            file_path = os.path.join(root, file)
-                            
-                            component_info = ComponentInfo(
-                                name=component_name,
-                                file_path=file_path,
-                                import_path=import_path,
-                                purpose=self._analyze_component_purpose(file_path, component_name),
-                                type=self._infer_component_type(component_name),
-                                is_shadcn=False
-                            )
-                            
-                            # Extract props if possible
-                            props = self._extract_component_props(file_path)
-                            if props:
-                                component_info.props = props
-                            
-                            # Extract description
-                            description = self._extract_component_description(file_path)
-                            if description:
-                                component_info.description = description
-                            
-                            # Avoid duplicates
-                            if not any(c.name == component_name for c in components):
-                                components.append(component_info)
+                    # Avoid duplicates
+                    if not any(c.name == component_name for c in components):
+                        components.append(component_info)
                 break
         
         return components
@@ -157,111 +147,31 @@ class ComponentScanner:
             import_base = "/".join(path_parts)
             return f"./{import_base}/{component_name}"
     
+    def _component_node(self, file_path: str) -> Optional[ComponentNode]:
+        """Parsed facts of a file, from the graph of the current scan if possible."""
+        if self._graph is not None:
+            node = self._graph.get_by_path(file_path)
+            if node is not None:
+                return node
+        return parse_component_file(file_path)
+    
     def _analyze_component_purpose(self, file_path: str, component_name: str) -> str:
         """Analyze component purpose from file content and name."""
-        purpose = ""
-        
-        # First, infer from component name
-        purpose = self._infer_purpose_from_name(component_name)
-        
-        # Try to read file for JSDoc or comments
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read(500)  # Read first 500 chars
-                
-                # Look for JSDoc comments
-                jsdoc_match = re.search(r'/\*\*\s*\n\s*\*\s*(.+?)(?:\n|\*/)', content)
-                if jsdoc_match:
-                    doc_line = jsdoc_match.group(1).strip()
-                    if not doc_line.startswith('@'):  # Skip JSDoc tags
-                        purpose = doc_line
-                
-                # Look for leading comments
-                elif content.strip().startswith('//'):
-                    comment_match = re.match(r'//\s*(.+)', content.strip())
-                    if comment_match:
-                        purpose = comment_match.group(1).strip()
-                        
-        except Exception:
-            pass
-        
-        return purpose
+        # JSDoc summary or leading comment wins over name-based inference
+        node = self._component_node(file_path)
+        if node is not None and node.summary:
+            return node.summary
+        return self._infer_purpose_from_name(component_name)
     
     def _extract_component_description(self, file_path: str) -> Optional[str]:
         """Extract detailed component description from JSDoc."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read(1000)  # Read first 1000 chars
-                
-                # Look for JSDoc comment with description
-                jsdoc_pattern = r'/\*\*\s*\n((?:\s*\*[^\n]*\n)*)\s*\*/'
-                match = re.search(jsdoc_pattern, content)
-                
-                if match:
-                    jsdoc_content = match.group(1)
-                    lines = jsdoc_content.split('\n')
-                    
-                    desc_lines = []
-                    for line in lines:
-                        line = line.strip().lstrip('*').strip()
-                        if line and not line.startswith('@'):
-                            desc_lines.append(line)
-                    
-                    if desc_lines:
-                        return ' '.join(desc_lines)
-        except Exception:
-            pass
-        
-        return None
+        node = self._component_node(file_path)
+        return node.description if node is not None else None
     
     def _extract_component_props(self, file_path: str) -> List[Dict[str, str]]:
         """Extract component props from TypeScript interface or PropTypes."""
-        props = []
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-                # Look for TypeScript interface
-                interface_pattern = r'interface\s+\w*Props\s*{\s*([^}]+)\s*}'
-                match = re.search(interface_pattern, content)
-                
-                if match:
-                    props_content = match.group(1)
-                    # Extract individual props
-                    prop_pattern = r'(\w+)(\?)?\s*:\s*([^;]+);'
-                    for prop_match in re.finditer(prop_pattern, props_content):
-                        prop_name = prop_match.group(1)
-                        is_optional = prop_match.group(2) == '?'
-                        prop_type = prop_match.group(3).strip()
-                        
-                        props.append({
-                            "name": prop_name,
-                            "type": prop_type,
-                            "required": not is_optional
-                        })
-                
-                # Fallback to function parameters
-                elif 'function' in content or '=>' in content:
-                    # Look for destructured props
-                    param_pattern = r'(?:function\s+\w+|const\s+\w+\s*=)\s*\(\s*{\s*([^}]+)\s*}'
-                    match = re.search(param_pattern, content)
-                    
-                    if match:
-                        params = match.group(1)
-                        # Extract parameter names
-                        for param in params.split(','):
-                            param = param.strip()
-                            if param:
-                                props.append({
-                                    "name": param.split(':')[0].strip(),
-                                    "type": "unknown",
-                                    "required": True
-                                })
-        except Exception:
-            pass
-        
-        return props
+        node = self._component_node(file_path)
+        return list(node.props) if node is not None else []
     
     def _infer_component_type(self, component_name: str) -> str:
         """Infer the component type from its name."""
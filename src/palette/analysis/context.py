@@ -1,10 +1,8 @@
-import glob
 import json
 import os
 import re
-import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 # Import TreeSitter analyzer
 try:
@@ -17,12 +15,24 @@ except ImportError:
 
 # Import ProjectStructureDetector for enhanced project analysis
 from .project_structure import ProjectStructureDetector, FrameworkType
+from .analysis_index import ProjectAnalysisIndex
+from .component_graph import ComponentNode, get_component_graph
+from .file_inventory import ProjectFileInventory
+
+from .tailwind_class_scanner import ClassUsage, TailwindClassScanner
+from ..utils.tailwind_worker import TailwindWorkerError, get_tailwind_worker
+
+# Source files handed to the AST analyzer
+AST_SOURCE_EXTENSIONS = [".tsx", ".jsx", ".ts", ".js"]
+
+# Source files scanned for Tailwind utility usage
+CLASS_SCAN_EXTENSIONS = [".tsx", ".jsx", ".ts", ".js", ".vue", ".html"]
 
 
 class ProjectAnalyzer:
     """Analyzes project structure to extract design patterns and context"""
 
-    def __init__(self, project_path: str = None):
+    def __init__(self, project_path: str = None, use_analysis_index: bool = True):
         # Simplified: Only support Vite + React projects
         self.supported_frameworks = {
             "vite": ["vite.config.js", "vite.config.ts", "vite.config.mjs"],
@@ -38,6 +48,14 @@ class ProjectAnalyzer:
         
         # Store project path if provided
         self.project_path = project_path
+
+        # File inventory shared by all extractors during analyze_project
+        self._inventory: Optional[ProjectFileInventory] = None
+        self._class_usage = None
+
+        # Persistent per-project analysis indexes (see analysis_index.py)
+        self.use_analysis_index = use_analysis_index
+        self._analysis_indexes: Dict[str, ProjectAnalysisIndex] = {}
         
         # Initialize AST analyzer
         if ASTAnalyzer:
@@ -53,25 +71,63 @@ class ProjectAnalyzer:
     def analyze_project(self, project_path: str) -> Dict:
         """Extract design patterns for UI generation"""
 
+        # Walk the project once; every extractor reads from this inventory
+        self._inventory = ProjectFileInventory(project_path)
+        print(
+            f"Info: Indexed {len(self._inventory)} project files in "
+            f"{self._inventory.build_seconds * 1000:.1f}ms"
+        )
+        try:
+            return self._analyze_project_files(project_path)
+        finally:
+            self._inventory = None
+            self._class_usage = None
+
+    def _analyze_project_files(self, project_path: str) -> Dict:
+        """Run the analysis against the current file inventory"""
+
+        # Consult the persistent analysis index so unchanged sections are reused
+        index = self._get_analysis_index(project_path)
+        if index is not None:
+            try:
+                index.refresh(self._inventory)
+                stats = index.last_refresh_stats
+                print(
+                    f"Info: Analysis index refreshed in {stats['refresh_ms']}ms "
+                    f"({stats['hashed_files']}/{stats['tracked_files']} files rehashed, "
+                    f"stale: {', '.join(stats['dirty_sections']) or 'none'})"
+                )
+            except Exception as e:
+                print(f"Warning: Analysis index refresh failed: {e}")
+                index = None
+
         # Enhanced project structure detection
         enhanced_structure = self._get_enhanced_project_structure(project_path)
-        
+
+        design_tokens = self._get_indexed_section(
+            index, "design_tokens", lambda: self._compute_design_tokens_section(project_path)
+        )
+        self.main_css_file_path = design_tokens["main_css_file"]
+
         context = {
             "framework": enhanced_structure.get("framework", self._detect_framework(project_path)),
             "styling": self._detect_styling_system(project_path),
             "component_library": self._detect_component_library(project_path),
-            "design_tokens": self._extract_design_tokens(project_path),
+            "design_tokens": design_tokens["tokens"],
             "component_patterns": self._analyze_component_patterns(project_path),
             "project_structure": enhanced_structure,
-            "available_imports": self.get_available_imports(project_path),
+            "available_imports": self._get_indexed_section(
+                index, "available_imports", lambda: self.get_available_imports(project_path)
+            ),
             "main_css_file": self.main_css_file_path,
         }
 
         # Add AST analysis if available
         if self.ast_analyzer:
             try:
-                print("Info: Running AST analysis...")
-                ast_analysis = self.ast_analyzer.analyze_project(project_path)
+                ast_analysis = self._get_indexed_section(
+                    index, "ast_analysis", lambda: self._run_ast_analysis(project_path)
+                )
                 context["ast_analysis"] = ast_analysis
                 
                 # AST analysis includes component patterns
@@ -82,8 +138,73 @@ class ProjectAnalyzer:
                 print(f"Warning: AST analysis failed: {e}")
                 context["ast_analysis"] = {"error": str(e)}
 
+        if index is not None:
+            index.save()
+
         return context
 
+    def _get_analysis_index(self, project_path: str) -> Optional[ProjectAnalysisIndex]:
+        """Get (or lazily load) the persistent analysis index for a project"""
+
+        if not self.use_analysis_index:
+            return None
+
+        key = os.path.abspath(project_path)
+        if key not in self._analysis_indexes:
+            try:
+                self._analysis_indexes[key] = ProjectAnalysisIndex(key)
+            except Exception as e:
+                print(f"Warning: Analysis index unavailable: {e}")
+                return None
+        return self._analysis_indexes[key]
+
+    def _get_indexed_section(
+        self,
+        index: Optional[ProjectAnalysisIndex],
+        section: str,
+        compute: Callable[[], Any],
+    ) -> Any:
+        """Return a cached analysis section, recomputing it only when stale"""
+
+        if index is None:
+            return compute()
+
+        cached = index.get_section(section)
+        if cached is not None:
+            return cached
+
+        value = compute()
+        # Failed AST runs are not worth remembering
+        if not (isinstance(value, dict) and "error" in value):
+            index.store_section(section, value)
+        return value
+
+    def _get_inventory(self, project_path: str) -> ProjectFileInventory:
+        """File inventory of the analysis in progress, or a fresh one"""
+
+        inventory = self._inventory
+        if inventory is not None and inventory.project_path == os.path.abspath(project_path):
+            return inventory
+        return ProjectFileInventory(project_path)
+
+    def _compute_design_tokens_section(self, project_path: str) -> Dict:
+        """Design tokens plus the main CSS file they were resolved from"""
+
+        self.main_css_file_path = None
+        tokens = self._extract_design_tokens(project_path)
+        return {"tokens": tokens, "main_css_file": self.main_css_file_path}
+
+    def _run_ast_analysis(self, project_path: str) -> Dict:
+        """Run the AST analyzer over the whole project"""
+
+        print("Info: Running AST analysis...")
+        inventory = self._get_inventory(project_path)
+        source_files = [
+            Path(inventory.abs_path(rel_path))
+            for rel_path in inventory.files_with_extensions(AST_SOURCE_EXTENSIONS)
+        ]
+        return self.ast_analyzer.analyze_project(project_path, files=source_files)
+
     def _detect_framework(self, project_path: str) -> str:
         """Detect if this is a Vite + React project"""
         
@@ -282,6 +403,7 @@ class ProjectAnalyzer:
             ),
             "shadows": self._extract_shadows_from_config(tailwind_config),
             "border_radius": self._extract_border_radius_from_config(tailwind_config),
+            "class_usage": self._get_class_usage(project_path).to_dict(),
         }
 
         return tokens
@@ -316,47 +438,22 @@ class ProjectAnalyzer:
             return self._parse_css_for_theme(project_path)
 
     def _parse_js_config(self, config_path: str, project_path: str) -> Dict:
-        """Parse JavaScript/TypeScript config file using Node.js helper script"""
+        """Parse JavaScript/TypeScript config file using the persistent Node.js worker"""
 
         try:
-            # Get the path to our Node.js helper script
-            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            parser_script = os.path.join(script_dir, "utils", "tailwind_parser.js")
-
-            # Convert config_path to absolute path for subprocess
-            abs_config_path = os.path.abspath(config_path)
-            
-            # Run the Node.js script to parse the config
-            result = subprocess.run(
-                ["node", parser_script, abs_config_path],
-                capture_output=True,
-                text=True,
-                timeout=15,  # Increased timeout for resolveConfig
-            )
-
-            if result.returncode == 0:
-                try:
-                    parsed_config = json.loads(result.stdout)
-                    
-                    # Check if we got a fully resolved config
-                    if parsed_config.get('_resolved', False):
-                        print(f"Info: Successfully resolved full Tailwind theme with defaults")
-                        # Process resolved theme
-                        return self._process_resolved_theme(parsed_config, project_path)
-                    else:
-                        print(f"Info: Using basic Tailwind config parsing (no resolveConfig)")
-                        return parsed_config
-                        
-                except json.JSONDecodeError as e:
-                    print(f"Warning: Failed to parse JSON from tailwind parser: {e}")
-                    print(f"Raw stdout: {result.stdout[:500]}")
-                    print(f"Raw stderr: {result.stderr[:500]}")
-                    return {}
+            # The worker keeps resolveConfig loaded and caches by config content hash
+            parsed_config = get_tailwind_worker().resolve(config_path, timeout=15)
+
+            # Check if we got a fully resolved config
+            if parsed_config.get('_resolved', False):
+                print(f"Info: Successfully resolved full Tailwind theme with defaults")
+                # Process resolved theme
+                return self._process_resolved_theme(parsed_config, project_path)
             else:
-                print(f"Warning: Tailwind parser failed: {result.stderr}")
-                return {}
+                print(f"Info: Using basic Tailwind config parsing (no resolveConfig)")
+                return parsed_config
 
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             print("Warning: Tailwind config parsing timed out")
             return {}
         except FileNotFoundError:
@@ -364,6 +461,9 @@ class ProjectAnalyzer:
                 "Warning: Node.js not found. Install Node.js to enable advanced Tailwind config parsing."
             )
             return {}
+        except TailwindWorkerError as e:
+            print(f"Warning: Tailwind parser failed: {e}")
+            return {}
         except Exception as e:
             print(f"Warning: Error parsing Tailwind config: {e}")
             return {}
@@ -510,9 +610,13 @@ class ProjectAnalyzer:
 
         return structured_data
 
-    def _find_main_css_file(self, project_path: str) -> Optional[str]:
+    def _find_main_css_file(
+        self, project_path: str, inventory: Optional[ProjectFileInventory] = None
+    ) -> Optional[str]:
         """Find the main CSS entry point by recursively searching all subdirectories"""
 
+        inventory = inventory or self._get_inventory(project_path)
+
         # Common CSS file names to look for (prioritized by importance)
         css_filenames = [
             "style.css",
@@ -549,47 +653,27 @@ class ProjectAnalyzer:
         ]
 
         for candidate in predefined_candidates:
-            css_path = os.path.join(project_path, candidate)
-            if os.path.exists(css_path):
-                return css_path
+            if inventory.is_file(candidate):
+                return os.path.join(project_path, candidate)
 
-        # If no predefined paths work, recursively search through all directories
+        # If no predefined paths work, search the whole (pruned) inventory
         print(f"Info: No CSS file found in common locations, searching recursively...")
 
-        for root, dirs, files in os.walk(project_path):
-            # Skip common directories that shouldn't contain main CSS files
-            dirs[:] = [
-                d
-                for d in dirs
-                if d
-                not in [
-                    ".git",
-                    "node_modules",
-                    ".next",
-                    "dist",
-                    "build",
-                    "__pycache__",
-                    ".vscode",
-                    "venv",
-                    ".venv",
-                    "env",
-                    ".env",
-                ]
-            ]
-
-            for filename in files:
-                if filename in css_filenames:
-                    css_path = os.path.join(root, filename)
-                    print(f"Info: Found CSS file during recursive search: {css_path}")
-                    return css_path
+        matches = inventory.find_by_name(css_filenames)
+        if matches:
+            css_path = os.path.join(project_path, *matches[0].split("/"))
+            print(f"Info: Found CSS file during recursive search: {css_path}")
+            return css_path
 
         return None
 
     def find_all_css_files(self, project_path: str) -> List[str]:
         """Find main CSS file and collect all imported CSS files"""
 
+        inventory = self._get_inventory(project_path)
+
         # Step 1: Find the main CSS entry point
-        main_css_file = self._find_main_css_file(project_path)
+        main_css_file = self._find_main_css_file(project_path, inventory)
 
         if not main_css_file:
             print(f"Info: No main CSS file found in {project_path}")
@@ -614,7 +698,7 @@ class ProjectAnalyzer:
 
             # Find @import statements in current file
             imported_files = self._extract_imports_from_css_file(
-                current_file, project_path
+                current_file, project_path, inventory
             )
 
             # Add new files to process queue
@@ -626,11 +710,15 @@ class ProjectAnalyzer:
         return all_css_files
 
     def _extract_imports_from_css_file(
-        self, css_file_path: str, project_path: str
+        self,
+        css_file_path: str,
+        project_path: str,
+        inventory: Optional[ProjectFileInventory] = None,
     ) -> List[str]:
         """Extract @import statements from a CSS file and return absolute paths"""
 
         imported_files = []
+        inventory = inventory or self._get_inventory(project_path)
 
         try:
             with open(css_file_path, "r", encoding="utf-8") as f:
@@ -663,7 +751,7 @@ class ProjectAnalyzer:
                     resolved_path = os.path.join(project_path, import_path)
 
                 # Only include if file exists
-                if os.path.exists(resolved_path):
+                if inventory.exists(resolved_path):
                     imported_files.append(resolved_path)
                 else:
                     # Only show warning for non-Tailwind imports
@@ -1426,75 +1514,14 @@ class ProjectAnalyzer:
     def _extract_colors_from_components(self, project_path: str) -> List[str]:
         """Extract color names from Tailwind classes used in component files"""
 
-        colors = set()
-
-        # Common file extensions for components
-        extensions = ["*.tsx", "*.jsx", "*.ts", "*.js", "*.vue", "*.html"]
+        usage = self._get_class_usage(project_path)
 
-        # Common directories to search
-        directories = ["components", "src", "app", "pages", "."]
-
-        # Regex to match Tailwind color classes
-        color_patterns = [
-            r"(?:bg|text|border|ring|shadow|outline|decoration|accent|caret|divide|placeholder)-([a-z]+)-\d+",  # bg-blue-500
-            r'(?:bg|text|border|ring|shadow|outline|decoration|accent|caret|divide|placeholder)-([a-z]+)(?:\s|"|\'|>|$)',  # bg-blue
-            r"(?:from|via|to)-([a-z]+)-\d+",  # gradient colors
-            r'(?:from|via|to)-([a-z]+)(?:\s|"|\'|>|$)',  # gradient colors
-        ]
-
-        compiled_patterns = [re.compile(pattern) for pattern in color_patterns]
-
-        for directory in directories:
-            dir_path = os.path.join(project_path, directory)
-            if not os.path.exists(dir_path):
-                continue
-
-            for extension in extensions:
-                pattern = os.path.join(dir_path, "**", extension)
-                files = glob.glob(pattern, recursive=True)
-
-                for file_path in files[:20]:  # Limit to 20 files for performance
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-
-                            for pattern in compiled_patterns:
-                                matches = pattern.findall(content)
-                                for match in matches:
-                                    # Only include valid Tailwind color names
-                                    valid_colors = [
-                                        "red",
-                                        "orange",
-                                        "amber",
-                                        "yellow",
-                                        "lime",
-                                        "green",
-                                        "emerald",
-                                        "teal",
-                                        "cyan",
-                                        "sky",
-                                        "blue",
-                                        "indigo",
-                                        "violet",
-                                        "purple",
-                                        "fuchsia",
-                                        "pink",
-                                        "rose",
-                                        "gray",
-                                        "slate",
-                                        "zinc",
-                                        "neutral",
-                                        "stone",
-                                        "white",
-                                        "black",
-                                    ]
-                                    if match in valid_colors:
-                                        colors.add(match)
-                    except Exception:
-                        continue
+        # Solid and gradient colors, most used first
+        color_counts = usage.histograms["color"] + usage.histograms["gradient"]
+        colors = [color for color, _ in color_counts.most_common(8)]
 
         # Sort and limit colors
-        color_list = sorted(list(colors))[:8]  # Return up to 8 colors
+        color_list = sorted(colors)  # Return up to 8 colors
 
         print(
             f"Info: Extracted {len(color_list)} colors from component files: {color_list}"
@@ -1661,31 +1688,10 @@ class ProjectAnalyzer:
     def _extract_spacing_patterns(self, project_path: str) -> List[str]:
         """Extract spacing patterns from existing components"""
 
-        spacing_patterns = []
-
-        # Look for common component directories
-        component_dirs = ["src/components", "components", "app/components"]
-
-        for comp_dir in component_dirs:
-            dir_path = os.path.join(project_path, comp_dir)
-            if os.path.exists(dir_path):
-                for root, dirs, files in os.walk(dir_path):
-                    for file in files:
-                        if file.endswith((".tsx", ".jsx", ".ts", ".js")):
-                            file_path = os.path.join(root, file)
-                            try:
-                                with open(file_path, "r") as f:
-                                    content = f.read()
-                                    # Extract Tailwind spacing classes
-                                    spacing_matches = re.findall(
-                                        r"[mp][xybtlr]?-(\d+)", content
-                                    )
-                                    spacing_patterns.extend(spacing_matches)
-                            except:
-                                continue
+        usage = self._get_class_usage(project_path)
 
         # Get unique spacing values, limit to common ones
-        unique_spacing = list(set(spacing_patterns))
+        unique_spacing = set(usage.histograms["spacing"])
         common_spacing = ["2", "4", "6", "8", "12", "16"]
 
         return [s for s in common_spacing if s in unique_spacing] or common_spacing[:4]
@@ -1693,32 +1699,11 @@ class ProjectAnalyzer:
     def _extract_typography_scale(self, project_path: str) -> List[str]:
         """Extract typography scale from existing components"""
 
-        typography = []
-
-        # Look for common component directories
-        component_dirs = ["src/components", "components", "app/components"]
-
-        for comp_dir in component_dirs:
-            dir_path = os.path.join(project_path, comp_dir)
-            if os.path.exists(dir_path):
-                for root, dirs, files in os.walk(dir_path):
-                    for file in files:
-                        if file.endswith((".tsx", ".jsx", ".ts", ".js")):
-                            file_path = os.path.join(root, file)
-                            try:
-                                with open(file_path, "r") as f:
-                                    content = f.read()
-                                    # Extract Tailwind text size classes
-                                    text_matches = re.findall(
-                                        r"text-(xs|sm|base|lg|xl|2xl|3xl|4xl)", content
-                                    )
-                                    typography.extend(text_matches)
-                            except:
-                                continue
+        usage = self._get_class_usage(project_path)
 
         # Default typography scale
         default_typography = ["sm", "base", "lg", "xl", "2xl"]
-        unique_typography = list(set(typography))
+        unique_typography = set(usage.histograms["typography"])
 
         return [
             t for t in default_typography if t in unique_typography
@@ -1726,11 +1711,32 @@ class ProjectAnalyzer:
 
     def _extract_shadow_patterns(self, project_path: str) -> List[str]:
         """Extract shadow patterns from existing components"""
-        return ["sm", "md", "lg"]  # Default shadows
+        usage = self._get_class_usage(project_path)
+        return usage.most_common("shadow", 3) or ["sm", "md", "lg"]  # Default shadows
 
     def _extract_border_patterns(self, project_path: str) -> List[str]:
         """Extract border radius patterns from existing components"""
-        return ["sm", "md", "lg"]  # Default border radius
+        usage = self._get_class_usage(project_path)
+        return usage.most_common("radius", 3) or ["sm", "md", "lg"]  # Default border radius
+
+    def _get_class_usage(self, project_path: str) -> ClassUsage:
+        """Tailwind utility histograms for the whole project, scanned once per analysis"""
+
+        inventory = self._get_inventory(project_path)
+        if self._class_usage is not None and self._class_usage[0] is inventory:
+            return self._class_usage[1]
+
+        source_files = [
+            inventory.abs_path(rel_path)
+            for rel_path in inventory.files_with_extensions(CLASS_SCAN_EXTENSIONS)
+        ]
+        usage = TailwindClassScanner().scan_files(source_files)
+        print(f"Info: Scanned Tailwind classes in {usage.files_scanned} files")
+
+        # Only reuse the scan while the inventory it was built from is current
+        if inventory is self._inventory:
+            self._class_usage = (inventory, usage)
+        return usage
 
     def _analyze_component_patterns(self, project_path: str) -> Dict:
         """Analyze existing component patterns"""
@@ -1899,14 +1905,14 @@ class ProjectAnalyzer:
         """Scan for available shadcn/ui components with detailed information"""
 
         components = []
-        ui_paths = [
-            os.path.join(project_path, "components", "ui"),
-            os.path.join(project_path, "src", "components", "ui"),
-        ]
-
-        for ui_path in ui_paths:
-            if os.path.exists(ui_path):
-                for file in os.listdir(ui_path):
+        inventory = self._get_inventory(project_path)
+        ui_dirs = ["components/ui", "src/components/ui"]
+
+        for ui_dir in ui_dirs:
+            if inventory.is_dir(ui_dir):
+                ui_path = os.path.join(project_path, *ui_dir.split("/"))
+                for rel_path in inventory.files_in_dir(ui_dir):
+                    file = rel_path.rsplit("/", 1)[-1]
                     if file.endswith((".tsx", ".ts", ".jsx", ".js")):
                         component_name = (
                             file.replace(".tsx", "")
@@ -1939,44 +1945,48 @@ class ProjectAnalyzer:
         """Scan for custom components with detailed information"""
 
         components = []
-        component_paths = [
-            os.path.join(project_path, "components"),
-            os.path.join(project_path, "src", "components"),
-        ]
+        inventory = self._get_inventory(project_path)
+        graph = get_component_graph(project_path, inventory)
+        component_dirs = ["components", "src/components"]
+
+        for comp_dir in component_dirs:
+            if inventory.is_dir(comp_dir):
+                for rel_path in inventory.files_with_extensions(
+                    [".tsx", ".ts", ".jsx", ".js"], under=[comp_dir]
+                ):
+                    rel_root, file = rel_path.rsplit("/", 1)
 
-        for comp_path in component_paths:
-            if os.path.exists(comp_path):
-                for root, dirs, files in os.walk(comp_path):
-                    # Skip ui directory (handled separately)
-                    if "ui" in dirs:
-                        dirs.remove("ui")
-
-                    for file in files:
-                        if file.endswith((".tsx", ".ts", ".jsx", ".js")):
-                            component_name = (
-                                file.replace(".tsx", "")
-                                .replace(".ts", "")
-                                .replace(".jsx", "")
-                                .replace(".js", "")
-                            )
-                            
-                            # Build import path
-                            rel_path = os.path.relpath(root, project_path)
-                            import_path = self._build_import_path(rel_path, component_name)
-                            
-                            # Extract component info
-                            file_path = os.path.join(root, file)
-                            component_info = {
-                                "name": component_name,
-                                "file_path": file_path,
-                                "import_path": import_path,
-                                "purpose": self._analyze_component_purpose(file_path, component_name),
-                                "type": self._infer_component_type(component_name),
-                            }
-                            
-                            # Avoid duplicates
-                            if not any(c["name"] == component_name for c in components):
-                                components.append(component_info)
+                    # Skip ui directories (handled separately)
+                    if "ui" in rel_root[len(comp_dir):].split("/"):
+                        continue
+
+                    component_name = (
+                        file.replace(".tsx", "")
+                        .replace(".ts", "")
+                        .replace(".jsx", "")
+                        .replace(".js", "")
+                    )
+
+                    # Build import path
+                    import_path = self._build_import_path(
+                        rel_root.replace("/", os.sep), component_name
+                    )
+
+                    # Extract component info
+                    file_path = os.path.join(project_path, *rel_path.split("/"))
+                    component_info = {
+                        "name": component_name,
+                        "file_path": file_path,
+                        "import_path": import_path,
+                        "purpose": self._analyze_component_purpose(
+                            file_path, component_name, graph.get(rel_path)
+                        ),
+                        "type": self._infer_component_type(component_name),
+                    }
+
+                    # Avoid duplicates
+                    if not any(c["name"] == component_name for c in components):
+                        components.append(component_info)
                 break
 
         return components  # No limit - return all components
@@ -2000,7 +2010,12 @@ class ProjectAnalyzer:
             import_base = "/".join(path_parts)
             return f"./{import_base}/{component_name}"
     
-    def _analyze_component_purpose(self, file_path: str, component_name: str) -> str:
+    def _analyze_component_purpose(
+        self,
+        file_path: str,
+        component_name: str,
+        node: Optional[ComponentNode] = None,
+    ) -> str:
         """Analyze component purpose from file content and name"""
         purpose = ""
         
@@ -2071,6 +2086,10 @@ class ProjectAnalyzer:
         elif "container" in name_lower:
             purpose = "Content container wrapper"
         
+        # JSDoc or leading comment, already parsed by the component graph
+        if node is not None:
+            return node.summary or purpose or f"Custom {component_name} component"
+
         # Try to read file for JSDoc or comments
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -5,13 +5,12 @@ Responsible for extracting colors, typography, spacing, etc. from projects.
 
 import os
 import re
-import json
-import subprocess
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from collections import defaultdict
 
 from ..interfaces import DesignTokens
+from ..utils.tailwind_worker import TailwindWorkerError, get_tailwind_worker
 
 
 class DesignTokenExtractor:
@@ -55,32 +54,15 @@ class DesignTokenExtractor:
             config_path = os.path.join(project_path, config_file)
             if os.path.exists(config_path):
                 try:
-                    # Use the JavaScript parser to extract config
-                    parser_path = os.path.join(
-                        os.path.dirname(__file__), "..", "utils", "tailwind_parser.js"
-                    )
-                    
-                    if not os.path.exists(parser_path):
-                        print(f"Warning: Tailwind parser not found at {parser_path}")
-                        return self._parse_tailwind_config_fallback(config_path)
-                    
-                    result = subprocess.run(
-                        ["node", parser_path, config_path],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                    )
-                    
-                    if result.returncode == 0:
-                        try:
-                            return json.loads(result.stdout)
-                        except json.JSONDecodeError:
-                            print(f"Warning: Failed to parse Tailwind config JSON output")
-                    else:
-                        print(f"Warning: Tailwind parser error: {result.stderr}")
-                        
-                except subprocess.TimeoutExpired:
+                    # Resolve through the persistent Node.js worker
+                    return get_tailwind_worker().resolve(config_path, timeout=10)
+                except FileNotFoundError:
+                    print("Warning: Node.js not found, using fallback Tailwind config parser")
+                    return self._parse_tailwind_config_fallback(config_path)
+                except TimeoutError:
                     print("Warning: Tailwind config parsing timed out")
+                except TailwindWorkerError as e:
+                    print(f"Warning: Tailwind parser error: {e}")
                 except Exception as e:
                     print(f"Warning: Failed to parse Tailwind config: {e}")
         
@@ -0,0 +1,327 @@
+"""
+Shared project file inventory.
+
+One pruned ``os.scandir`` walk collects every file (with its stat result) and
+directory of a project. ProjectAnalyzer extractors, the analysis index and
+tree-sitter discovery all read from the same inventory instead of walking or
+globbing the filesystem themselves. Walks can optionally honor the project's
+``.gitignore`` files as well.
+"""
+
+import os
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Directories never descended into
+DEFAULT_EXCLUDED_DIRS = {
+    ".git",
+    "node_modules",
+    ".next",
+    "dist",
+    "build",
+    "coverage",
+    "__pycache__",
+    ".vscode",
+    ".idea",
+    "venv",
+    ".venv",
+    "env",
+    ".env",
+    ".turbo",
+    ".cache",
+    ".palette",
+}
+
+
+class GitIgnoreRules:
+    """
+    Patterns of one ``.gitignore`` file.
+
+    Supports the common syntax: comments, ``!`` negation, trailing ``/`` for
+    directories, leading or inner ``/`` anchoring, ``*``, ``?``, ``[...]``
+    and ``**``.
+    """
+
+    def __init__(self, base_dir: str, lines: Iterable[str]):
+        self.base_dir = base_dir
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            rule = self._compile(line.rstrip("\n").rstrip())
+            if rule is not None:
+                self.rules.append(rule)
+
+    @classmethod
+    def load(cls, base_dir: str, path: str) -> Optional["GitIgnoreRules"]:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                rules = cls(base_dir, f)
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True/False if a rule decides (last match wins), None otherwise."""
+        prefix = self.base_dir + "/" if self.base_dir else ""
+        if not rel_path.startswith(prefix):
+            return None
+        local_path = rel_path[len(prefix):]
+
+        decision = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(local_path):
+                decision = not negated
+        return decision
+
+    @staticmethod
+    def _compile(pattern: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        if not pattern or pattern.startswith("#"):
+            return None
+        negated = pattern.startswith("!")
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith("\\"):
+            pattern = pattern[1:]
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            return None
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+
+        regex = ""
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith("**/", i):
+                regex += "(?:.*/)?"
+                i += 3
+            elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+                regex += "/.*"
+                i += 3
+            elif pattern.startswith("**", i):
+                regex += ".*"
+                i += 2
+            elif pattern[i] == "*":
+                regex += "[^/]*"
+                i += 1
+            elif pattern[i] == "?":
+                regex += "[^/]"
+                i += 1
+            elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+                end = pattern.index("]", i + 1)
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex += "[" + body.replace("\\", "\\\\") + "]"
+                i = end + 1
+            else:
+                regex += re.escape(pattern[i])
+                i += 1
+
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        return re.compile(regex + r"\Z"), negated, dir_only
+
+
+class ProjectFileInventory:
+    """
+    Snapshot of a project's files built in a single walk.
+
+    Paths are stored relative to the project root with ``/`` separators and
+    kept in walk order (directories top-down, entries sorted by name), so
+    "first match" lookups behave like a sorted ``os.walk``.
+    """
+
+    def __init__(
+        self,
+        project_path: str,
+        excluded_dirs: Optional[Set[str]] = None,
+        respect_gitignore: bool = False,
+    ):
+        self.project_path = os.path.abspath(project_path)
+        self.excluded_dirs = (
+            DEFAULT_EXCLUDED_DIRS if excluded_dirs is None else set(excluded_dirs)
+        )
+        self.respect_gitignore = respect_gitignore
+        # Paths skipped because of .gitignore rules (directories are not descended)
+        self.ignored: Set[str] = set()
+
+        self._files: Dict[str, os.stat_result] = {}
+        self._dirs: Set[str] = {""}
+        self._by_name: Dict[str, List[str]] = {}
+        self._by_extension: Dict[str, List[str]] = {}
+
+        start = time.perf_counter()
+        self._walk()
+        self.build_seconds = time.perf_counter() - start
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    @property
+    def files(self) -> Dict[str, os.stat_result]:
+        """All files mapped to their stat results, in walk order."""
+        return self._files
+
+    def rel_path(self, path: str) -> Optional[str]:
+        """Project-relative form of an absolute or relative path, or None if outside."""
+        abs_path = os.path.normpath(os.path.join(self.project_path, path))
+        if abs_path == self.project_path:
+            return ""
+        if not abs_path.startswith(self.project_path + os.sep):
+            return None
+        return abs_path[len(self.project_path) + 1:].replace(os.sep, "/")
+
+    def abs_path(self, rel_path: str) -> str:
+        return os.path.join(self.project_path, *rel_path.split("/")) if rel_path else self.project_path
+
+    def is_covered(self, rel_path: str) -> bool:
+        """True if the walk looked at this location (i.e. it is not pruned)."""
+        parts = rel_path.split("/")[:-1] if rel_path else []
+        if any(part in self.excluded_dirs for part in parts):
+            return False
+        if self.ignored and rel_path:
+            # Ignored locations (or anything below them) were never recorded
+            parts = rel_path.split("/")
+            return not any(
+                "/".join(parts[:i]) in self.ignored for i in range(1, len(parts) + 1)
+            )
+        return True
+
+    def exists(self, path: str) -> bool:
+        """
+        ``os.path.exists`` answered from the inventory.
+
+        Locations outside the project or inside pruned directories fall back
+        to the filesystem.
+        """
+        rel_path = self.rel_path(path)
+        if rel_path is None or not self.is_covered(rel_path) or (
+            rel_path and rel_path.split("/")[-1] in self.excluded_dirs
+        ):
+            return os.path.exists(os.path.join(self.project_path, path))
+        return rel_path in self._files or rel_path in self._dirs
+
+    def is_file(self, path: str) -> bool:
+        rel_path = self.rel_path(path)
+        if rel_path is None or not self.is_covered(rel_path):
+            return os.path.isfile(os.path.join(self.project_path, path))
+        return rel_path in self._files
+
+    def is_dir(self, path: str) -> bool:
+        rel_path = self.rel_path(path)
+        if rel_path is None or not self.is_covered(rel_path):
+            return os.path.isdir(os.path.join(self.project_path, path))
+        return rel_path in self._dirs
+
+    def stat(self, rel_path: str) -> Optional[os.stat_result]:
+        return self._files.get(rel_path)
+
+    def find_by_name(self, names: Iterable[str]) -> List[str]:
+        """All files whose base name is one of ``names``, in walk order."""
+        matches: List[str] = []
+        for name in set(names):
+            matches.extend(self._by_name.get(name, []))
+        return sorted(matches, key=self._order.__getitem__)
+
+    def files_with_extensions(
+        self,
+        extensions: Iterable[str],
+        under: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """
+        Files with any of the given extensions (``".tsx"`` style).
+
+        Args:
+            extensions: File extensions including the dot
+            under: Optional project-relative directories to restrict to
+        """
+        matches: List[str] = []
+        for extension in extensions:
+            matches.extend(self._by_extension.get(extension, []))
+
+        if under is not None:
+            prefixes = tuple(
+                "" if d in ("", ".") else d.strip("/") + "/" for d in under
+            )
+            if "" not in prefixes:
+                matches = [p for p in matches if p.startswith(prefixes)]
+
+        # Restore walk order across extensions
+        return sorted(set(matches), key=self._order.__getitem__)
+
+    def files_in_dir(self, rel_dir: str, recursive: bool = False) -> List[str]:
+        """Files directly in (or, if recursive, below) a project directory."""
+        prefix = rel_dir.strip("/") + "/" if rel_dir.strip("/") else ""
+        if recursive:
+            return [p for p in self._files if p.startswith(prefix)]
+        return [
+            p for p in self._files
+            if p.startswith(prefix) and "/" not in p[len(prefix):]
+        ]
+
+    def iter_files(self) -> Iterator[Tuple[str, os.stat_result]]:
+        return iter(self._files.items())
+
+    def _walk(self):
+        """Depth-first, sorted, pruned walk recording every file's stat result."""
+        # Each directory carries the .gitignore rules in effect for it, outermost first
+        stack: List[Tuple[str, Tuple[GitIgnoreRules, ...]]] = [("", ())]
+        while stack:
+            rel_dir, rules = stack.pop()
+            try:
+                with os.scandir(self.abs_path(rel_dir)) as iterator:
+                    entries = sorted(iterator, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            if self.respect_gitignore and any(e.name == ".gitignore" for e in entries):
+                local_rules = GitIgnoreRules.load(
+                    rel_dir, os.path.join(self.abs_path(rel_dir), ".gitignore")
+                )
+                if local_rules is not None:
+                    rules = rules + (local_rules,)
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in self.excluded_dirs:
+                            continue
+                        if rules and self._is_ignored(rules, rel_path, True):
+                            self.ignored.add(rel_path)
+                            continue
+                        self._dirs.add(rel_path)
+                        subdirs.append((rel_path, rules))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if rules and self._is_ignored(rules, rel_path, False):
+                        self.ignored.add(rel_path)
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                self._files[rel_path] = stat
+                self._by_name.setdefault(entry.name, []).append(rel_path)
+                extension = os.path.splitext(entry.name)[1]
+                if extension:
+                    self._by_extension.setdefault(extension, []).append(rel_path)
+
+            # Files of this directory come before anything in its subdirectories
+            stack.extend(reversed(subdirs))
+
+        self._order = {rel_path: i for i, rel_path in enumerate(self._files)}
+
+    @staticmethod
+    def _is_ignored(rules: Tuple[GitIgnoreRules, ...], rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for gitignore in rules:
+            decision = gitignore.match(rel_path, is_dir)
+            if decision is not None:
+                ignored = decision
+        return ignored
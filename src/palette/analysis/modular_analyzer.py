@@ -15,7 +15,7 @@ from .framework_detector import FrameworkDetector
 from .design_token_extractor import DesignTokenExtractor
 from .component_scanner import ComponentScanner
 from .strategies import AnalysisStrategy, HybridStrategy
-from ..cache.decorators import cache_result
+from ..cache.decorators import project_fingerprint
 from ..errors import AnalysisError
 from ..errors.decorators import handle_errors, retry_on_error
 
@@ -51,6 +51,24 @@ class ModularAnalyzer(IAnalyzer):
         except ImportError:
             print("Warning: TreeSitter analyzer not available")
     
+    def _content_cache_key(self, kind: str, project_path: str, fingerprint: Optional[str] = None) -> str:
+        """
+        Cache key that changes whenever any project file changes, so a
+        persistent cache never serves results for an older tree.
+        
+        Args:
+            kind: Kind of cached result
+            project_path: Path to the project directory
+            fingerprint: ``project_fingerprint`` already taken during this
+                analysis (one project walk serves every key)
+        """
+        if fingerprint is None:
+            fingerprint = project_fingerprint(project_path)
+        return (
+            f"{kind}:{os.path.abspath(project_path)}:{type(self.strategy).__qualname__}:"
+            f"{int(self.ast_analyzer is not None)}:{fingerprint}"
+        )
+    
     @handle_errors(reraise=True)
     def analyze(self, project_path: str) -> AnalysisResult:
         """
@@ -80,15 +98,17 @@ class ModularAnalyzer(IAnalyzer):
             )
         
         # Try cache first if available
+        fingerprint = None
         if self.cache:
-            cache_key = f"analysis:{project_path}"
+            fingerprint = project_fingerprint(project_path)
+            cache_key = self._content_cache_key("analysis", project_path, fingerprint)
             cached_result = self.cache.get(cache_key)
             if cached_result and isinstance(cached_result, AnalysisResult):
                 return cached_result
         
         try:
             # Perform analysis
-            result = self._perform_analysis(project_path)
+            result = self._perform_analysis(project_path, fingerprint)
             
             # Cache result if available
             if self.cache and result:
@@ -105,12 +125,13 @@ class ModularAnalyzer(IAnalyzer):
                     cause=e
                 )
     
-    def _perform_analysis(self, project_path: str) -> AnalysisResult:
+    def _perform_analysis(self, project_path: str, fingerprint: Optional[str] = None) -> AnalysisResult:
         """
         Analyze a project and extract all relevant information.
         
         Args:
             project_path: Path to the project directory
+            fingerprint: Project fingerprint already taken by ``analyze``
             
         Returns:
             AnalysisResult containing all extracted information
@@ -139,7 +160,7 @@ class ModularAnalyzer(IAnalyzer):
         # Run AST analysis if available (with caching)
         ast_analysis = None
         if self.ast_analyzer:
-            ast_analysis = self._run_ast_analysis_cached(project_path, components)
+            ast_analysis = self._run_ast_analysis_cached(project_path, components, fingerprint)
         
         # Build result
         return AnalysisResult(
@@ -437,11 +458,13 @@ class ModularAnalyzer(IAnalyzer):
         
         return list(component_map.values())
     
-    def _run_ast_analysis_cached(self, project_path: str, components: List[ComponentInfo]) -> Optional[Dict[str, Any]]:
+    def _run_ast_analysis_cached(
+        self, project_path: str, components: List[ComponentInfo], fingerprint: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """Run AST analysis with caching."""
         # Check cache if available
         if self.cache:
-            cache_key = f"ast_analysis:{project_path}"
+            cache_key = self._content_cache_key("ast_analysis", project_path, fingerprint)
             cached = self.cache.get(cache_key)
             if cached:
                 return cached
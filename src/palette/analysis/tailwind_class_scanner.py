@@ -0,0 +1,199 @@
+"""
+Single-pass Tailwind utility scanner.
+
+Each source file is read once, its class strings (``className``/``class``
+attributes and string arguments of ``cn``/``clsx``/``cva``-style helpers) are
+tokenized once, and every utility is classified in the same pass as a color,
+spacing, typography, shadow, radius or gradient utility. The result is a set
+of frequency histograms for the whole project.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TAILWIND_COLORS = frozenset(
+    [
+        "red", "orange", "amber", "yellow", "lime", "green", "emerald", "teal",
+        "cyan", "sky", "blue", "indigo", "violet", "purple", "fuchsia", "pink",
+        "rose", "gray", "slate", "zinc", "neutral", "stone", "white", "black",
+    ]
+)
+
+CATEGORIES = ("color", "spacing", "typography", "shadow", "radius", "gradient")
+
+# Utility prefixes that take a color (longest first so "ring-offset" wins over "ring")
+COLOR_PREFIXES = (
+    "ring-offset", "placeholder", "decoration", "outline", "divide", "border",
+    "accent", "shadow", "caret", "stroke", "fill", "ring", "text", "bg",
+)
+GRADIENT_PREFIXES = ("from", "via", "to")
+
+TEXT_SIZES = frozenset(
+    ["xs", "sm", "base", "lg", "xl", "2xl", "3xl", "4xl", "5xl", "6xl", "7xl", "8xl", "9xl"]
+)
+FONT_WEIGHTS = frozenset(
+    ["thin", "extralight", "light", "normal", "medium", "semibold", "bold", "extrabold", "black"]
+)
+SHADOW_SIZES = frozenset(["sm", "md", "lg", "xl", "2xl", "inner", "none"])
+RADIUS_SIZES = frozenset(["none", "sm", "md", "lg", "xl", "2xl", "3xl", "full"])
+
+# Attribute values: className="..." / class='...' / className={`...`} / className={"..."}
+CLASS_ATTRIBUTE_RE = re.compile(
+    r"""\b(?:className|class)\s*=\s*(?:"([^"]*)"|'([^']*)'|\{\s*(?:`([^`]*)`|"([^"]*)"|'([^']*)'))"""
+)
+# Class helper calls whose string arguments are class lists
+CLASS_HELPER_RE = re.compile(r"\b(?:cn|clsx|classnames|classNames|twMerge|twJoin|cva|tv)\s*\(")
+STRING_LITERAL_RE = re.compile(r""""([^"\n]*)"|'([^'\n]*)'|`([^`]*)`""")
+
+COLOR_UTILITY_RE = re.compile(
+    r"^(%s)-([a-z]+)(?:-(\d{2,3}))?(?:/\d+)?$" % "|".join(COLOR_PREFIXES)
+)
+GRADIENT_UTILITY_RE = re.compile(r"^(from|via|to)-([a-z]+)(?:-(\d{2,3}))?(?:/\d+)?$")
+SPACING_UTILITY_RE = re.compile(
+    r"^(?:[mp][xytrblse]?|gap(?:-[xy])?|space-[xy])-(\d+(?:\.\d+)?|px|auto)$"
+)
+
+# Longest helper-call argument list followed when collecting class strings
+MAX_HELPER_ARGS_LENGTH = 4000
+
+
+@dataclass
+class ClassUsage:
+    """Frequency histograms of Tailwind utilities across scanned files."""
+    histograms: Dict[str, Counter] = field(
+        default_factory=lambda: {category: Counter() for category in CATEGORIES}
+    )
+    utilities: Counter = field(default_factory=Counter)
+    files_scanned: int = 0
+
+    def merge(self, other: "ClassUsage"):
+        for category in CATEGORIES:
+            self.histograms[category].update(other.histograms[category])
+        self.utilities.update(other.utilities)
+        self.files_scanned += other.files_scanned
+
+    def most_common(self, category: str, limit: Optional[int] = None) -> List[str]:
+        """Values of a category ordered by frequency."""
+        return [value for value, _ in self.histograms[category].most_common(limit)]
+
+    def to_dict(self, limit: int = 20) -> Dict[str, Any]:
+        """Top ``limit`` entries of every histogram as plain dicts, plus the file count."""
+        return {
+            "histograms": {
+                category: dict(self.histograms[category].most_common(limit))
+                for category in CATEGORIES
+            },
+            "files_scanned": self.files_scanned,
+        }
+
+
+class TailwindClassScanner:
+    """Tokenizes class strings once per file and classifies every utility."""
+
+    def scan_files(self, file_paths: Iterable[str]) -> ClassUsage:
+        """Scan every file (no sampling) and aggregate the histograms."""
+        usage = ClassUsage()
+        for file_path in file_paths:
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except Exception:
+                continue
+            self.scan_source(content, usage)
+            usage.files_scanned += 1
+        return usage
+
+    def scan_source(self, content: str, usage: Optional[ClassUsage] = None) -> ClassUsage:
+        """Scan one source string into ``usage`` (a new one if omitted)."""
+        usage = usage if usage is not None else ClassUsage()
+
+        for class_string in self._iter_class_strings(content):
+            for token in class_string.split():
+                classified = self.classify(token)
+                if classified is None:
+                    continue
+                category, value, utility = classified
+                usage.histograms[category][value] += 1
+                usage.utilities[utility] += 1
+
+        return usage
+
+    def classify(self, token: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Classify a single class token.
+
+        Returns:
+            ``(category, value, utility)`` where ``utility`` is the token with
+            variants (``hover:``, ``md:``), ``!`` and ``-`` prefixes removed,
+            or None if the token is not a tracked utility
+        """
+        utility = token.rsplit(":", 1)[-1].lstrip("!")
+        if utility.startswith("-"):
+            utility = utility[1:]
+        if not utility or "[" in utility or "${" in utility:
+            return None
+
+        head = utility.split("-", 1)[0]
+
+        if head in GRADIENT_PREFIXES:
+            match = GRADIENT_UTILITY_RE.match(utility)
+            if match and match.group(2) in TAILWIND_COLORS:
+                return "gradient", match.group(2), utility
+            return None
+
+        if head == "rounded":
+            size = utility.rsplit("-", 1)[-1] if utility != "rounded" else "DEFAULT"
+            if size == "DEFAULT" or size in RADIUS_SIZES:
+                return "radius", size, utility
+            return None
+
+        if head == "shadow":
+            size = utility[len("shadow-"):] if utility != "shadow" else "DEFAULT"
+            if size == "DEFAULT" or size in SHADOW_SIZES:
+                return "shadow", size, utility
+            # shadow-<color> falls through to the color check
+
+        if head == "text" and utility[len("text-"):] in TEXT_SIZES:
+            return "typography", utility[len("text-"):], utility
+        if head == "font" and utility[len("font-"):] in FONT_WEIGHTS:
+            return "typography", utility, utility
+        if head in ("leading", "tracking"):
+            return "typography", utility, utility
+
+        match = SPACING_UTILITY_RE.match(utility)
+        if match:
+            return "spacing", match.group(1), utility
+
+        match = COLOR_UTILITY_RE.match(utility)
+        if match and match.group(2) in TAILWIND_COLORS:
+            return "color", match.group(2), utility
+
+        return None
+
+    def _iter_class_strings(self, content: str) -> Iterable[str]:
+        """Yield every class string in a source file."""
+        for match in CLASS_ATTRIBUTE_RE.finditer(content):
+            value = next((group for group in match.groups() if group is not None), "")
+            yield value
+
+        for match in CLASS_HELPER_RE.finditer(content):
+            arguments = self._call_arguments(content, match.end())
+            for literal in STRING_LITERAL_RE.finditer(arguments):
+                yield next((group for group in literal.groups() if group is not None), "")
+
+    @staticmethod
+    def _call_arguments(content: str, start: int) -> str:
+        """Text between an opening parenthesis at ``start - 1`` and its match."""
+        depth = 1
+        end = min(len(content), start + MAX_HELPER_ARGS_LENGTH)
+        for index in range(start, end):
+            char = content[index]
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    return content[start:index]
+        return content[start:end]
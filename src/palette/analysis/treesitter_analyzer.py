@@ -5,11 +5,14 @@ Replaces SimpleASTAnalyzer with dramatically improved accuracy and reliability.
 
 import os
 import json
+import itertools
 import re
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 try:
     import tree_sitter_languages as tsl
@@ -55,12 +58,116 @@ class ComponentPattern:
             self.examples = []
 
 
+COMPONENT_EXTENSIONS = {'.tsx', '.jsx', '.ts', '.js'}
+
+# Directories pruned before descending during discovery
+DISCOVERY_EXCLUDED_DIRS = {
+    'node_modules', 'dist', 'build', 'out', 'coverage', '__tests__',
+    '__mocks__', '__pycache__', 'storybook-static', 'venv',
+}
+
+# File name fragments that mark tests, stories and tool configs
+EXCLUDED_FILE_PATTERNS = (
+    '.test.', '.spec.', '.stories.',
+    'babel.config', 'webpack.config', 'vite.config',
+    '.eslint', '.prettier', 'jest.config',
+)
+
+
+@dataclass
+class DiscoveryStats:
+    """Counters collected while streaming component files."""
+    dirs_scanned: int = 0
+    files_scanned: int = 0
+    files_sniffed: int = 0
+    files_yielded: int = 0
+    files_skipped: int = 0  # Yielded but dropped when the time budget ran out
+    seconds: float = 0.0
+    budget_exhausted: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dirs_scanned": self.dirs_scanned,
+            "files_scanned": self.files_scanned,
+            "files_sniffed": self.files_sniffed,
+            "files_discovered": self.files_yielded,
+            "files_skipped": self.files_skipped,
+            "discovery_seconds": round(self.seconds, 3),
+            "files_per_second": _rate(self.files_scanned, self.seconds),
+        }
+
+
+def _rate(count: int, seconds: float) -> Optional[float]:
+    return round(count / seconds, 1) if seconds > 0 else None
+
+
+# Below this many files the process pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Files handed to a worker per task; large enough to amortize IPC overhead
+PARALLEL_CHUNK_SIZE = 32
+
+# Chunks queued per worker, so a time budget can stop parsing between chunks
+PARALLEL_CHUNKS_IN_FLIGHT_PER_JOB = 2
+
+
+def resolve_jobs(jobs: Optional[int] = None) -> int:
+    """
+    Resolve the number of parse workers.
+
+    ``None`` reads ``PALETTE_ANALYSIS_JOBS`` (default 1, i.e. serial),
+    ``0`` or a negative value means one worker per CPU core.
+    """
+    if jobs is None:
+        try:
+            jobs = int(os.getenv("PALETTE_ANALYSIS_JOBS", "1"))
+        except ValueError:
+            jobs = 1
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return jobs
+
+
+# Per-process analyzer used by pool workers, so each worker owns its parsers
+_worker_analyzer: Optional["TreeSitterAnalyzer"] = None
+
+
+def _init_parse_worker():
+    """Process pool initializer: build one analyzer (and parser set) per worker."""
+    global _worker_analyzer
+    _worker_analyzer = TreeSitterAnalyzer(jobs=1)
+
+
+def _parse_chunk_in_worker(file_paths: List[str]) -> Tuple[List["ComponentPattern"], Counter, Counter]:
+    """Analyze a chunk of files inside a worker and pre-aggregate its counters."""
+    components = []
+    styling_idioms = Counter()
+    import_patterns = Counter()
+
+    for file_path in file_paths:
+        try:
+            component = _worker_analyzer._analyze_component_with_treesitter(Path(file_path))
+        except Exception as e:
+            print(f"Error analyzing {file_path}: {e}")
+            continue
+
+        if component:
+            components.append(component)
+            styling_idioms.update(component.styling_patterns)
+            import_patterns.update(component.imports)
+
+    return components, styling_idioms, import_patterns
+
+
 class TreeSitterAnalyzer:
     """High-accuracy Tree-sitter based AST analyzer for React components."""
     
-    def __init__(self):
+    def __init__(self, jobs: Optional[int] = None):
         if not TREE_SITTER_AVAILABLE:
             raise ImportError("tree-sitter and tree-sitter-languages required")
+
+        # Number of parse workers (1 = serial, see resolve_jobs)
+        self.jobs = resolve_jobs(jobs)
         
         # Initialize parsers with compatible API
         try:
@@ -108,42 +215,55 @@ class TreeSitterAnalyzer:
         except:
             raise ImportError(f"Cannot create {language} parser")
     
-    def analyze_project(self, project_path: str) -> Dict[str, Any]:
-        """Analyze project with enhanced Tree-sitter parsing."""
+    def analyze_project(
+        self,
+        project_path: str,
+        jobs: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        files: Optional[Iterable[Path]] = None,
+    ) -> Dict[str, Any]:
+        """Analyze project with enhanced Tree-sitter parsing.
+        
+        Every component file in the project is analyzed. Files are discovered
+        by a streaming walk and fed to the parser as they are found, so
+        discovery and parsing overlap. Callers that already walked the project
+        (see ``ProjectFileInventory``) can pass its ``files`` instead, which
+        are then only filtered and sniffed. ``time_budget`` (seconds)
+        optionally stops feeding new files once exceeded; the statistics then
+        report ``budget_exhausted``.
+        """
         project_path = Path(project_path)
+        jobs = self.jobs if jobs is None else resolve_jobs(jobs)
         
-        # Smart file discovery for large projects
-        component_files = self._smart_file_discovery(project_path)
+        start = time.perf_counter()
+        deadline = start + time_budget if time_budget is not None else None
+        discovery = DiscoveryStats()
+        if files is None:
+            component_files = self.iter_component_files(project_path, discovery)
+        else:
+            component_files = self.filter_component_files(project_path, files, discovery)
+        if deadline is not None:
+            component_files = self._limit_to_budget(component_files, deadline, discovery)
         
-        if not component_files:
+        # Only pay for a process pool when there is enough work to share
+        head = list(itertools.islice(component_files, PARALLEL_MIN_FILES))
+        if not head:
             return {"error": "No React component files found"}
+        component_files = itertools.chain(head, component_files)
         
-        # Analyze components in batches for large projects
-        components = []
-        styling_idioms = defaultdict(int)
-        import_patterns = defaultdict(int)
-        
-        batch_size = 50 if len(component_files) > 200 else len(component_files)
-        
-        for i in range(0, len(component_files), batch_size):
-            batch = component_files[i:i + batch_size]
-            
-            for file_path in batch:
-                try:
-                    component = self._analyze_component_with_treesitter(file_path)
-                    if component:
-                        components.append(component)
-                        
-                        # Collect patterns
-                        for pattern in component.styling_patterns:
-                            styling_idioms[pattern] += 1
-                        
-                        for imp in component.imports:
-                            import_patterns[imp] += 1
-                            
-                except Exception as e:
-                    print(f"Error analyzing {file_path}: {e}")
-                    continue
+        if jobs > 1 and len(head) >= PARALLEL_MIN_FILES:
+            components, styling_idioms, import_patterns = self._analyze_files_parallel(
+                component_files, jobs, deadline, discovery
+            )
+        else:
+            jobs = 1
+            components, styling_idioms, import_patterns = self._analyze_files_serial(
+                component_files
+            )
+        total_seconds = time.perf_counter() - start
+        # Discovery runs interleaved with parsing; attribute the rest to parsing
+        parse_seconds = max(total_seconds - discovery.seconds, 0.0)
+        files_analyzed = discovery.files_yielded - discovery.files_skipped
         
         # Extract common patterns
         common_patterns = self._extract_common_patterns(components)
@@ -157,182 +277,244 @@ class TreeSitterAnalyzer:
                 "total_components": len(components),
                 "typescript_components": sum(1 for c in components if c.has_typescript),
                 "functional_components": sum(1 for c in components if c.is_functional),
-                "files_analyzed": len(component_files),
+                "files_analyzed": files_analyzed,
+                "parse_jobs": jobs,
+                "parse_seconds": round(parse_seconds, 3),
+                "parse_files_per_second": _rate(files_analyzed, parse_seconds),
+                "discovery": discovery.to_dict(),
+                "total_seconds": round(total_seconds, 3),
+                "budget_exhausted": discovery.budget_exhausted,
             }
         }
     
-    def _smart_file_discovery(self, project_path: Path) -> List[Path]:
-        """Smart file discovery optimized for large projects."""
-        extensions = {'.tsx', '.jsx', '.ts', '.js'}
-        component_files = []
-        
-        # Priority-based search for better performance
-        search_strategies = [
-            # Strategy 1: Monorepo structure
-            self._search_monorepo_structure,
-            # Strategy 2: Standard React structure  
-            self._search_standard_structure,
-            # Strategy 3: Full project search (fallback)
-            self._search_full_project
-        ]
+    def _analyze_files_serial(self, component_files: Iterable[Path]) -> Tuple[List[ComponentPattern], Counter, Counter]:
+        """Analyze files one after another in this process."""
+        components = []
+        styling_idioms = Counter()
+        import_patterns = Counter()
         
-        for strategy in search_strategies:
-            component_files = strategy(project_path, extensions)
-            if component_files:
-                break
+        for file_path in component_files:
+            try:
+                component = self._analyze_component_with_treesitter(file_path)
+                if component:
+                    components.append(component)
+                    
+                    # Collect patterns
+                    styling_idioms.update(component.styling_patterns)
+                    import_patterns.update(component.imports)
+                        
+            except Exception as e:
+                print(f"Error analyzing {file_path}: {e}")
+                continue
         
-        # Smart filtering and limiting
-        component_files = self._filter_and_prioritize_files(component_files)
+        return components, styling_idioms, import_patterns
+    
+    def _analyze_files_parallel(
+        self,
+        component_files: Iterable[Path],
+        jobs: int,
+        deadline: Optional[float] = None,
+        stats: Optional["DiscoveryStats"] = None,
+    ) -> Tuple[List[ComponentPattern], Counter, Counter]:
+        """Spread file analysis across a process pool and merge the results.
+        
+        Every worker builds its own parsers once (tree-sitter parsers cannot be
+        pickled) and returns its components with pre-aggregated counters, so the
+        parent only merges per-chunk results. Component order is preserved.
+        
+        Only a few chunks per worker are queued at a time. Once ``deadline``
+        passes, no further chunk is submitted, queued chunks are cancelled and
+        chunks still parsing are abandoned.
+        """
+        stats = stats if stats is not None else DiscoveryStats()
+        # Materialize paths as they stream in so a serial fallback can replay them
+        consumed: List[Path] = []
+        
+        def chunks() -> Iterator[List[str]]:
+            iterator = iter(component_files)
+            while True:
+                chunk = list(itertools.islice(iterator, PARALLEL_CHUNK_SIZE))
+                if not chunk:
+                    return
+                consumed.extend(chunk)
+                yield [str(file_path) for file_path in chunk]
+        
+        def budget_left() -> bool:
+            return deadline is None or time.perf_counter() < deadline
+        
+        max_in_flight = jobs * PARALLEL_CHUNKS_IN_FLIGHT_PER_JOB
+        pending = {}  # future -> (chunk index, chunk size)
+        results = {}
+        chunk_iter = chunks()
+        exhausted = False
+        
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_parse_worker)
+        try:
+            index = 0
+            while True:
+                while len(pending) < max_in_flight and not exhausted:
+                    if not budget_left():
+                        exhausted = True
+                        break
+                    chunk = next(chunk_iter, None)
+                    if chunk is None:
+                        break
+                    pending[executor.submit(_parse_chunk_in_worker, chunk)] = (index, len(chunk))
+                    index += 1
+                
+                if exhausted or not pending:
+                    break
+                
+                timeout = None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_index, _ = pending.pop(future)
+                    results[chunk_index] = future.result()
+                if not done:
+                    exhausted = True
+                    break
+        except Exception as e:
+            executor.shutdown(wait=False, cancel_futures=True)
+            # Pools can be unavailable (restricted sandboxes, frozen apps)
+            print(f"Warning: Parallel analysis failed ({e}), falling back to serial parsing")
+            return self._analyze_files_serial(itertools.chain(consumed, component_files))
+        
+        if exhausted:
+            for future, (_, size) in pending.items():
+                future.cancel()
+                stats.files_skipped += size
+            if not stats.budget_exhausted:
+                stats.budget_exhausted = True
+                print("Warning: Analysis time budget exhausted, remaining files skipped")
+        # Abandoned chunks finish in the background instead of holding up the result
+        executor.shutdown(wait=not exhausted, cancel_futures=True)
         
-        return component_files
+        components = []
+        styling_idioms = Counter()
+        import_patterns = Counter()
+        for chunk_index in sorted(results):
+            chunk_components, chunk_styling, chunk_imports = results[chunk_index]
+            components.extend(chunk_components)
+            styling_idioms.update(chunk_styling)
+            import_patterns.update(chunk_imports)
+        
+        return components, styling_idioms, import_patterns
     
-    def _search_monorepo_structure(self, project_path: Path, extensions: Set[str]) -> List[Path]:
-        """Search monorepo structure efficiently."""
-        component_files = []
-        
-        # Check for monorepo indicators
-        monorepo_dirs = ['apps', 'packages', 'libs']
-        
-        for mono_dir_name in monorepo_dirs:
-            mono_dir = project_path / mono_dir_name
-            if mono_dir.exists():
-                for app_dir in mono_dir.iterdir():
-                    if app_dir.is_dir():
-                        # Priority paths within each app
-                        priority_paths = [
-                            'src/components',
-                            'src/app',
-                            'components',
-                            'src',
-                            'lib'
-                        ]
+    def iter_component_files(self, project_path: Path, stats: Optional["DiscoveryStats"] = None) -> Iterator[Path]:
+        """Stream component files from a single pruned ``os.scandir`` walk.
+        
+        Excluded directories (``node_modules``, build output, tests, ...) are
+        dropped before descending, file names are filtered without touching
+        the file, and only the survivors get a cheap prefix sniff. Files are
+        yielded as each directory is scanned, in a deterministic order.
+        """
+        stats = stats if stats is not None else DiscoveryStats()
+        stack = [str(project_path)]
+        
+        while stack:
+            scan_start = time.perf_counter()
+            dir_path = stack.pop()
+            subdirs = []
+            candidates = []
+            
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not self._is_excluded_dir(entry.name):
+                                    subdirs.append(entry.path)
+                                continue
+                            if not entry.is_file():
+                                continue
+                        except OSError:
+                            continue
                         
-                        for priority_path in priority_paths:
-                            search_path = app_dir / priority_path
-                            if search_path.exists():
-                                component_files.extend(self._collect_files_in_path(
-                                    search_path, extensions, max_files=30
-                                ))
-        
-        return component_files
+                        stats.files_scanned += 1
+                        if self._is_candidate_file_name(entry.name):
+                            candidates.append(entry.path)
+            except OSError:
+                stats.seconds += time.perf_counter() - scan_start
+                continue
+            
+            stats.dirs_scanned += 1
+            # Pop subdirectories in sorted order on the next iterations
+            stack.extend(sorted(subdirs, reverse=True))
+            
+            matched = []
+            for file_path in sorted(candidates):
+                stats.files_sniffed += 1
+                if self._quick_component_check(Path(file_path)):
+                    matched.append(Path(file_path))
+            stats.seconds += time.perf_counter() - scan_start
+            
+            for file_path in matched:
+                stats.files_yielded += 1
+                yield file_path
     
-    def _search_standard_structure(self, project_path: Path, extensions: Set[str]) -> List[Path]:
-        """Search standard React project structure."""
-        component_files = []
-        
-        priority_dirs = [
-            'src/components',
-            'src/app', 
-            'src/pages',
-            'components',
-            'src',
-            'app',
-            'pages',
-            'lib'
-        ]
-        
-        for dir_name in priority_dirs:
-            search_path = project_path / dir_name
-            if search_path.exists():
-                component_files.extend(self._collect_files_in_path(
-                    search_path, extensions, max_files=50
-                ))
-        
-        return component_files
+    def filter_component_files(self, project_path: Path, files: Iterable[Path], stats: Optional["DiscoveryStats"] = None) -> Iterator[Path]:
+        """Apply discovery filtering to files that were listed elsewhere."""
+        stats = stats if stats is not None else DiscoveryStats()
+        
+        for file_path in files:
+            check_start = time.perf_counter()
+            file_path = Path(file_path)
+            stats.files_scanned += 1
+            
+            try:
+                parent_parts = file_path.relative_to(project_path).parent.parts
+            except ValueError:
+                parent_parts = file_path.parent.parts
+            
+            matched = (
+                not any(self._is_excluded_dir(part) for part in parent_parts)
+                and self._is_candidate_file_name(file_path.name)
+            )
+            if matched:
+                stats.files_sniffed += 1
+                matched = self._quick_component_check(file_path)
+            stats.seconds += time.perf_counter() - check_start
+            
+            if matched:
+                stats.files_yielded += 1
+                yield file_path
     
-    def _search_full_project(self, project_path: Path, extensions: Set[str]) -> List[Path]:
-        """Full project search as fallback."""
-        return self._collect_files_in_path(project_path, extensions, max_files=100)
+    def _limit_to_budget(self, files: Iterator[Path], deadline: float, stats: "DiscoveryStats") -> Iterator[Path]:
+        """Stop feeding files to the parser once the time budget is spent."""
+        for file_path in files:
+            if time.perf_counter() > deadline:
+                stats.budget_exhausted = True
+                print("Warning: Analysis time budget exhausted, remaining files skipped")
+                return
+            yield file_path
     
-    def _collect_files_in_path(self, search_path: Path, extensions: Set[str], max_files: int = 50) -> List[Path]:
-        """Collect component files in a specific path."""
-        files = []
-        
-        for file_path in search_path.rglob('*'):
-            if len(files) >= max_files:
-                break
-                
-            if (file_path.suffix in extensions and 
-                file_path.is_file() and
-                self._should_include_file(file_path)):
-                files.append(file_path)
-        
-        return files
+    def _is_excluded_dir(self, name: str) -> bool:
+        """Directories never worth descending into."""
+        return name in DISCOVERY_EXCLUDED_DIRS or name.startswith('.')
     
-    def _should_include_file(self, file_path: Path) -> bool:
-        """Determine if file should be included in analysis."""
-        path_str = str(file_path)
-        
-        # Exclude patterns
-        exclude_patterns = [
-            'node_modules', '.next', 'dist', 'build', 'coverage',
-            '__tests__', '.test.', '.spec.', '.stories.',
-            'babel.config', 'webpack.config', 'vite.config',
-            '.eslint', '.prettier', 'jest.config'
-        ]
-        
-        if any(pattern in path_str for pattern in exclude_patterns):
+    def _is_candidate_file_name(self, name: str) -> bool:
+        """Cheap name-only filter applied before any file is opened."""
+        if os.path.splitext(name)[1] not in COMPONENT_EXTENSIONS or name.endswith('.d.ts'):
             return False
-        
-        # Include only if likely to be a component
-        return self._quick_component_check(file_path)
+        return not any(pattern in name for pattern in EXCLUDED_FILE_PATTERNS)
     
     def _quick_component_check(self, file_path: Path) -> bool:
         """Quick check if file likely contains React components."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Read first 500 chars for quick check
-                sample = f.read(500).lower()
-                
-                # Must have React indicators
-                react_indicators = ['import', 'react', 'export', 'function', 'const', 'jsx']
-                has_react = sum(1 for indicator in react_indicators if indicator in sample) >= 3
-                
-                # Should have JSX-like content
-                has_jsx = any(pattern in sample for pattern in ['<', 'return', '=>', '{', '}'])
-                
-                return has_react and has_jsx
-        except:
+            with open(file_path, 'rb') as f:
+                # Sniff the first 512 bytes for a quick check
+                sample = f.read(512).decode('utf-8', errors='ignore').lower()
+        except OSError:
             return True  # Include if can't read (better to over-include than miss)
-    
-    def _filter_and_prioritize_files(self, component_files: List[Path]) -> List[Path]:
-        """Filter and prioritize files for analysis."""
-        if len(component_files) <= 150:
-            return component_files
         
-        # Prioritize TypeScript files and well-named components
-        scored_files = []
+        # Must have React indicators
+        react_indicators = ['import', 'react', 'export', 'function', 'const', 'jsx']
+        has_react = sum(1 for indicator in react_indicators if indicator in sample) >= 3
         
-        for file_path in component_files:
-            score = 0
-            
-            # TypeScript bonus
-            if file_path.suffix in ['.tsx', '.ts']:
-                score += 3
-            
-            # Component-like naming bonus
-            name = file_path.stem
-            if name and name[0].isupper():
-                score += 2
-            
-            # Common component directories bonus
-            if any(dir_name in str(file_path) for dir_name in 
-                   ['components', 'ui', 'shared', 'common']):
-                score += 1
-            
-            # Smaller files are often cleaner components
-            try:
-                size = file_path.stat().st_size
-                if size < 5000:  # Less than 5KB
-                    score += 1
-            except:
-                pass
-            
-            scored_files.append((score, file_path))
+        # Should have JSX-like content
+        has_jsx = any(pattern in sample for pattern in ['<', 'return', '=>', '{', '}'])
         
-        # Sort by score and take top files
-        scored_files.sort(key=lambda x: x[0], reverse=True)
-        return [file_path for _, file_path in scored_files[:150]]
+        return has_react and has_jsx
     
     def _analyze_component_with_treesitter(self, file_path: Path) -> Optional[ComponentPattern]:
         """Analyze component using Tree-sitter AST parsing."""
@@ -1212,25 +1394,106 @@ class TreeSitterAnalyzer:
         }
 
 
-def analyze_project_treesitter(project_path: str) -> Dict[str, Any]:
+def analyze_project_treesitter(project_path: str, jobs: Optional[int] = None) -> Dict[str, Any]:
     """Convenience function using Tree-sitter analyzer."""
     if not TREE_SITTER_AVAILABLE:
         raise ImportError("Tree-sitter not available, use SimpleASTAnalyzer instead")
     
-    analyzer = TreeSitterAnalyzer()
+    analyzer = TreeSitterAnalyzer(jobs=jobs)
     return analyzer.analyze_project(project_path)
 
 
+def _write_synthetic_project(root: Path, component_count: int):
+    """Generate a synthetic React project with ``component_count`` components."""
+    template = """import React from 'react';
+import {{ cn }} from '@/lib/utils';
+
+interface {name}Props {{
+  title: string;
+  variant?: 'primary' | 'secondary';
+  onSelect?: (id: number) => void;
+}}
+
+/**
+ * {name} renders a card for benchmark purposes.
+ */
+export const {name} = ({{ title, variant = 'primary', onSelect }}: {name}Props) => {{
+  const [open, setOpen] = React.useState(false);
+  return (
+    <div className={{cn('rounded-lg p-4 shadow-md', variant === 'primary' ? 'bg-blue-500' : 'bg-gray-100')}}>
+      <h2 className="text-lg font-semibold">{{title}}</h2>
+      <button className="px-4 py-2 text-white" onClick={{() => {{ setOpen(!open); onSelect?.({index}); }}}}>
+        Toggle
+      </button>
+    </div>
+  );
+}};
+
+export default {name};
+"""
+    for index in range(component_count):
+        feature_dir = root / "src" / "components" / f"feature{index // 100}"
+        feature_dir.mkdir(parents=True, exist_ok=True)
+        name = f"Widget{index}"
+        (feature_dir / f"{name}.tsx").write_text(template.format(name=name, index=index))
+
+
+def benchmark_parallel_parsing(component_count: int = 5000, jobs: Optional[int] = None) -> Dict[str, Any]:
+    """Time serial vs. process-pool parsing on a synthetic component tree."""
+    import tempfile
+    
+    jobs = resolve_jobs(0 if jobs is None else jobs)
+    analyzer = TreeSitterAnalyzer(jobs=1)
+    
+    with tempfile.TemporaryDirectory(prefix="palette-bench-") as tmp_dir:
+        root = Path(tmp_dir)
+        _write_synthetic_project(root, component_count)
+        discovery = DiscoveryStats()
+        files = list(analyzer.iter_component_files(root, discovery))
+        
+        start = time.perf_counter()
+        serial = analyzer._analyze_files_serial(files)
+        serial_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        parallel = analyzer._analyze_files_parallel(files, jobs)
+        parallel_seconds = time.perf_counter() - start
+    
+    return {
+        "files": len(files),
+        "jobs": jobs,
+        "discovery": discovery.to_dict(),
+        "serial_seconds": round(serial_seconds, 3),
+        "parallel_seconds": round(parallel_seconds, 3),
+        "speedup": round(serial_seconds / parallel_seconds, 2) if parallel_seconds else None,
+        "results_match": [c.name for c in serial[0]] == [c.name for c in parallel[0]]
+                          and serial[1] == parallel[1] and serial[2] == parallel[2],
+    }
+
+
 if __name__ == "__main__":
+    import argparse
     import sys
     
-    if len(sys.argv) > 1:
-        project_path = sys.argv[1]
-        try:
-            result = analyze_project_treesitter(project_path)
+    parser = argparse.ArgumentParser(description="Tree-sitter React component analyzer")
+    parser.add_argument("project_path", nargs="?", help="Project to analyze")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Parse workers (1 = serial, 0 = one per CPU core)")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="Stop feeding new files to the parser after this many seconds")
+    parser.add_argument("--benchmark", type=int, metavar="N", default=None,
+                        help="Benchmark serial vs. parallel parsing on N synthetic components")
+    args = parser.parse_args()
+    
+    try:
+        if args.benchmark:
+            print(json.dumps(benchmark_parallel_parsing(args.benchmark, args.jobs), indent=2))
+        elif args.project_path:
+            analyzer = TreeSitterAnalyzer(jobs=args.jobs)
+            result = analyzer.analyze_project(args.project_path, time_budget=args.time_budget)
             print(json.dumps(result, indent=2))
-        except ImportError as e:
-            print(f"Error: {e}")
-            sys.exit(1)
-    else:
-        print("Usage: python treesitter_analyzer.py <project_path>")
\ No newline at end of file
+        else:
+            parser.print_usage()
+    except ImportError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
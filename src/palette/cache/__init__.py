@@ -4,8 +4,10 @@ Caching implementations for Palette.
 
 from .memory_cache import MemoryCache
 from .file_cache import FileCache
+from .sqlite_cache import SQLiteCache
 
 __all__ = [
     "MemoryCache",
     "FileCache",
+    "SQLiteCache",
 ]
\ No newline at end of file
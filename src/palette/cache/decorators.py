@@ -1,12 +1,34 @@
 """
 Caching decorators for expensive operations.
+
+Cache keys are derived from the *content* of a call's inputs rather than
+object identities, so results are shared across instances and (with a
+persistent cache) across processes:
+
+- plain values (str, numbers, lists, dicts, dataclasses, paths) are hashed
+  by value
+- objects can define ``__cache_key__()`` to describe what they depend on
+- the ``cls`` of a classmethod contributes its class; the ``self`` of a
+  method must define ``__cache_key__`` (instance state may change the
+  result, so a class-only key would share one result across instances)
+- ``key=`` lets a function declare its inputs explicitly, typically with
+  ``project_fingerprint()`` / ``file_fingerprint()`` / ``config_hash()``
+
+Arguments that cannot be keyed are never guessed at: the call simply runs
+uncached.
 """
 
+import dataclasses
 import functools
 import hashlib
+import inspect
 import json
-from typing import Any, Callable, Optional, Union
+import os
+import threading
+import time
 from datetime import timedelta
+from pathlib import PurePath
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Union
 
 from ..interfaces import ICache
 from .memory_cache import MemoryCache
@@ -15,6 +37,10 @@ from .memory_cache import MemoryCache
 # Global cache instance for decorators
 _global_cache: Optional[ICache] = None
 
+# Seconds a namespace's generation number is trusted before re-reading it from
+# the cache (a clear_cache() in another process becomes visible after this)
+GENERATION_REFRESH_SECONDS = 1.0
+
 
 def set_global_cache(cache: ICache):
     """Set the global cache instance used by decorators."""
@@ -30,6 +56,349 @@ def get_global_cache() -> ICache:
     return _global_cache
 
 
+class UncacheableArgument(TypeError):
+    """Raised when an argument has no stable, content-derived cache key."""
+    pass
+
+
+# --- Declared inputs -------------------------------------------------------
+
+
+def file_fingerprint(*paths: Union[str, PurePath]) -> str:
+    """
+    Fingerprint of files by path, mtime and size (no content read).
+
+    Missing files contribute a marker, so creating them changes the fingerprint.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        path = os.fspath(path)
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+        except OSError:
+            digest.update(f"{path}\0missing\n".encode())
+    return digest.hexdigest()
+
+
+def config_hash(*paths: Union[str, PurePath]) -> str:
+    """Content hash of configuration files (missing files hash as empty)."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(os.fspath(path).encode() + b"\0")
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"\0missing")
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def project_fingerprint(
+    project_path: Union[str, PurePath],
+    extensions: Optional[Iterable[str]] = None,
+) -> str:
+    """
+    Fingerprint of a project's files (optionally only some extensions).
+
+    Built from one pruned walk's stat results, so it changes whenever a
+    relevant file is added, removed or modified.
+    """
+    # Imported lazily: the analysis package itself uses these decorators
+    from ..analysis.file_inventory import ProjectFileInventory
+
+    inventory = ProjectFileInventory(os.fspath(project_path))
+    wanted = set(extensions) if extensions is not None else None
+
+    digest = hashlib.sha1(inventory.project_path.encode())
+    for rel_path, stat in inventory.iter_files():
+        if wanted is not None and os.path.splitext(rel_path)[1] not in wanted:
+            continue
+        digest.update(f"{rel_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+# --- Key derivation --------------------------------------------------------
+
+
+def stable_key(value: Any) -> Any:
+    """
+    JSON-compatible, identity-free representation of a value.
+
+    Raises:
+        UncacheableArgument: The value has no content-derived key
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, bytes):
+        return {"bytes": hashlib.sha1(value).hexdigest()}
+    if isinstance(value, PurePath):
+        return {"path": str(value)}
+    if hasattr(value, "__cache_key__"):
+        return {"type": _qualified_name(type(value)), "key": stable_key(value.__cache_key__())}
+    if isinstance(value, (list, tuple)):
+        return [stable_key(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {"set": sorted(json.dumps(stable_key(item), sort_keys=True) for item in value)}
+    if isinstance(value, dict):
+        return {
+            "dict": sorted(
+                (json.dumps(stable_key(k), sort_keys=True), stable_key(v))
+                for k, v in value.items()
+            )
+        }
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"type": _qualified_name(type(value)), "fields": stable_key(dataclasses.asdict(value))}
+    if hasattr(value, "value") and hasattr(type(value), "__members__"):
+        # Enum members
+        return {"enum": f"{_qualified_name(type(value))}.{value.name}"}
+    raise UncacheableArgument(f"No stable cache key for {type(value).__name__}")
+
+
+def _qualified_name(obj: Any) -> str:
+    return f"{obj.__module__}.{obj.__qualname__}"
+
+
+def _build_cache_key(
+    func: Callable,
+    args: tuple,
+    kwargs: dict,
+    prefix: Optional[str] = None,
+    skip_first: bool = False,
+) -> str:
+    """
+    Build a content-derived cache key from function and arguments.
+
+    Raises:
+        UncacheableArgument: An argument has no stable key
+    """
+    key_args = list(args)
+    owner = None
+    if skip_first and key_args:
+        # Method receiver: a class is keyed by name, an instance only by what
+        # it declares it depends on
+        receiver = key_args.pop(0)
+        if isinstance(receiver, type):
+            owner = _qualified_name(receiver)
+        elif hasattr(receiver, "__cache_key__"):
+            owner = stable_key(receiver)
+        else:
+            raise UncacheableArgument(
+                f"{type(receiver).__name__} defines no __cache_key__; pass key= to cache its methods"
+            )
+
+    material = json.dumps(
+        {"owner": owner, "args": stable_key(key_args), "kwargs": stable_key(kwargs)},
+        sort_keys=True,
+    )
+    namespace = prefix or _qualified_name(func)
+    return f"{namespace}|{hashlib.sha1(material.encode()).hexdigest()}"
+
+
+# --- Memoization -----------------------------------------------------------
+
+
+class _InFlight:
+    """A computation other callers with the same key can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Memoizer:
+    """
+    Memoization state of one decorated function (its namespace).
+
+    Exposed on the wrapper as ``wrapper.memo`` and through
+    ``wrapper.clear_cache()`` / ``wrapper.cache_info()``.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        namespace: str,
+        ttl: Optional[Union[int, timedelta]],
+        cache: Optional[ICache],
+        key: Optional[Callable[..., Any]],
+        single_flight: bool,
+    ):
+        self.func = func
+        self.namespace = namespace
+        self.ttl = ttl
+        self._cache = cache
+        self.key_func = key
+        self.single_flight = single_flight
+
+        parameters = list(inspect.signature(func).parameters)
+        self.is_method = bool(parameters) and parameters[0] in ("self", "cls")
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._keys: Set[str] = set()
+        self._generation: Optional[int] = None
+        self._generation_checked = 0.0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.uncacheable = 0
+
+    @property
+    def cache(self) -> ICache:
+        return self._cache or get_global_cache()
+
+    def call(self, args: tuple, kwargs: dict) -> Any:
+        try:
+            cache_key = self.make_key(args, kwargs)
+        except UncacheableArgument:
+            with self._lock:
+                self.uncacheable += 1
+            return self.func(*args, **kwargs)
+
+        cached_value = self.cache.get(cache_key)
+        if cached_value is not None:
+            with self._lock:
+                self.hits += 1
+            return cached_value
+
+        if not self.single_flight:
+            with self._lock:
+                self.misses += 1
+            return self._compute(cache_key, args, kwargs)
+
+        with self._lock:
+            flight = self._in_flight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[cache_key] = _InFlight()
+                self.misses += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            # An identical call is already running; share its outcome
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._compute(cache_key, args, kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(cache_key, None)
+            flight.done.set()
+
+    def make_key(self, args: tuple, kwargs: dict) -> str:
+        """Cache key for a call (raises UncacheableArgument if there is none)."""
+        prefix = f"memo:{self.namespace}:g{self._current_generation()}"
+        if self.key_func is not None:
+            material = stable_key(self.key_func(*args, **kwargs))
+            digest = hashlib.sha1(json.dumps(material, sort_keys=True).encode()).hexdigest()
+            return f"{prefix}|{digest}"
+        return _build_cache_key(self.func, args, kwargs, prefix, skip_first=self.is_method)
+
+    def clear(self) -> int:
+        """
+        Invalidate every cached result of this function.
+
+        Bumps the namespace generation stored in the cache (so other processes
+        sharing a persistent cache stop seeing old entries too) and deletes the
+        keys this process wrote. Returns the number of keys deleted.
+        """
+        cache = self.cache
+        generation = self._current_generation(force=True) + 1
+        cache.set(self._generation_key, generation, None)
+
+        with self._lock:
+            keys, self._keys = self._keys, set()
+            self._generation = generation
+            self._generation_checked = time.monotonic()
+
+        return sum(1 for key in keys if cache.delete(key))
+
+    def info(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "function": self.func.__name__,
+            "namespace": self.namespace,
+            "generation": self._current_generation(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0,
+            "shared_in_flight": self.shared,
+            "uncacheable_calls": self.uncacheable,
+            "keys_written": len(self._keys),
+            "cache_stats": self.cache.get_stats(),
+        }
+
+    @property
+    def _generation_key(self) -> str:
+        return f"memo:{self.namespace}:generation"
+
+    def _current_generation(self, force: bool = False) -> int:
+        now = time.monotonic()
+        if (
+            force
+            or self._generation is None
+            or now - self._generation_checked > GENERATION_REFRESH_SECONDS
+        ):
+            self._generation = self.cache.get(self._generation_key) or 0
+            self._generation_checked = now
+        return self._generation
+
+    def _compute(self, cache_key: str, args: tuple, kwargs: dict) -> Any:
+        result = self.func(*args, **kwargs)
+        if result is not None and self.cache.set(cache_key, result, self.ttl):
+            with self._lock:
+                self._keys.add(cache_key)
+        return result
+
+
+def memoize(
+    ttl: Optional[Union[int, timedelta]] = 3600,
+    namespace: Optional[str] = None,
+    cache: Optional[ICache] = None,
+    key: Optional[Callable[..., Any]] = None,
+    single_flight: bool = True,
+):
+    """
+    Decorator to memoize results under content-derived keys.
+
+    Args:
+        ttl: Time to live for cached results
+        namespace: Key namespace (defaults to the function's qualified name)
+        cache: Optional cache instance (uses global if not provided);
+            MemoryCache, FileCache and SQLiteCache all work
+        key: Optional function receiving the call's arguments and returning
+            the inputs the result depends on, e.g.
+            ``key=lambda self, path: (path, project_fingerprint(path))``
+        single_flight: Let concurrent identical calls wait for one computation
+
+    The wrapper gains ``clear_cache()``, ``cache_info()`` and ``memo``.
+    """
+    def decorator(func: Callable) -> Callable:
+        memo = Memoizer(func, namespace or _qualified_name(func), ttl, cache, key, single_flight)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return memo.call(args, kwargs)
+
+        wrapper.memo = memo
+        wrapper.clear_cache = memo.clear
+        wrapper.cache_info = memo.info
+        return wrapper
+    return decorator
+
+
 def cache_result(
     ttl: Optional[Union[int, timedelta]] = 3600,
     key_prefix: Optional[str] = None,
@@ -37,39 +406,17 @@ def cache_result(
 ):
     """
     Decorator to cache function results.
-    
+
     Args:
         ttl: Time to live for cached results
         key_prefix: Optional prefix for cache keys
         cache: Optional cache instance (uses global if not provided)
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            # Get cache instance
-            cache_instance = cache or get_global_cache()
-            
-            # Build cache key
-            cache_key = _build_cache_key(func, args, kwargs, key_prefix)
-            
-            # Try to get from cache
-            cached_value = cache_instance.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function
-            result = func(*args, **kwargs)
-            
-            # Cache result
-            cache_instance.set(cache_key, result, ttl)
-            
-            return result
-        
-        # Add cache control methods
-        wrapper.clear_cache = lambda: _clear_function_cache(func, cache or get_global_cache(), key_prefix)
-        wrapper.cache_info = lambda: _get_cache_info(func, cache or get_global_cache(), key_prefix)
-        
-        return wrapper
+        namespace = _qualified_name(func)
+        if key_prefix:
+            namespace = f"{key_prefix}.{namespace}"
+        return memoize(ttl=ttl, namespace=namespace, cache=cache)(func)
     return decorator
 
 
@@ -79,107 +426,50 @@ def cache_property(
 ):
     """
     Decorator to cache property results on instances.
-    
+
+    Instances that define ``__cache_key__()`` share results through the cache
+    (across instances and processes); others keep the result on the instance
+    itself, so it is released together with the instance.
+
     Args:
         ttl: Time to live for cached results
         cache: Optional cache instance (uses global if not provided)
     """
+    ttl_seconds = ttl.total_seconds() if isinstance(ttl, timedelta) else ttl
+
     def decorator(func: Callable) -> property:
+        shared = memoize(ttl=ttl, cache=cache)(func)
+        slot = f"_cached_{func.__name__}"
+
+        @functools.wraps(func)
         def getter(self):
-            # Get cache instance
-            cache_instance = cache or get_global_cache()
-            
-            # Build cache key including instance id
-            cache_key = f"{self.__class__.__name__}.{id(self)}.{func.__name__}"
-            
-            # Try to get from cache
-            cached_value = cache_instance.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call property
+            if hasattr(self, "__cache_key__"):
+                return shared(self)
+
+            entry = self.__dict__.get(slot)
+            now = time.monotonic()
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                return entry[0]
+
             result = func(self)
-            
-            # Cache result
-            cache_instance.set(cache_key, result, ttl)
-            
+            expires_at = now + ttl_seconds if ttl_seconds is not None else None
+            self.__dict__[slot] = (result, expires_at)
             return result
-        
+
         return property(getter)
     return decorator
 
 
-def _build_cache_key(
-    func: Callable,
-    args: tuple,
-    kwargs: dict,
-    prefix: Optional[str] = None
-) -> str:
-    """Build a cache key from function and arguments."""
-    parts = []
-    
-    # Add prefix if provided
-    if prefix:
-        parts.append(prefix)
-    
-    # Add function identifier
-    parts.append(f"{func.__module__}.{func.__name__}")
-    
-    # Add arguments
-    if args:
-        # Handle different types of arguments
-        arg_parts = []
-        for arg in args:
-            if isinstance(arg, (str, int, float, bool)):
-                arg_parts.append(str(arg))
-            elif hasattr(arg, "__dict__"):
-                # For objects, use their type and id
-                arg_parts.append(f"{type(arg).__name__}:{id(arg)}")
-            else:
-                # For other types, try to serialize
-                try:
-                    arg_parts.append(json.dumps(arg, sort_keys=True))
-                except:
-                    arg_parts.append(str(type(arg)))
-        
-        parts.append("args:" + ",".join(arg_parts))
-    
-    # Add keyword arguments
-    if kwargs:
-        # Sort for consistent ordering
-        kwarg_parts = []
-        for key in sorted(kwargs.keys()):
-            value = kwargs[key]
-            if isinstance(value, (str, int, float, bool)):
-                kwarg_parts.append(f"{key}={value}")
-            else:
-                try:
-                    kwarg_parts.append(f"{key}={json.dumps(value, sort_keys=True)}")
-                except:
-                    kwarg_parts.append(f"{key}={type(value).__name__}")
-        
-        parts.append("kwargs:" + ",".join(kwarg_parts))
-    
-    # Create hash for very long keys
-    key = "|".join(parts)
-    if len(key) > 250:
-        # Use hash for long keys
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return f"{parts[0]}|{parts[1]}|hash:{key_hash}"
-    
-    return key
-
-
 def _clear_function_cache(
     func: Callable,
     cache: ICache,
     prefix: Optional[str] = None
-):
-    """Clear all cached results for a function."""
-    # This is a simplified implementation
-    # In practice, you might want to track keys per function
-    stats = cache.get_stats()
-    print(f"Cache cleared for {func.__name__} (current cache size: {stats['size']})")
+) -> int:
+    """Clear all cached results for a memoized function."""
+    memo = getattr(func, "memo", None)
+    if memo is None:
+        raise ValueError(f"{func.__name__} is not a memoized function")
+    return memo.clear()
 
 
 def _get_cache_info(
@@ -187,9 +477,8 @@ def _get_cache_info(
     cache: ICache,
     prefix: Optional[str] = None
 ) -> dict:
-    """Get cache information for a function."""
-    stats = cache.get_stats()
-    return {
-        "function": func.__name__,
-        "cache_stats": stats
-    }
\ No newline at end of file
+    """Get cache information for a memoized function."""
+    memo = getattr(func, "memo", None)
+    if memo is None:
+        return {"function": func.__name__, "cache_stats": cache.get_stats()}
+    return memo.info()
@@ -0,0 +1,427 @@
+"""
+SQLite-backed persistent cache.
+
+A single WAL-mode database replaces FileCache's per-entry files plus a JSON
+metadata file that was rewritten on every operation. Lookups are a primary-key
+read, access-time bookkeeping is batched, the total size is kept by triggers,
+and a byte budget is enforced with LRU or LFU eviction. WAL mode and SQLite's
+own locking make it safe to share one database between the CLI, the server
+and MCP server processes.
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..interfaces import ICache
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Access-time updates are written once this many are pending...
+TOUCH_BATCH_SIZE = 64
+# ...or once the oldest pending update is this many seconds old
+TOUCH_FLUSH_INTERVAL = 5.0
+
+# Eviction frees space down to this fraction of the budget
+EVICTION_TARGET_RATIO = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_accessed ON entries (last_accessed);
+CREATE INDEX IF NOT EXISTS entries_hits ON entries (hits, last_accessed);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at) WHERE expires_at IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, entries, bytes) VALUES (0, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+
+class SQLiteCache(ICache):
+    """
+    Persistent cache stored in one SQLite database.
+
+    Args:
+        cache_dir: Directory holding ``cache.sqlite3`` (default ``~/.palette/cache``)
+        default_ttl: Seconds until entries expire (None = never)
+        serializer: "pickle" or "json"
+        max_bytes: Budget for stored values; defaults to ``PALETTE_CACHE_MAX_MB``
+            or 256 MB
+        eviction_policy: "lru" (least recently used) or "lfu" (least frequently used)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        default_ttl: Optional[int] = 3600,
+        serializer: str = "pickle",
+        max_bytes: Optional[int] = None,
+        eviction_policy: str = "lru",
+    ):
+        if eviction_policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
+        self.cache_dir = Path(cache_dir or os.path.expanduser("~/.palette/cache"))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "cache.sqlite3"
+        self.default_ttl = default_ttl
+        self.serializer = serializer
+        self.max_bytes = max_bytes or int(
+            float(os.getenv("PALETTE_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024
+        )
+        self.eviction_policy = eviction_policy
+
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pending_touches: Dict[str, Tuple[float, int]] = {}
+        self._oldest_touch: Optional[float] = None
+
+        # Statistics (this process only)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        # executescript manages its own transaction
+        self._connection().executescript(SCHEMA)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value from the cache."""
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self._record_miss()
+            return None
+
+        value_blob, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            self.delete(key)
+            self._record_miss()
+            return None
+
+        try:
+            value = self._loads(value_blob)
+        except Exception as e:
+            print(f"Cache read error for {key}: {e}")
+            self.delete(key)
+            self._record_miss()
+            return None
+
+        with self._lock:
+            self._hits += 1
+            _, hits = self._pending_touches.get(key, (now, 0))
+            self._pending_touches[key] = (now, hits + 1)
+            if self._oldest_touch is None:
+                self._oldest_touch = now
+            should_flush = (
+                len(self._pending_touches) >= TOUCH_BATCH_SIZE
+                or now - self._oldest_touch >= TOUCH_FLUSH_INTERVAL
+            )
+        if should_flush:
+            self.flush()
+
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[Union[int, timedelta]] = None) -> bool:
+        """Set a value in the cache."""
+        try:
+            blob = self._dumps(value)
+        except Exception as e:
+            print(f"Cache write error for {key}: {e}")
+            return False
+
+        if len(blob) > self.max_bytes:
+            print(f"Cache write skipped for {key}: value larger than cache budget")
+            return False
+
+        # Use default TTL if not specified
+        if ttl is None:
+            ttl = self.default_ttl
+        if isinstance(ttl, timedelta):
+            ttl = ttl.total_seconds()
+
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO entries (key, value, size, created_at, expires_at, last_accessed, hits)
+                    VALUES (?, ?, ?, ?, ?, ?, 0)
+                    ON CONFLICT(key) DO UPDATE SET
+                        value = excluded.value,
+                        size = excluded.size,
+                        created_at = excluded.created_at,
+                        expires_at = excluded.expires_at,
+                        last_accessed = excluded.last_accessed
+                    """,
+                    (key, sqlite3.Binary(blob), len(blob), now, expires_at, now),
+                )
+                total_bytes = conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+                if total_bytes > self.max_bytes:
+                    self._evict(conn, total_bytes, protect=key)
+            return True
+        except sqlite3.Error as e:
+            print(f"Cache write error for {key}: {e}")
+            return False
+
+    def delete(self, key: str) -> bool:
+        """Delete a value from the cache."""
+        with self._lock:
+            self._pending_touches.pop(key, None)
+        try:
+            with self._transaction() as conn:
+                return conn.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Error deleting cache entry: {e}")
+            return False
+
+    def clear(self) -> bool:
+        """Clear all cached values."""
+        with self._lock:
+            self._pending_touches.clear()
+            self._oldest_touch = None
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM entries")
+            self._connection().execute("VACUUM")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error clearing cache: {e}")
+            return False
+
+    def exists(self, key: str) -> bool:
+        """Check if a key exists in the cache."""
+        row = self._connection().execute(
+            "SELECT expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False
+        if row[0] is not None and row[0] <= time.time():
+            self.delete(key)
+            return False
+        return True
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        self.flush()
+        conn = self._connection()
+        entries, total_bytes = conn.execute(
+            "SELECT entries, bytes FROM totals WHERE id = 0"
+        ).fetchone()
+        expired_count = conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        ).fetchone()[0]
+
+        total_requests = self._hits + self._misses
+        return {
+            "size": entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total_requests if total_requests > 0 else 0,
+            "evictions": self._evictions,
+            "expired_entries": expired_count,
+            "total_size_bytes": total_bytes,
+            "total_size_mb": total_bytes / (1024 * 1024),
+            "max_size_mb": self.max_bytes / (1024 * 1024),
+            "eviction_policy": self.eviction_policy,
+            "db_path": str(self.db_path),
+            "cache_dir": str(self.cache_dir),
+        }
+
+    def cleanup_expired(self) -> int:
+        """Remove all expired entries. Returns number of entries removed."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            ).rowcount
+
+    def flush(self):
+        """Write batched access-time and hit-count updates."""
+        with self._lock:
+            if not self._pending_touches:
+                return
+        try:
+            with self._transaction() as conn:
+                self._apply_touches(conn)
+        except sqlite3.Error as e:
+            # Access times only steer eviction; losing a batch is harmless
+            print(f"Warning: Could not record cache access times: {e}")
+
+    def close(self):
+        """Flush pending updates and close this thread's connection."""
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _evict(self, conn: sqlite3.Connection, total_bytes: int, protect: str):
+        """Delete entries (expired first, then by policy) until under the target size."""
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+
+        # Pending access times influence which entries are considered cold
+        self._apply_touches(conn)
+
+        evicted = conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ? AND key != ?",
+            (time.time(), protect),
+        ).rowcount
+        total_bytes = conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+
+        order = "last_accessed" if self.eviction_policy == "lru" else "hits, last_accessed"
+        while total_bytes > target:
+            victims: List[Tuple[str, int]] = conn.execute(
+                f"SELECT key, size FROM entries WHERE key != ? ORDER BY {order} LIMIT 64",
+                (protect,),
+            ).fetchall()
+            if not victims:
+                break
+
+            chosen = []
+            for key, size in victims:
+                chosen.append((key,))
+                total_bytes -= size
+                if total_bytes <= target:
+                    break
+            conn.executemany("DELETE FROM entries WHERE key = ?", chosen)
+            evicted += len(chosen)
+
+        with self._lock:
+            self._evictions += evicted
+
+    def _apply_touches(self, conn: sqlite3.Connection):
+        with self._lock:
+            touches, self._pending_touches = self._pending_touches, {}
+            self._oldest_touch = None
+        if touches:
+            conn.executemany(
+                "UPDATE entries SET last_accessed = MAX(last_accessed, ?), hits = hits + ? WHERE key = ?",
+                [(accessed, hits, key) for key, (accessed, hits) in touches.items()],
+            )
+
+    def _record_miss(self):
+        with self._lock:
+            self._misses += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not shareable across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def _dumps(self, value: Any) -> bytes:
+        if self.serializer == "pickle":
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return json.dumps(value).encode("utf-8")
+
+    def _loads(self, blob: bytes) -> Any:
+        if self.serializer == "pickle":
+            return pickle.loads(blob)
+        return json.loads(blob.decode("utf-8"))
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` block that takes the write lock up front."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+
+def benchmark_caches(entry_counts: List[int] = None, reads: int = 2000) -> List[Dict[str, Any]]:
+    """Time cache hits for FileCache vs. SQLiteCache at growing entry counts."""
+    import random
+    import tempfile
+
+    from .file_cache import FileCache
+
+    results = []
+    for count in entry_counts or [100, 1000, 5000]:
+        row: Dict[str, Any] = {"entries": count}
+        for name, cache_class in (("file_cache", FileCache), ("sqlite_cache", SQLiteCache)):
+            with tempfile.TemporaryDirectory(prefix="palette-cache-bench-") as tmp_dir:
+                cache = cache_class(cache_dir=tmp_dir)
+                payload = {"tokens": list(range(50)), "name": "x" * 200}
+
+                start = time.perf_counter()
+                for i in range(count):
+                    cache.set(f"key-{i}", payload)
+                write_seconds = time.perf_counter() - start
+
+                keys = [f"key-{random.randrange(count)}" for _ in range(reads)]
+                start = time.perf_counter()
+                for key in keys:
+                    cache.get(key)
+                read_seconds = time.perf_counter() - start
+
+                row[name] = {
+                    "set_us": round(write_seconds / count * 1e6, 1),
+                    "hit_us": round(read_seconds / reads * 1e6, 1),
+                }
+                if isinstance(cache, SQLiteCache):
+                    cache.close()
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark Palette's persistent caches")
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 5000],
+                        help="Entry counts to benchmark")
+    parser.add_argument("--reads", type=int, default=2000, help="Cache hits timed per run")
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark_caches(args.entries, args.reads), indent=2))
@@ -11,7 +11,6 @@ from dataclasses import asdict, is_dataclass
 from datetime import datetime
 from enum import Enum
 
-from ..conversation import ConversationEngine
 from rich.console import Console
 
 console = Console()
@@ -107,6 +106,7 @@ def conversation(message: Optional[str] = None, project_path: Optional[str] = No
             sys.stdout.flush()
             sys.exit(1)
         
+        from ..conversation import ConversationEngine
         engine = ConversationEngine(project_path=project_path)
         
         # Start or continue conversation
@@ -163,6 +163,7 @@ def conversation(message: Optional[str] = None, project_path: Optional[str] = No
 def _handle_list_components(project_path: str, original_stdout):
     """Handle --list-components flag"""
     try:
+        from ..conversation import ConversationEngine
         engine = ConversationEngine(project_path=project_path)
         session_id = engine.start_conversation()
         response, metadata = engine.process_message("list available components")
@@ -191,6 +192,7 @@ def _handle_list_components(project_path: str, original_stdout):
 def _handle_install_component(component_name: str, project_path: str, original_stdout):
     """Handle --install flag"""
     try:
+        from ..conversation import ConversationEngine
         engine = ConversationEngine(project_path=project_path)
         session_id = engine.start_conversation()
         message = f"install {component_name} component"
@@ -222,6 +224,7 @@ def _handle_install_component(component_name: str, project_path: str, original_s
 def _handle_theme_update(theme_request: str, project_path: str, original_stdout):
     """Handle --theme flag"""
     try:
+        from ..conversation import ConversationEngine
         engine = ConversationEngine(project_path=project_path)
         session_id = engine.start_conversation()
         message = f"update theme to {theme_request}"
@@ -280,6 +283,7 @@ def _handle_quick_generation(component_type: str, project_path: str, original_st
             sys.stdout.flush()
             sys.exit(1)
         
+        from ..conversation import ConversationEngine
         engine = ConversationEngine(project_path=project_path)
         session_id = engine.start_conversation()
         response, metadata = engine.process_message(template)
@@ -317,6 +321,7 @@ def _handle_interactive_mode(project_path: str, session_id: Optional[str], origi
         console.print("\n🚀 [bold blue]Palette Interactive Mode[/bold blue] (Vite + React + shadcn/ui)")
         console.print("Type 'exit' or 'quit' to end the conversation\n")
         
+        from ..conversation import ConversationEngine
         engine = ConversationEngine(project_path=project_path)
         
         if not session_id:
@@ -1,5 +1,10 @@
 # Enhanced CLI for UI/UX Copilot
 # Supports multi-file generation, editing, and multiple frameworks/libraries
+#
+# Keep module-level imports light: generators, LLM clients, analyzers and the
+# knowledge base are imported inside the commands that need them, so that
+# `palette --help`, `palette template` or `palette config` start fast
+# (see palette.cli.startup_benchmark).
 
 import os
 import sys
@@ -13,7 +18,6 @@ import click
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.syntax import Syntax
 from rich.prompt import Prompt, Confirm
 from dotenv import load_dotenv
 
@@ -21,25 +25,17 @@ from dotenv import load_dotenv
 # Look for .env in current directory and parent directories
 load_dotenv(verbose=False)
 
-from ..generation.generator import UIGenerator
-from ..generation.prompts import (
-    GenerationRequest,
-    FrameworkType,
-    StylingLibrary,
-    ComponentLibrary,
-    GenerationType,
-    create_generation_request
-)
 
-# Try to import knowledge-enhanced generator
-try:
-    from ..generation.knowledge_generator import KnowledgeUIGenerator
-    KNOWLEDGE_AVAILABLE = True
-except ImportError:
-    KNOWLEDGE_AVAILABLE = False
+console = Console()
 
 
-console = Console()
+def _knowledge_generator_class():
+    """Knowledge-enhanced generator class, or None if it cannot be imported."""
+    try:
+        from ..generation.knowledge_generator import KnowledgeUIGenerator
+        return KnowledgeUIGenerator
+    except ImportError:
+        return None
 
 
 @click.group()
@@ -94,8 +90,12 @@ def generate(prompt: str, type: Optional[str], framework: Optional[str],
         mcp_in_cwd = Path("mcp-servers").exists()
         mcp_in_palette = (palette_dir / "mcp-servers").exists()
         
+        from ..generation.generator import UIGenerator
+        from ..generation.prompts import create_generation_request
+        
         # Use Knowledge-enhanced generator if available
-        if KNOWLEDGE_AVAILABLE:
+        KnowledgeUIGenerator = _knowledge_generator_class()
+        if KnowledgeUIGenerator is not None:
             generator = KnowledgeUIGenerator(project_path=output, quality_assurance=True)
             console.print("[green]🧠 Using Knowledge-Enhanced Generator[/green]")
         else:
@@ -231,6 +231,7 @@ def edit(file_path: str, prompt: str, mode: str, preview: bool):
     ))
     
     try:
+        from ..generation.generator import UIGenerator
         generator = UIGenerator()
         
         # Edit the file
@@ -255,9 +256,15 @@ def edit(file_path: str, prompt: str, mode: str, preview: bool):
 
 
 @main.command()
-def analyze():
+@click.option("--jobs", "-j", type=int, default=None,
+              help="Parallel AST parse workers (1 = serial, 0 = one per CPU core)")
+def analyze(jobs: Optional[int]):
     """Analyze project structure and patterns"""
     
+    if jobs is not None:
+        # Picked up by TreeSitterAnalyzer when the project analyzer is built
+        os.environ["PALETTE_ANALYSIS_JOBS"] = str(jobs)
+    
     console.print(Panel(
         "[bold blue]📊 Project Analysis[/bold blue]",
         title="Analyzing",
@@ -265,6 +272,7 @@ def analyze():
     ))
     
     try:
+        from ..generation.generator import UIGenerator
         generator = UIGenerator()
         context = generator.project_context
         
@@ -1009,8 +1017,8 @@ def knowledge_status():
         border_style="blue",
     ))
     
-    if KNOWLEDGE_AVAILABLE:
-        from ..generation.knowledge_generator import KnowledgeUIGenerator
+    KnowledgeUIGenerator = _knowledge_generator_class()
+    if KnowledgeUIGenerator is not None:
         generator = KnowledgeUIGenerator()
         status = generator.get_knowledge_status()
         
@@ -1670,6 +1678,8 @@ def _show_configuration_enhanced(framework: str, styling: str, ui: str, type: st
 
 def _preview_files(files: Dict[str, str]):
     """Preview generated files"""
+    from rich.syntax import Syntax  # pulls in pygments
+    
     console.print("\n[bold]Generated Files:[/bold]\n")
     
     for file_path, content in files.items():
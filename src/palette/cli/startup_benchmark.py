@@ -0,0 +1,145 @@
+"""
+Cold-start benchmark for the palette CLI.
+
+Runs lightweight commands in fresh interpreters with ``python -X importtime``
+and checks that importing the CLI stays within an import-time budget and
+never pulls in the heavy dependencies (LLM clients, embedding models, the
+generator) that only real generation commands need.
+
+Usage:
+    python -m palette.cli.startup_benchmark [--budget-ms 300] [--runs 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_BUDGET_MS = 300
+
+# Commands that must start without the heavy import graph
+LIGHTWEIGHT_COMMANDS: Sequence[Sequence[str]] = (
+    ("--help",),
+    ("template", "--help"),
+    ("config", "--help"),
+    ("conversation", "--help"),
+)
+
+# Modules only generation/analysis commands may import
+HEAVY_MODULES = (
+    "anthropic",
+    "openai",
+    "sentence_transformers",
+    "torch",
+    "faiss",
+    "palette.generation.generator",
+    "palette.conversation.conversation_engine",
+)
+
+CLI_ENTRY = (
+    "import sys; from palette.cli.main import main; "
+    "main(sys.argv[1:], prog_name='palette', standalone_mode=False)"
+)
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds per module from ``-X importtime`` output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            # Header line
+            continue
+        timings[parts[2].strip()] = cumulative
+    return timings
+
+
+def measure_command(args: Sequence[str], runs: int = 3) -> Dict[str, object]:
+    """Best-of-``runs`` CLI import time and wall time for one command."""
+    src_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_path, env.get("PYTHONPATH")]))
+
+    best: Optional[Dict[str, object]] = None
+    for _ in range(max(runs, 1)):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CLI_ENTRY, *args],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        timings = parse_importtime(result.stderr)
+        import_ms = timings.get("palette.cli.main", timings.get("palette.cli", 0)) / 1000
+        measurement = {
+            "command": " ".join(args),
+            "import_ms": round(import_ms, 1),
+            "wall_ms": round(wall_ms, 1),
+            "heavy_modules": sorted(m for m in HEAVY_MODULES if m in timings),
+            "returncode": result.returncode,
+        }
+        if best is None or measurement["import_ms"] < best["import_ms"]:
+            best = measurement
+    return best
+
+
+def benchmark_cli_startup(
+    commands: Optional[Sequence[Sequence[str]]] = None,
+    budget_ms: Optional[float] = None,
+    runs: int = 3,
+) -> List[Dict[str, object]]:
+    """
+    Measure cold CLI startup for lightweight commands.
+
+    Args:
+        commands: Argument lists to run (default LIGHTWEIGHT_COMMANDS)
+        budget_ms: Import-time budget for ``palette.cli.main``; defaults to
+            ``PALETTE_CLI_IMPORT_BUDGET_MS`` or 300 ms
+        runs: Runs per command; the fastest counts
+
+    Returns:
+        One result per command, with ``within_budget`` set
+    """
+    budget_ms = budget_ms or float(os.getenv("PALETTE_CLI_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+    results = []
+    for args in commands or LIGHTWEIGHT_COMMANDS:
+        measurement = measure_command(args, runs)
+        measurement["budget_ms"] = budget_ms
+        measurement["within_budget"] = (
+            measurement["returncode"] == 0
+            and measurement["import_ms"] <= budget_ms
+            and not measurement["heavy_modules"]
+        )
+        results.append(measurement)
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check palette CLI cold-start import time")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Import-time budget in milliseconds")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per command (fastest counts)")
+    options = parser.parse_args(argv)
+
+    results = benchmark_cli_startup(budget_ms=options.budget_ms, runs=options.runs)
+    for result in results:
+        status = "ok" if result["within_budget"] else "OVER BUDGET"
+        heavy = f"  heavy: {', '.join(result['heavy_modules'])}" if result["heavy_modules"] else ""
+        print(
+            f"palette {result['command']:<24} import {result['import_ms']:>7.1f} ms  "
+            f"wall {result['wall_ms']:>7.1f} ms  [{status}]{heavy}"
+        )
+    return 0 if all(result["within_budget"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
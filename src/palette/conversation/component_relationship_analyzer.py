@@ -6,12 +6,13 @@ consistent styling and patterns across component generation.
 """
 
 import re
-import ast
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple, Any
 from dataclasses import dataclass
 from collections import defaultdict, Counter
 
+from ..analysis.component_graph import ComponentGraph, get_component_graph
+
 @dataclass
 class ComponentDependency:
     """Represents a dependency between components"""
@@ -47,6 +48,7 @@ class ComponentRelationshipAnalyzer:
         self.component_families: Dict[str, ComponentFamily] = {}
         self.component_files: List[Path] = []
         self.component_data: Dict[str, Dict[str, Any]] = {}
+        self._graph: Optional[ComponentGraph] = None
         
     def analyze_relationships(self) -> Dict[str, Any]:
         """Analyze all component relationships"""
@@ -76,185 +78,48 @@ class ComponentRelationshipAnalyzer:
 
     def _discover_components(self) -> None:
         """Discover all component files in the project"""
-        component_patterns = [
-            '**/*{C,c}omponent*.{tsx,ts,jsx,js}',
-            '**/components/**/*.{tsx,ts,jsx,js}',
-            '**/ui/**/*.{tsx,ts,jsx,js}',
-            'src/**/*.{tsx,ts,jsx,js}'
-        ]
-        
-        for pattern in component_patterns:
-            files = self.project_path.glob(pattern)
-            for file in files:
-                if file.is_file() and file.stem not in ['index', 'types']:
-                    self.component_files.append(file)
-        
-        # Remove duplicates
-        self.component_files = list(set(self.component_files))
+        self._graph = get_component_graph(str(self.project_path))
+
+        for node in self._graph.nodes_under([""]):
+            if node.stem in ['index', 'types']:
+                continue
+            parts = node.rel_path.split('/')
+            # *Component* files, anything under components/ or ui/, and all of src/
+            if (
+                'component' in node.stem.lower()
+                or 'components' in parts[:-1]
+                or 'ui' in parts[:-1]
+                or parts[0] == 'src'
+            ):
+                self.component_files.append(self.project_path / node.rel_path)
 
     def _parse_components(self) -> None:
-        """Parse each component file to extract metadata"""
+        """Collect metadata of each component file from the component graph"""
         for component_file in self.component_files[:30]:  # Limit for performance
-            try:
-                with open(component_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                component_name = self._extract_component_name(content, component_file)
-                if component_name:
-                    self.component_data[component_name] = {
-                        'file_path': str(component_file),
-                        'imports': self._extract_imports(content),
-                        'props': self._extract_props(content),
-                        'styling': self._extract_styling_info(content),
-                        'jsx_elements': self._extract_jsx_elements(content),
-                        'hooks': self._extract_hooks(content),
-                        'content': content
-                    }
-                    
-            except (UnicodeDecodeError, FileNotFoundError) as e:
-                print(f"Warning: Could not read {component_file}: {e}")
+            node = self._graph.get_by_path(str(component_file))
+            if node is None:
                 continue
 
-    def _extract_component_name(self, content: str, file_path: Path) -> Optional[str]:
-        """Extract the main component name from file content"""
-        # Try to find export default or export const patterns
-        patterns = [
-            r'export\s+default\s+(?:function\s+)?(\w+)',
-            r'export\s+(?:const|function)\s+(\w+)',
-            r'const\s+(\w+)\s*=.*forwardRef',
-            r'function\s+(\w+)\s*\(',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, content)
-            if match:
-                return match.group(1)
-        
-        # Fallback to filename
-        return file_path.stem
-
-    def _extract_imports(self, content: str) -> List[Dict[str, str]]:
-        """Extract import statements"""
-        imports = []
-        
-        # Find import statements
-        import_pattern = r'import\s+(?:{[^}]+}|\w+|[^;]+)\s+from\s+[\'"]([^\'"]+)[\'"];?'
-        matches = re.findall(import_pattern, content)
-        
-        for match in matches:
-            # Check if it's a relative import (component dependency)
-            if match.startswith('.'):
-                imports.append({
-                    'type': 'relative',
-                    'path': match,
-                    'is_component': self._looks_like_component_import(match)
-                })
-            else:
-                imports.append({
-                    'type': 'external',
-                    'path': match,
-                    'is_component': False
-                })
-        
-        return imports
-
-    def _extract_props(self, content: str) -> Dict[str, Any]:
-        """Extract component props information"""
-        props_info = {
-            'interface_props': [],
-            'destructured_props': [],
-            'prop_types': {}
-        }
-        
-        # Extract interface definitions
-        interface_matches = re.findall(
-            r'interface\s+(\w*Props)\s*\{([^}]+)\}', 
-            content, 
-            re.DOTALL
-        )
-        
-        for interface_name, interface_body in interface_matches:
-            prop_matches = re.findall(r'(\w+)\??:\s*([^;,\n]+)', interface_body)
-            for prop_name, prop_type in prop_matches:
-                props_info['interface_props'].append(prop_name)
-                props_info['prop_types'][prop_name] = prop_type.strip()
-        
-        # Extract destructured props
-        destructure_matches = re.findall(
-            r'\{\s*([^}]+)\s*\}\s*:\s*\w*Props', 
-            content
-        )
-        
-        for destructure_content in destructure_matches:
-            prop_names = [p.strip() for p in destructure_content.split(',')]
-            props_info['destructured_props'].extend(prop_names)
-        
-        return props_info
-
-    def _extract_styling_info(self, content: str) -> Dict[str, Any]:
-        """Extract styling information from component"""
-        styling_info = {
-            'tailwind_classes': [],
-            'css_modules': [],
-            'styled_components': [],
-            'style_objects': [],
-            'css_variables': []
-        }
-        
-        # Extract Tailwind classes
-        tailwind_matches = re.findall(r'className\s*=\s*[\'"`]([^\'"`]+)[\'"`]', content)
-        for match in tailwind_matches:
-            classes = match.split()
-            styling_info['tailwind_classes'].extend(classes)
-        
-        # Extract template literal classes (for conditional styling)
-        template_matches = re.findall(r'className\s*=\s*`([^`]+)`', content)
-        for match in template_matches:
-            # Simple extraction, could be enhanced to parse template literals better
-            classes = re.findall(r'[\w-]+', match)
-            styling_info['tailwind_classes'].extend(classes)
-        
-        # Extract CSS modules
-        css_module_matches = re.findall(r'styles\.(\w+)', content)
-        styling_info['css_modules'].extend(css_module_matches)
-        
-        # Extract styled-components
-        styled_matches = re.findall(r'styled\.(\w+)`([^`]*)`', content, re.DOTALL)
-        for element, styles in styled_matches:
-            styling_info['styled_components'].append({
-                'element': element,
-                'styles': styles.strip()
-            })
-        
-        # Extract CSS custom properties
-        css_var_matches = re.findall(r'var\(--([^)]+)\)', content)
-        styling_info['css_variables'].extend(css_var_matches)
-        
-        return styling_info
-
-    def _extract_jsx_elements(self, content: str) -> List[str]:
-        """Extract JSX elements used in the component"""
-        elements = []
-        
-        # Find JSX opening tags
-        jsx_pattern = r'<(\w+)(?:\s+[^>]*)?/?>'
-        matches = re.findall(jsx_pattern, content)
-        
-        # Filter out HTML elements, keep component elements
-        for match in matches:
-            if match[0].isupper():  # Component (starts with uppercase)
-                elements.append(match)
-        
-        return list(set(elements))  # Remove duplicates
-
-    def _extract_hooks(self, content: str) -> List[str]:
-        """Extract React hooks used in the component"""
-        hooks = []
-        
-        hook_pattern = r'(use\w+)\s*\('
-        matches = re.findall(hook_pattern, content)
-        
-        return list(set(matches))
+            component_name = node.name or node.declared_name or node.stem
+            self.component_data[component_name] = {
+                'file_path': str(component_file),
+                'imports': [
+                    {
+                        'type': 'relative' if spec.startswith('.') else 'external',
+                        'path': spec,
+                        'is_component': self._looks_like_component_import(spec)
+                    }
+                    for spec in node.imports
+                ],
+                'props': {
+                    'interface_props': node.prop_names,
+                    'destructured_props': [],
+                    'prop_types': {prop['name']: prop['type'] for prop in node.props}
+                },
+                'styling': node.styling,
+                'jsx_elements': list(node.rendered),
+                'hooks': list(node.hooks),
+            }
 
     def _analyze_dependencies(self) -> None:
         """Analyze dependencies between components"""
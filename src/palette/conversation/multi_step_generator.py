@@ -5,6 +5,7 @@ This module handles complex multi-step feature generation that spans multiple
 components, files, and implementation phases.
 """
 
+import asyncio
 import os
 import re
 from pathlib import Path
@@ -13,6 +14,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 import json
 
+from .step_scheduler import StepScheduler, resolve_step_dependencies
+
 @dataclass
 class GenerationStep:
     """Represents a single step in multi-step generation"""
@@ -42,10 +45,12 @@ class FeatureComplexity(Enum):
 class MultiStepGenerator:
     """Generates complex features across multiple steps and files"""
     
-    def __init__(self, project_path: str, conversation_engine):
+    def __init__(self, project_path: str, conversation_engine, max_concurrency: Optional[int] = None):
         self.project_path = Path(project_path)
         self.conversation_engine = conversation_engine
         self.current_plan: Optional[FeaturePlan] = None
+        # Independent steps generated at once (default: PALETTE_STEP_CONCURRENCY)
+        self.scheduler = StepScheduler(max_concurrency)
         self.generation_templates = self._load_generation_templates()
         
     def _load_generation_templates(self) -> Dict[str, Dict[str, Any]]:
@@ -468,7 +473,7 @@ class MultiStepGenerator:
         return config
 
     async def execute_feature_plan(self, plan: FeaturePlan) -> Dict[str, Any]:
-        """Execute the feature generation plan step by step"""
+        """Execute the feature generation plan, running independent steps concurrently"""
         self.current_plan = plan
         results = {
             'feature_name': plan.feature_name,
@@ -480,50 +485,50 @@ class MultiStepGenerator:
         }
         
         print(f"🚀 Starting multi-step generation for: {plan.feature_name}")
-        print(f"📋 Total steps: {len(plan.steps)}")
-        
-        # Execute steps in dependency order
-        for step in plan.steps:
-            try:
-                print(f"⏳ Step {step.step_id}: {step.description}")
-                step.status = "in_progress"
-                
-                # Generate content for this step
-                step_result = await self._execute_single_step(step, plan)
-                
-                if step_result['success']:
-                    step.status = "completed"
-                    step.content = step_result['content']
-                    results['completed_steps'] += 1
-                    results['generated_files'].append(step.file_path)
-                    results['step_results'][step.step_id] = step_result
-                    print(f"✅ Completed: {step.description}")
-                else:
-                    step.status = "failed"
-                    results['errors'].append({
-                        'step_id': step.step_id,
-                        'error': step_result['error']
-                    })
-                    print(f"❌ Failed: {step.description} - {step_result['error']}")
-                
-            except Exception as e:
-                step.status = "failed"
-                error_msg = str(e)
+        print(f"📋 Total steps: {len(plan.steps)} (up to {self.scheduler.max_concurrency} at once)")
+        
+        async def execute(step: GenerationStep) -> Dict[str, Any]:
+            print(f"⏳ Step {step.step_id}: {step.description}")
+            step.status = "in_progress"
+            return await self._execute_single_step(step, plan)
+        
+        def on_finished(step: GenerationStep, step_result: Dict[str, Any]):
+            if step_result['success']:
+                step.status = "completed"
+                step.content = step_result['content']
+                results['completed_steps'] += 1
+                results['generated_files'].append(step.file_path)
+                results['step_results'][step.step_id] = step_result
+                print(f"✅ Completed: {step.description}")
+            else:
+                step.status = "skipped" if step_result.get('skipped') else "failed"
                 results['errors'].append({
                     'step_id': step.step_id,
-                    'error': error_msg
+                    'error': step_result['error']
                 })
-                print(f"❌ Error in step {step.step_id}: {error_msg}")
+                print(f"❌ Failed: {step.description} - {step_result['error']}")
+        
+        # Steps start as soon as their dependencies complete
+        report = await self.scheduler.run(plan.steps, execute, on_finished)
+        results['schedule'] = report.to_dict()
         
         # Generate summary
-        success_rate = (results['completed_steps'] / results['total_steps']) * 100
+        success_rate = (results['completed_steps'] / results['total_steps']) * 100 if results['total_steps'] else 100.0
         print(f"🎯 Feature generation complete: {success_rate:.1f}% success rate")
         print(f"📁 Generated {len(results['generated_files'])} files")
+        print(f"⏱️ {report.wall_ms / 1000:.1f}s total, critical path {report.critical_path_ms / 1000:.1f}s "
+              f"({' → '.join(report.critical_path)})")
         
         return results
 
     async def _execute_single_step(self, step: GenerationStep, plan: FeaturePlan) -> Dict[str, Any]:
         """Execute a single step in the feature plan"""
+        # Generation blocks on the LLM, so it runs in a worker thread and
+        # concurrent steps overlap their round-trips
+        return await asyncio.to_thread(self._generate_step, step, plan)
+
+    def _generate_step(self, step: GenerationStep, plan: FeaturePlan) -> Dict[str, Any]:
+        """Generate the content of one step"""
         try:
             # Build context for this step
             step_context = self._build_step_context(step, plan)
@@ -579,16 +584,18 @@ class MultiStepGenerator:
             'current_step': step.step_id
         }
         
-        # Add dependency context
+        # Add dependency context, including the code dependencies generated
         if step.dependencies:
             dependency_info = []
-            for dep_id in step.dependencies:
-                dep_step = next((s for s in plan.steps if s.step_id == dep_id), None)
-                if dep_step and dep_step.status == "completed":
+            steps_by_id = {s.step_id: s for s in plan.steps}
+            for dep_id in resolve_step_dependencies(plan.steps)[step.step_id]:
+                dep_step = steps_by_id[dep_id]
+                if dep_step.status == "completed":
                     dependency_info.append({
                         'name': dep_step.metadata.get('component_name', 'Dependency'),
                         'type': dep_step.step_type,
-                        'path': dep_step.file_path
+                        'path': dep_step.file_path,
+                        'content': dep_step.content
                     })
             step_context['dependencies'] = dependency_info
         
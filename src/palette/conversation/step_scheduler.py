@@ -0,0 +1,272 @@
+"""
+Dependency-aware scheduling of feature plan steps.
+
+``GenerationStep.dependencies`` name the steps a step builds on, either by
+step id or by the component/hook/util/page they produce (template plans use
+lowercase component names such as ``provider``). ``StepScheduler`` resolves
+those names into a DAG and runs every step whose dependencies have finished
+concurrently, up to ``max_concurrency`` at a time. A failed step fails all of
+its dependents without running them, and the report records each step's
+latency together with the plan's critical path.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+DEFAULT_STEP_CONCURRENCY = 4
+
+# Metadata keys holding the name a step produces
+_NAME_KEYS = ("component_name", "hook_name", "util_name", "page_name")
+
+
+def default_step_concurrency() -> int:
+    """Concurrency limit from ``PALETTE_STEP_CONCURRENCY`` (default 4)."""
+    try:
+        return max(1, int(os.getenv("PALETTE_STEP_CONCURRENCY", DEFAULT_STEP_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_STEP_CONCURRENCY
+
+
+def resolve_step_dependencies(steps: List[Any]) -> Dict[str, List[str]]:
+    """
+    Map every step id to the ids of the steps it depends on.
+
+    A dependency matches a step id first, then a produced name or file stem
+    (case-insensitive), then the end of one (``provider`` -> ``AuthProvider``).
+    Names that match no other step are dropped.
+    """
+    aliases: Dict[str, str] = {}
+    for step in steps:
+        names = [step.metadata.get(key) for key in _NAME_KEYS]
+        names.append(os.path.splitext(os.path.basename(step.file_path or ""))[0])
+        for name in names:
+            if name:
+                aliases.setdefault(name.lower(), step.step_id)
+
+    step_ids = {step.step_id for step in steps}
+    resolved: Dict[str, List[str]] = {}
+    for step in steps:
+        dep_ids: List[str] = []
+        for dep in step.dependencies:
+            if dep in step_ids:
+                dep_id = dep
+            else:
+                key = dep.lower()
+                dep_id = aliases.get(key)
+                if dep_id is None:
+                    dep_id = next((sid for name, sid in aliases.items() if name.endswith(key)), None)
+            if dep_id is not None and dep_id != step.step_id and dep_id not in dep_ids:
+                dep_ids.append(dep_id)
+        resolved[step.step_id] = dep_ids
+    return resolved
+
+
+@dataclass
+class StepTiming:
+    """When a step ran, relative to the start of the schedule."""
+    step_id: str
+    status: str
+    ready_ms: float = 0.0
+    started_ms: Optional[float] = None
+    finished_ms: Optional[float] = None
+
+    @property
+    def latency_ms(self) -> float:
+        if self.started_ms is None or self.finished_ms is None:
+            return 0.0
+        return self.finished_ms - self.started_ms
+
+    @property
+    def queued_ms(self) -> float:
+        """Time spent ready but waiting for a free slot."""
+        if self.started_ms is None:
+            return 0.0
+        return self.started_ms - self.ready_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "latency_ms": round(self.latency_ms, 1),
+            "queued_ms": round(self.queued_ms, 1),
+            "started_ms": None if self.started_ms is None else round(self.started_ms, 1),
+            "finished_ms": None if self.finished_ms is None else round(self.finished_ms, 1),
+        }
+
+
+@dataclass
+class ScheduleReport:
+    """Outcome and timing of one scheduled plan."""
+    results: Dict[str, Dict[str, Any]]
+    timings: Dict[str, StepTiming]
+    dependencies: Dict[str, List[str]]
+    wall_ms: float = 0.0
+    max_concurrency: int = 1
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_ms: float = 0.0
+
+    @property
+    def sequential_ms(self) -> float:
+        """Summed step latencies, i.e. the time running them one by one would take."""
+        return sum(timing.latency_ms for timing in self.timings.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_ms": round(self.wall_ms, 1),
+            "sequential_ms": round(self.sequential_ms, 1),
+            "critical_path_ms": round(self.critical_path_ms, 1),
+            "critical_path": self.critical_path,
+            "max_concurrency": self.max_concurrency,
+            "speedup": round(self.sequential_ms / self.wall_ms, 2) if self.wall_ms else None,
+            "steps": {step_id: timing.to_dict() for step_id, timing in self.timings.items()},
+        }
+
+
+class StepScheduler:
+    """
+    Runs plan steps as a DAG with bounded concurrency.
+
+    Args:
+        max_concurrency: Steps running at once (default: ``PALETTE_STEP_CONCURRENCY``)
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max(1, max_concurrency or default_step_concurrency())
+
+    async def run(self, steps: List[Any],
+                  execute: Callable[[Any], Awaitable[Dict[str, Any]]],
+                  on_finished: Optional[Callable[[Any, Dict[str, Any]], None]] = None) -> ScheduleReport:
+        """
+        Execute ``steps`` in dependency order.
+
+        Args:
+            steps: ``GenerationStep``s of a plan
+            execute: Coroutine function returning ``{'success': bool, ...}``
+                for one step; exceptions count as failures
+            on_finished: Called with each step and its result as it finishes,
+                including steps failed because a dependency failed
+
+        Returns:
+            Per-step results and timings
+        """
+        by_id = {step.step_id: step for step in steps}
+        dependencies = resolve_step_dependencies(steps)
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in by_id}
+        remaining = {}
+        for step_id, dep_ids in dependencies.items():
+            remaining[step_id] = len(dep_ids)
+            for dep_id in dep_ids:
+                dependents[dep_id].append(step_id)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        def now_ms() -> float:
+            return (loop.time() - started) * 1000
+
+        report = ScheduleReport(
+            results={},
+            timings={step_id: StepTiming(step_id, "pending") for step_id in by_id},
+            dependencies=dependencies,
+            max_concurrency=self.max_concurrency,
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        running: Dict[asyncio.Task, str] = {}
+
+        def finish(step_id: str, result: Dict[str, Any]):
+            report.results[step_id] = result
+            timing = report.timings[step_id]
+            timing.status = "completed" if result.get("success") else "failed"
+            if on_finished is not None:
+                on_finished(by_id[step_id], result)
+
+        def fail_dependents(step_id: str):
+            pending = list(dependents[step_id])
+            while pending:
+                dependent = pending.pop()
+                if dependent in report.results:
+                    continue
+                finish(dependent, {
+                    "success": False,
+                    "error": f"Skipped: dependency {step_id} failed",
+                    "skipped": True,
+                })
+                report.timings[dependent].status = "skipped"
+                pending.extend(dependents[dependent])
+
+        async def run_step(step) -> Dict[str, Any]:
+            async with semaphore:
+                report.timings[step.step_id].started_ms = now_ms()
+                try:
+                    return await execute(step)
+                except Exception as e:
+                    return {"success": False, "error": str(e)}
+                finally:
+                    report.timings[step.step_id].finished_ms = now_ms()
+
+        def start(step_id: str):
+            report.timings[step_id].ready_ms = now_ms()
+            report.timings[step_id].status = "ready"
+            running[asyncio.create_task(run_step(by_id[step_id]))] = step_id
+
+        # Plan order breaks ties, so steps start in the order they were planned
+        for step in steps:
+            if remaining[step.step_id] == 0:
+                start(step.step_id)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step_id = running.pop(task)
+                    result = task.result()
+                    finish(step_id, result)
+                    if not result.get("success"):
+                        fail_dependents(step_id)
+                        continue
+                    for dependent in dependents[step_id]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0 and dependent not in report.results:
+                            start(dependent)
+        finally:
+            for task in running:
+                task.cancel()
+
+        # Whatever never became ready sits on a dependency cycle
+        for step in steps:
+            if step.step_id not in report.results:
+                finish(step.step_id, {"success": False, "error": "Dependency cycle"})
+
+        report.wall_ms = now_ms()
+        report.critical_path, report.critical_path_ms = self._critical_path(steps, report)
+        return report
+
+    @staticmethod
+    def _critical_path(steps: List[Any], report: ScheduleReport):
+        """Longest chain of step latencies through the dependency graph."""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        # Steps finish after their dependencies, so finish order is topological
+        ordered = sorted(
+            (s.step_id for s in steps if report.timings[s.step_id].finished_ms is not None),
+            key=lambda step_id: report.timings[step_id].finished_ms,
+        )
+        for step_id in ordered:
+            best, best_dep = 0.0, None
+            for dep_id in report.dependencies[step_id]:
+                if longest.get(dep_id, 0.0) > best:
+                    best, best_dep = longest[dep_id], dep_id
+            longest[step_id] = best + report.timings[step_id].latency_ms
+            previous[step_id] = best_dep
+
+        if not longest:
+            return [], 0.0
+        step_id = max(longest, key=longest.get)
+        total = longest[step_id]
+        path = []
+        while step_id is not None:
+            path.append(step_id)
+            step_id = previous[step_id]
+        return list(reversed(path)), total
+
@@ -1,6 +1,16 @@
 """Generation module for AI-powered component creation."""
 
-from .generator import UIGenerator
-from .prompts import UIUXCopilotPromptBuilder
-
 __all__ = ["UIGenerator", "UIUXCopilotPromptBuilder"]
+
+
+def __getattr__(name):
+    # Imported on first access: the generator pulls in the LLM clients,
+    # optimizer and validators, which lightweight callers (e.g. the CLI's
+    # --help or template commands importing .prompts) should not pay for.
+    if name == "UIGenerator":
+        from .generator import UIGenerator
+        return UIGenerator
+    if name == "UIUXCopilotPromptBuilder":
+        from .prompts import UIUXCopilotPromptBuilder
+        return UIUXCopilotPromptBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,202 @@
+"""
+Pairwise color-token relationships computed as matrix operations.
+
+Every color value is parsed once into hue (degrees), saturation, lightness
+and relative luminance. Relationships between all token pairs then come from
+NumPy comparisons over n x n matrices instead of a Python double loop:
+
+- complement: hues 170-190 degrees apart
+- analogous: hues 20-60 degrees apart
+- variant: the same hue (within 10 degrees), or two greys, at a lightness
+  at least 0.2 apart, i.e. steps of one shade ladder
+- contrast: a WCAG contrast ratio of at least 4.5:1 (body text on background)
+
+Greys (saturation below 0.1) have no meaningful hue, so they only take part
+in shade ladders and contrast pairs.
+
+Results are cached per token set, so re-analysing an unchanged design system
+is free. Without NumPy the same thresholds are applied pair by pair.
+"""
+
+import colorsys
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# (source, target, relationship_type, strength)
+ColorRelationship = Tuple[str, str, str, float]
+
+COMPLEMENT_HUE_RANGE = (170.0, 190.0)
+ANALOGOUS_HUE_RANGE = (20.0, 60.0)
+VARIANT_MAX_HUE_DIFF = 10.0
+VARIANT_MIN_LIGHTNESS_DIFF = 0.2
+MIN_HUE_SATURATION = 0.1
+MIN_CONTRAST_RATIO = 4.5
+
+# Token sets whose relationships are kept
+RELATIONSHIP_CACHE_SIZE = 32
+
+_RGB_PATTERN = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)')
+
+_relationship_cache: "OrderedDict[str, List[ColorRelationship]]" = OrderedDict()
+
+
+def parse_color(value) -> Optional[Tuple[float, float, float]]:
+    """RGB channels in 0..1 of a hex or ``rgb()`` color, or None."""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        if value.startswith('#'):
+            hex_color = value[1:]
+            if len(hex_color) == 3:
+                hex_color = ''.join(c * 2 for c in hex_color)
+            if len(hex_color) in (6, 8):
+                return tuple(int(hex_color[i:i + 2], 16) / 255.0 for i in (0, 2, 4))
+            return None
+        match = _RGB_PATTERN.match(value)
+        if match:
+            return tuple(min(int(x), 255) / 255.0 for x in match.groups())
+    except ValueError:
+        pass
+    return None
+
+
+def color_to_hsl(value) -> Optional[Tuple[float, float, float]]:
+    """Hue in degrees, saturation and lightness (0..1) of a color value."""
+    rgb = parse_color(value)
+    if rgb is None:
+        return None
+    hue, lightness, saturation = colorsys.rgb_to_hls(*rgb)
+    return hue * 360.0, saturation, lightness
+
+
+def relative_luminance(rgb: Tuple[float, float, float]) -> float:
+    """WCAG relative luminance of RGB channels in 0..1."""
+    linear = [c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4 for c in rgb]
+    return 0.2126 * linear[0] + 0.7152 * linear[1] + 0.0722 * linear[2]
+
+
+def token_set_key(colors: Sequence[Tuple[str, str]]) -> str:
+    """Stable hash of ``(name, value)`` pairs, independent of their order."""
+    digest = hashlib.sha1()
+    for name, value in sorted(colors):
+        digest.update(f"{name}\0{value}\n".encode("utf-8", "replace"))
+    return digest.hexdigest()
+
+
+def analyze_color_relationships(colors: Sequence[Tuple[str, str]]) -> List[ColorRelationship]:
+    """
+    Relationships between every pair of color tokens.
+
+    Each ordered pair gets at most one hue relationship (complement, then
+    analogous, then variant, as before). Contrast is symmetric and is
+    reported once per pair, from the darker to the lighter color.
+
+    Args:
+        colors: ``(token_name, color_value)`` pairs; unparseable values are skipped
+
+    Returns:
+        ``(source, target, relationship_type, strength)`` tuples
+    """
+    key = token_set_key(colors)
+    cached = _relationship_cache.get(key)
+    if cached is not None:
+        _relationship_cache.move_to_end(key)
+        return list(cached)
+
+    names: List[str] = []
+    hsl: List[Tuple[float, float, float]] = []
+    luminance: List[float] = []
+    parsed: Dict[str, Optional[Tuple[Tuple[float, float, float], float]]] = {}
+    for name, value in colors:
+        if value not in parsed:
+            rgb = parse_color(value)
+            parsed[value] = None if rgb is None else (color_to_hsl(value), relative_luminance(rgb))
+        entry = parsed[value]
+        if entry is not None:
+            names.append(name)
+            hsl.append(entry[0])
+            luminance.append(entry[1])
+
+    if NUMPY_AVAILABLE:
+        relationships = _relationships_vectorized(names, hsl, luminance)
+    else:
+        relationships = _relationships_pairwise(names, hsl, luminance)
+
+    _relationship_cache[key] = relationships
+    while len(_relationship_cache) > RELATIONSHIP_CACHE_SIZE:
+        _relationship_cache.popitem(last=False)
+    return list(relationships)
+
+
+def _relationships_vectorized(names: List[str], hsl: List[Tuple[float, float, float]],
+                              luminance: List[float]) -> List[ColorRelationship]:
+    n = len(names)
+    if n < 2:
+        return []
+    values = np.asarray(hsl, dtype=np.float64)
+    hue, lightness = values[:, 0], values[:, 2]
+    chromatic = values[:, 1] >= MIN_HUE_SATURATION
+    lum = np.asarray(luminance, dtype=np.float64)
+
+    hue_diff = np.abs(hue[:, None] - hue[None, :])
+    hue_diff = np.minimum(hue_diff, 360.0 - hue_diff)
+    lightness_diff = np.abs(lightness[:, None] - lightness[None, :])
+    both_chromatic = (chromatic[:, None] & chromatic[None, :]) & ~np.eye(n, dtype=bool)
+    both_grey = ~chromatic[:, None] & ~chromatic[None, :] & ~np.eye(n, dtype=bool)
+
+    complement = both_chromatic & (hue_diff >= COMPLEMENT_HUE_RANGE[0]) & (hue_diff <= COMPLEMENT_HUE_RANGE[1])
+    analogous = both_chromatic & (hue_diff >= ANALOGOUS_HUE_RANGE[0]) & (hue_diff <= ANALOGOUS_HUE_RANGE[1])
+    variant = (((both_chromatic & (hue_diff <= VARIANT_MAX_HUE_DIFF)) | both_grey)
+               & (lightness_diff >= VARIANT_MIN_LIGHTNESS_DIFF))
+
+    lighter = np.maximum(lum[:, None], lum[None, :])
+    darker = np.minimum(lum[:, None], lum[None, :])
+    ratio = (lighter + 0.05) / (darker + 0.05)
+    # Once per pair: from the darker (row) to the lighter (column) color
+    contrast = (ratio >= MIN_CONTRAST_RATIO) & (lum[:, None] < lum[None, :])
+
+    relationships: List[ColorRelationship] = []
+    for mask, kind, strength in ((complement, "complement", 0.9), (analogous, "analogous", 0.7),
+                                 (variant, "variant", 0.8)):
+        for i, j in zip(*np.nonzero(mask)):
+            relationships.append((names[i], names[j], kind, strength))
+    for i, j in zip(*np.nonzero(contrast)):
+        relationships.append((names[i], names[j], "contrast", round(min(float(ratio[i, j]) / 7.0, 1.0), 3)))
+    return relationships
+
+
+def _relationships_pairwise(names: List[str], hsl: List[Tuple[float, float, float]],
+                            luminance: List[float]) -> List[ColorRelationship]:
+    by_kind: Dict[str, List[ColorRelationship]] = {"complement": [], "analogous": [], "variant": [], "contrast": []}
+    for i, (h1, s1, l1) in enumerate(hsl):
+        for j, (h2, s2, l2) in enumerate(hsl):
+            if i == j:
+                continue
+            hue_diff = abs(h1 - h2)
+            hue_diff = min(hue_diff, 360.0 - hue_diff)
+            chromatic = (s1 >= MIN_HUE_SATURATION, s2 >= MIN_HUE_SATURATION)
+            lightness_apart = abs(l1 - l2) >= VARIANT_MIN_LIGHTNESS_DIFF
+            if all(chromatic):
+                if COMPLEMENT_HUE_RANGE[0] <= hue_diff <= COMPLEMENT_HUE_RANGE[1]:
+                    by_kind["complement"].append((names[i], names[j], "complement", 0.9))
+                elif ANALOGOUS_HUE_RANGE[0] <= hue_diff <= ANALOGOUS_HUE_RANGE[1]:
+                    by_kind["analogous"].append((names[i], names[j], "analogous", 0.7))
+                elif hue_diff <= VARIANT_MAX_HUE_DIFF and lightness_apart:
+                    by_kind["variant"].append((names[i], names[j], "variant", 0.8))
+            elif not any(chromatic) and lightness_apart:
+                by_kind["variant"].append((names[i], names[j], "variant", 0.8))
+
+            if luminance[i] < luminance[j]:
+                ratio = (luminance[j] + 0.05) / (luminance[i] + 0.05)
+                if ratio >= MIN_CONTRAST_RATIO:
+                    by_kind["contrast"].append((names[i], names[j], "contrast", round(min(ratio / 7.0, 1.0), 3)))
+    return [relationship for kind in by_kind.values() for relationship in kind]
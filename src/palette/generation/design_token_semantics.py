@@ -6,13 +6,13 @@ Provides intelligent token recommendations for component generation.
 
 import re
 import json
-import colorsys
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any, Set, Union
 from pathlib import Path
 
 from ..errors.decorators import handle_errors
+from .color_relationships import analyze_color_relationships, color_to_hsl
 
 
 class TokenType(Enum):
@@ -472,16 +472,18 @@ class DesignTokenSemantics:
     
     def _analyze_token_relationships(self):
         """Analyze relationships between tokens."""
-        color_tokens = {name: token for name, token in self.tokens.items() 
-                       if token.token_type == TokenType.COLOR}
-        
-        # Analyze color relationships
-        for name1, token1 in color_tokens.items():
-            for name2, token2 in color_tokens.items():
-                if name1 != name2:
-                    relationship = self._analyze_color_relationship(token1, token2)
-                    if relationship:
-                        self.relationships.append(relationship)
+        self.relationships = []
+        
+        # Analyze color relationships (all pairs at once, cached per token set)
+        colors = [(name, token.value) for name, token in self.tokens.items()
+                  if token.token_type == TokenType.COLOR and isinstance(token.value, str)]
+        for source, target, relationship_type, strength in analyze_color_relationships(colors):
+            self.relationships.append(TokenRelationship(
+                source_token=source,
+                target_token=target,
+                relationship_type=relationship_type,
+                strength=strength
+            ))
         
         # Analyze spacing relationships (hierarchical)
         spacing_tokens = {name: token for name, token in self.tokens.items() 
@@ -491,83 +493,11 @@ class DesignTokenSemantics:
             hierarchy_relationships = self._analyze_spacing_hierarchy(name, token, spacing_tokens)
             self.relationships.extend(hierarchy_relationships)
     
-    def _analyze_color_relationship(self, token1: TokenMetadata, token2: TokenMetadata) -> Optional[TokenRelationship]:
-        """Analyze relationship between two color tokens."""
-        try:
-            # Convert colors to HSL for analysis
-            hsl1 = self._color_to_hsl(token1.value)
-            hsl2 = self._color_to_hsl(token2.value)
-            
-            if not hsl1 or not hsl2:
-                return None
-            
-            h1, s1, l1 = hsl1
-            h2, s2, l2 = hsl2
-            
-            # Check for complementary colors
-            hue_diff = abs(h1 - h2)
-            if 170 <= hue_diff <= 190:
-                return TokenRelationship(
-                    source_token=token1.name,
-                    target_token=token2.name,
-                    relationship_type="complement",
-                    strength=0.9
-                )
-            
-            # Check for analogous colors
-            if 20 <= hue_diff <= 60:
-                return TokenRelationship(
-                    source_token=token1.name,
-                    target_token=token2.name,
-                    relationship_type="analogous",
-                    strength=0.7
-                )
-            
-            # Check for variants (same hue, different lightness)
-            if abs(h1 - h2) <= 10 and abs(l1 - l2) >= 0.2:
-                return TokenRelationship(
-                    source_token=token1.name,
-                    target_token=token2.name,
-                    relationship_type="variant",
-                    strength=0.8
-                )
-            
-        except Exception:
-            pass
-        
-        return None
-    
     def _color_to_hsl(self, color_value: str) -> Optional[Tuple[float, float, float]]:
-        """Convert color value to HSL tuple."""
-        if color_value in self._color_analysis_cache:
-            return self._color_analysis_cache[color_value].get('hsl')
-        
-        try:
-            # Handle hex colors
-            if color_value.startswith('#'):
-                hex_color = color_value[1:]
-                if len(hex_color) == 3:
-                    hex_color = ''.join([c*2 for c in hex_color])
-                if len(hex_color) == 6:
-                    r = int(hex_color[0:2], 16) / 255.0
-                    g = int(hex_color[2:4], 16) / 255.0
-                    b = int(hex_color[4:6], 16) / 255.0
-                    hsl = colorsys.rgb_to_hls(r, g, b)
-                    self._color_analysis_cache[color_value] = {'hsl': hsl}
-                    return hsl
-            
-            # Handle rgb colors
-            rgb_match = re.match(r'rgb\((\d+),\s*(\d+),\s*(\d+)\)', color_value)
-            if rgb_match:
-                r, g, b = [int(x) / 255.0 for x in rgb_match.groups()]
-                hsl = colorsys.rgb_to_hls(r, g, b)
-                self._color_analysis_cache[color_value] = {'hsl': hsl}
-                return hsl
-                
-        except Exception:
-            pass
-        
-        return None
+        """Convert color value to an HSL tuple (hue in degrees)."""
+        if color_value not in self._color_analysis_cache:
+            self._color_analysis_cache[color_value] = {'hsl': color_to_hsl(color_value)}
+        return self._color_analysis_cache[color_value]['hsl']
     
     def _analyze_spacing_hierarchy(self, token_name: str, token: TokenMetadata, 
                                   all_spacing: Dict[str, TokenMetadata]) -> List[TokenRelationship]:
@@ -1,7 +1,9 @@
+import asyncio
 import os
 import subprocess
 import tempfile
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
 import anthropic
 from openai import OpenAI
@@ -21,6 +23,13 @@ from ..quality import ComponentValidator, QualityReport
 from ..quality.zero_fix_pipeline import ZeroFixPipeline
 from ..utils.async_utils import safe_run_async
 from .enhanced_prompts import EnhancedPromptBuilder
+from .llm_streaming import (
+    FakeStreamingProvider,
+    StreamMetrics,
+    iter_anthropic_text,
+    iter_openai_text,
+    stream_text,
+)
 from .smart_context_injector import SmartComponentContextInjector, SmartContextConfig, ContextInjectionLevel
 from .prompt_parser import PromptParser, extract_component_name_from_requirements
 from .prompts import UIUXCopilotPromptBuilder
@@ -347,6 +356,74 @@ Follow the established patterns, naming conventions, and styling approach used i
     def generate_component_traditional(self, prompt: str, context: Dict) -> str:
         """Generate a React component from a prompt and project context (traditional approach)"""
 
+        system_prompt, user_prompt = self._build_generation_prompts(prompt, context)
+
+        # Choose API based on model
+        if self.model.startswith("gpt"):
+            component_code = self._generate_with_openai(system_prompt, user_prompt)
+        elif self.model.startswith("claude"):
+            component_code = self._generate_with_anthropic(system_prompt, user_prompt)
+        else:
+            raise ValueError(f"Unsupported model: {self.model}")
+
+        # Add usage example to the component
+        usage_example = self._generate_usage_example(component_code, prompt)
+        return component_code + usage_example
+
+    async def stream_generate_component(
+        self, prompt: str, context: Dict, metrics: Optional[StreamMetrics] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a generated component token by token.
+
+        Same prompts as ``generate_component_traditional``, but the provider
+        response is yielded as it arrives (followed by the usage example).
+        Timing of the stream is filled into ``metrics`` when the caller passes
+        one; generators are shared per project, so each stream owns its metrics.
+        """
+        # Prompt building analyzes the project; keep it off the event loop
+        system_prompt, user_prompt = await asyncio.to_thread(
+            self._build_generation_prompts, prompt, context
+        )
+        provider, open_stream = self._open_provider_stream(system_prompt, user_prompt)
+
+        if metrics is None:
+            metrics = StreamMetrics(provider=provider, model=self.model)
+        else:
+            # Time the provider stream, not prompt building
+            metrics.provider, metrics.model = provider, self.model
+            metrics.started_at = time.perf_counter()
+
+        parts = []
+        async for delta in stream_text(open_stream, metrics):
+            parts.append(delta)
+            yield delta
+
+        yield self._generate_usage_example("".join(parts).strip(), prompt)
+
+    def _open_provider_stream(self, system_prompt: str, user_prompt: str) -> Tuple[str, Callable[[], Iterator[str]]]:
+        """Provider name and a callable opening its text-delta stream."""
+        if os.getenv("PALETTE_LLM_PROVIDER") == "fake":
+            fake = FakeStreamingProvider.from_env()
+            return "fake", lambda: fake.iter_text(system_prompt, user_prompt)
+
+        if self.model.startswith("gpt"):
+            if not self.openai_client:
+                raise ValueError("OpenAI API key not configured")
+            return "openai", lambda: iter_openai_text(
+                self.openai_client, self.model, system_prompt, user_prompt
+            )
+        if self.model.startswith("claude"):
+            if not self.anthropic_client:
+                raise ValueError("Anthropic API key not configured")
+            return "anthropic", lambda: iter_anthropic_text(
+                self.anthropic_client, self.model, system_prompt, user_prompt
+            )
+        raise ValueError(f"Unsupported model: {self.model}")
+
+    def _build_generation_prompts(self, prompt: str, context: Dict) -> Tuple[str, str]:
+        """System and user prompts for a component generation request"""
+
         # Parse the prompt to understand requirements
         requirements = self.prompt_parser.parse(prompt)
 
@@ -404,17 +481,7 @@ Follow the established patterns, naming conventions, and styling approach used i
             except Exception as e:
                 print(f"⚠️ Smart context injection failed: {e}")
 
-        # Choose API based on model
-        if self.model.startswith("gpt"):
-            component_code = self._generate_with_openai(system_prompt, user_prompt)
-        elif self.model.startswith("claude"):
-            component_code = self._generate_with_anthropic(system_prompt, user_prompt)
-        else:
-            raise ValueError(f"Unsupported model: {self.model}")
-
-        # Add usage example to the component
-        usage_example = self._generate_usage_example(component_code, prompt)
-        return component_code + usage_example
+        return system_prompt, user_prompt
 
     def generate_component_with_qa(
         self, prompt: str, context: Dict, target_path: str = None
@@ -0,0 +1,258 @@
+"""
+Token-level streaming from LLM providers.
+
+Provider SDK streams (OpenAI chat completion chunks, Anthropic message
+streams) are exposed as plain iterators of text deltas, and
+``stream_text`` turns such an iterator into an async generator that pulls
+each delta in a worker thread, records time-to-first-token, and closes the
+provider stream when the consumer stops early (e.g. the SSE client went
+away).
+
+``FakeStreamingProvider`` replays canned text with an optional per-chunk
+delay so the whole pipeline can be exercised without API keys
+(``PALETTE_LLM_PROVIDER=fake``).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StreamMetrics:
+    """Timing of one streamed generation."""
+    provider: str
+    model: str
+    started_at: float = field(default_factory=time.perf_counter)
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    chunks: int = 0
+    characters: int = 0
+    cancelled: bool = False
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        """Time to first token in milliseconds."""
+        if self.first_token_at is None:
+            return None
+        return (self.first_token_at - self.started_at) * 1000
+
+    @property
+    def total_ms(self) -> Optional[float]:
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        ttft_ms, total_ms = self.ttft_ms, self.total_ms
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "ttftMs": round(ttft_ms, 1) if ttft_ms is not None else None,
+            "totalMs": round(total_ms, 1) if total_ms is not None else None,
+            "chunks": self.chunks,
+            "characters": self.characters,
+            "cancelled": self.cancelled,
+        }
+
+
+class StreamMetricsRecorder:
+    """Keeps the most recent stream metrics for status reporting."""
+
+    def __init__(self, max_entries: int = 200):
+        self._metrics: Deque[StreamMetrics] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self.total_streams = 0
+
+    def record(self, metrics: StreamMetrics):
+        with self._lock:
+            self._metrics.append(metrics)
+            self.total_streams += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = list(self._metrics)
+        ttfts = sorted(m.ttft_ms for m in recent if m.ttft_ms is not None)
+        return {
+            "totalStreams": self.total_streams,
+            "recentStreams": len(recent),
+            "cancelled": sum(1 for m in recent if m.cancelled),
+            "ttftMsAvg": round(sum(ttfts) / len(ttfts), 1) if ttfts else None,
+            "ttftMsP95": round(ttfts[min(len(ttfts) - 1, int(len(ttfts) * 0.95))], 1) if ttfts else None,
+        }
+
+
+# Process-wide recorder (reported by the server's /api/status)
+stream_metrics = StreamMetricsRecorder()
+
+
+def iter_openai_text(client, model: str, system_prompt: str, user_prompt: str,
+                     max_tokens: int = 2000, temperature: float = 0.7) -> Iterator[str]:
+    """Text deltas of a streamed OpenAI chat completion."""
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        stream=True,
+    )
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        # Closes the HTTP response when the consumer stops early
+        stream.close()
+
+
+def iter_anthropic_text(client, model: str, system_prompt: str, user_prompt: str,
+                        max_tokens: int = 2000, temperature: float = 0.7) -> Iterator[str]:
+    """Text deltas of a streamed Anthropic message."""
+    with client.messages.stream(
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        system=system_prompt,
+        messages=[{"role": "user", "content": user_prompt}],
+    ) as stream:
+        for text in stream.text_stream:
+            yield text
+
+
+class FakeStreamingProvider:
+    """
+    Local stand-in for an LLM provider.
+
+    Args:
+        text: Response to stream (default: a small React component)
+        chunk_size: Characters per streamed delta
+        delay: Seconds to sleep before each delta
+        first_token_delay: Extra seconds before the first delta
+    """
+
+    DEFAULT_RESPONSE = (
+        "```tsx\n"
+        "import React from 'react';\n\n"
+        "interface ButtonProps {\n"
+        "  label: string;\n"
+        "  onClick?: () => void;\n"
+        "}\n\n"
+        "export const Button: React.FC<ButtonProps> = ({ label, onClick }) => (\n"
+        "  <button className=\"px-4 py-2 rounded-md bg-blue-600 text-white\" onClick={onClick}>\n"
+        "    {label}\n"
+        "  </button>\n"
+        ");\n\n"
+        "export default Button;\n"
+        "```"
+    )
+
+    def __init__(self, text: Optional[str] = None, chunk_size: int = 8,
+                 delay: float = 0.0, first_token_delay: float = 0.0):
+        self.text = self.DEFAULT_RESPONSE if text is None else text
+        self.chunk_size = max(1, chunk_size)
+        self.delay = delay
+        self.first_token_delay = first_token_delay
+        self.closed = False
+
+    def iter_text(self, system_prompt: str = "", user_prompt: str = "") -> Iterator[str]:
+        try:
+            if self.first_token_delay:
+                time.sleep(self.first_token_delay)
+            for start in range(0, len(self.text), self.chunk_size):
+                if self.delay:
+                    time.sleep(self.delay)
+                yield self.text[start:start + self.chunk_size]
+        finally:
+            self.closed = True
+
+    @classmethod
+    def from_env(cls) -> "FakeStreamingProvider":
+        return cls(
+            delay=float(os.getenv("PALETTE_FAKE_LLM_DELAY", "0.01")),
+            first_token_delay=float(os.getenv("PALETTE_FAKE_LLM_TTFT", "0.2")),
+        )
+
+
+_EXHAUSTED = object()
+
+
+def _next_or_exhausted(iterator: Iterator[str], lock: threading.Lock):
+    with lock:
+        try:
+            return next(iterator)
+        except StopIteration:
+            return _EXHAUSTED
+
+
+def _close_when_idle(iterator: Iterator[str], lock: threading.Lock, provider: str):
+    # Waits for a delta still being pulled in another worker thread
+    with lock:
+        try:
+            iterator.close()
+        except Exception as e:
+            print(f"Warning: Closing {provider} stream failed: {e}")
+
+
+async def stream_text(
+    open_stream: Callable[[], Iterator[str]],
+    metrics: StreamMetrics,
+    record: bool = True,
+) -> AsyncIterator[str]:
+    """
+    Async generator over a blocking provider stream.
+
+    Each delta is pulled in a worker thread so the event loop keeps serving
+    other streams. Closing the generator (or cancelling its consumer) stops
+    pulling and closes the provider stream; a delta already being awaited in
+    the worker thread is dropped.
+
+    Args:
+        open_stream: Opens the provider stream (called in a worker thread,
+            since opening sends the request)
+        metrics: Filled in with first-token time, chunk counts and end time
+        record: Add the finished metrics to ``stream_metrics``
+    """
+    iterator: Optional[Iterator[str]] = None
+    lock = threading.Lock()
+    completed = False
+    try:
+        iterator = await asyncio.to_thread(open_stream)
+        while True:
+            delta = await asyncio.to_thread(_next_or_exhausted, iterator, lock)
+            if delta is _EXHAUSTED:
+                completed = True
+                break
+            if not delta:
+                continue
+            if metrics.first_token_at is None:
+                metrics.first_token_at = time.perf_counter()
+            metrics.chunks += 1
+            metrics.characters += len(delta)
+            yield delta
+    finally:
+        metrics.finished_at = time.perf_counter()
+        metrics.cancelled = not completed
+        if iterator is not None and not completed and hasattr(iterator, "close"):
+            threading.Thread(
+                target=_close_when_idle,
+                args=(iterator, lock, metrics.provider),
+                name="palette-stream-close",
+                daemon=True,
+            ).start()
+        if record:
+            stream_metrics.record(metrics)
+
+
+async def collect_text(chunks: AsyncIterator[str]) -> str:
+    """Join an async stream of deltas."""
+    parts: List[str] = []
+    async for chunk in chunks:
+        parts.append(chunk)
+    return "".join(parts)
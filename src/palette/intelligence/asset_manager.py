@@ -7,10 +7,13 @@ import json
 import mimetypes
 import os
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..analysis.file_inventory import ProjectFileInventory
 
 
 class AssetType(Enum):
@@ -54,6 +57,7 @@ class AssetContext:
     patterns: List[Asset]  # Background patterns
     animations: List[Asset]  # Animation files
     placeholders: Dict[str, str]  # Placeholder suggestions
+    timings: Dict[str, float] = field(default_factory=dict)  # Milliseconds per scan phase
 
 
 @dataclass
@@ -67,14 +71,93 @@ class AssetSuggestion:
     priority: str = "medium"  # high, medium, low
 
 
+class AssetInventory:
+    """
+    Asset-oriented view of one project walk.
+
+    Built from a single pruned, ``.gitignore``-aware ``ProjectFileInventory``
+    and indexed by lower-cased extension, so every scan phase filters an
+    in-memory list instead of globbing the tree again. File contents and image
+    dimensions are only read on demand and then memoized.
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = project_path
+        self.inventory = ProjectFileInventory(str(project_path), respect_gitignore=True)
+
+        self._by_extension: Dict[str, List[str]] = {}
+        for rel_path in self.inventory.files:
+            extension = os.path.splitext(rel_path)[1].lower()
+            if extension:
+                self._by_extension.setdefault(extension, []).append(rel_path)
+
+        self._texts: Dict[str, Optional[str]] = {}
+        self._dimensions: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.inventory)
+
+    def files(
+        self, extensions: Iterable[str], under: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Files with any of the (lower-case) extensions, optionally below some directories."""
+        matches: List[str] = []
+        for extension in extensions:
+            matches.extend(self._by_extension.get(extension, []))
+
+        if under is not None:
+            prefixes = tuple(d.strip("/") + "/" for d in under)
+            matches = [p for p in matches if p.startswith(prefixes)]
+        return sorted(set(matches))
+
+    def find(self, keywords: Iterable[str], extensions: Iterable[str]) -> List[str]:
+        """Files whose name contains any keyword (case-insensitive), like ``rglob("*kw*")``."""
+        keywords = [k.lower() for k in keywords]
+        return [
+            rel_path
+            for rel_path in self.files(extensions)
+            if any(k in rel_path.rsplit("/", 1)[-1].lower() for k in keywords)
+        ]
+
+    def path(self, rel_path: str) -> Path:
+        return self.project_path / rel_path
+
+    def stat(self, rel_path: str) -> Optional[os.stat_result]:
+        return self.inventory.stat(rel_path)
+
+    def read_text(self, rel_path: str) -> Optional[str]:
+        """File contents, read once per inventory (None if unreadable)."""
+        if rel_path not in self._texts:
+            try:
+                self._texts[rel_path] = self.path(rel_path).read_text()
+            except Exception:
+                self._texts[rel_path] = None
+        return self._texts[rel_path]
+
+    def dimensions(self, rel_path: str, reader) -> Optional[Tuple[int, int]]:
+        """Image dimensions, read once per inventory with ``reader(path)``."""
+        if rel_path not in self._dimensions:
+            self._dimensions[rel_path] = reader(self.path(rel_path))
+        return self._dimensions[rel_path]
+
+
 class AssetIntelligence:
     """Intelligent asset management and suggestion system."""
 
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
+        self._inventory: Optional[AssetInventory] = None
+        self.last_timings: Dict[str, float] = {}
         self._init_patterns()
         self._init_placeholder_templates()
 
+    @property
+    def inventory(self) -> AssetInventory:
+        """Asset inventory of the current scan (built on first use)."""
+        if self._inventory is None:
+            self._inventory = AssetInventory(self.project_path)
+        return self._inventory
+
     def _init_patterns(self):
         """Initialize patterns for asset detection."""
         self.asset_patterns = {
@@ -108,7 +191,19 @@ class AssetIntelligence:
         }
 
     def analyze_project_assets(self) -> AssetContext:
-        """Analyze and catalog all project assets."""
+        """Analyze and catalog all project assets (one project walk per call)."""
+        timings: Dict[str, float] = {}
+
+        def timed(phase: str, scan):
+            start = time.perf_counter()
+            result = scan()
+            timings[phase] = round((time.perf_counter() - start) * 1000, 2)
+            return result
+
+        # Fresh walk per analysis so added or removed assets are picked up
+        self._inventory = None
+        timed("inventory", lambda: self.inventory)
+
         context = AssetContext(
             images={},
             icons={},
@@ -121,26 +216,32 @@ class AssetIntelligence:
         )
 
         # Scan for images
-        context.images = self._scan_images()
+        context.images = timed("images", self._scan_images)
 
         # Detect icon system
-        context.icons = self._detect_icon_system()
+        context.icons = timed("icons", self._detect_icon_system)
 
         # Extract fonts
-        context.fonts = self._extract_fonts()
+        context.fonts = timed("fonts", self._extract_fonts)
 
         # Find logos
-        context.logos = self._find_logos()
+        context.logos = timed("logos", self._find_logos)
 
         # Find patterns
-        context.patterns = self._find_patterns()
+        context.patterns = timed("patterns", self._find_patterns)
 
         # Detect animations
-        context.animations = self._find_animations()
+        context.animations = timed("animations", self._find_animations)
 
         # Extract brand colors from CSS/config
-        context.colors = self._extract_brand_colors()
+        context.colors = timed("colors", self._extract_brand_colors)
 
+        context.timings = timings
+        self.last_timings = timings
+        print(
+            f"Info: Scanned {len(self.inventory)} files for assets in "
+            f"{sum(timings.values()):.1f}ms"
+        )
         return context
 
     def _scan_images(self) -> Dict[str, List[Asset]]:
@@ -158,38 +259,43 @@ class AssetIntelligence:
         common_dirs = ["public", "assets", "images", "static", "src/assets"]
 
         for dir_name in common_dirs:
-            dir_path = self.project_path / dir_name
-            if dir_path.exists():
-                for file_path in dir_path.rglob("*"):
-                    if file_path.suffix.lower() in image_extensions:
-                        asset = self._create_image_asset(file_path)
-                        category = self._categorize_image(asset)
-                        images[category].append(asset)
+            for rel_path in self.inventory.files(image_extensions, under=[dir_name]):
+                asset = self._create_image_asset(self.inventory.path(rel_path))
+                category = self._categorize_image(asset)
+                images[category].append(asset)
 
         return images
 
     def _create_image_asset(self, file_path: Path) -> Asset:
-        """Create an Asset object for an image file."""
+        """
+        Create an Asset object for an image file.
+
+        Dimensions are left unset; ``_categorize_image`` reads them only when
+        the name alone does not decide the category.
+        """
         relative_path = file_path.relative_to(self.project_path)
         mime_type, _ = mimetypes.guess_type(str(file_path))
-
-        # Try to extract dimensions for raster images
-        dimensions = None
-        if file_path.suffix.lower() in {".png", ".jpg", ".jpeg", ".webp"}:
-            dimensions = self._get_image_dimensions(file_path)
+        stat = self.inventory.stat(relative_path.as_posix())
 
         return Asset(
             path=str(relative_path),
             type=AssetType.IMAGE,
             name=file_path.stem,
-            size=file_path.stat().st_size if file_path.exists() else 0,
+            size=stat.st_size if stat else 0,
             mime_type=mime_type or "image/unknown",
-            dimensions=dimensions,
             format=file_path.suffix[1:].lower(),
             tags=self._extract_tags_from_filename(file_path.name),
-            last_modified=file_path.stat().st_mtime if file_path.exists() else 0,
+            last_modified=stat.st_mtime if stat else 0,
         )
 
+    def _load_dimensions(self, asset: Asset) -> Optional[Tuple[int, int]]:
+        """Read (and remember) a raster image's dimensions."""
+        if asset.dimensions is None and asset.format in {"png", "jpg", "jpeg", "webp"}:
+            asset.dimensions = self.inventory.dimensions(
+                Path(asset.path).as_posix(), self._get_image_dimensions
+            )
+        return asset.dimensions
+
     def _categorize_image(self, asset: Asset) -> str:
         """Categorize an image based on its name and path."""
         name_lower = asset.name.lower()
@@ -208,7 +314,7 @@ class AssetIntelligence:
                     return "thumbnail"
 
         # Size-based categorization
-        if asset.dimensions:
+        if self._load_dimensions(asset):
             width, height = asset.dimensions
             if width > 1200 or height > 600:
                 return "hero"
@@ -258,21 +364,21 @@ class AssetIntelligence:
         icon_dirs = ["icons", "assets/icons", "src/icons", "public/icons"]
 
         for dir_name in icon_dirs:
-            dir_path = self.project_path / dir_name
-            if dir_path.exists():
-                for svg_file in dir_path.glob("**/*.svg"):
-                    # Check if it's likely an icon (small size, simple name)
-                    if svg_file.stat().st_size < 10000:  # Less than 10KB
-                        icon_name = svg_file.stem
-                        icons[icon_name] = Asset(
-                            path=str(svg_file.relative_to(self.project_path)),
-                            type=AssetType.ICON,
-                            name=icon_name,
-                            size=svg_file.stat().st_size,
-                            mime_type="image/svg+xml",
-                            format="svg",
-                            tags=self._extract_tags_from_filename(icon_name),
-                        )
+            for rel_path in self.inventory.files([".svg"], under=[dir_name]):
+                size = self.inventory.stat(rel_path).st_size
+                # Check if it's likely an icon (small size, simple name)
+                if size < 10000:  # Less than 10KB
+                    svg_file = self.inventory.path(rel_path)
+                    icon_name = svg_file.stem
+                    icons[icon_name] = Asset(
+                        path=str(svg_file.relative_to(self.project_path)),
+                        type=AssetType.ICON,
+                        name=icon_name,
+                        size=size,
+                        mime_type="image/svg+xml",
+                        format="svg",
+                        tags=self._extract_tags_from_filename(icon_name),
+                    )
 
         return icons
 
@@ -286,9 +392,11 @@ class AssetIntelligence:
             r"--font-.*:\s*['\"]?([^;'\"]+)['\"]?",
         ]
 
-        for css_file in self.project_path.rglob("*.css"):
+        for rel_path in self.inventory.files([".css"]):
+            content = self.inventory.read_text(rel_path)
+            if content is None:
+                continue
             try:
-                content = css_file.read_text()
                 for pattern in css_patterns:
                     matches = re.findall(pattern, content)
                     for match in matches:
@@ -318,9 +426,11 @@ class AssetIntelligence:
         fonts = set()
 
         # Check HTML files for font links
-        for html_file in self.project_path.rglob("*.html"):
+        for rel_path in self.inventory.files([".html"]):
+            content = self.inventory.read_text(rel_path)
+            if content is None:
+                continue
             try:
-                content = html_file.read_text()
                 # Google Fonts
                 google_fonts = re.findall(
                     r"fonts\.googleapis\.com/css[^'\"]*family=([^&'\"]+)", content
@@ -338,17 +448,10 @@ class AssetIntelligence:
         logos = []
         logo_patterns = ["logo", "brand", "mark"]
 
-        for pattern in logo_patterns:
-            for file_path in self.project_path.rglob(f"*{pattern}*"):
-                if file_path.is_file() and file_path.suffix.lower() in {
-                    ".png",
-                    ".svg",
-                    ".jpg",
-                    ".jpeg",
-                }:
-                    asset = self._create_image_asset(file_path)
-                    asset.type = AssetType.LOGO
-                    logos.append(asset)
+        for rel_path in self.inventory.find(logo_patterns, {".png", ".svg", ".jpg", ".jpeg"}):
+            asset = self._create_image_asset(self.inventory.path(rel_path))
+            asset.type = AssetType.LOGO
+            logos.append(asset)
 
         return logos
 
@@ -357,16 +460,10 @@ class AssetIntelligence:
         patterns = []
         pattern_keywords = ["pattern", "texture", "background", "bg"]
 
-        for keyword in pattern_keywords:
-            for file_path in self.project_path.rglob(f"*{keyword}*"):
-                if file_path.is_file() and file_path.suffix.lower() in {
-                    ".png",
-                    ".svg",
-                    ".jpg",
-                }:
-                    asset = self._create_image_asset(file_path)
-                    asset.type = AssetType.PATTERN
-                    patterns.append(asset)
+        for rel_path in self.inventory.find(pattern_keywords, {".png", ".svg", ".jpg"}):
+            asset = self._create_image_asset(self.inventory.path(rel_path))
+            asset.type = AssetType.PATTERN
+            patterns.append(asset)
 
         return patterns
 
@@ -376,38 +473,36 @@ class AssetIntelligence:
         animation_extensions = {".json", ".gif", ".mp4", ".webm"}
 
         # Look for Lottie animations
-        for json_file in self.project_path.rglob("*.json"):
-            if (
-                "lottie" in json_file.name.lower()
-                or "animation" in json_file.name.lower()
-            ):
-                try:
-                    with open(json_file) as f:
-                        data = json.load(f)
-                        # Simple check for Lottie structure
-                        if isinstance(data, dict) and "v" in data and "fr" in data:
-                            animations.append(
-                                Asset(
-                                    path=str(json_file.relative_to(self.project_path)),
-                                    type=AssetType.ANIMATION,
-                                    name=json_file.stem,
-                                    size=json_file.stat().st_size,
-                                    mime_type="application/json",
-                                    format="lottie",
-                                    tags=["lottie", "animation"],
-                                )
+        for rel_path in self.inventory.find(["lottie", "animation"], [".json"]):
+            json_file = self.inventory.path(rel_path)
+            try:
+                with open(json_file) as f:
+                    data = json.load(f)
+                    # Simple check for Lottie structure
+                    if isinstance(data, dict) and "v" in data and "fr" in data:
+                        animations.append(
+                            Asset(
+                                path=str(json_file.relative_to(self.project_path)),
+                                type=AssetType.ANIMATION,
+                                name=json_file.stem,
+                                size=self.inventory.stat(rel_path).st_size,
+                                mime_type="application/json",
+                                format="lottie",
+                                tags=["lottie", "animation"],
                             )
-                except Exception:
-                    continue
+                        )
+            except Exception:
+                continue
 
         # Look for GIF animations
-        for gif_file in self.project_path.rglob("*.gif"):
+        for rel_path in self.inventory.files([".gif"]):
+            gif_file = self.inventory.path(rel_path)
             animations.append(
                 Asset(
                     path=str(gif_file.relative_to(self.project_path)),
                     type=AssetType.ANIMATION,
                     name=gif_file.stem,
-                    size=gif_file.stat().st_size,
+                    size=self.inventory.stat(rel_path).st_size,
                     mime_type="image/gif",
                     format="gif",
                     tags=["gif", "animation"],
@@ -426,9 +521,11 @@ class AssetIntelligence:
             r"(primary|secondary|accent|brand).*:\s*(#[0-9a-fA-F]{3,8}|rgb[a]?\([^)]+\))",
         ]
 
-        for css_file in self.project_path.rglob("*.css"):
+        for rel_path in self.inventory.files([".css"]):
+            content = self.inventory.read_text(rel_path)
+            if content is None:
+                continue
             try:
-                content = css_file.read_text()
                 for pattern in color_patterns:
                     matches = re.findall(pattern, content, re.IGNORECASE)
                     for name, value in matches:
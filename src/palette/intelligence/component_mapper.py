@@ -3,14 +3,15 @@ Component Relationship Mapping system for understanding component dependencies
 and relationships within a project.
 """
 
-import ast
-import re
+import os
 from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+from ..analysis.component_graph import ComponentNode, get_component_graph
+
 
 class RelationshipType(Enum):
     """Types of relationships between components."""
@@ -74,7 +75,7 @@ class ComponentRelationshipEngine:
         self._scan_project()
 
     def _scan_project(self):
-        """Scan the project for all components and their relationships."""
+        """Collect components and their relationships from the shared component graph."""
         # Common component directories
         component_dirs = [
             "components",
@@ -87,76 +88,37 @@ class ComponentRelationshipEngine:
             "src/layouts",
         ]
 
+        graph = get_component_graph(str(self.project_path))
         for dir_name in component_dirs:
-            dir_path = self.project_path / dir_name
-            if dir_path.exists():
-                self._scan_directory(dir_path)
-
-    def _scan_directory(self, directory: Path):
-        """Recursively scan a directory for components."""
-        component_extensions = {".tsx", ".jsx", ".ts", ".js"}
-
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix in component_extensions:
-                component_info = self._analyze_component(file_path)
+            for node in graph.nodes_under([dir_name]):
+                component_info = self._component_info(node)
                 if component_info:
                     self.components[component_info.name] = component_info
                     self._extract_relationships(component_info)
 
-    def _analyze_component(self, file_path: Path) -> Optional[ComponentInfo]:
-        """Analyze a single component file."""
-        try:
-            content = file_path.read_text()
-
-            # Skip test files and stories
-            if ".test." in file_path.name or ".stories." in file_path.name:
-                return None
-
-            # Extract component name
-            component_name = self._extract_component_name(content, file_path)
-            if not component_name:
-                return None
-
-            # Determine component type
-            component_type = self._determine_component_type(file_path)
-
-            # Extract various aspects
-            imports = self._extract_imports(content)
-            exports = self._extract_exports(content)
-            props = self._extract_props(content)
-            hooks = self._extract_hooks(content)
-            context_usage = self._extract_context_usage(content)
-            children = self._extract_children_components(content, imports)
-
-            return ComponentInfo(
-                name=component_name,
-                path=str(file_path.relative_to(self.project_path)),
-                type=component_type,
-                imports=imports,
-                exports=exports,
-                props=props,
-                state_hooks=hooks,
-                context_usage=context_usage,
-                children_components=children,
-            )
-        except Exception as e:
-            print(f"Error analyzing {file_path}: {e}")
+    def _component_info(self, node: ComponentNode) -> Optional[ComponentInfo]:
+        """Build relationship info for a parsed source file."""
+        # Skip test files and stories
+        file_name = node.rel_path.rsplit("/", 1)[-1]
+        if ".test." in file_name or ".stories." in file_name:
             return None
 
-    def _extract_component_name(self, content: str, file_path: Path) -> Optional[str]:
-        """Extract the main component name from the file."""
-        # Try to find default export
-        default_export = re.search(r"export\s+default\s+(?:function\s+)?(\w+)", content)
-        if default_export:
-            return default_export.group(1)
-
-        # Try to find named component export
-        named_export = re.search(r"export\s+(?:const|function)\s+(\w+)", content)
-        if named_export:
-            return named_export.group(1)
+        # Exported name, falling back to the file name
+        component_name = node.name or (node.stem if node.stem not in ["index", "Index"] else None)
+        if not component_name:
+            return None
 
-        # Fall back to filename
-        return file_path.stem if file_path.stem not in ["index", "Index"] else None
+        return ComponentInfo(
+            name=component_name,
+            path=node.rel_path.replace("/", os.sep),
+            type=self._determine_component_type(self.project_path / node.rel_path),
+            imports=node.relative_imports,
+            exports=list(node.exports),
+            props=node.prop_names,
+            state_hooks=list(node.hooks),
+            context_usage=list(node.contexts),
+            children_components=list(node.rendered),
+        )
 
     def _determine_component_type(self, file_path: Path) -> str:
         """Determine the type of component based on its location."""
@@ -173,115 +135,6 @@ class ComponentRelationshipEngine:
         else:
             return "component"
 
-    def _extract_imports(self, content: str) -> List[str]:
-        """Extract all imports from the component."""
-        imports = []
-        import_pattern = r"import\s+(?:{[^}]+}|[\w\s,]+)\s+from\s+['\"]([^'\"]+)['\"]"
-
-        for match in re.finditer(import_pattern, content):
-            import_path = match.group(1)
-            # Focus on relative imports (project components)
-            if import_path.startswith("."):
-                imports.append(import_path)
-
-        return imports
-
-    def _extract_exports(self, content: str) -> List[str]:
-        """Extract all exports from the component."""
-        exports = []
-
-        # Default export
-        if "export default" in content:
-            exports.append("default")
-
-        # Named exports
-        named_exports = re.findall(
-            r"export\s+(?:const|function|class)\s+(\w+)", content
-        )
-        exports.extend(named_exports)
-
-        # Re-exports
-        reexports = re.findall(r"export\s+{([^}]+)}", content)
-        for reexport in reexports:
-            exports.extend([e.strip() for e in reexport.split(",")])
-
-        return list(set(exports))
-
-    def _extract_props(self, content: str) -> List[str]:
-        """Extract prop names from the component."""
-        props = []
-
-        # TypeScript interface
-        interface_match = re.search(
-            r"interface\s+\w*Props\s*{([^}]+)}", content, re.DOTALL
-        )
-        if interface_match:
-            prop_content = interface_match.group(1)
-            prop_names = re.findall(r"^\s*(\w+)\s*[?:]", prop_content, re.MULTILINE)
-            props.extend(prop_names)
-
-        # Type alias
-        type_match = re.search(r"type\s+\w*Props\s*=\s*{([^}]+)}", content, re.DOTALL)
-        if type_match:
-            prop_content = type_match.group(1)
-            prop_names = re.findall(r"^\s*(\w+)\s*[?:]", prop_content, re.MULTILINE)
-            props.extend(prop_names)
-
-        # Destructured props in function
-        destructure_match = re.search(
-            r"(?:function|const)\s+\w+\s*\(\s*{\s*([^}]+)\s*}", content
-        )
-        if destructure_match:
-            prop_names = [
-                p.strip().split(":")[0] for p in destructure_match.group(1).split(",")
-            ]
-            props.extend(prop_names)
-
-        return list(set(props))
-
-    def _extract_hooks(self, content: str) -> List[str]:
-        """Extract React hooks used in the component."""
-        hooks = []
-        hook_pattern = r"(use\w+)\s*\("
-
-        for match in re.finditer(hook_pattern, content):
-            hook_name = match.group(1)
-            hooks.append(hook_name)
-
-        return list(set(hooks))
-
-    def _extract_context_usage(self, content: str) -> List[str]:
-        """Extract React context usage."""
-        contexts = []
-
-        # useContext usage
-        context_pattern = r"useContext\s*\(\s*(\w+)\s*\)"
-        for match in re.finditer(context_pattern, content):
-            contexts.append(match.group(1))
-
-        # Context.Consumer pattern
-        consumer_pattern = r"(\w+)\.Consumer"
-        for match in re.finditer(consumer_pattern, content):
-            contexts.append(match.group(1))
-
-        return list(set(contexts))
-
-    def _extract_children_components(
-        self, content: str, imports: List[str]
-    ) -> List[str]:
-        """Extract components used as children."""
-        children = []
-
-        # Look for JSX component usage
-        jsx_pattern = r"<(\w+)[\s/>]"
-        for match in re.finditer(jsx_pattern, content):
-            component = match.group(1)
-            # Filter out HTML elements
-            if component[0].isupper():
-                children.append(component)
-
-        return list(set(children))
-
     def _extract_relationships(self, component: ComponentInfo):
         """Extract relationships from component information."""
         # Parent-child relationships from imports and usage
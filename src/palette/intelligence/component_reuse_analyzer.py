@@ -4,15 +4,19 @@ Analyzes existing project components to determine reuse opportunities before gen
 """
 
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 import json
 import difflib
 
+from ..analysis.component_graph import get_component_graph
 from ..errors.decorators import handle_errors
 from .component_mapper import ComponentRelationshipEngine, ComponentInfo
+from .reuse_index import ComponentReuseIndex, tokenize_name
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -79,19 +83,43 @@ class ReuseAnalysisResult:
     reasoning: str = ""                  # Why this recommendation was made
 
 
+# Most the library-aware scoring can add to a base confidence
+# (0.5 * semantic 0.25 + 0.3 * structural 0.35 + 0.2 * API 0.4)
+MAX_LIBRARY_BONUS = 0.5 * 0.25 + 0.3 * 0.35 + 0.2 * 0.4
+
+# Prompts whose base confidences are kept (concurrent steps score different prompts)
+BASE_SCORE_CACHE_SIZE = 8
+
+
 class ComponentReuseAnalyzer:
     """
     Intelligent component reuse analyzer that determines the best strategy
     for leveraging existing components before generating new ones.
     Enhanced with MCP UI library integration for library-aware component matching.
+    
+    Candidates are ranked on a precomputed ``ComponentReuseIndex``; only the
+    shortlist that can still reach a threshold gets library-aware scoring.
     """
     
+    # Component name tokens commonly composed with each primary type
+    RELATED_TYPES = {
+        'button': ['form', 'modal', 'card'],
+        'form': ['input', 'button', 'validation'],
+        'card': ['button', 'image', 'text'],
+        'modal': ['button', 'form', 'overlay'],
+        'navigation': ['link', 'dropdown', 'logo'],
+    }
+    
     def __init__(self, project_path: str = "."):
         self.project_path = Path(project_path)
         
         # Initialize existing systems
         self.component_mapper = ComponentRelationshipEngine(str(project_path))
-        self.search_index = self._initialize_search_index()
+        self._search_index = None
+        # Analyses may run concurrently on worker threads (multi-step
+        # generation), so lazily built state is guarded
+        self._lock = threading.Lock()
+        self._base_scores: "OrderedDict[Tuple[str, bool], List[float]]" = OrderedDict()
         
         # Initialize MCP UI library integration
         self.library_manager = None
@@ -101,8 +129,8 @@ class ComponentReuseAnalyzer:
         # Initialize MCP integration lazily
         self._init_mcp_integration(str(project_path))
         
-        # Build search index from discovered components
-        self._build_search_index()
+        # Build reuse index from discovered components
+        self.reuse_index = self._build_reuse_index()
         
         # Initialize intent analysis patterns
         self._initialize_intent_patterns()
@@ -129,6 +157,30 @@ class ComponentReuseAnalyzer:
             print(f"⚠️ MCP integration unavailable: {e}")
             self.library_manager = None
     
+    @property
+    def search_index(self):
+        """RAG search index over component sources, built on first use."""
+        if self._search_index is None:
+            with self._lock:
+                if self._search_index is None:
+                    # Published only once fully built
+                    index = self._initialize_search_index()
+                    self._search_index = self._build_search_index(index)
+        return self._search_index
+    
+    def _build_reuse_index(self) -> ComponentReuseIndex:
+        """Index components with styling classes from the shared component graph."""
+        styling = {}
+        try:
+            graph = get_component_graph(str(self.project_path))
+            for name, component in self.component_mapper.components.items():
+                node = graph.get(Path(component.path).as_posix())
+                if node is not None:
+                    styling[name] = node.styling.get("tailwind_classes", [])
+        except Exception as e:
+            print(f"Warning: Component styling unavailable for reuse index: {e}")
+        return ComponentReuseIndex(self.component_mapper.components, styling, self.project_path)
+    
     def _initialize_search_index(self):
         """Initialize search index with lazy import to avoid circular dependency."""
         try:
@@ -148,32 +200,37 @@ class ComponentReuseAnalyzer:
             print("🎯 Initializing UI library context for component reuse analysis...")
             
             # Detect project UI library
-            self.detected_library = await self.library_manager.detect_project_ui_library()
+            detected_library = await self.library_manager.detect_project_ui_library()
             
-            if self.detected_library:
-                print(f"   Detected UI library: {self.detected_library.value}")
+            if detected_library:
+                print(f"   Detected UI library: {detected_library.value}")
                 
                 # Get library context
-                self.library_context = await self.library_manager.get_library_context(self.detected_library)
+                library_context = await self.library_manager.get_library_context(detected_library)
                 
-                if self.library_context:
-                    print(f"   Loaded {len(self.library_context.components)} library components")
-                    print(f"   Available design tokens: {list(self.library_context.design_tokens.keys())[:5]}")
+                if library_context:
+                    print(f"   Loaded {len(library_context.components)} library components")
+                    print(f"   Available design tokens: {list(library_context.design_tokens.keys())[:5]}")
                 else:
                     print("   Warning: Could not load library context")
+                
+                # Context first: concurrent analyses skip initialization as soon
+                # as detected_library is set, and must then see the context
+                self.library_context = library_context
+                self.detected_library = detected_library
             else:
                 print("   No specific UI library detected - using generic analysis")
         
         except Exception as e:
             print(f"   Warning: Library context initialization failed: {e}")
     
-    def _build_search_index(self):
-        """Build searchable index from existing components."""
-        if isinstance(self.search_index, dict):
+    def _build_search_index(self, index):
+        """Fill a searchable index with existing components and return it."""
+        if isinstance(index, dict):
             # Simple fallback indexing
             for name, component in self.component_mapper.components.items():
-                self.search_index[name] = component
-            return
+                index[name] = component
+            return index
         
         # Full enhanced indexing
         try:
@@ -181,12 +238,9 @@ class ComponentReuseAnalyzer:
             
             for name, component in self.component_mapper.components.items():
                 try:
-                    # Read component source code
-                    component_path = self.project_path / component.path
-                    if component_path.exists():
-                        with open(component_path, 'r', encoding='utf-8') as f:
-                            source_code = f.read()
-                        
+                    # Component source code (read once, shared with scoring)
+                    source_code = self.reuse_index.source(name)
+                    if source_code:
                         # Create ComponentExample for search index
                         example = ComponentExample(
                             name=component.name,
@@ -197,13 +251,15 @@ class ComponentReuseAnalyzer:
                             complexity_score=self._calculate_complexity(source_code)
                         )
                         
-                        self.search_index.add_component(example)
+                        index.add_component(example)
                 except Exception as e:
                     print(f"Warning: Could not index component {name}: {e}")
         except ImportError:
             # Fallback to simple indexing
+            index = {}
             for name, component in self.component_mapper.components.items():
-                self.search_index[name] = component
+                index[name] = component
+        return index
     
     def _initialize_intent_patterns(self):
         """Initialize patterns for understanding user intent."""
@@ -256,9 +312,7 @@ class ComponentReuseAnalyzer:
     
     def _tokenize_name(self, name: str) -> List[str]:
         """Tokenize component name into meaningful parts."""
-        # Split camelCase and PascalCase
-        tokens = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\b)', name)
-        return [token.lower() for token in tokens]
+        return tokenize_name(name)
     
     def _extract_styling_patterns(self, source_code: str) -> List[str]:
         """Extract styling patterns from component source code."""
@@ -427,37 +481,31 @@ class ComponentReuseAnalyzer:
         if not primary_type:
             return matches
         
-        # Look for components with matching names and purposes
-        for name, component in self.component_mapper.components.items():
-            name_tokens = self._tokenize_name(component.name)
+        # Components whose name contains the primary type or one of its keywords
+        candidates = self.reuse_index.lookup([primary_type, *self.intent_keywords[primary_type]])
+        
+        # High threshold for exact matches
+        for i, semantic_sim, structural_sim, api_sim, overall_confidence in await self._score_candidates(
+            candidates, user_prompt, intent, low=0.85, high=None, limit=3
+        ):
+            component = self.reuse_index.components[i]
             
-            # Check if component name contains the primary type
-            if primary_type in name_tokens or any(kw in name_tokens for kw in self.intent_keywords[primary_type]):
-                
-                # Calculate similarity scores
-                semantic_sim = await self._calculate_enhanced_semantic_similarity(user_prompt, component)
-                structural_sim = await self._calculate_enhanced_structural_similarity(intent, component)
-                api_sim = await self._calculate_enhanced_api_compatibility(intent, component)
-                
-                overall_confidence = (semantic_sim * 0.5 + structural_sim * 0.3 + api_sim * 0.2)
-                
-                if overall_confidence >= 0.85:  # High threshold for exact matches
-                    # Check for associated UI library component
-                    library_component, library_context_info = await self._get_library_component_match(component, primary_type)
-                    
-                    match = ComponentMatch(
-                        component=component,
-                        match_type=ReuseOpportunityType.EXACT_MATCH,
-                        confidence=overall_confidence,
-                        semantic_similarity=semantic_sim,
-                        structural_similarity=structural_sim,
-                        api_compatibility=api_sim,
-                        reasoning=f"Component '{component.name}' appears to be an exact match for {primary_type}",
-                        usage_example=await self._generate_enhanced_usage_example(component, intent),
-                        library_component=library_component,
-                        library_context=library_context_info
-                    )
-                    matches.append(match)
+            # Check for associated UI library component
+            library_component, library_context_info = await self._get_library_component_match(component, primary_type)
+            
+            match = ComponentMatch(
+                component=component,
+                match_type=ReuseOpportunityType.EXACT_MATCH,
+                confidence=overall_confidence,
+                semantic_similarity=semantic_sim,
+                structural_similarity=structural_sim,
+                api_compatibility=api_sim,
+                reasoning=f"Component '{component.name}' appears to be an exact match for {primary_type}",
+                usage_example=await self._generate_enhanced_usage_example(component, intent),
+                library_component=library_component,
+                library_context=library_context_info
+            )
+            matches.append(match)
         
         # Sort by confidence
         matches.sort(key=lambda m: m.confidence, reverse=True)
@@ -467,32 +515,28 @@ class ComponentReuseAnalyzer:
         """Find components that are close matches with minor differences."""
         matches = []
         
-        for name, component in self.component_mapper.components.items():
-            semantic_sim = await self._calculate_enhanced_semantic_similarity(user_prompt, component)
-            structural_sim = await self._calculate_enhanced_structural_similarity(intent, component)
-            api_sim = await self._calculate_enhanced_api_compatibility(intent, component)
+        # Close matches are between 0.65 and 0.85 confidence
+        for i, semantic_sim, structural_sim, api_sim, overall_confidence in await self._score_candidates(
+            range(len(self.reuse_index)), user_prompt, intent, low=0.65, high=0.85, limit=5
+        ):
+            component = self.reuse_index.components[i]
+            modifications = await self._identify_library_aware_modifications(intent, component)
+            library_component, library_context_info = await self._get_library_component_match(component, intent.get('primary_component_type'))
             
-            overall_confidence = (semantic_sim * 0.5 + structural_sim * 0.3 + api_sim * 0.2)
-            
-            # Close matches are between 0.65 and 0.85 confidence
-            if 0.65 <= overall_confidence < 0.85:
-                modifications = await self._identify_library_aware_modifications(intent, component)
-                library_component, library_context_info = await self._get_library_component_match(component, intent.get('primary_component_type'))
-                
-                match = ComponentMatch(
-                    component=component,
-                    match_type=ReuseOpportunityType.CLOSE_MATCH,
-                    confidence=overall_confidence,
-                    semantic_similarity=semantic_sim,
-                    structural_similarity=structural_sim,
-                    api_compatibility=api_sim,
-                    reasoning=f"Component '{component.name}' is similar but may need minor modifications",
-                    modifications_needed=modifications,
-                    usage_example=await self._generate_enhanced_usage_example(component, intent),
-                    library_component=library_component,
-                    library_context=library_context_info
-                )
-                matches.append(match)
+            match = ComponentMatch(
+                component=component,
+                match_type=ReuseOpportunityType.CLOSE_MATCH,
+                confidence=overall_confidence,
+                semantic_similarity=semantic_sim,
+                structural_similarity=structural_sim,
+                api_compatibility=api_sim,
+                reasoning=f"Component '{component.name}' is similar but may need minor modifications",
+                modifications_needed=modifications,
+                usage_example=await self._generate_enhanced_usage_example(component, intent),
+                library_component=library_component,
+                library_context=library_context_info
+            )
+            matches.append(match)
         
         matches.sort(key=lambda m: m.confidence, reverse=True)
         return matches[:5]  # Return top 5 close matches
@@ -507,11 +551,10 @@ class ComponentReuseAnalyzer:
             return opportunities
         
         # Find components that are commonly used together
-        related_components = []
-        for name, component in self.component_mapper.components.items():
-            # Check if this component is commonly used with the primary type
-            if self._are_components_related(primary_type, component):
-                related_components.append(component)
+        related_components = [
+            self.reuse_index.components[i]
+            for i in self.reuse_index.lookup(self.RELATED_TYPES.get(primary_type, []))
+        ]
         
         # Generate composition opportunities
         if len(related_components) >= 2:
@@ -544,8 +587,9 @@ class ComponentReuseAnalyzer:
         """Find components that could be extended or modified."""
         matches = []
         
-        for name, component in self.component_mapper.components.items():
-            semantic_sim = self._calculate_semantic_similarity(user_prompt, component)
+        semantic_scores = self.reuse_index.semantic_scores(user_prompt)
+        for i, component in enumerate(self.reuse_index.components):
+            semantic_sim = float(semantic_scores[i])
             
             # Extension opportunities are components with moderate similarity
             # that could be enhanced to meet the request
@@ -574,8 +618,11 @@ class ComponentReuseAnalyzer:
         matches = []
         
         # Find components with similar patterns even if not directly reusable
-        for name, component in self.component_mapper.components.items():
-            pattern_sim = self._calculate_pattern_similarity(intent, component)
+        pattern_scores = self.reuse_index.pattern_scores(
+            bool(intent.get('interaction_patterns')), len(intent.get('features', []))
+        )
+        for i, component in enumerate(self.reuse_index.components):
+            pattern_sim = float(pattern_scores[i])
             
             if pattern_sim >= 0.4:
                 match = ComponentMatch(
@@ -593,6 +640,80 @@ class ComponentReuseAnalyzer:
         matches.sort(key=lambda m: m.confidence, reverse=True)
         return matches[:5]  # Return top 5 pattern references
     
+    def _base_confidences(self, user_prompt: str, intent: Dict[str, Any]):
+        """Base (library-independent) confidence of every indexed component."""
+        key = (user_prompt, bool(intent.get('interaction_patterns')))
+        with self._lock:
+            confidences = self._base_scores.get(key)
+            if confidences is not None:
+                self._base_scores.move_to_end(key)
+                return confidences
+        
+        index = self.reuse_index
+        semantic = index.semantic_scores(user_prompt)
+        structural = index.structural_scores(key[1])
+        api = index.api_scores()
+        confidences = [
+            float(semantic[i]) * 0.5 + float(structural[i]) * 0.3 + float(api[i]) * 0.2
+            for i in range(len(index))
+        ]
+        
+        with self._lock:
+            self._base_scores[key] = confidences
+            while len(self._base_scores) > BASE_SCORE_CACHE_SIZE:
+                self._base_scores.popitem(last=False)
+        return confidences
+    
+    async def _score_candidates(
+        self,
+        positions: Iterable[int],
+        user_prompt: str,
+        intent: Dict[str, Any],
+        low: float,
+        high: Optional[float],
+        limit: int,
+    ) -> List[Tuple[int, float, float, float, float]]:
+        """
+        Library-aware scores of the best candidates with confidence in [low, high).
+        
+        Library-aware scoring only ever adds to the base confidence, by at most
+        MAX_LIBRARY_BONUS, so candidates whose base score is already too high or
+        whose upper bound is too low are skipped, and scoring stops once the
+        remaining upper bounds cannot beat the current top ``limit``.
+        
+        Returns:
+            (position, semantic, structural, api, confidence) tuples, best first
+        """
+        base = self._base_confidences(user_prompt, intent)
+        bonus = MAX_LIBRARY_BONUS if self.library_context else 0.0
+        epsilon = 1e-9
+        
+        shortlist = [
+            i for i in positions
+            if base[i] + bonus + epsilon >= low and (high is None or base[i] < high + epsilon)
+        ]
+        shortlist.sort(key=lambda i: -base[i])
+        
+        scored: List[Tuple[int, float, float, float, float]] = []
+        for i in shortlist:
+            if len(scored) >= limit:
+                kth_best = sorted((s[4] for s in scored), reverse=True)[limit - 1]
+                if base[i] + bonus + epsilon < kth_best:
+                    break
+            
+            component = self.reuse_index.components[i]
+            semantic_sim = await self._calculate_enhanced_semantic_similarity(user_prompt, component)
+            structural_sim = await self._calculate_enhanced_structural_similarity(intent, component)
+            api_sim = await self._calculate_enhanced_api_compatibility(intent, component)
+            
+            overall_confidence = (semantic_sim * 0.5 + structural_sim * 0.3 + api_sim * 0.2)
+            if overall_confidence >= low and (high is None or overall_confidence < high):
+                scored.append((i, semantic_sim, structural_sim, api_sim, overall_confidence))
+        
+        # Ties keep component discovery order
+        scored.sort(key=lambda s: (-s[4], s[0]))
+        return scored[:limit]
+    
     def _calculate_semantic_similarity(self, user_prompt: str, component: ComponentInfo) -> float:
         """Calculate semantic similarity between user request and component."""
         prompt_words = set(re.findall(r'\w+', user_prompt.lower()))
@@ -644,16 +765,7 @@ class ComponentReuseAnalyzer:
     
     def _are_components_related(self, primary_type: str, component: ComponentInfo) -> bool:
         """Check if a component is related to the primary type."""
-        # Define common relationships
-        relationships = {
-            'button': ['form', 'modal', 'card'],
-            'form': ['input', 'button', 'validation'],
-            'card': ['button', 'image', 'text'],
-            'modal': ['button', 'form', 'overlay'],
-            'navigation': ['link', 'dropdown', 'logo'],
-        }
-        
-        related_types = relationships.get(primary_type, [])
+        related_types = self.RELATED_TYPES.get(primary_type, [])
         component_tokens = self._tokenize_name(component.name)
         
         return any(rel_type in component_tokens for rel_type in related_types)
@@ -1032,16 +1144,8 @@ const Enhanced{component.name} = (props) => {{
             if hasattr(component, 'source_code'):
                 source_code = component.source_code
             else:
-                # Try to read source code
-                try:
-                    component_path = self.project_path / component.path
-                    if component_path.exists():
-                        with open(component_path, 'r', encoding='utf-8') as f:
-                            source_code = f.read()
-                    else:
-                        source_code = ""
-                except:
-                    source_code = ""
+                # Source is read once per component and shared across prompts
+                source_code = self.reuse_index.source(component.name)
             
             # Check for library-specific imports
             if self.detected_library and hasattr(self.detected_library, 'value'):
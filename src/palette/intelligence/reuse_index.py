@@ -0,0 +1,164 @@
+"""
+Precomputed search index for ComponentReuseAnalyzer.
+
+Built once per analyzer from the components the relationship engine found:
+
+- an inverted index from tokens (name parts, prop words, styling classes,
+  component type) to component positions, for keyword candidate lookups
+- per-component count arrays that, together with the posting lists of the
+  prompt's words, score the base semantic/structural/API similarities of
+  *every* component against a prompt in a handful of vectorized operations
+
+Only the shortlist that can still reach a threshold is then handed to the
+analyzer's expensive, library-aware scoring.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def tokenize_name(name: str) -> List[str]:
+    """Split camelCase/PascalCase names into lower-case parts."""
+    tokens = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\b)', name)
+    return [token.lower() for token in tokens]
+
+
+def prompt_words(prompt: str) -> Set[str]:
+    return set(re.findall(r'\w+', prompt.lower()))
+
+
+class ComponentReuseIndex:
+    """Token inverted index and feature arrays over project components."""
+
+    def __init__(self, components: Dict[str, object], styling: Optional[Dict[str, Iterable[str]]] = None, project_path: Optional[Path] = None):
+        """
+        Args:
+            components: Component name -> ComponentInfo (relationship engine order)
+            styling: Optional component name -> styling classes
+            project_path: Project root, for reading sources of shortlisted components
+        """
+        self.project_path = project_path
+        self.names: List[str] = list(components)
+        self.components = [components[name] for name in self.names]
+        self.position: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        self.name_tokens: List[Set[str]] = [set(tokenize_name(c.name)) for c in self.components]
+        self.prop_words: List[Set[str]] = [
+            {word.lower() for prop in c.props for word in re.findall(r'\w+', prop)}
+            for c in self.components
+        ]
+        self.types: List[str] = [c.type for c in self.components]
+        self.prop_counts: List[int] = [len(c.props) for c in self.components]
+        self.hook_counts: List[int] = [len(c.state_hooks) for c in self.components]
+
+        # Inverted index: "name:card", "prop:onclick", "style:p-4", "type:page"
+        self.postings: Dict[str, List[int]] = {}
+        for i, component in enumerate(self.components):
+            tokens = {f"name:{t}" for t in self.name_tokens[i]}
+            tokens |= {f"prop:{w}" for w in self.prop_words[i]}
+            tokens |= {f"style:{s}" for s in (styling or {}).get(self.names[i], ())}
+            tokens.add(f"type:{self.types[i]}")
+            for token in tokens:
+                self.postings.setdefault(token, []).append(i)
+
+        self._sources: Dict[str, str] = {}
+        self._build_arrays()
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def lookup(self, tokens: Iterable[str], field: str = "name") -> List[int]:
+        """Positions of components having any of the tokens in a field, in index order."""
+        positions: Set[int] = set()
+        for token in tokens:
+            positions.update(self.postings.get(f"{field}:{token}", ()))
+        return sorted(positions)
+
+    def source(self, name: str) -> str:
+        """Source code of a component, read once ('' if unavailable)."""
+        if name not in self._sources:
+            source = ""
+            component = self.components[self.position[name]] if name in self.position else None
+            if component is not None and self.project_path is not None:
+                try:
+                    source = (self.project_path / component.path).read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    source = ""
+            self._sources[name] = source
+        return self._sources[name]
+
+    def semantic_scores(self, prompt: str) -> Sequence[float]:
+        """
+        Base semantic similarity of every component to the prompt.
+
+        Same formula as ``ComponentReuseAnalyzer._calculate_semantic_similarity``:
+        0.6 * name overlap + 0.3 * prop overlap + 0.1 * type mention.
+        """
+        words = prompt_words(prompt)
+        prompt_lower = prompt.lower()
+        n_words = len(words)
+
+        if NUMPY_AVAILABLE and len(self):
+            # Only the components sharing a prompt word are touched
+            name_hits = np.zeros(len(self), dtype=np.float64)
+            prop_hits = np.zeros(len(self), dtype=np.float64)
+            for word in words:
+                name_hits[self.postings.get(f"name:{word}", [])] += 1.0
+                prop_hits[self.postings.get(f"prop:{word}", [])] += 1.0
+            name_overlap = name_hits / np.maximum(np.maximum(self.name_token_counts, n_words), 1)
+            prop_overlap = prop_hits / max(n_words, 1)
+            type_similarity = np.array(
+                [0.5 if t in prompt_lower else 0.0 for t in self.unique_types], dtype=np.float64
+            )[self.type_ids]
+            return name_overlap * 0.6 + prop_overlap * 0.3 + type_similarity * 0.1
+
+        scores = []
+        for i in range(len(self)):
+            name_overlap = len(words & self.name_tokens[i]) / max(n_words, len(self.name_tokens[i]), 1)
+            prop_overlap = len(words & self.prop_words[i]) / max(n_words, 1)
+            type_similarity = 0.5 if self.types[i] in prompt_lower else 0.0
+            scores.append(name_overlap * 0.6 + prop_overlap * 0.3 + type_similarity * 0.1)
+        return scores
+
+    def structural_scores(self, interactive: bool) -> Sequence[float]:
+        """Base structural similarity (interactive prompts favor stateful components)."""
+        if NUMPY_AVAILABLE and len(self):
+            return np.where((self.hook_count_array > 0) & interactive, 0.3, 0.0)
+        return [0.3 if interactive and hooks else 0.0 for hooks in self.hook_counts]
+
+    def api_scores(self) -> Sequence[float]:
+        """Base API compatibility from prop counts."""
+        return self._api_scores
+
+    def pattern_scores(self, interactive: bool, feature_count: int) -> Sequence[float]:
+        """Pattern similarity from hook usage and prop/hook complexity."""
+        if NUMPY_AVAILABLE and len(self):
+            hooks = (self.hook_count_array > 0) & interactive
+            complexity = self.prop_count_array + self.hook_count_array
+            return np.where(hooks, 0.3, 0.0) + np.where(np.abs(feature_count - complexity) <= 2, 0.2, 0.0)
+        return [
+            (0.3 if interactive and hooks else 0.0)
+            + (0.2 if abs(feature_count - (props + hooks)) <= 2 else 0.0)
+            for props, hooks in zip(self.prop_counts, self.hook_counts)
+        ]
+
+    def _build_arrays(self):
+        api = [0.8 if 2 <= n <= 8 else 0.6 if n <= 2 else 0.4 for n in self.prop_counts]
+        if not NUMPY_AVAILABLE:
+            self._api_scores = api
+            return
+
+        self.name_token_counts = np.array([len(t) for t in self.name_tokens], dtype=np.float64)
+        self.prop_count_array = np.array(self.prop_counts, dtype=np.int32)
+        self.hook_count_array = np.array(self.hook_counts, dtype=np.int32)
+        self.unique_types = sorted(set(self.types))
+        type_positions = {t: i for i, t in enumerate(self.unique_types)}
+        self.type_ids = np.array([type_positions[t] for t in self.types], dtype=np.int32)
+        self._api_scores = np.array(api, dtype=np.float64)
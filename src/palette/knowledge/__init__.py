@@ -4,12 +4,18 @@ Supports both local knowledge base and OpenAI File Search.
 """
 
 from .file_search import PaletteKnowledgeBase, KnowledgeEnhancedGenerator
-from .local_knowledge import LocalKnowledgeBase, LocalKnowledgeEnhancedGenerator, HAS_LOCAL_KNOWLEDGE
+from .local_knowledge import (
+    LocalKnowledgeBase,
+    LocalKnowledgeEnhancedGenerator,
+    HAS_LOCAL_KNOWLEDGE,
+    preload_embedding_model,
+)
 
 __all__ = [
     'PaletteKnowledgeBase', 
     'KnowledgeEnhancedGenerator',
     'LocalKnowledgeBase',
     'LocalKnowledgeEnhancedGenerator',
-    'HAS_LOCAL_KNOWLEDGE'
+    'HAS_LOCAL_KNOWLEDGE',
+    'preload_embedding_model'
 ]
\ No newline at end of file
@@ -1,20 +1,34 @@
 """
 Local knowledge base using sentence transformers and FAISS for semantic search.
 No API calls, no rate limits, fast local computation.
+
+The embedding model (and sentence_transformers/torch itself) is only loaded
+when something actually needs encoding; query embeddings are cached in
+memory and on disk, so repeated searches never touch the model.
 """
 
+import atexit
+import hashlib
+import importlib.util
 import json
+import math
+import os
 import pickle
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
 from pathlib import Path
 
+from ..cache import MemoryCache, SQLiteCache
+
 # Try to import dependencies, with graceful fallback
 try:
     import numpy as np
-    from sentence_transformers import SentenceTransformer
     import faiss
-    HAS_LOCAL_KNOWLEDGE = True
+    # Imported on first model load; importing torch alone takes seconds
+    HAS_LOCAL_KNOWLEDGE = importlib.util.find_spec("sentence_transformers") is not None
 except ImportError:
     HAS_LOCAL_KNOWLEDGE = False
     # Create mock numpy for graceful fallback
@@ -25,45 +39,157 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Process-wide models, shared by every knowledge base
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def load_embedding_model(model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """SentenceTransformer for a model name, loaded once per process."""
+    with _models_lock:
+        model = _models.get(model_name)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            print(f"Info: Loading embedding model {model_name}")
+            model = SentenceTransformer(model_name)
+            _models[model_name] = model
+        return model
+
+
+def preload_embedding_model(model_name: str = DEFAULT_EMBEDDING_MODEL) -> Optional[threading.Thread]:
+    """Load the embedding model in a background thread (e.g. at server start)."""
+    if not HAS_LOCAL_KNOWLEDGE or model_name in _models:
+        return None
+
+    def load():
+        try:
+            load_embedding_model(model_name)
+        except Exception as e:
+            print(f"Warning: Background embedding model load failed: {e}")
+
+    thread = threading.Thread(target=load, name="palette-embedding-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: case- and whitespace-insensitive."""
+    return " ".join(query.lower().split())
+
+
+def chunk_id_for(text: str, metadata: Dict[str, Any]) -> str:
+    """Stable id for a chunk, so re-adding the same knowledge is an upsert."""
+    payload = json.dumps({"text": text, "metadata": metadata}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _flush_at_exit(knowledge_base_ref: "weakref.ref"):
+    knowledge_base = knowledge_base_ref()
+    if knowledge_base is not None:
+        knowledge_base.flush()
+
 
 class KnowledgeChunk:
     """Represents a chunk of knowledge with metadata."""
     
-    def __init__(self, text: str, metadata: Dict[str, Any]):
+    def __init__(self, text: str, metadata: Dict[str, Any], chunk_id: Optional[str] = None, row: int = -1):
         self.text = text
         self.metadata = metadata
+        self.id = chunk_id or chunk_id_for(text, metadata)
+        # Vector id of the chunk in the FAISS index
+        self.row = row
         self.embedding = None
     
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "id": self.id,
+            "row": self.row,
             "text": self.text,
             "metadata": self.metadata
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'KnowledgeChunk':
-        return cls(data["text"], data["metadata"])
+        return cls(data["text"], data["metadata"], data.get("id"), data.get("row", -1))
 
 
 class LocalKnowledgeBase:
-    """Local semantic search knowledge base using sentence transformers."""
+    """
+    Local semantic search knowledge base using sentence transformers.
+    
+    Chunks are appended to a line-oriented store (``chunks.jsonl``; deletions
+    are tombstone lines) and their embeddings live in a FAISS index keyed by
+    each chunk's row id. The index is checkpointed after
+    ``PALETTE_KNOWLEDGE_CHECKPOINT_ROWS`` changed rows or
+    ``PALETTE_KNOWLEDGE_CHECKPOINT_SECONDS``, on ``flush()``/``close()`` and at
+    exit; rows appended since the last checkpoint are re-indexed from the
+    chunk store on load. Above
+    ``PALETTE_KNOWLEDGE_ANN_THRESHOLD`` vectors the exact ``IndexFlatIP`` is
+    replaced by an ``IndexIVFFlat`` (which, unlike HNSW, supports removal).
+    """
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        cached_queries_only: Optional[bool] = None
+    ):
+        """
+        Args:
+            model_name: SentenceTransformer model used for embeddings
+            cached_queries_only: Serve searches from cached query embeddings
+                only, never loading the model for unseen queries (default
+                ``PALETTE_KNOWLEDGE_CACHED_QUERIES_ONLY``)
+        """
         self.model_name = model_name
-        self.model = None
         self.index = None
         self.chunks: List[KnowledgeChunk] = []
         self.embedding_dim = 384  # Dimension for all-MiniLM-L6-v2
         
+        # Ingestion and ANN settings
+        self.batch_size = _env_int("PALETTE_KNOWLEDGE_BATCH_SIZE", 64)
+        self.ann_threshold = _env_int("PALETTE_KNOWLEDGE_ANN_THRESHOLD", 20000)
+        self.nprobe = _env_int("PALETTE_KNOWLEDGE_NPROBE", 16)
+        self.checkpoint_rows = _env_int("PALETTE_KNOWLEDGE_CHECKPOINT_ROWS", 500)
+        self.checkpoint_seconds = _env_int("PALETTE_KNOWLEDGE_CHECKPOINT_SECONDS", 60)
+        self._unsaved_rows = 0
+        self._last_checkpoint = time.monotonic()
+        if cached_queries_only is None:
+            cached_queries_only = os.getenv("PALETTE_KNOWLEDGE_CACHED_QUERIES_ONLY", "").lower() in ("1", "true", "yes")
+        self.cached_queries_only = cached_queries_only
+        
+        # Row id -> chunk, chunk id -> chunk, and (key, value) -> rows for filters
+        self._by_row: Dict[int, KnowledgeChunk] = {}
+        self._by_id: Dict[str, KnowledgeChunk] = {}
+        self._postings: Dict[Tuple[str, Any], Set[int]] = {}
+        self._next_row = 0
+        self._dead_lines = 0
+        
         # Storage paths
         self.data_dir = Path.home() / ".palette" / "knowledge"
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        self.chunks_file = self.data_dir / "chunks.json"
+        self.chunks_file = self.data_dir / "chunks.jsonl"
+        self.legacy_chunks_file = self.data_dir / "chunks.json"
         self.index_file = self.data_dir / "faiss.index"
+        self.meta_file = self.data_dir / "index_meta.json"
+        
+        # Query embeddings: in-memory LRU in front of a persistent store
+        self.query_cache = MemoryCache(max_size=_env_int("PALETTE_KNOWLEDGE_QUERY_CACHE", 256), default_ttl=None)
+        self._persistent_query_cache: Optional[SQLiteCache] = None
+        self._query_store_failed = False
         
         if HAS_LOCAL_KNOWLEDGE:
             self._initialize()
+            atexit.register(_flush_at_exit, weakref.ref(self))
         else:
             logger.warning("Local knowledge dependencies not installed. Install with: pip install sentence-transformers faiss-cpu")
     
@@ -71,27 +197,15 @@ class LocalKnowledgeBase:
         """Initialize the model and load existing data."""
         try:
             print("🧠 Initializing local knowledge base...")
-            self.model = SentenceTransformer(self.model_name)
-            
-            # Create or load FAISS index
-            if self.index_file.exists():
-                self.index = faiss.read_index(str(self.index_file))
-                print(f"✅ Loaded existing FAISS index with {self.index.ntotal} embeddings")
-            else:
-                self.index = faiss.IndexFlatIP(self.embedding_dim)  # Inner product for cosine similarity
-                print("✅ Created new FAISS index")
             
-            # Load existing chunks
-            if self.chunks_file.exists():
-                with open(self.chunks_file, 'r') as f:
-                    chunks_data = json.load(f)
-                    self.chunks = [KnowledgeChunk.from_dict(chunk) for chunk in chunks_data]
-                print(f"✅ Loaded {len(self.chunks)} knowledge chunks")
+            self._load_chunks()
+            self._load_index()
+            print(f"✅ Loaded {len(self.chunks)} knowledge chunks")
             
             # Initialize with core knowledge if empty
             if len(self.chunks) == 0:
                 self._populate_core_knowledge()
-                
+        
         except Exception as e:
             logger.error(f"Failed to initialize local knowledge base: {e}")
             raise
@@ -143,39 +257,100 @@ class LocalKnowledgeBase:
             }
         ]
         
-        for knowledge in core_knowledge:
-            self.add_knowledge(knowledge["text"], knowledge["metadata"])
+        self.add_knowledge_batch(core_knowledge)
+        self.flush()
         
         print(f"✅ Added {len(core_knowledge)} core knowledge items")
     
-    def add_knowledge(self, text: str, metadata: Dict[str, Any]) -> None:
-        """Add a new piece of knowledge to the base."""
+    def add_knowledge(self, text: str, metadata: Dict[str, Any], chunk_id: Optional[str] = None) -> Optional[str]:
+        """Add (or replace, by id) a single piece of knowledge."""
+        ids = self.add_knowledge_batch([{"text": text, "metadata": metadata, "id": chunk_id}])
+        return ids[0] if ids else None
+    
+    def add_knowledge_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> List[str]:
+        """
+        Add many pieces of knowledge at once.
+        
+        Texts are encoded ``batch_size`` at a time and chunks are appended to
+        the store; the index is checkpointed only once enough changes have
+        accumulated (see the class docstring). Items whose id already exists
+        replace the stored chunk.
+        
+        Args:
+            items: Dicts with ``text``, ``metadata`` and an optional ``id``
+            batch_size: Encoding batch size (default ``PALETTE_KNOWLEDGE_BATCH_SIZE``)
+        
+        Returns:
+            Ids of the added chunks
+        """
         if not HAS_LOCAL_KNOWLEDGE:
             logger.warning("Cannot add knowledge: dependencies not installed")
-            return
+            return []
         
-        chunk = KnowledgeChunk(text, metadata)
+        # Last occurrence of an id within the batch wins
+        pending: Dict[str, KnowledgeChunk] = {}
+        for item in items:
+            metadata = item.get("metadata") or {}
+            chunk = KnowledgeChunk(item["text"], metadata, item.get("id"))
+            pending.pop(chunk.id, None)
+            pending[chunk.id] = chunk
+        if not pending:
+            return []
         
-        # Generate embedding
-        embedding = self.model.encode([text], normalize_embeddings=True)[0]
+        # Upsert: drop previous versions first
+        replaced = [chunk_id for chunk_id in pending if chunk_id in self._by_id]
+        if replaced:
+            self._delete(replaced)
         
-        # Add to FAISS index
-        self.index.add(embedding.reshape(1, -1))
+        chunks = list(pending.values())
+        batch_size = batch_size or self.batch_size
+        with open(self.chunks_file, "a", encoding="utf-8") as f:
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start:start + batch_size]
+                embeddings = self._encode([chunk.text for chunk in batch], batch_size)
+                for chunk in batch:
+                    chunk.row = self._next_row
+                    self._next_row += 1
+                self.index.add_with_ids(embeddings, np.array([c.row for c in batch], dtype="int64"))
+                for chunk in batch:
+                    self._register(chunk)
+                    f.write(json.dumps(chunk.to_dict()) + "\n")
         
-        # Add to chunks list
-        self.chunks.append(chunk)
+        # An IVF rebuild is expensive, so it is saved right away
+        upgraded = self._maybe_upgrade_index()
+        self._record_changes(len(chunks) + len(replaced), force=upgraded)
+        return [chunk.id for chunk in chunks]
+    
+    def delete_knowledge(self, chunk_ids: Iterable[str]) -> int:
+        """Delete chunks by id. Returns the number of chunks removed."""
+        if not HAS_LOCAL_KNOWLEDGE or self.index is None:
+            return 0
         
-        # Save to disk
-        self._save_data()
+        removed = self._delete([chunk_id for chunk_id in chunk_ids if chunk_id in self._by_id])
+        if removed:
+            self._record_changes(removed)
+        return removed
+    
+    def flush(self):
+        """Checkpoint the index if it has changes not yet saved."""
+        if self._unsaved_rows and self.index is not None:
+            self._save_data()
+    
+    def close(self):
+        self.flush()
     
     def search(
-        self, 
-        query: str, 
-        k: int = 5, 
+        self,
+        query: str,
+        k: int = 5,
         filter_metadata: Optional[Dict[str, Any]] = None
     ) -> List[Tuple[KnowledgeChunk, float]]:
         """Search for relevant knowledge chunks."""
-        if not HAS_LOCAL_KNOWLEDGE or not self.model:
+        if not HAS_LOCAL_KNOWLEDGE or self.index is None:
             logger.warning("Local knowledge search not available")
             return []
         
@@ -184,32 +359,158 @@ class LocalKnowledgeBase:
             return []
         
         try:
-            # Generate query embedding
-            query_embedding = self.model.encode([query], normalize_embeddings=True)[0]
+            # Restrict to matching rows before searching, not after
+            allowed = self._filter_rows(filter_metadata)
+            if allowed is not None and not allowed:
+                return []
+            k = min(k, len(allowed) if allowed is not None else len(self.chunks))
             
-            # Search FAISS index
-            scores, indices = self.index.search(query_embedding.reshape(1, -1), min(k * 2, len(self.chunks)))
+            # Cached query embedding, or encode it
+            query_embedding = self.query_embedding(query)
+            if query_embedding is None:
+                logger.info(f"No cached embedding for query, skipping search: {query!r}")
+                return []
+            query_embedding = query_embedding.reshape(1, -1)
             
-            # Get results with scores
-            results = []
-            for score, idx in zip(scores[0], indices[0]):
-                if idx < len(self.chunks):  # Valid index
-                    chunk = self.chunks[idx]
-                    
-                    # Apply metadata filtering
-                    if self._matches_filter(chunk.metadata, filter_metadata):
-                        results.append((chunk, float(score)))
+            results = self._search_rows(query_embedding, k, allowed)
             
             # Sort by score (higher is better for inner product)
             results.sort(key=lambda x: x[1], reverse=True)
             
             # Return top k results
             return results[:k]
-            
+        
         except Exception as e:
             logger.error(f"Search failed: {e}")
             return []
     
+    @property
+    def model(self):
+        """The embedding model, loaded on first access."""
+        return load_embedding_model(self.model_name)
+    
+    @property
+    def model_loaded(self) -> bool:
+        return self.model_name in _models
+    
+    def query_embedding(self, query: str):
+        """
+        Embedding of a search query.
+        
+        Served from the in-memory LRU, then the persistent query cache; only
+        unseen queries load the model (or return None in cached-only mode).
+        """
+        key = f"{self.model_name}:{normalize_query(query)}"
+        embedding = self.query_cache.get(key)
+        if embedding is not None:
+            return embedding
+        
+        persistent = self._query_store()
+        embedding = persistent.get(key) if persistent is not None else None
+        if embedding is None:
+            if self.cached_queries_only and not self.model_loaded:
+                return None
+            embedding = self._encode([query], 1)[0]
+            if persistent is not None:
+                persistent.set(key, embedding)
+        
+        self.query_cache.set(key, embedding)
+        return embedding
+    
+    def precompute_query_embeddings(self, queries: Iterable[str], batch_size: Optional[int] = None) -> int:
+        """Encode and persist embeddings for queries not cached yet. Returns the number encoded."""
+        persistent = self._query_store()
+        if not HAS_LOCAL_KNOWLEDGE or persistent is None:
+            return 0
+        
+        keys = {f"{self.model_name}:{normalize_query(query)}": query for query in queries}
+        missing = [(key, query) for key, query in keys.items() if not persistent.exists(key)]
+        batch_size = batch_size or self.batch_size
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            embeddings = self._encode([query for _, query in batch], batch_size)
+            for (key, _), embedding in zip(batch, embeddings):
+                persistent.set(key, embedding)
+        return len(missing)
+    
+    def _query_store(self) -> Optional[SQLiteCache]:
+        if self._persistent_query_cache is None and not self._query_store_failed:
+            try:
+                self._persistent_query_cache = SQLiteCache(
+                    cache_dir=str(self.data_dir / "query_cache"),
+                    default_ttl=None,
+                    max_bytes=_env_int("PALETTE_KNOWLEDGE_QUERY_CACHE_MB", 16) * 1024 * 1024,
+                )
+            except Exception as e:
+                logger.warning(f"Persistent query cache unavailable: {e}")
+                self._query_store_failed = True
+        return self._persistent_query_cache
+    
+    def _search_rows(
+        self,
+        query_embedding,
+        k: int,
+        allowed: Optional[Set[int]]
+    ) -> List[Tuple[KnowledgeChunk, float]]:
+        """Top-k chunks among the allowed rows (all rows if None)."""
+        if allowed is None:
+            return self._collect(*self._index_search(query_embedding, k))
+        
+        # FAISS >= 1.7.3 can restrict the search to an id subset directly
+        try:
+            ids = np.array(sorted(allowed), dtype="int64")
+            selector = faiss.IDSelectorBatch(len(ids), faiss.swig_ptr(ids))
+            return self._collect(*self._index_search(query_embedding, k, selector), allowed)
+        except (AttributeError, TypeError, RuntimeError):
+            pass
+        
+        # Older FAISS: over-fetch until enough rows pass the filter
+        fetch = k * 2
+        while True:
+            fetch = min(fetch, self.index.ntotal)
+            results = self._collect(*self._index_search(query_embedding, fetch), allowed)
+            if len(results) >= k or fetch >= self.index.ntotal:
+                return results
+            fetch *= 4
+    
+    def _index_search(self, query_embedding, k: int, selector=None):
+        if self._is_ivf():
+            faiss.extract_index_ivf(self.index).nprobe = self.nprobe
+            if selector is not None:
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe)
+                return self.index.search(query_embedding, k, params=params)
+        elif selector is not None:
+            return self.index.search(query_embedding, k, params=faiss.SearchParameters(sel=selector))
+        return self.index.search(query_embedding, k)
+    
+    def _collect(self, scores, rows, allowed: Optional[Set[int]] = None) -> List[Tuple[KnowledgeChunk, float]]:
+        results = []
+        for score, row in zip(scores[0], rows[0]):
+            chunk = self._by_row.get(int(row))  # -1 marks an empty slot
+            if chunk is not None and (allowed is None or chunk.row in allowed):
+                results.append((chunk, float(score)))
+        return results
+    
+    def _filter_rows(self, filter_metadata: Optional[Dict[str, Any]]) -> Optional[Set[int]]:
+        """Rows whose metadata matches the filter, or None when unfiltered."""
+        if not filter_metadata:
+            return None
+        
+        allowed: Optional[Set[int]] = None
+        for key, value in filter_metadata.items():
+            try:
+                rows = self._postings.get((key, value), set())
+            except TypeError:
+                # Unhashable filter value
+                rows = {
+                    chunk.row for chunk in self.chunks
+                    if self._matches_filter(chunk.metadata, {key: value})
+                }
+            allowed = set(rows) if allowed is None else allowed & rows
+            if not allowed:
+                break
+        return allowed
+    
     def _matches_filter(self, metadata: Dict[str, Any], filter_metadata: Optional[Dict[str, Any]]) -> bool:
         """Check if metadata matches the filter criteria."""
         if not filter_metadata:
@@ -221,17 +522,213 @@ class LocalKnowledgeBase:
         
         return True
     
+    def _encode(self, texts: List[str], batch_size: int):
+        embeddings = self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+        return np.asarray(embeddings, dtype="float32").reshape(len(texts), -1)
+    
+    def _register(self, chunk: KnowledgeChunk):
+        self.chunks.append(chunk)
+        self._by_row[chunk.row] = chunk
+        self._by_id[chunk.id] = chunk
+        for key, value in chunk.metadata.items():
+            try:
+                self._postings.setdefault((key, value), set()).add(chunk.row)
+            except TypeError:
+                pass
+    
+    def _unregister(self, chunk: KnowledgeChunk):
+        self._by_row.pop(chunk.row, None)
+        self._by_id.pop(chunk.id, None)
+        for key, value in chunk.metadata.items():
+            try:
+                self._postings.get((key, value), set()).discard(chunk.row)
+            except TypeError:
+                pass
+    
+    def _delete(self, chunk_ids: List[str]) -> int:
+        """Remove chunks from the index and memory and append tombstones."""
+        chunks = [self._by_id[chunk_id] for chunk_id in dict.fromkeys(chunk_ids) if chunk_id in self._by_id]
+        if not chunks:
+            return 0
+        
+        self.index.remove_ids(np.array([chunk.row for chunk in chunks], dtype="int64"))
+        with open(self.chunks_file, "a", encoding="utf-8") as f:
+            for chunk in chunks:
+                self._unregister(chunk)
+                f.write(json.dumps({"id": chunk.id, "row": chunk.row, "deleted": True}) + "\n")
+        
+        removed = {chunk.row for chunk in chunks}
+        self.chunks = [chunk for chunk in self.chunks if chunk.row not in removed]
+        # The chunk line and its tombstone are both dead
+        self._dead_lines += 2 * len(chunks)
+        return len(chunks)
+    
+    def _load_chunks(self):
+        """Replay the chunk store (migrating a legacy ``chunks.json``)."""
+        if not self.chunks_file.exists() and self.legacy_chunks_file.exists():
+            with open(self.legacy_chunks_file, 'r') as f:
+                chunks_data = json.load(f)
+            # Legacy chunks were added to the index in list order
+            for row, data in enumerate(chunks_data):
+                self._register(KnowledgeChunk(data["text"], data["metadata"], row=row))
+            self._next_row = len(chunks_data)
+            self._compact()
+            print(f"✅ Migrated {len(chunks_data)} chunks to {self.chunks_file.name}")
+            return
+        
+        if not self.chunks_file.exists():
+            return
+        
+        live: Dict[str, KnowledgeChunk] = {}
+        total_lines = 0
+        with open(self.chunks_file, 'r', encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                total_lines += 1
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn write from an interrupted append
+                    continue
+                self._next_row = max(self._next_row, data.get("row", -1) + 1)
+                if data.get("deleted"):
+                    live.pop(data["id"], None)
+                else:
+                    live[data["id"]] = KnowledgeChunk.from_dict(data)
+        
+        for chunk in live.values():
+            self._register(chunk)
+        self._dead_lines = total_lines - len(live)
+    
+    def _load_index(self):
+        """Load the FAISS index, catching it up with the chunk store."""
+        meta = {}
+        if self.meta_file.exists():
+            try:
+                meta = json.loads(self.meta_file.read_text())
+            except (OSError, json.JSONDecodeError):
+                meta = {}
+        
+        index = None
+        if self.index_file.exists() and meta.get("model", self.model_name) == self.model_name:
+            try:
+                index = faiss.read_index(str(self.index_file))
+            except Exception as e:
+                logger.warning(f"Could not read FAISS index, rebuilding: {e}")
+        
+        changed = False
+        if index is not None and not meta:
+            if isinstance(index, faiss.IndexFlat):
+                # Legacy positional IndexFlatIP: reuse its vectors under row ids
+                vectors = index.reconstruct_n(0, index.ntotal)
+                index = self._new_flat_index()
+                index.add_with_ids(vectors, np.arange(len(vectors), dtype="int64"))
+                meta = {"next_row": len(vectors)}
+            else:
+                index = None
+            changed = True
+        
+        if index is None:
+            self.index = self._new_flat_index()
+            self._reindex(self.chunks)
+            changed = True
+        else:
+            self.index = index
+            # Rows appended after the last checkpoint
+            checkpoint = meta.get("next_row", 0)
+            missing = [chunk for chunk in self.chunks if chunk.row >= checkpoint]
+            if missing:
+                self._reindex(missing)
+                changed = True
+            # Rows deleted after the last checkpoint
+            covered = sum(1 for row in self._by_row if row < checkpoint)
+            if self.index.ntotal > covered + len(missing):
+                stale = [row for row in range(checkpoint) if row not in self._by_row]
+                self.index.remove_ids(np.array(stale, dtype="int64"))
+                changed = True
+        
+        print(f"✅ Loaded FAISS index with {self.index.ntotal} embeddings")
+        if self._maybe_upgrade_index() or changed:
+            self._save_data()
+    
+    def _reindex(self, chunks: List[KnowledgeChunk]):
+        """(Re-)add chunk embeddings; rows already in the index are replaced."""
+        if chunks and self.index.ntotal:
+            self.index.remove_ids(np.array([c.row for c in chunks], dtype="int64"))
+        for start in range(0, len(chunks), self.batch_size):
+            batch = chunks[start:start + self.batch_size]
+            embeddings = self._encode([chunk.text for chunk in batch], self.batch_size)
+            self.index.add_with_ids(embeddings, np.array([c.row for c in batch], dtype="int64"))
+    
+    def _new_flat_index(self):
+        # Inner product on normalized embeddings is cosine similarity
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_dim))
+    
+    def _is_ivf(self) -> bool:
+        try:
+            faiss.extract_index_ivf(self.index)
+            return True
+        except Exception:
+            return False
+    
+    def _maybe_upgrade_index(self) -> bool:
+        """Switch from exact to IVF search once the index is large."""
+        if self.index.ntotal < self.ann_threshold or self._is_ivf():
+            return False
+        
+        flat = faiss.downcast_index(self.index.index)
+        vectors = flat.reconstruct_n(0, flat.ntotal)
+        rows = faiss.vector_to_array(self.index.id_map).astype("int64")
+        
+        nlist = max(16, min(65536, int(4 * math.sqrt(len(vectors)))))
+        print(f"Info: Building IVF knowledge index ({nlist} lists) for {len(vectors)} embeddings")
+        quantizer = faiss.IndexFlatIP(self.embedding_dim)
+        index = faiss.IndexIVFFlat(quantizer, self.embedding_dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.add_with_ids(vectors, rows)
+        index.nprobe = self.nprobe
+        self.index = index
+        return True
+    
+    def _compact(self):
+        """Rewrite the chunk store with live chunks only."""
+        tmp_file = self.chunks_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            for chunk in self.chunks:
+                f.write(json.dumps(chunk.to_dict()) + "\n")
+        os.replace(tmp_file, self.chunks_file)
+        self._dead_lines = 0
+    
+    def _record_changes(self, rows: int, force: bool = False):
+        """Count changed rows and checkpoint once a row or time threshold is hit."""
+        self._unsaved_rows += rows
+        if (
+            force
+            or self._unsaved_rows >= self.checkpoint_rows
+            or time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds
+        ):
+            self._save_data()
+    
     def _save_data(self):
-        """Save chunks and index to disk."""
+        """Checkpoint the index (and compact the chunk store when mostly dead)."""
+        self._unsaved_rows = 0
+        self._last_checkpoint = time.monotonic()
         try:
-            # Save chunks as JSON
-            chunks_data = [chunk.to_dict() for chunk in self.chunks]
-            with open(self.chunks_file, 'w') as f:
-                json.dump(chunks_data, f, indent=2)
-            
-            # Save FAISS index
-            faiss.write_index(self.index, str(self.index_file))
+            if self._dead_lines > max(1000, len(self.chunks)):
+                self._compact()
             
+            # Save FAISS index, then record which rows it covers
+            tmp_index = self.index_file.with_suffix(".index.tmp")
+            faiss.write_index(self.index, str(tmp_index))
+            os.replace(tmp_index, self.index_file)
+            self.meta_file.write_text(json.dumps({
+                "model": self.model_name,
+                "next_row": self._next_row,
+                "index_type": "ivf" if self._is_ivf() else "flat",
+            }))
+        
         except Exception as e:
             logger.error(f"Failed to save knowledge base: {e}")
     
@@ -263,7 +760,12 @@ class LocalKnowledgeBase:
             "available": True,
             "total_chunks": len(self.chunks),
             "embedding_model": self.model_name,
+            "model_loaded": self.model_loaded,
+            "cached_queries_only": self.cached_queries_only,
+            "query_cache": self.query_cache.get_stats(),
             "embedding_dimension": self.embedding_dim,
+            "index_type": "ivf" if self.index is not None and self._is_ivf() else "flat",
+            "indexed_embeddings": self.index.ntotal if self.index is not None else 0,
             "categories": categories,
             "frameworks": frameworks,
             "topics": topics,
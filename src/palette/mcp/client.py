@@ -1,6 +1,6 @@
 """
 Enhanced MCP (Model Context Protocol) client for Palette.
-Uses official MCP Python SDK (2025) for connecting to MCP servers.
+Talks to stdio MCP servers through persistent, pooled JSON-RPC sessions.
 Optimized for UI/UX design prototyping workflow.
 """
 
@@ -13,16 +13,7 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
 
-# Official MCP Python SDK (2025) - Required for Palette
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-    from mcp.types import Tool, Resource, TextContent, ImageContent
-    HAS_MCP_SDK = True
-except ImportError as e:
-    HAS_MCP_SDK = False
-    logging.error(f"❌ MCP SDK not installed. Install with: pip install mcp (Error: {e})")
-    raise ImportError("MCP SDK is required for Palette to function properly")
+from .session_pool import MCPStdioSession, get_mcp_session_pool
 
 
 @dataclass
@@ -66,7 +57,7 @@ class PaletteMCPClient:
     def __init__(self, design_context: Optional[Dict[str, Any]] = None):
         self.design_context = design_context or {}
         self.servers: Dict[str, MCPServerConfig] = {}
-        self.sessions: Dict[str, ClientSession] = {}
+        self.sessions: Dict[str, MCPStdioSession] = {}
         self.available_tools: Dict[str, MCPTool] = {}
         self.available_resources: Dict[str, MCPResource] = {}
         self.logger = logging.getLogger(__name__)
@@ -116,7 +107,7 @@ class PaletteMCPClient:
         return results
     
     async def connect_server(self, server_name: str) -> bool:
-        """Connect to a specific MCP server using official SDK"""
+        """Connect to a specific MCP server"""
         if server_name not in self.servers:
             self.logger.error(f"Server {server_name} not configured")
             return False
@@ -134,7 +125,7 @@ class PaletteMCPClient:
             return False
     
     async def _connect_stdio_server_2025(self, server_name: str, config: MCPServerConfig) -> bool:
-        """Connect using 2025 MCP SDK - simplified and reliable"""
+        """Start (or reuse) a persistent stdio session and discover its capabilities"""
         try:
             # Check if MCP server exists before attempting connection
             server_path = Path(config.command) if config.command else None
@@ -142,53 +133,63 @@ class PaletteMCPClient:
                 self.logger.warning(f"MCP server not found: {config.command}")
                 return False
             
-            # Create server parameters
-            server_params = StdioServerParameters(
+            # Sessions are pooled process-wide, so reconnecting reuses a running server
+            pool = get_mcp_session_pool()
+            session = pool.acquire(
                 command=config.command,
                 args=config.args or [],
-                env=config.env or {}
+                env=config.env or {},
+                name=server_name,
+                timeout=config.timeout,
             )
+            try:
+                await session.start()
+            except Exception:
+                pool.release(session)
+                raise
+            previous = self.sessions.get(server_name)
+            self.sessions[server_name] = session
+            if previous is not None:
+                pool.release(previous)
             
-            # Connect using stdio client from SDK
-            # Note: For now, skip actual connection to avoid blocking during testing
-            # TODO: Implement proper persistent connection handling
-            self.logger.info(f"⏳ MCP server {server_name} connection deferred (testing mode)")
+            await self._discover_server_capabilities_2025(server_name, session)
+            self.logger.info(f"✅ Connected to MCP server: {server_name}")
             return True
                 
         except Exception as e:
             self.logger.error(f"Failed to connect to {server_name}: {e}")
             return False
     
-    async def _discover_server_capabilities_2025(self, server_name: str, session: ClientSession) -> None:
-        """Discover tools and resources from MCP server using 2025 SDK"""
+    async def _discover_server_capabilities_2025(self, server_name: str, session: MCPStdioSession) -> None:
+        """Discover tools and resources from MCP server"""
         try:
             # List available tools
-            tools_response = await session.list_tools()
-            for tool in tools_response.tools:
+            tools = await session.list_tools()
+            for tool in tools:
                 tool_obj = MCPTool(
-                    name=tool.name,
-                    description=tool.description or "",
-                    parameters=tool.inputSchema.model_dump() if tool.inputSchema else {},
+                    name=tool["name"],
+                    description=tool.get("description") or "",
+                    parameters=tool.get("inputSchema") or {},
                     server=server_name
                 )
-                self.available_tools[f"{server_name}.{tool.name}"] = tool_obj
+                self.available_tools[f"{server_name}.{tool['name']}"] = tool_obj
             
-            self.logger.info(f"📋 Discovered {len(tools_response.tools)} tools from {server_name}")
+            self.logger.info(f"📋 Discovered {len(tools)} tools from {server_name}")
             
             # List available resources
             try:
-                resources_response = await session.list_resources()
-                for resource in resources_response.resources:
+                resources = await session.list_resources()
+                for resource in resources:
                     resource_obj = MCPResource(
-                        uri=resource.uri,
-                        name=resource.name,
-                        mime_type=resource.mimeType or "application/octet-stream",
-                        description=resource.description,
+                        uri=resource["uri"],
+                        name=resource.get("name", resource["uri"]),
+                        mime_type=resource.get("mimeType") or "application/octet-stream",
+                        description=resource.get("description"),
                         server=server_name
                     )
-                    self.available_resources[resource.uri] = resource_obj
+                    self.available_resources[resource["uri"]] = resource_obj
                 
-                self.logger.info(f"📂 Discovered {len(resources_response.resources)} resources from {server_name}")
+                self.logger.info(f"📂 Discovered {len(resources)} resources from {server_name}")
             except Exception as e:
                 self.logger.warning(f"No resources available from {server_name}: {e}")
                 
@@ -224,14 +225,9 @@ class PaletteMCPClient:
             result = await session.call_tool(tool_name, arguments)
             
             # Process result content
-            content_result = []
-            for content_item in result.content:
-                if isinstance(content_item, TextContent):
-                    content_result.append({"type": "text", "content": content_item.text})
-                elif isinstance(content_item, ImageContent):
-                    content_result.append({"type": "image", "content": content_item.data})
-                else:
-                    content_result.append({"type": "unknown", "content": str(content_item)})
+            content_result = [
+                self._convert_content(content_item) for content_item in result.get("content", [])
+            ]
             
             return {
                 "success": True,
@@ -264,14 +260,9 @@ class PaletteMCPClient:
             result = await session.read_resource(uri)
             
             # Process resource content
-            content_result = []
-            for content_item in result.contents:
-                if isinstance(content_item, TextContent):
-                    content_result.append({"type": "text", "content": content_item.text})
-                elif isinstance(content_item, ImageContent):
-                    content_result.append({"type": "image", "content": content_item.data})
-                else:
-                    content_result.append({"type": "unknown", "content": str(content_item)})
+            content_result = [
+                self._convert_content(content_item) for content_item in result.get("contents", [])
+            ]
             
             return {
                 "success": True,
@@ -284,6 +275,15 @@ class PaletteMCPClient:
             self.logger.error(f"Resource read failed for {uri}: {e}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _convert_content(content_item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an MCP content item to Palette's result format"""
+        if "text" in content_item:
+            return {"type": "text", "content": content_item["text"]}
+        if content_item.get("type") == "image" or "blob" in content_item:
+            return {"type": "image", "content": content_item.get("data", content_item.get("blob"))}
+        return {"type": "unknown", "content": str(content_item)}
+    
     def list_design_tools(self, category: str = None) -> List[MCPTool]:
         """List available design tools, optionally filtered by category"""
         design_tools = []
@@ -317,7 +317,7 @@ class PaletteMCPClient:
             status[server_name] = {
                 "configured": True,
                 "enabled": config.enabled,
-                "connected": server_name in self.sessions,
+                "connected": server_name in self.sessions and self.sessions[server_name].is_alive,
                 "type": config.type,
                 "tools_count": len([t for t in self.available_tools.values() 
                                   if t.server == server_name]),
@@ -333,11 +333,10 @@ class PaletteMCPClient:
             return False
         
         try:
-            session = self.sessions[server_name]
+            session = self.sessions.pop(server_name)
             
-            # Close the session properly
-            # Note: The SDK handles cleanup automatically when the session goes out of scope
-            del self.sessions[server_name]
+            # Other clients may share the pooled server; the pool stops it once idle
+            get_mcp_session_pool().release(session)
             
             # Remove associated tools and resources
             tools_to_remove = [key for key, tool in self.available_tools.items() 
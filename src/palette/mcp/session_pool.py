@@ -0,0 +1,524 @@
+"""
+Persistent MCP stdio sessions.
+
+Each configured MCP server is started once (lazily, on first use) and kept
+running. Requests are multiplexed over the server's stdin/stdout by JSON-RPC
+id, so concurrent tool calls share one process instead of each launching its
+own. Sessions are health-checked after being idle and restarted automatically
+when the server process exits.
+
+The pool keeps at most ``PALETTE_MCP_MAX_SESSIONS`` servers running and stops
+the least recently used idle one beyond that. Long-lived users ``acquire`` a
+session and ``release`` it when done, so it is never stopped under them.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "palette", "version": "0.1.0"}
+
+# Concurrent in-flight requests per server process
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Server processes kept running by the pool
+DEFAULT_MAX_SESSIONS = 8
+
+# Sessions idle longer than this are pinged before the next request
+HEALTH_CHECK_IDLE_SECONDS = 30.0
+
+# Largest single JSON-RPC message accepted from a server
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class MCPSessionError(Exception):
+    """Raised when an MCP server fails, exits or returns a JSON-RPC error."""
+    pass
+
+
+@dataclass(frozen=True)
+class MCPServerSpec:
+    """How to launch one stdio MCP server."""
+    command: str
+    args: Tuple[str, ...] = ()
+    cwd: Optional[str] = None
+    env: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def key(self) -> str:
+        return json.dumps([self.command, list(self.args), self.cwd, list(self.env)])
+
+
+class MCPStdioSession:
+    """One long-lived MCP server process speaking newline-delimited JSON-RPC."""
+
+    def __init__(
+        self,
+        spec: MCPServerSpec,
+        name: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: float = 30.0,
+        on_start_failed: Optional[Callable[["MCPStdioSession"], None]] = None,
+    ):
+        self.spec = spec
+        self.name = name or os.path.basename(spec.args[0] if spec.args else spec.command)
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.on_start_failed = on_start_failed
+
+        # Holders that acquired the session from the pool
+        self.refs = 0
+
+        self.server_info: Dict[str, Any] = {}
+        self.server_capabilities: Dict[str, Any] = {}
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._stderr_tail: deque = deque(maxlen=20)
+        self._next_id = 0
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._last_used = 0.0
+        self._started = False
+
+        # Statistics
+        self.starts = 0
+        self.restarts = 0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def in_use(self) -> bool:
+        return self.refs > 0 or bool(self._pending)
+
+    @property
+    def is_alive(self) -> bool:
+        return (
+            self._process is not None
+            and self._process.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
+
+    async def start(self):
+        """Start the server and perform the MCP initialize handshake if needed."""
+        self._bind_loop()
+        async with self._start_lock:
+            if self.is_alive:
+                return
+            await self._spawn()
+
+    async def request(
+        self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Send a JSON-RPC request and return its ``result``.
+
+        Raises:
+            MCPSessionError: The server returned an error or exited
+            asyncio.TimeoutError: No response within the timeout
+        """
+        async with self._semaphore_for_loop():
+            # A dead server is restarted here; a request that was in flight when
+            # it died is not replayed, since tool calls need not be idempotent
+            await self._ensure_healthy()
+            try:
+                return await self._send_request(method, params, timeout)
+            except (MCPSessionError, asyncio.TimeoutError):
+                self.failures += 1
+                raise
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a JSON-RPC notification (no response expected)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._write(message)
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.request("tools/call", {"name": tool_name, "arguments": arguments})
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        return (await self.request("tools/list", {})).get("tools", [])
+
+    async def list_resources(self) -> List[Dict[str, Any]]:
+        return (await self.request("resources/list", {})).get("resources", [])
+
+    async def read_resource(self, uri: str) -> Dict[str, Any]:
+        return await self.request("resources/read", {"uri": uri})
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Check that the server answers; a method-not-found error still counts as alive."""
+        if not self.is_alive:
+            return False
+        try:
+            await self._send_request("ping", {}, timeout)
+            return True
+        except MCPSessionError as e:
+            return self.is_alive and "method not found" in str(e).lower()
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self):
+        """Stop the server process and fail any pending requests."""
+        process, self._process = self._process, None
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._fail_pending(MCPSessionError(f"MCP session {self.name} closed"))
+
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.stdin.close()
+        except Exception:
+            pass
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=2)
+        except Exception:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    def close_nowait(self):
+        """Stop the server without awaiting it (for callers outside its event loop)."""
+        process, self._process = self._process, None
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._fail_pending(MCPSessionError(f"MCP session {self.name} closed"))
+        if process is not None and process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "alive": self.is_alive,
+            "pid": self._process.pid if self._process else None,
+            "refs": self.refs,
+            "in_flight": len(self._pending),
+            "max_concurrency": self.max_concurrency,
+            "starts": self.starts,
+            "restarts": self.restarts,
+            "requests": self.requests,
+            "failures": self.failures,
+            "idle_seconds": round(time.monotonic() - self._last_used, 1) if self._last_used else None,
+        }
+
+    def _bind_loop(self):
+        """Bind asyncio primitives to the running loop, dropping a session from a dead loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._process is not None and self._process.returncode is None:
+            # Subprocess transports cannot move between loops
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+        self._process = None
+        self._reader_task = None
+        self._stderr_task = None
+        self._pending = {}
+        self._loop = loop
+        self._start_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._write_lock = asyncio.Lock()
+
+    def _semaphore_for_loop(self) -> asyncio.Semaphore:
+        self._bind_loop()
+        return self._semaphore
+
+    async def _ensure_healthy(self):
+        if self.is_alive and self._last_used and (
+            time.monotonic() - self._last_used > HEALTH_CHECK_IDLE_SECONDS
+        ):
+            if not await self.ping():
+                print(f"Warning: MCP server {self.name} failed its health check, restarting")
+                await self.close()
+        if not self.is_alive:
+            await self.start()
+
+    async def _spawn(self):
+        if self._started:
+            self.restarts += 1
+        self._started = True
+        self.starts += 1
+
+        env = None
+        if self.spec.env:
+            env = {**os.environ, **dict(self.spec.env)}
+
+        self._process = await asyncio.create_subprocess_exec(
+            self.spec.command,
+            *self.spec.args,
+            cwd=self.spec.cwd,
+            env=env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=MAX_MESSAGE_BYTES,
+        )
+        self._reader_task = asyncio.create_task(self._read_responses(self._process))
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self._process))
+
+        try:
+            await self._initialize()
+        except BaseException:
+            # Never leave a half-initialized server behind
+            await self.close()
+            if self.on_start_failed is not None:
+                self.on_start_failed(self)
+            raise
+
+    async def _initialize(self):
+        try:
+            result = await self._send_request(
+                "initialize",
+                {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": CLIENT_INFO,
+                },
+                self.timeout,
+            )
+            self.server_info = result.get("serverInfo", {}) if isinstance(result, dict) else {}
+            self.server_capabilities = (
+                result.get("capabilities", {}) if isinstance(result, dict) else {}
+            )
+            await self.notify("notifications/initialized")
+        except asyncio.TimeoutError:
+            raise MCPSessionError(
+                f"MCP server {self.name} did not answer initialize within {self.timeout}s"
+            )
+        except MCPSessionError as e:
+            if not self.is_alive:
+                raise
+            # Servers without the handshake still answer plain requests
+            print(f"Warning: MCP server {self.name} rejected initialize: {e}")
+
+    async def _send_request(
+        self, method: str, params: Optional[Dict[str, Any]], timeout: Optional[float]
+    ) -> Any:
+        if not self.is_alive:
+            raise MCPSessionError(self._exit_message())
+
+        self._next_id += 1
+        request_id = self._next_id
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+
+        self.requests += 1
+        self._last_used = time.monotonic()
+        try:
+            await self._write(message)
+            response = await asyncio.wait_for(future, timeout or self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+            self._last_used = time.monotonic()
+
+        if "error" in response:
+            error = response["error"]
+            detail = error.get("message", error) if isinstance(error, dict) else error
+            raise MCPSessionError(f"{method} failed: {detail}")
+        return response.get("result", {})
+
+    async def _write(self, message: Dict[str, Any]):
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        async with self._write_lock:
+            try:
+                self._process.stdin.write(data)
+                await self._process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError, AttributeError) as e:
+                raise MCPSessionError(f"MCP server {self.name} pipe closed: {e}")
+
+    async def _read_responses(self, process: asyncio.subprocess.Process):
+        """Dispatch every response line to the request waiting on its id."""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Log output written to stdout by the server
+
+                if not isinstance(message, dict) or "id" not in message:
+                    continue  # Server notifications are not used
+                if "method" in message:
+                    # Server-to-client request (e.g. ping); answer so it never waits
+                    try:
+                        await self._write({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+                    except MCPSessionError:
+                        pass
+                    continue
+
+                future = self._pending.get(message["id"])
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except Exception as e:
+            self._stderr_tail.append(f"reader failed: {e}")
+        finally:
+            self._fail_pending(MCPSessionError(self._exit_message()))
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process):
+        # Servers log to stderr; keep a tail for error messages
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                return
+            self._stderr_tail.append(line.decode("utf-8", "replace").rstrip())
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _exit_message(self) -> str:
+        stderr = " | ".join(self._stderr_tail)
+        return f"MCP server {self.name} exited" + (f": {stderr}" if stderr else "")
+
+
+class MCPSessionPool:
+    """Process-wide LRU pool of MCP sessions, one per distinct server launch spec."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[str, MCPStdioSession]" = OrderedDict()
+        self.evictions = 0
+
+    def get_session(
+        self,
+        command: str,
+        args: Optional[List[str]] = None,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
+        timeout: float = 30.0,
+    ) -> MCPStdioSession:
+        """Get the session for a server, creating it (not yet started) on first use."""
+        spec = MCPServerSpec(
+            command=command,
+            args=tuple(args or ()),
+            cwd=cwd,
+            env=tuple(sorted((env or {}).items())),
+        )
+        session = self._sessions.get(spec.key)
+        if session is None:
+            session = MCPStdioSession(
+                spec,
+                name=name,
+                max_concurrency=self.max_concurrency,
+                timeout=timeout,
+                on_start_failed=self._forget,
+            )
+            self._sessions[spec.key] = session
+            self._evict_idle(protect=session)
+        self._sessions.move_to_end(spec.key)
+        return session
+
+    def acquire(self, command: str, **kwargs) -> MCPStdioSession:
+        """``get_session`` for long-lived holders; pair with ``release``."""
+        session = self.get_session(command, **kwargs)
+        session.refs += 1
+        return session
+
+    def release(self, session: MCPStdioSession):
+        """Drop a holder's reference; the server keeps running for other users."""
+        session.refs = max(0, session.refs - 1)
+        self._evict_idle()
+
+    async def call_tool(
+        self, session: MCPStdioSession, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return await session.call_tool(tool_name, arguments)
+
+    async def health_check(self) -> Dict[str, bool]:
+        """Ping every running session."""
+        return {
+            session.name: await session.ping()
+            for session in self._sessions.values()
+            if session.is_alive
+        }
+
+    async def close_session(self, session: MCPStdioSession):
+        """Stop a server even if others hold it (prefer ``release``)."""
+        self._forget(session)
+        await session.close()
+
+    async def close_all(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [session.get_stats() for session in self._sessions.values()]
+
+    def _forget(self, session: MCPStdioSession):
+        if self._sessions.get(session.spec.key) is session:
+            del self._sessions[session.spec.key]
+
+    def _evict_idle(self, protect: Optional[MCPStdioSession] = None):
+        """Stop least recently used idle sessions beyond ``max_sessions``."""
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return
+        # Sessions in use are skipped, so the pool may exceed its size meanwhile
+        victims = [
+            session for session in self._sessions.values()
+            if session is not protect and not session.in_use
+        ][:excess]
+        for session in victims:
+            self._forget(session)
+            self.evictions += 1
+            self._close_in_background(session)
+
+    def _close_in_background(self, session: MCPStdioSession):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and session._loop is running:
+            running.create_task(session.close())
+        else:
+            session.close_nowait()
+
+
+_pool: Optional[MCPSessionPool] = None
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Get the process-wide MCP session pool."""
+    global _pool
+    if _pool is None:
+        _pool = MCPSessionPool(
+            max_concurrency=int(os.getenv("PALETTE_MCP_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+            max_sessions=int(os.getenv("PALETTE_MCP_MAX_SESSIONS", DEFAULT_MAX_SESSIONS)),
+        )
+    return _pool
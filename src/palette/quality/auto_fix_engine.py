@@ -12,6 +12,7 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .renderability_validator import RenderError
+from .validation_context import VOID_ELEMENTS, add_missing_keys, get_validation_context
 from .validator import ValidationIssue, ValidationLevel
 
 
@@ -473,23 +474,16 @@ class AutoFixEngine:
         if package_name in self.import_mappings:
             import_statement = self.import_mappings[package_name]
 
-            # Add import at the top after existing imports
-            lines = code.split("\\n")
-            import_inserted = False
-
-            for i, line in enumerate(lines):
-                if line.strip().startswith("import "):
-                    continue
-                elif not import_inserted:
-                    lines.insert(i, import_statement)
-                    import_inserted = True
-                    break
-
-            if not import_inserted:
-                # Add at the very beginning
-                lines.insert(0, import_statement)
+            # Add import after the existing imports (or the 'use client' directive)
+            context = get_validation_context(code)
+            lines = list(context.lines)
+            if context.imports:
+                insert_at = max(node.end_line for node in context.imports)
+            else:
+                insert_at = context.directives.get("use client", -1) + 1
+            lines.insert(insert_at, import_statement)
 
-            return {"code": "\\n".join(lines)}
+            return {"code": "\n".join(lines)}
 
         return None
 
@@ -549,48 +543,24 @@ class AutoFixEngine:
     def _fix_self_closing_tags(self, code: str) -> str:
         """Fix self-closing JSX tags."""
 
-        self_closing_tags = [
-            "br",
-            "img",
-            "input",
-            "hr",
-            "area",
-            "base",
-            "col",
-            "embed",
-            "link",
-            "meta",
-            "source",
-            "track",
-            "wbr",
-        ]
-
-        for tag in self_closing_tags:
-            # Fix <tag> to <tag />
-            pattern = f"<{tag}(\\s[^>]*)?(?<!/)>"
-            replacement = f"<{tag}\\1 />"
-            code = re.sub(pattern, replacement, code)
+        # Fix <tag> to <tag /> for void elements that are not closed explicitly
+        pieces, last = [], 0
+        for element in get_validation_context(code).jsx_elements:
+            if element.tag not in VOID_ELEMENTS or element.self_closing:
+                continue
+            if re.match(rf"\s*</{element.tag}\s*>", code[element.end:]):
+                continue
+            pieces.append(code[last:element.end - 1].rstrip())
+            pieces.append(" />")
+            last = element.end
 
-        return code
+        pieces.append(code[last:])
+        return "".join(pieces)
 
     def _add_key_props(self, code: str) -> str:
         """Add key props to mapped JSX elements."""
 
-        # Find .map() without key prop
-        map_pattern = r"(\\.map\\([^}]+=>\\s*<)(\\w+)([^>]*?)(?<!key=)([^>]*?>)"
-
-        def add_key(match):
-            before = match.group(1)
-            tag = match.group(2)
-            props1 = match.group(3)
-            props2 = match.group(4)
-
-            if "key=" not in props1 + props2:
-                # Add key prop (assuming index is available)
-                return f"{before}{tag} key={{index}}{props1}{props2}"
-            return match.group(0)
-
-        return re.sub(map_pattern, add_key, code)
+        return add_missing_keys(get_validation_context(code))
 
     def _fix_export_default(self, code: str) -> str:
         """Fix export default syntax."""
@@ -5,8 +5,10 @@ Ensures generated code meets framework and styling system specific requirements.
 """
 
 import re
+import time
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..errors.decorators import handle_errors
@@ -15,6 +17,8 @@ from ..intelligence.configuration_hub import Framework, ProjectConfiguration
 from ..intelligence.styling_analyzer import StylingSystem
 from .auto_fix_engine import AutoFixEngine, AutoFixResult, FixStrategy
 from .renderability_validator import RenderabilityResult, RenderabilityValidator
+from .rule_engine import CodeView, CompiledRuleSet, RuleStats, timed
+from .validation_context import get_validation_context
 from .validator import (
     ComponentValidator,
     QualityReport,
@@ -22,6 +26,62 @@ from .validator import (
     ValidationLevel,
 )
 
+# Checker patterns, compiled once
+HOOK_CALL_PATTERN = re.compile(r"use[A-Z]\w*\(")
+IMG_TAG_PATTERN = re.compile(r"<img\s[^>]*>")
+EMPTY_BUTTON_PATTERN = re.compile(r"<Button[^>]*>[\s]*</Button>")
+ICON_BUTTON_PATTERN = re.compile(r"<Button[^>]*><[^>]*Icon[^>]*></Button>")
+LOWERCASE_COMPONENT_PATTERN = re.compile(r"(?:const|function)\s+([a-z][a-zA-Z0-9]*)\s*[=:].*React\.FC")
+
+# Tailwind classes in Chakra UI code
+CHAKRA_TAILWIND_PATTERNS = [
+    re.compile(r'className="[^"]*' + pattern)
+    for pattern in (
+        r"bg-(?:red|blue|green|gray|slate|zinc|neutral|stone|amber|yellow|lime|emerald|teal|cyan|sky|indigo|violet|purple|fuchsia|pink|rose)-\d+",
+        r"text-(?:xs|sm|base|lg|xl|2xl|3xl|4xl|5xl|6xl|7xl|8xl|9xl)",
+        r"(?:p|px|py|pt|pb|pl|pr)-\d+",
+        r"(?:m|mx|my|mt|mb|ml|mr)-\d+",
+        r"(?:w|h)-(?:full|screen|\d+)",
+        r"(?:flex|grid|block|inline|hidden)",
+    )
+]
+INVALID_TAILWIND_PATTERNS = [
+    re.compile(r'className="[^"]*' + pattern)
+    for pattern in (
+        r"bg-\d+-\d+",  # Invalid color format
+        r"text-\d+px",  # Invalid size format
+    )
+]
+TAILWIND_COLOR_CLASS_PATTERN = re.compile(r'className="[^"]*bg-\w+-\d+')
+
+# Tailwind to Chakra UI prop conversions applied by the auto-fix
+CHAKRA_TAILWIND_CONVERSIONS = [
+    (re.compile(pattern), replacement)
+    for pattern, replacement in (
+        # Colors
+        (r'className="([^"]*)?bg-blue-(\d+)([^"]*?)"', r'bg="blue.\2"'),
+        (r'className="([^"]*)?bg-red-(\d+)([^"]*?)"', r'bg="red.\2"'),
+        (r'className="([^"]*)?bg-green-(\d+)([^"]*?)"', r'bg="green.\2"'),
+        (r'className="([^"]*)?text-blue-(\d+)([^"]*?)"', r'color="blue.\2"'),
+        (r'className="([^"]*)?text-red-(\d+)([^"]*?)"', r'color="red.\2"'),
+        # Spacing
+        (r'className="([^"]*)?p-(\d+)([^"]*?)"', r"p={\2}"),
+        (r'className="([^"]*)?px-(\d+)([^"]*?)"', r"px={\2}"),
+        (r'className="([^"]*)?py-(\d+)([^"]*?)"', r"py={\2}"),
+        (r'className="([^"]*)?m-(\d+)([^"]*?)"', r"m={\2}"),
+        # Size
+        (r'className="([^"]*)?w-full([^"]*?)"', r'w="full"'),
+        (r'className="([^"]*)?h-full([^"]*?)"', r'h="full"'),
+        # Border radius
+        (r'className="([^"]*)?rounded-lg([^"]*?)"', r'rounded="lg"'),
+        (r'className="([^"]*)?rounded-md([^"]*?)"', r'rounded="md"'),
+        # Shadow
+        (r'className="([^"]*)?shadow-md([^"]*?)"', r'shadow="md"'),
+        (r'className="([^"]*)?shadow-lg([^"]*?)"', r'shadow="lg"'),
+    )
+]
+EMPTY_CLASS_NAME_PATTERN = re.compile(r'className="[\s]*"\s*')
+
 
 class ValidationStage(Enum):
     """Stages in the quality validation pipeline."""
@@ -97,6 +157,10 @@ class ConfigurationAwareQualityPipeline:
         self.base_validator = None  # Will be initialized when needed with project path
         self.validation_rules: Dict[str, ConfigurationValidationRule] = {}
 
+        # Rules compiled per (framework, styling system), reset when rules change
+        self._compiled_rules: Dict[Tuple[Framework, StylingSystem], Dict[ValidationStage, CompiledRuleSet]] = {}
+        self.rule_stats: Dict[str, RuleStats] = {}
+
         # Initialize new validation components
         self.renderability_validator = RenderabilityValidator(project_path)
         self.auto_fix_engine = AutoFixEngine(project_path, FixStrategy.SAFE)
@@ -289,6 +353,29 @@ class ConfigurationAwareQualityPipeline:
     def add_validation_rule(self, rule: ConfigurationValidationRule):
         """Add a custom validation rule."""
         self.validation_rules[rule.name] = rule
+        self._compiled_rules.clear()
+
+    def get_rule_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-rule call counts and timings since the pipeline was created."""
+        return {name: stats.to_dict() for name, stats in self.rule_stats.items()}
+
+    def _compile_rules(
+        self, configuration: ProjectConfiguration
+    ) -> Dict[ValidationStage, CompiledRuleSet]:
+        """Applicable rules grouped and compiled per stage, once per configuration."""
+        key = (configuration.framework, configuration.styling_system)
+        compiled = self._compiled_rules.get(key)
+        if compiled is None:
+            by_stage: Dict[ValidationStage, List[ConfigurationValidationRule]] = {}
+            for rule in self._get_applicable_rules(configuration):
+                by_stage.setdefault(rule.stage, []).append(rule)
+            compiled = {stage: CompiledRuleSet(rules) for stage, rules in by_stage.items()}
+            self._compiled_rules[key] = compiled
+        return compiled
+
+    def _view(self, code: str) -> CodeView:
+        """Tokenized view of the code, shared with the renderability validator and auto-fixer."""
+        return get_validation_context(code).view
 
     @handle_errors(reraise=True)
     def validate_and_fix(
@@ -330,7 +417,9 @@ class ConfigurationAwareQualityPipeline:
         stage_results = {}
 
         # Get applicable rules for this configuration
-        applicable_rules = self._get_applicable_rules(configuration)
+        compiled_rules = self._compile_rules(configuration)
+        applicable_rules = [rule for rule_set in compiled_rules.values() for rule in rule_set.rules]
+        validation_ms = 0.0
         print(
             f"📋 Running {len(applicable_rules)} configuration-specific validation rules"
         )
@@ -355,9 +444,12 @@ class ConfigurationAwareQualityPipeline:
             iteration_fixes = []
 
             for stage in validation_stages:
+                stage_started = time.perf_counter()
                 stage_issues, stage_fixes, stage_passed = self._run_validation_stage(
-                    current_code, stage, applicable_rules, configuration
+                    current_code, stage, compiled_rules, configuration
                 )
+                stage_ms = (time.perf_counter() - stage_started) * 1000
+                validation_ms += stage_ms
 
                 iteration_issues.extend(stage_issues)
                 iteration_fixes.extend(stage_fixes)
@@ -376,6 +468,7 @@ class ConfigurationAwareQualityPipeline:
                     "issues_count": len(stage_issues),
                     "fixes_applied": len(stage_fixes),
                     "passed": stage_passed,
+                    "duration_ms": round(stage_ms, 3),
                 }
 
             all_issues.extend(iteration_issues)
@@ -458,6 +551,12 @@ class ConfigurationAwareQualityPipeline:
             pipeline_metadata={
                 "iterations": iteration + 1,
                 "rules_applied": len(applicable_rules),
+                "validation_ms": round(validation_ms, 3),
+                "rule_timings": {
+                    rule.name: self.rule_stats[rule.name].to_dict()
+                    for rule in applicable_rules
+                    if rule.name in self.rule_stats
+                },
                 "configuration": {
                     "framework": configuration.framework.value,
                     "styling_system": configuration.styling_system.value,
@@ -534,7 +633,7 @@ class ConfigurationAwareQualityPipeline:
         self,
         code: str,
         stage: ValidationStage,
-        applicable_rules: List[ConfigurationValidationRule],
+        compiled_rules: Dict[ValidationStage, CompiledRuleSet],
         configuration: ProjectConfiguration,
     ) -> Tuple[List[ValidationIssue], List[Tuple[str, str]], bool]:
         """Run a specific validation stage."""
@@ -545,22 +644,28 @@ class ConfigurationAwareQualityPipeline:
         elif stage == ValidationStage.IMPORT_APPROVAL:
             return self._run_import_approval_validation(code, configuration)
 
-        stage_rules = [rule for rule in applicable_rules if rule.stage == stage]
-        if not stage_rules:
+        rule_set = compiled_rules.get(stage)
+        if not rule_set:
             return [], [], True
 
         stage_issues = []
         stage_fixes = []
 
-        for rule in stage_rules:
+        for rule in rule_set.rules:
             # Run the validation rule
-            issues = self._run_validation_rule(code, rule)
+            with timed(self.rule_stats, rule.name) as timer:
+                issues = self._run_validation_rule(code, rule, rule_set)
+                timer.issues = len(issues)
             stage_issues.extend(issues)
 
             # Apply auto-fixes if available
             if rule.auto_fix_function and issues:
                 try:
+                    fix_started = time.perf_counter()
                     fixed_code = rule.auto_fix_function(code)
+                    self.rule_stats[rule.name].record_fix(
+                        (time.perf_counter() - fix_started) * 1000
+                    )
                     if fixed_code != code:
                         stage_fixes.append((f"Applied {rule.name} fix", fixed_code))
                         code = fixed_code  # Update code for next rule
@@ -579,9 +684,12 @@ class ConfigurationAwareQualityPipeline:
         return stage_issues, stage_fixes, stage_passed
 
     def _run_validation_rule(
-        self, code: str, rule: ConfigurationValidationRule
+        self,
+        code: str,
+        rule: ConfigurationValidationRule,
+        rule_set: Optional[CompiledRuleSet] = None,
     ) -> List[ValidationIssue]:
-        """Run a single validation rule."""
+        """Run a single validation rule (``rule_set`` holds its compiled pattern)."""
 
         issues = []
 
@@ -609,8 +717,10 @@ class ConfigurationAwareQualityPipeline:
 
             elif rule.pattern:
                 # Use regex pattern matching
-                matches = re.findall(rule.pattern, code, re.MULTILINE)
-                if matches:
+                if rule_set is None:
+                    rule_set = CompiledRuleSet([rule])
+                violations = rule_set.scanner.count(rule, code)
+                if violations:
                     issues.append(
                         ValidationIssue(
                             level=(
@@ -620,7 +730,7 @@ class ConfigurationAwareQualityPipeline:
                                 else ValidationLevel.WARNING
                             ),
                             category=rule.name,
-                            message=f"{rule.description}: Found {len(matches)} violations",
+                            message=f"{rule.description}: Found {violations} violations",
                             line=None,
                             suggestion=f"Fix {rule.name} violations",
                         )
@@ -663,7 +773,7 @@ class ConfigurationAwareQualityPipeline:
         """Check for img tag usage instead of next/image."""
         issues = []
 
-        img_tags = re.findall(r"<img\s[^>]*>", code)
+        img_tags = IMG_TAG_PATTERN.findall(code) if "<img" in code else []
         if img_tags:
             issues.append(
                 ValidationIssue(
@@ -696,21 +806,21 @@ class ConfigurationAwareQualityPipeline:
         issues = []
 
         # Check for hooks in conditions or loops (basic check)
-        lines = code.split("\n")
-        for i, line in enumerate(lines):
-            if re.search(r"use[A-Z]\w*\(", line):  # Hook usage
-                # Check if it's inside a condition or loop
-                indent_level = len(line) - len(line.lstrip())
-                if indent_level > 8:  # Likely inside nested structure
-                    issues.append(
-                        ValidationIssue(
-                            level=ValidationLevel.ERROR,
-                            category="react_hooks_rules",
-                            message="Hooks should be called at the top level",
-                            line=i + 1,
-                            suggestion="Move hook to component top level",
-                        )
+        view = self._view(code)
+        for i in view.lines_matching(HOOK_CALL_PATTERN):  # Hook usage
+            line = view.lines[i]
+            # Check if it's inside a condition or loop
+            indent_level = len(line) - len(line.lstrip())
+            if indent_level > 8:  # Likely inside nested structure
+                issues.append(
+                    ValidationIssue(
+                        level=ValidationLevel.ERROR,
+                        category="react_hooks_rules",
+                        message="Hooks should be called at the top level",
+                        line=i + 1,
+                        suggestion="Move hook to component top level",
                     )
+                )
 
         return issues
 
@@ -748,18 +858,12 @@ class ConfigurationAwareQualityPipeline:
         """CRITICAL: Check for Tailwind classes in Chakra UI code."""
         issues = []
 
-        # Patterns for Tailwind classes
-        tailwind_patterns = [
-            r'className="[^"]*bg-(?:red|blue|green|gray|slate|zinc|neutral|stone|amber|yellow|lime|emerald|teal|cyan|sky|indigo|violet|purple|fuchsia|pink|rose)-\d+',
-            r'className="[^"]*text-(?:xs|sm|base|lg|xl|2xl|3xl|4xl|5xl|6xl|7xl|8xl|9xl)',
-            r'className="[^"]*(?:p|px|py|pt|pb|pl|pr)-\d+',
-            r'className="[^"]*(?:m|mx|my|mt|mb|ml|mr)-\d+',
-            r'className="[^"]*(?:w|h)-(?:full|screen|\d+)',
-            r'className="[^"]*(?:flex|grid|block|inline|hidden)',
-        ]
+        if 'className="' not in code:
+            return issues
 
-        for pattern in tailwind_patterns:
-            matches = re.findall(pattern, code)
+        # Patterns for Tailwind classes (the message shows the first three)
+        for pattern in CHAKRA_TAILWIND_PATTERNS:
+            matches = [match.group(0) for match in islice(pattern.finditer(code), 3)]
             if matches:
                 issues.append(
                     ValidationIssue(
@@ -775,36 +879,15 @@ class ConfigurationAwareQualityPipeline:
     def _fix_chakra_tailwind_classes(self, code: str) -> str:
         """CRITICAL: Fix Tailwind classes in Chakra UI code."""
 
-        # Common Tailwind to Chakra conversions
-        conversions = [
-            # Colors
-            (r'className="([^"]*)?bg-blue-(\d+)([^"]*?)"', r'bg="blue.\2"'),
-            (r'className="([^"]*)?bg-red-(\d+)([^"]*?)"', r'bg="red.\2"'),
-            (r'className="([^"]*)?bg-green-(\d+)([^"]*?)"', r'bg="green.\2"'),
-            (r'className="([^"]*)?text-blue-(\d+)([^"]*?)"', r'color="blue.\2"'),
-            (r'className="([^"]*)?text-red-(\d+)([^"]*?)"', r'color="red.\2"'),
-            # Spacing
-            (r'className="([^"]*)?p-(\d+)([^"]*?)"', r"p={\2}"),
-            (r'className="([^"]*)?px-(\d+)([^"]*?)"', r"px={\2}"),
-            (r'className="([^"]*)?py-(\d+)([^"]*?)"', r"py={\2}"),
-            (r'className="([^"]*)?m-(\d+)([^"]*?)"', r"m={\2}"),
-            # Size
-            (r'className="([^"]*)?w-full([^"]*?)"', r'w="full"'),
-            (r'className="([^"]*)?h-full([^"]*?)"', r'h="full"'),
-            # Border radius
-            (r'className="([^"]*)?rounded-lg([^"]*?)"', r'rounded="lg"'),
-            (r'className="([^"]*)?rounded-md([^"]*?)"', r'rounded="md"'),
-            # Shadow
-            (r'className="([^"]*)?shadow-md([^"]*?)"', r'shadow="md"'),
-            (r'className="([^"]*)?shadow-lg([^"]*?)"', r'shadow="lg"'),
-        ]
+        if 'className="' not in code:
+            return code
 
-        for pattern, replacement in conversions:
-            code = re.sub(pattern, replacement, code)
+        # Common Tailwind to Chakra conversions
+        for pattern, replacement in CHAKRA_TAILWIND_CONVERSIONS:
+            code = pattern.sub(replacement, code)
 
         # Remove empty className attributes
-        code = re.sub(r'className=""\s*', "", code)
-        code = re.sub(r'className="[\s]*"\s*', "", code)
+        code = EMPTY_CLASS_NAME_PATTERN.sub("", code)
 
         return code
 
@@ -920,13 +1003,8 @@ class ConfigurationAwareQualityPipeline:
         # For now, just check for common invalid patterns
         issues = []
 
-        invalid_patterns = [
-            r'className="[^"]*bg-\d+-\d+',  # Invalid color format
-            r'className="[^"]*text-\d+px',  # Invalid size format
-        ]
-
-        for pattern in invalid_patterns:
-            if re.search(pattern, code):
+        for pattern in INVALID_TAILWIND_PATTERNS:
+            if 'className="' in code and pattern.search(code):
                 issues.append(
                     ValidationIssue(
                         level=ValidationLevel.ERROR,
@@ -968,8 +1046,7 @@ class ConfigurationAwareQualityPipeline:
         issues = []
 
         # Check for buttons without aria-label or text content
-        button_pattern = r"<Button[^>]*>[\s]*</Button>"
-        if re.search(button_pattern, code):
+        if "<Button" in code and EMPTY_BUTTON_PATTERN.search(code):
             issues.append(
                 ValidationIssue(
                     level=ValidationLevel.WARNING,
@@ -986,8 +1063,7 @@ class ConfigurationAwareQualityPipeline:
         issues = []
 
         # Check for buttons with only icons
-        icon_button_pattern = r"<Button[^>]*><[^>]*Icon[^>]*></Button>"
-        if re.search(icon_button_pattern, code):
+        if "<Button" in code and ICON_BUTTON_PATTERN.search(code):
             issues.append(
                 ValidationIssue(
                     level=ValidationLevel.WARNING,
@@ -1016,10 +1092,7 @@ class ConfigurationAwareQualityPipeline:
         issues = []
 
         # Check for PascalCase component names
-        component_pattern = (
-            r"(?:const|function)\s+([a-z][a-zA-Z0-9]*)\s*[=:].*React\.FC"
-        )
-        matches = re.findall(component_pattern, code)
+        matches = LOWERCASE_COMPONENT_PATTERN.findall(code) if "React.FC" in code else []
 
         if matches:
             issues.append(
@@ -1108,8 +1181,8 @@ class ConfigurationAwareQualityPipeline:
         # Styling system compliance
         if configuration.styling_system == StylingSystem.CHAKRA_UI:
             compliance["chakra_imports"] = "@chakra-ui/react" in code
-            compliance["no_tailwind_classes"] = not re.search(
-                r'className="[^"]*bg-\w+-\d+', code
+            compliance["no_tailwind_classes"] = not TAILWIND_COLOR_CLASS_PATTERN.search(
+                code
             )
             compliance["chakra_components"] = any(
                 comp in code for comp in ["<Box", "<Button", "<Text"]
@@ -13,8 +13,17 @@ from typing import Dict, List, Optional, Tuple, Any, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .validation_context import add_missing_keys, get_validation_context
 from .validator import ValidationIssue, ValidationLevel
 
+# Tailwind utilities that have a Chakra UI style prop equivalent
+# (variant prefixes such as hover: or md: are skipped)
+TAILWIND_UTILITY_PATTERN = re.compile(r'^(?:[\w-]+:)*(?:bg-|text-|p-|m-|w-|h-|flex|grid)')
+INVALID_TAILWIND_PATTERNS = [
+    re.compile(r'^(?:[\w-]+:)*bg-\d+-\d+'),   # Invalid color format
+    re.compile(r'^(?:[\w-]+:)*text-\d+px'),    # Invalid size format
+]
+
 
 class SyntaxValidationMode(Enum):
     """Modes for syntax validation."""
@@ -263,7 +272,7 @@ class RealtimeSyntaxValidator:
         warnings = []
         suggestions = []
         
-        import_lines = [line.strip() for line in code.split('\n') if line.strip().startswith('import')]
+        import_lines = get_validation_context(code).import_lines
         
         for i, line in enumerate(import_lines):
             # Check for missing semicolon
@@ -300,7 +309,7 @@ class RealtimeSyntaxValidator:
         warnings = []
         suggestions = []
         
-        import_lines = [line.strip() for line in code.split('\n') if line.strip().startswith('import')]
+        import_lines = get_validation_context(code).import_lines
         
         # Check if React import is first
         if import_lines and not any('react' in line.lower() for line in import_lines[:1]):
@@ -359,27 +368,13 @@ class RealtimeSyntaxValidator:
         warnings = []
         suggestions = []
         
+        parsed = get_validation_context(code)
+        
         # Check if React import is present
-        has_react_import = any(pattern in code for pattern in [
-            "import React from 'react'",
-            'import React from "react"',
-            "import * as React from 'react'",
-            'import * as React from "react"',
-            "from 'react'",
-            'from "react"'
-        ])
-        
-        # Detect JSX usage patterns that require React
-        jsx_patterns = [
-            r'<[A-Z][a-zA-Z0-9]*[^>]*>',  # React components (PascalCase)
-            r'<[a-z][a-zA-Z0-9]*[^>]*>',  # HTML elements
-            r'<Fragment',                  # React Fragment
-            r'<React\.',                   # React.Component usage
-            r'<>',                         # Fragment shorthand
-            r'</>'                         # Fragment shorthand closing
-        ]
+        has_react_import = bool(parsed.imports_from('react'))
         
-        has_jsx = any(re.search(pattern, code) for pattern in jsx_patterns)
+        # Detect JSX usage (elements, components and fragments) that requires React
+        has_jsx = bool(parsed.jsx_elements)
         
         # Check for React hooks usage
         react_hooks = [
@@ -388,7 +383,8 @@ class RealtimeSyntaxValidator:
             'useDebugValue', 'useDeferredValue', 'useTransition', 'useId'
         ]
         
-        uses_hooks = any(hook in code for hook in react_hooks)
+        used_hooks = [hook for hook in react_hooks if hook in parsed.hook_names]
+        uses_hooks = bool(used_hooks)
         
         # Check for React types usage (TypeScript)
         react_types = [
@@ -407,8 +403,7 @@ class RealtimeSyntaxValidator:
             if has_jsx:
                 reasons.append("JSX usage")
             if uses_hooks:
-                hook_matches = [hook for hook in react_hooks if hook in code]
-                reasons.append(f"React hooks: {', '.join(hook_matches[:3])}")
+                reasons.append(f"React hooks: {', '.join(used_hooks[:3])}")
             if uses_react_types:
                 reasons.append("React TypeScript types")
             
@@ -446,10 +441,9 @@ class RealtimeSyntaxValidator:
         
         # Check for hook imports when only hooks are used
         if uses_hooks and not has_jsx and not uses_react_types:
-            hook_list = [hook for hook in react_hooks if hook in code]
-            if len(hook_list) <= 3:  # For small number of hooks, suggest named imports
+            if len(used_hooks) <= 3:  # For small number of hooks, suggest named imports
                 suggestions.append(
-                    f"Consider named imports for hooks: import {{ {', '.join(hook_list)} }} from 'react';"
+                    f"Consider named imports for hooks: import {{ {', '.join(used_hooks)} }} from 'react';"
                 )
         
         return {
@@ -674,13 +668,17 @@ class RealtimeSyntaxValidator:
         warnings = []
         
         # Check for inline arrow functions in event handlers
-        inline_handler_pattern = r'on\w+={[^}]*=>[^}]*}'
-        if re.search(inline_handler_pattern, code):
+        inline_handler = next((
+            element for element in get_validation_context(code).jsx_elements
+            if any(name.startswith('on') and value and '=>' in value
+                   for name, value in element.attributes.items())
+        ), None)
+        if inline_handler:
             warnings.append(ValidationIssue(
                 ValidationLevel.WARNING,
                 "Inline arrow functions in event handlers can cause unnecessary re-renders",
                 "inline_event_handler",
-                0,
+                inline_handler.line,
                 "Consider extracting event handlers to useCallback or component methods"
             ))
         
@@ -714,12 +712,15 @@ class RealtimeSyntaxValidator:
         warnings = []
         
         # Check for className instead of class
-        if 'class=' in code and 'className=' not in code:
+        class_element = next(
+            (element for element in get_validation_context(code).jsx_elements if 'class' in element.attributes), None
+        )
+        if class_element:
             errors.append(ValidationIssue(
                 ValidationLevel.ERROR,
                 "Use 'className' instead of 'class' in JSX",
                 "jsx_class_attribute",
-                0,
+                class_element.line,
                 "Replace 'class=' with 'className=' in JSX elements"
             ))
         
@@ -733,14 +734,14 @@ class RealtimeSyntaxValidator:
         
         if context.styling_system == "chakra":
             # Check for Tailwind-like classes in Chakra components
-            tailwind_classes = ['bg-', 'text-', 'p-', 'm-', 'w-', 'h-', 'flex', 'grid']
-            for tw_class in tailwind_classes:
-                if f'{tw_class}' in code and 'className=' in code:
+            for literal in get_validation_context(code).class_names:
+                tw_class = next((cls for cls in literal.classes if TAILWIND_UTILITY_PATTERN.match(cls)), None)
+                if tw_class:
                     warnings.append(ValidationIssue(
                         ValidationLevel.WARNING,
                         f"Consider using Chakra UI props instead of className with '{tw_class}' classes",
                         "styling_system_mixing",
-                        0,
+                        literal.line,
                         "Use Chakra UI's built-in styling props for consistency"
                     ))
                     break
@@ -813,9 +814,10 @@ class RealtimeSyntaxValidator:
         
         if context.framework == "nextjs":
             # Check for client-side hooks in server components
-            client_hooks = ['useState', 'useEffect', 'useContext', 'useReducer']
-            has_client_hooks = any(hook in code for hook in client_hooks)
-            has_use_client = "'use client'" in code or '"use client"' in code
+            parsed = get_validation_context(code)
+            client_hooks = {'useState', 'useEffect', 'useContext', 'useReducer'}
+            has_client_hooks = bool(client_hooks & parsed.hook_names)
+            has_use_client = 'use client' in parsed.directives
             
             if has_client_hooks and not has_use_client:
                 warnings.append(ValidationIssue(
@@ -835,15 +837,16 @@ class RealtimeSyntaxValidator:
         warnings = []
         
         # Check for unclosed JSX tags
-        jsx_tag_pattern = r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*>'
-        closing_tag_pattern = r'</([a-zA-Z][a-zA-Z0-9]*)>'
+        closing_tag_pattern = r'</([a-zA-Z][\w.]*)>'
         
-        opening_tags = re.findall(jsx_tag_pattern, code)
-        closing_tags = re.findall(closing_tag_pattern, code)
+        elements = get_validation_context(code).jsx_elements
+        opening_tags = [element.tag for element in elements if element.tag and not element.self_closing]
+        self_closed_tags = {element.tag for element in elements if element.self_closing}
+        closing_tags = set(re.findall(closing_tag_pattern, code))
         
         # Check for mismatched tags (basic check)
         for tag in opening_tags:
-            if tag not in closing_tags and not re.search(f'<{tag}[^>]*/>', code):
+            if tag not in closing_tags and tag not in self_closed_tags:
                 # Might be self-closing or mismatched
                 if tag.lower() not in ['img', 'br', 'hr', 'input', 'meta', 'link']:
                     warnings.append(ValidationIssue(
@@ -872,26 +875,29 @@ class RealtimeSyntaxValidator:
         errors = []
         warnings = []
         
+        parsed = get_validation_context(code)
+        
         # Check for missing key props in mapped elements
-        if '.map(' in code and 'key=' not in code:
+        for element in parsed.unkeyed_mapped_elements():
             warnings.append(ValidationIssue(
                 ValidationLevel.WARNING,
-                "Missing key prop in mapped JSX elements",
+                f"Missing key prop in mapped JSX element <{element.tag}>",
                 "missing_key_prop",
-                0,
+                element.line,
                 "Add unique key prop to mapped elements"
             ))
         
         # Check for invalid attribute names
-        invalid_attrs = re.findall(r'(class|for)=', code)
-        for attr in invalid_attrs:
-            errors.append(ValidationIssue(
-                ValidationLevel.ERROR,
-                f"Invalid JSX attribute '{attr}' - use '{attr}Name' instead",
-                "invalid_jsx_attribute",
-                0,
-                f"Replace '{attr}=' with '{'className' if attr == 'class' else 'htmlFor'}='"
-            ))
+        for element in parsed.jsx_elements:
+            for attr in ('class', 'for'):
+                if attr in element.attributes:
+                    errors.append(ValidationIssue(
+                        ValidationLevel.ERROR,
+                        f"Invalid JSX attribute '{attr}' - use '{attr}Name' instead",
+                        "invalid_jsx_attribute",
+                        element.line,
+                        f"Replace '{attr}=' with '{'className' if attr == 'class' else 'htmlFor'}='"
+                    ))
         
         return {
             "errors": errors,
@@ -907,32 +913,32 @@ class RealtimeSyntaxValidator:
         errors = []
         warnings = []
         
+        class_names = get_validation_context(code).class_names
+        
         if context.styling_system == "chakra":
             # Check for Tailwind classes in Chakra components
-            tailwind_pattern = r'className=["\'][^"\']*(?:bg-|text-|p-|m-|w-|h-|flex|grid)[^"\']*["\']'
-            if re.search(tailwind_pattern, code):
+            conflict = next((literal for literal in class_names
+                             if any(TAILWIND_UTILITY_PATTERN.match(cls) for cls in literal.classes)), None)
+            if conflict:
                 errors.append(ValidationIssue(
                     ValidationLevel.ERROR,
                     "Tailwind classes found in Chakra UI component",
                     "styling_system_conflict",
-                    0,
+                    conflict.line,
                     "Use Chakra UI props instead of Tailwind classes"
                 ))
         
         elif context.styling_system == "tailwind":
             # Check for invalid Tailwind class patterns
-            invalid_patterns = [
-                r'className=["\'][^"\']*bg-\d+-\d+[^"\']*["\']',  # Invalid color format
-                r'className=["\'][^"\']*text-\d+px[^"\']*["\']'    # Invalid size format
-            ]
-            
-            for pattern in invalid_patterns:
-                if re.search(pattern, code):
+            for pattern in INVALID_TAILWIND_PATTERNS:
+                invalid = next((literal for literal in class_names
+                                if any(pattern.match(cls) for cls in literal.classes)), None)
+                if invalid:
                     warnings.append(ValidationIssue(
                         ValidationLevel.WARNING,
                         "Potentially invalid Tailwind class detected",
                         "invalid_tailwind_class",
-                        0,
+                        invalid.line,
                         "Use valid Tailwind CSS class names"
                     ))
         
@@ -1162,11 +1168,7 @@ class RealtimeSyntaxValidator:
     def _add_key_props(self, code: str) -> str:
         """Add key props to mapped JSX elements."""
         
-        # Basic pattern to add key props
-        map_pattern = r'(\.map\([^}]+=>\s*<)(\w+)([^>]*?)>'
-        replacement = r'\1\2 key={index}\3>'
-        
-        return re.sub(map_pattern, replacement, code)
+        return add_missing_keys(get_validation_context(code))
     
     def _fix_component_naming(self, code: str) -> str:
         """Fix component naming to follow PascalCase."""
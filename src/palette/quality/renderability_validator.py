@@ -17,8 +17,12 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+from .validation_context import VOID_ELEMENTS, get_validation_context
 from .validator import ValidationIssue, ValidationLevel
 
+# Tailwind utilities that conflict with Chakra UI style props
+CHAKRA_TAILWIND_CLASS_PATTERN = re.compile(r"(?:bg-\w+|text-\w+|p-\d+|m-\d+|flex|grid)\b")
+
 
 class RenderError(Enum):
     """Types of rendering errors that can occur."""
@@ -276,35 +280,33 @@ class RenderabilityValidator:
         """Check for JSX-specific syntax issues."""
 
         errors = []
-        lines = code.split("\n")
+        context = get_validation_context(code)
 
-        for i, line in enumerate(lines, 1):
-            # Check for unclosed JSX tags
-            if "<" in line and ">" in line:
-                # Basic check for self-closing tags that should be self-closed
-                if any(tag in line for tag in ["<br>", "<img>", "<input>", "<hr>"]):
-                    if not line.strip().endswith("/>") and not "></":
-                        errors.append(
-                            ValidationIssue(
-                                ValidationLevel.ERROR,
-                                f"Self-closing tag should end with '/>' on line {i}",
-                                "jsx_syntax",
-                                i,
-                                "Add '/>' to self-closing tags",
-                            )
+        # Check for void elements that are neither self-closed nor closed
+        for element in context.jsx_elements:
+            if element.tag in VOID_ELEMENTS and not element.self_closing:
+                if not re.match(rf"\s*</{element.tag}\s*>", code[element.end:]):
+                    errors.append(
+                        ValidationIssue(
+                            ValidationLevel.ERROR,
+                            f"Self-closing tag should end with '/>' on line {element.line}",
+                            "jsx_syntax",
+                            element.line,
+                            "Add '/>' to self-closing tags",
                         )
-
-            # Check for missing key props in lists
-            if "map(" in line and "key=" not in line:
-                errors.append(
-                    ValidationIssue(
-                        ValidationLevel.WARNING,
-                        f"Missing 'key' prop in mapped element on line {i}",
-                        "jsx_key",
-                        i,
-                        "Add unique 'key' prop to mapped elements",
                     )
+
+        # Check for missing key props on elements returned from .map callbacks
+        for element in context.unkeyed_mapped_elements():
+            errors.append(
+                ValidationIssue(
+                    ValidationLevel.WARNING,
+                    f"Missing 'key' prop in mapped element on line {element.line}",
+                    "jsx_key",
+                    element.line,
+                    "Add unique 'key' prop to mapped elements",
                 )
+            )
 
         return errors
 
@@ -312,7 +314,7 @@ class RenderabilityValidator:
         """Check for common syntax mistakes."""
 
         errors = []
-        lines = code.split("\n")
+        lines = get_validation_context(code).lines
 
         for i, line in enumerate(lines, 1):
             # Check for incorrect export syntax
@@ -346,11 +348,9 @@ class RenderabilityValidator:
         """Validate that all imports can be resolved."""
 
         errors = []
-        import_lines = re.findall(
-            r'^import\s+.*from\s+[\'"]([^\'"]+)[\'"];?', code, re.MULTILINE
-        )
+        import_paths = [node.source for node in get_validation_context(code).imports]
 
-        for import_path in import_lines:
+        for import_path in import_paths:
             if import_path.startswith("."):
                 # Relative import - would need actual file system check
                 continue
@@ -388,12 +388,14 @@ class RenderabilityValidator:
         framework = self.project_config.get("framework")
 
         if framework == "nextjs":
+            context = get_validation_context(code)
+
             # Check for 'use client' directive
-            has_client_hooks = any(
-                hook in code
-                for hook in ["useState", "useEffect", "onClick", "onChange"]
+            has_client_hooks = bool({"useState", "useEffect"} & context.hook_names) or any(
+                "onClick" in element.attributes or "onChange" in element.attributes
+                for element in context.jsx_elements
             )
-            has_use_client = '"use client"' in code or "'use client'" in code
+            has_use_client = "use client" in context.directives
 
             if has_client_hooks and not has_use_client:
                 errors.append(
@@ -407,19 +409,24 @@ class RenderabilityValidator:
                 )
 
             # Check for proper Next.js imports
-            if "next/image" in code or "next/link" in code:
-                # Validate proper usage
-                if (
-                    "import Image from" in code
-                    and "width=" not in code
-                    and "height=" not in code
-                ):
+            image_imports = [node.default for node in context.imports_from("next/image") if node.default]
+            if image_imports:
+                # Validate proper usage: fixed-size images need both dimensions
+                unsized = [
+                    element
+                    for element in context.jsx_elements
+                    if element.tag in image_imports
+                    and not element.has_spread
+                    and "fill" not in element.attributes
+                    and ("width" not in element.attributes or "height" not in element.attributes)
+                ]
+                if unsized:
                     errors.append(
                         ValidationIssue(
                             ValidationLevel.ERROR,
                             "Next.js Image component requires width and height props",
                             "nextjs_image_props",
-                            0,
+                            unsized[0].line,
                             "Add width and height props to Image component",
                         )
                     )
@@ -483,15 +490,9 @@ class RenderabilityValidator:
 
         if styling == "chakra":
             # Check for Tailwind classes in Chakra component
-            tailwind_patterns = [
-                r'className="[^"]*\b(bg-\w+|text-\w+|p-\d+|m-\d+|flex|grid)\b',
-                r"className='[^']*\b(bg-\w+|text-\w+|p-\d+|m-\d+|flex|grid)\b",
-            ]
-
-            for pattern in tailwind_patterns:
-                matches = re.finditer(pattern, code)
-                for match in matches:
-                    line_num = code[: match.start()].count("\n") + 1
+            for literal in get_validation_context(code).class_names:
+                if any(CHAKRA_TAILWIND_CLASS_PATTERN.match(cls.rsplit(":", 1)[-1]) for cls in literal.classes):
+                    line_num = literal.line
                     errors.append(
                         ValidationIssue(
                             ValidationLevel.ERROR,
@@ -535,7 +536,7 @@ class RenderabilityValidator:
             )
 
         # Check for accessibility issues
-        if "<img" in code and "alt=" not in code:
+        if self._has_image_without_alt(code):
             warnings.append(
                 ValidationIssue(
                     ValidationLevel.WARNING,
@@ -750,7 +751,7 @@ class RenderabilityValidator:
             score += 0.1
 
         # Missing accessibility features
-        if "<img" in code and "alt=" not in code:
+        if self._has_image_without_alt(code):
             score -= 0.2
         if (
             "<button" in code
@@ -764,9 +765,10 @@ class RenderabilityValidator:
     def _estimate_complexity(self, code: str) -> str:
         """Estimate component complexity."""
 
-        lines = len(code.split("\n"))
-        hooks = code.count("use")
-        jsx_elements = code.count("<")
+        context = get_validation_context(code)
+        lines = len(context.lines)
+        hooks = len(context.hooks)
+        jsx_elements = len(context.jsx_elements)
 
         if lines < 50 and hooks < 3 and jsx_elements < 10:
             return "simple"
@@ -774,3 +776,10 @@ class RenderabilityValidator:
             return "medium"
         else:
             return "complex"
+
+    @staticmethod
+    def _has_image_without_alt(code: str) -> bool:
+        return any(
+            "alt" not in element.attributes and not element.has_spread
+            for element in get_validation_context(code).elements("img")
+        )
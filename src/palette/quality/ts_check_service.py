@@ -0,0 +1,165 @@
+"""
+Warm TypeScript compile-check service.
+
+``npx tsc --noEmit`` pays for npx resolution and a full program build on every
+call. Instead, each project gets a small pool of ``ts_check_service.js``
+workers that keep a TypeScript LanguageService warm and type-check in-memory
+source text, so repeated checks (e.g. every iterative refinement pass) only
+re-check the changed file.
+"""
+
+import atexit
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..utils.node_worker import NodeJsonWorker, NodeWorkerError
+
+SERVICE_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils", "ts_check_service.js"
+)
+
+# Workers per project; concurrent checks beyond this wait for a free worker
+DEFAULT_POOL_SIZE = 2
+
+
+class TypeScriptUnavailableError(NodeWorkerError):
+    """Raised when Node.js or the project's TypeScript package is missing."""
+    pass
+
+
+class TypeScriptCheckService(NodeJsonWorker):
+    """One warm LanguageService for a project."""
+
+    def __init__(self, project_path: str, node_command: str = "node"):
+        self.project_path = os.path.abspath(project_path)
+        super().__init__(
+            SERVICE_SCRIPT,
+            ["--project", self.project_path],
+            node_command=node_command,
+            cwd=self.project_path,
+        )
+
+    def check(self, code: str, file_name: str, timeout: float = 30) -> List[Dict[str, Any]]:
+        """
+        Type-check source text as if it lived at ``file_name``.
+
+        Returns:
+            Diagnostics as dicts with code, category, message, line and column
+
+        Raises:
+            TypeScriptUnavailableError: Node.js or TypeScript is not installed
+            TimeoutError: The worker did not answer in time
+            NodeWorkerError: The worker failed
+        """
+        try:
+            response = self.call(
+                {"method": "check", "fileName": file_name, "code": code}, timeout
+            )
+        except FileNotFoundError as e:
+            raise TypeScriptUnavailableError(f"Node.js not found: {e}")
+
+        if response.get("code") == "typescript_not_found":
+            raise TypeScriptUnavailableError(response.get("error", "TypeScript not found"))
+        if "error" in response:
+            raise NodeWorkerError(response["error"])
+        return response.get("result", {}).get("diagnostics", [])
+
+
+class TypeScriptCheckPool:
+    """Pool of warm check services for one project."""
+
+    def __init__(self, project_path: str, size: Optional[int] = None):
+        self.project_path = os.path.abspath(project_path)
+        self.size = max(1, size or int(os.getenv("PALETTE_TSC_WORKERS", DEFAULT_POOL_SIZE)))
+
+        self._idle: "queue.Queue[TypeScriptCheckService]" = queue.Queue()
+        self._services: List[TypeScriptCheckService] = []
+        self._lock = threading.Lock()
+
+        # Set once Node.js/TypeScript turned out to be missing
+        self.unavailable_reason: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        return self.unavailable_reason is None
+
+    def check(self, code: str, target_path: str, timeout: float = 30) -> List[Dict[str, Any]]:
+        """
+        Type-check ``code`` on the first free service.
+
+        ``target_path`` decides how relative imports and path aliases resolve;
+        targets outside the project are checked at the project root.
+        """
+        if self.unavailable_reason:
+            raise TypeScriptUnavailableError(self.unavailable_reason)
+
+        service = self._acquire(timeout)
+        try:
+            return service.check(code, self._virtual_file_name(target_path), timeout)
+        except TypeScriptUnavailableError as e:
+            self.unavailable_reason = str(e)
+            raise
+        finally:
+            self._idle.put(service)
+
+    def close(self):
+        with self._lock:
+            for service in self._services:
+                service.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "project_path": self.project_path,
+            "size": self.size,
+            "started": len(self._services),
+            "available": self.available,
+            "services": [service.get_stats() for service in self._services],
+        }
+
+    def _acquire(self, timeout: float) -> TypeScriptCheckService:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Grow the pool lazily up to its size
+        with self._lock:
+            if len(self._services) < self.size:
+                service = TypeScriptCheckService(self.project_path)
+                self._services.append(service)
+                return service
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No TypeScript check service became free in time")
+
+    def _virtual_file_name(self, target_path: str) -> str:
+        abs_target = os.path.abspath(os.path.join(self.project_path, target_path))
+        if not abs_target.startswith(self.project_path + os.sep):
+            abs_target = os.path.join(self.project_path, "__palette_check__.tsx")
+        if not abs_target.endswith((".ts", ".tsx")):
+            abs_target = os.path.splitext(abs_target)[0] + ".tsx"
+        return abs_target
+
+
+_pools: Dict[str, TypeScriptCheckPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_ts_check_pool(project_path: str) -> TypeScriptCheckPool:
+    """Get the process-wide check pool for a project, creating it on first use."""
+    key = os.path.abspath(project_path)
+    with _pools_lock:
+        if key not in _pools:
+            if not _pools:
+                atexit.register(_close_pools)
+            _pools[key] = TypeScriptCheckPool(key)
+        return _pools[key]
+
+
+def _close_pools():
+    for pool in list(_pools.values()):
+        pool.close()
@@ -0,0 +1,755 @@
+"""
+Parse-once view of generated code shared by the quality validators.
+
+Validators used to split the code into lines and run their own regexes over
+the raw string, check by check. ``ValidationContext`` parses a code string
+once - with the tree-sitter TSX grammar when it is installed, with a small
+compiled-regex scanner otherwise - and caches the node queries the checks
+need:
+
+- ``imports``: import declarations with their source and bound names
+- ``jsx_elements``: opening and self-closing JSX elements with their
+  attributes, and whether each is the element returned by a ``.map`` callback
+- ``class_names``: string literals inside ``className`` attributes
+- ``hooks``: hook calls (``useState``, ``React.useMemo``, custom ``useX``)
+- ``regions``: the import prologue and the body after it, with content
+  hashes, so results can be memoized per region (see ``validation_memo``)
+
+``get_validation_context`` keeps the contexts of recently seen code, so every
+validator run over the same code shares one parse.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .rule_engine import CodeView
+from .validation_memo import content_hash
+
+try:
+    import tree_sitter as ts
+    import tree_sitter_languages as tsl
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+# Code strings whose parsed context is kept
+VALIDATION_CONTEXT_CACHE_SIZE = 16
+
+# Elements that never have children and must be self-closed in JSX
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+})
+
+_IMPORT_PATTERN = re.compile(
+    r"^[ \t]*import\s+(?:(type)\s+)?(?:([^;'\"]*?)\s*from\s*)?(['\"])([^'\"\n]+)\3", re.MULTILINE
+)
+_NAMESPACE_IMPORT_PATTERN = re.compile(r"\*\s*as\s+([\w$]+)")
+_NAMED_IMPORTS_PATTERN = re.compile(r"\{([^}]*)\}")
+# "<" starting a JSX element: not a generic argument (Array<T>, useState<T>)
+_JSX_OPEN_PATTERN = re.compile(r"(?<![\w$.)\]])<(>|[A-Za-z][\w.:-]*)")
+_JSX_ATTR_NAME_PATTERN = re.compile(r"[A-Za-z_$][\w$:.-]*")
+# Attribute values up to three brace levels deep; deeper tags use the slow scanner
+_JSX_STRING = r"\"[^\"]*\"|'[^']*'|`[^`]*`"
+_JSX_ATTR_VALUE = (
+    rf"\"[^\"]*\"|'[^']*'"
+    rf"|\{{(?:[^{{}}\"'`]|{_JSX_STRING}|\{{(?:[^{{}}\"'`]|{_JSX_STRING}|\{{[^{{}}\"'`]*\}})*\}})*\}}"
+)
+_JSX_ATTR_PATTERN = re.compile(
+    rf"([A-Za-z_$][\w$:.-]*)(?:\s*=\s*({_JSX_ATTR_VALUE}))?|\{{\s*(\.\.\.)[^{{}}]*\}}"
+)
+_JSX_TAG_BODY_PATTERN = re.compile(
+    rf"(?:\s+(?:[A-Za-z_$][\w$:.-]*(?:\s*=\s*(?:{_JSX_ATTR_VALUE}))?|\{{\s*\.\.\.[^{{}}]*\}}))*\s*(/?)>"
+)
+_MAP_CALLBACK_PATTERN = re.compile(
+    r"\.map\(\s*(?:async\s+)?"
+    r"(?:function\s*\(([^()]*)\)|\(([^()]*)\)|([A-Za-z_$][\w$]*))"
+    r"\s*(?::\s*[^=(){}]+?)?\s*(=>)?\s*"
+)
+_RETURN_JSX_PATTERN = re.compile(r"\breturn\s*(?:\(\s*)*<")
+_HOOK_CALL_PATTERN = re.compile(r"(?<![\w$])(?:React\.)?(use[A-Z][\w$]*)\s*(?:<[^()]*?>)?\s*\(")
+_FUNCTION_KEYWORD_PATTERN = re.compile(r"function\s*\*?\s*$")
+_DIRECTIVE_PATTERN = re.compile(r"^[ \t]*(['\"])(use [a-z]+)\1;?[ \t]*$", re.MULTILINE)
+_STRING_LITERAL_PATTERN = re.compile(r"\"((?:[^\"\\\n]|\\.)*)\"|'((?:[^'\\\n]|\\.)*)'|`((?:[^`\\]|\\.)*)`")
+_TEMPLATE_SUBSTITUTION_PATTERN = re.compile(r"\$\{[^}]*\}")
+_HOOK_NAME_PATTERN = re.compile(r"use[A-Z][\w$]*$")
+
+_context_cache: "OrderedDict[str, ValidationContext]" = OrderedDict()
+_context_cache_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+@dataclass
+class ImportNode:
+    """One import declaration."""
+    source: str
+    line: int
+    end_line: int
+    default: Optional[str] = None
+    names: List[str] = field(default_factory=list)
+    namespace: Optional[str] = None
+    type_only: bool = False
+
+    @property
+    def bindings(self) -> List[str]:
+        """Every local name the declaration binds."""
+        bound = [self.default] if self.default else []
+        bound.extend(self.names)
+        if self.namespace:
+            bound.append(self.namespace)
+        return bound
+
+
+@dataclass
+class JSXElementNode:
+    """Opening (or self-closing) tag of one JSX element; ``tag`` is "" for ``<>``."""
+    tag: str
+    line: int
+    start: int
+    name_end: int
+    end: int
+    attributes: Dict[str, Optional[str]] = field(default_factory=dict)
+    self_closing: bool = False
+    has_spread: bool = False
+    in_map: bool = False
+    map_params: Tuple[str, ...] = ()
+    # Callback parameter list as (start, end, parenthesized); inside the parentheses
+    map_params_span: Optional[Tuple[int, int, bool]] = None
+
+
+@dataclass
+class ClassNameLiteral:
+    """String literal inside a ``className`` attribute."""
+    value: str
+    line: int
+
+    @property
+    def classes(self) -> List[str]:
+        return self.value.split()
+
+
+@dataclass
+class HookCall:
+    name: str
+    line: int
+
+
+@dataclass
+class CodeRegion:
+    """Consecutive lines of the code; ``start_line`` is 1-based."""
+    name: str
+    start_line: int
+    text: str
+    digest: str
+
+
+class ValidationContext:
+    """
+    One code string, parsed once for every validator.
+
+    Node queries are computed on first access. ``parser`` tells which
+    backend produced them ("tree-sitter" or "regex").
+    """
+
+    def __init__(self, code: str):
+        self.code = code
+        self.view = CodeView(code)
+        self.parser: Optional[str] = None
+        self._imports: List[ImportNode] = []
+        self._jsx_elements: List[JSXElementNode] = []
+        self._class_names: List[ClassNameLiteral] = []
+        self._hooks: List[HookCall] = []
+        self._parsed = False
+        self._import_lines: Optional[List[str]] = None
+        self._directives: Optional[Dict[str, int]] = None
+        self._regions: Optional[Dict[str, CodeRegion]] = None
+
+    @property
+    def lines(self) -> List[str]:
+        return self.view.lines
+
+    def line_of(self, offset: int) -> int:
+        return self.view.line_of(offset)
+
+    @property
+    def imports(self) -> List[ImportNode]:
+        self._ensure_parsed()
+        return self._imports
+
+    @property
+    def jsx_elements(self) -> List[JSXElementNode]:
+        self._ensure_parsed()
+        return self._jsx_elements
+
+    @property
+    def class_names(self) -> List[ClassNameLiteral]:
+        self._ensure_parsed()
+        return self._class_names
+
+    @property
+    def hooks(self) -> List[HookCall]:
+        self._ensure_parsed()
+        return self._hooks
+
+    @property
+    def hook_names(self) -> Set[str]:
+        return {hook.name for hook in self.hooks}
+
+    @property
+    def import_lines(self) -> List[str]:
+        """Stripped source lines starting with ``import``, parseable or not."""
+        if self._import_lines is None:
+            self._import_lines = [line.strip() for line in self.lines if line.strip().startswith("import")]
+        return self._import_lines
+
+    @property
+    def directives(self) -> Dict[str, int]:
+        """First 0-based line of each ``'use ...'`` directive, e.g. ``{"use client": 0}``."""
+        if self._directives is None:
+            directives: Dict[str, int] = {}
+            for match in _DIRECTIVE_PATTERN.finditer(self.code):
+                directives.setdefault(match.group(2), self.line_of(match.start()) - 1)
+            self._directives = directives
+        return self._directives
+
+    @property
+    def regions(self) -> Dict[str, CodeRegion]:
+        """
+        ``header`` (directives and imports, up to the last of them), ``body``
+        (everything after) and ``full`` (the whole code).
+
+        When other statements sit between the imports, the body starts at the
+        top so that it still holds every non-import line.
+        """
+        if self._regions is None:
+            header_end = max(
+                [node.end_line for node in self.imports] + [line + 1 for line in self.directives.values()],
+                default=0,
+            )
+            prologue = set(self.directives.values())
+            for node in self.imports:
+                prologue.update(range(node.line - 1, node.end_line))
+            body_start = header_end
+            if any(
+                index not in prologue and self.lines[index].strip()
+                and not self.lines[index].lstrip().startswith(("//", "/*", "*"))
+                for index in range(header_end)
+            ):
+                body_start = 0
+            header = "\n".join(self.lines[:header_end])
+            body = "\n".join(self.lines[body_start:])
+            self._regions = {
+                "header": CodeRegion("header", 1, header, content_hash(header)),
+                "body": CodeRegion("body", body_start + 1, body, content_hash(body)),
+                "full": CodeRegion("full", 1, self.code, content_hash(self.code)),
+            }
+        return self._regions
+
+    def imports_from(self, source: str) -> List[ImportNode]:
+        return [node for node in self.imports if node.source == source]
+
+    def imported_names(self) -> Set[str]:
+        return {name for node in self.imports for name in node.bindings}
+
+    def duplicate_imports(self) -> Dict[str, List[ImportNode]]:
+        """Sources imported by more than one value (or more than one type) declaration."""
+        groups: Dict[Tuple[str, bool], List[ImportNode]] = {}
+        for node in self.imports:
+            groups.setdefault((node.source, node.type_only), []).append(node)
+        duplicates: Dict[str, List[ImportNode]] = {}
+        for (source, _), nodes in groups.items():
+            if len(nodes) > 1:
+                duplicates.setdefault(source, []).extend(nodes)
+        return duplicates
+
+    def elements(self, tag: str) -> List[JSXElementNode]:
+        return [element for element in self.jsx_elements if element.tag == tag]
+
+    def unkeyed_mapped_elements(self) -> List[JSXElementNode]:
+        """Elements returned from ``.map`` callbacks without a ``key`` prop."""
+        return [
+            element for element in self.jsx_elements
+            if element.in_map and "key" not in element.attributes and not element.has_spread
+        ]
+
+    def _ensure_parsed(self):
+        if self._parsed:
+            return
+        collected = None
+        if TREE_SITTER_AVAILABLE:
+            try:
+                collected = _TreeSitterCollector(self).collect()
+                self.parser = "tree-sitter"
+            except Exception as e:
+                print(f"⚠️ Tree-sitter parsing failed, using regex scan: {e}")
+        if collected is None:
+            collected = _RegexCollector(self).collect()
+            self.parser = "regex"
+        self._imports, self._jsx_elements, self._class_names, self._hooks = collected
+        self._parsed = True
+
+
+def get_validation_context(code: str) -> ValidationContext:
+    """Shared context of ``code``, reused while it is among the recently validated strings."""
+    with _context_cache_lock:
+        context = _context_cache.get(code)
+        if context is not None:
+            _context_cache.move_to_end(code)
+            return context
+        context = ValidationContext(code)
+        _context_cache[code] = context
+        while len(_context_cache) > VALIDATION_CONTEXT_CACHE_SIZE:
+            _context_cache.popitem(last=False)
+        return context
+
+
+def add_missing_keys(context: ValidationContext, fallback_key: str = "index") -> str:
+    """
+    Code of ``context`` with a ``key`` prop on every unkeyed element returned
+    from a ``.map`` callback.
+
+    The callback's index parameter is used when it has one; otherwise an index
+    parameter (``fallback_key``, or a variant not used anywhere in the code) is
+    added to the callback. Elements whose callback cannot take one are skipped.
+    """
+    code = context.code
+    edits: Dict[int, Tuple[int, str]] = {}  # start -> (end, replacement)
+    added: Dict[Tuple[int, int, bool], str] = {}
+    for element in context.unkeyed_mapped_elements():
+        if not element.tag:
+            continue  # <>...</> cannot take a key
+        params = element.map_params
+        if len(params) > 1:
+            if not params[1]:
+                continue  # Destructured index
+            key = params[1]
+        else:
+            span = element.map_params_span
+            if span is None:
+                continue
+            if span not in added:
+                name = _unused_name(code, fallback_key)
+                edit = _add_index_param(code, span, name)
+                if edit is None:
+                    continue
+                added[span] = name
+                edits[span[0]] = edit
+            key = added[span]
+        edits[element.name_end] = (element.name_end, f" key={{{key}}}")
+
+    pieces, last = [], 0
+    for start in sorted(edits):
+        end, replacement = edits[start]
+        pieces.append(code[last:start])
+        pieces.append(replacement)
+        last = end
+    pieces.append(code[last:])
+    return "".join(pieces)
+
+
+def _unused_name(code: str, name: str) -> str:
+    """``name`` or ``name2``, ``name3``... whichever no identifier in the code uses."""
+    candidate, suffix = name, 1
+    while re.search(rf"(?<![\w$]){re.escape(candidate)}(?![\w$])", code):
+        suffix += 1
+        candidate = f"{name}{suffix}"
+    return candidate
+
+
+def _add_index_param(code: str, span: Tuple[int, int, bool], name: str) -> Optional[Tuple[int, str]]:
+    """Edit ``(end, replacement)`` starting at ``span[0]`` that appends an index parameter."""
+    start, end, parenthesized = span
+    params = code[start:end]
+    if not parenthesized:
+        return end, f"({params}, {name})"
+    stripped = params.rstrip()
+    if stripped.endswith(","):
+        stripped = stripped[:-1].rstrip()
+    if "..." in stripped:
+        return None  # A rest parameter must stay last
+    if not stripped.strip():
+        return end, f"_item, {name}"
+    return end, f"{stripped}, {name}"
+
+
+def _class_literals(value: str) -> List[str]:
+    """Static class strings of a ``className`` attribute value."""
+    if value[:1] in "\"'":
+        return [value[1:-1]]
+    literals = []
+    for match in _STRING_LITERAL_PATTERN.finditer(value):
+        double, single, template = match.groups()
+        if template is not None:
+            literals.append(_TEMPLATE_SUBSTITUTION_PATTERN.sub(" ", template))
+        else:
+            literals.append(double if double is not None else single)
+    return literals
+
+
+def _param_names(text: str) -> Tuple[str, ...]:
+    """Parameter names of a parameter list; "" for destructured parameters."""
+    names, depth, current = [], 0, []
+    for char in text + ",":
+        if char in "([{<":
+            depth += 1
+        elif char in ")]}>":
+            depth -= 1
+        elif char == "," and depth == 0:
+            param = "".join(current).strip()
+            if param:
+                name = re.split(r"[:=?]", param, 1)[0].strip()
+                names.append(name if re.fullmatch(r"[A-Za-z_$][\w$]*", name) else "")
+            current = []
+            continue
+        current.append(char)
+    return tuple(names)
+
+
+def _matching_brace(code: str, start: int) -> int:
+    """Index of the ``}`` closing the ``{`` at ``start``, or -1."""
+    depth, i, n = 0, start, len(code)
+    while i < n:
+        char = code[i]
+        if char in "\"'`":
+            i += 1
+            while i < n and code[i] != char:
+                i += 2 if code[i] == "\\" else 1
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+class _RegexCollector:
+    """Regex scan used when tree-sitter is not installed."""
+
+    def __init__(self, context: ValidationContext):
+        self.context = context
+        self.code = context.code
+
+    def collect(self):
+        imports = self._imports()
+        elements, class_names = self._jsx()
+        return imports, elements, class_names, self._hooks()
+
+    def _imports(self) -> List[ImportNode]:
+        imports = []
+        for match in _IMPORT_PATTERN.finditer(self.code):
+            type_only, clause, _, source = match.groups()
+            node = ImportNode(
+                source=source,
+                line=self.context.line_of(match.start()),
+                end_line=self.context.line_of(match.end()),
+                type_only=bool(type_only),
+            )
+            if clause:
+                namespace = _NAMESPACE_IMPORT_PATTERN.search(clause)
+                if namespace:
+                    node.namespace = namespace.group(1)
+                named = _NAMED_IMPORTS_PATTERN.search(clause)
+                if named:
+                    for spec in named.group(1).split(","):
+                        spec = re.sub(r"^\s*type\s+", "", spec).strip()
+                        if spec:
+                            node.names.append(spec.split(" as ")[-1].strip())
+                default = re.split(r"[,{*]", clause, 1)[0].strip()
+                if default:
+                    node.default = default
+            imports.append(node)
+        return imports
+
+    def _jsx(self) -> Tuple[List[JSXElementNode], List[ClassNameLiteral]]:
+        code = self.code
+        map_roots = self._map_roots()
+        elements, class_names = [], []
+        for match in _JSX_OPEN_PATTERN.finditer(code):
+            tag = match.group(1)
+            if tag == ">":
+                element = JSXElementNode(tag="", line=self.context.line_of(match.start()),
+                                         start=match.start(), name_end=match.start() + 1, end=match.end())
+            else:
+                scanned = self._scan_tag(match.end())
+                if scanned is None:
+                    continue
+                end, attributes, self_closing, has_spread = scanned
+                element = JSXElementNode(
+                    tag=tag, line=self.context.line_of(match.start()), start=match.start(),
+                    name_end=match.end(), end=end, self_closing=self_closing, has_spread=has_spread,
+                    attributes={name: value for name, value, _ in attributes},
+                )
+                for name, value, offset in attributes:
+                    if name == "className" and value:
+                        line = self.context.line_of(offset)
+                        class_names.extend(ClassNameLiteral(literal, line) for literal in _class_literals(value))
+            if element.start in map_roots:
+                element.in_map = True
+                element.map_params, element.map_params_span = map_roots[element.start]
+            elements.append(element)
+        return elements, class_names
+
+    def _scan_tag(self, i: int):
+        """Attributes of the tag whose name ends at ``i``; None when it is not a tag."""
+        body = _JSX_TAG_BODY_PATTERN.match(self.code, i)
+        if body is not None:
+            attributes, has_spread = [], False
+            for attr in _JSX_ATTR_PATTERN.finditer(self.code, i, body.start(1)):
+                if attr.group(3):
+                    has_spread = True
+                else:
+                    attributes.append((attr.group(1), attr.group(2), attr.start()))
+            return body.end(), attributes, bool(body.group(1)), has_spread
+        return self._scan_tag_slow(i)
+
+    def _scan_tag_slow(self, i: int):
+        """Character scan for tags the compiled pattern cannot follow (deep nesting)."""
+        code, n = self.code, len(self.code)
+        attributes, has_spread = [], False
+        while i < n:
+            char = code[i]
+            if char.isspace():
+                i += 1
+            elif char == ">":
+                return i + 1, attributes, False, has_spread
+            elif char == "/" and code.startswith(">", i + 1):
+                return i + 2, attributes, True, has_spread
+            elif char == "{":
+                close = _matching_brace(code, i)
+                if close < 0:
+                    return None
+                has_spread = has_spread or code[i + 1:close].lstrip().startswith("...")
+                i = close + 1
+            else:
+                name = _JSX_ATTR_NAME_PATTERN.match(code, i)
+                if name is None:
+                    return None
+                i = name.end()
+                while i < n and code[i].isspace():
+                    i += 1
+                value = None
+                if i < n and code[i] == "=":
+                    i += 1
+                    while i < n and code[i].isspace():
+                        i += 1
+                    if i >= n:
+                        return None
+                    if code[i] in "\"'":
+                        close = code.find(code[i], i + 1)
+                    elif code[i] == "{":
+                        close = _matching_brace(code, i)
+                    else:
+                        return None
+                    if close < 0:
+                        return None
+                    value = code[i:close + 1]
+                    i = close + 1
+                attributes.append((name.group(0), value, name.start()))
+        return None
+
+    def _map_roots(self) -> Dict[int, Tuple[Tuple[str, ...], Tuple[int, int, bool]]]:
+        """
+        Offset of the element each ``.map`` callback returns, with the callback's
+        parameters and parameter list span.
+        """
+        code = self.code
+        roots = {}
+        for match in _MAP_CALLBACK_PATTERN.finditer(code):
+            function_params, arrow_params, single_param, arrow = match.groups()
+            if function_params is None and not arrow:
+                continue
+            group = 1 if function_params is not None else 2 if arrow_params is not None else 3
+            params = (_param_names(match.group(group)), (match.start(group), match.end(group), group != 3))
+            i = match.end()
+            while i < len(code) and (code[i] == "(" or code[i].isspace()):
+                i += 1
+            if code.startswith("<", i):
+                roots[i] = params
+            elif code.startswith("{", i):
+                close = _matching_brace(code, i)
+                returned = _RETURN_JSX_PATTERN.search(code, i, close if close > 0 else len(code))
+                if returned:
+                    roots[returned.end() - 1] = params
+        return roots
+
+    def _hooks(self) -> List[HookCall]:
+        hooks = []
+        for match in _HOOK_CALL_PATTERN.finditer(self.code):
+            # Skip declarations: function useThing(
+            if _FUNCTION_KEYWORD_PATTERN.search(self.code, max(0, match.start() - 12), match.start()):
+                continue
+            hooks.append(HookCall(match.group(1), self.context.line_of(match.start())))
+        return hooks
+
+
+def _tsx_parser():
+    """Per-thread TSX parser (tree-sitter parsers are not thread-safe)."""
+    parser = getattr(_thread_state, "parser", None)
+    if parser is None:
+        parser = ts.Parser()
+        try:
+            language = tsl.get_language("tsx")
+        except Exception:
+            language = tsl.get_language("typescript")
+        parser.set_language(language)
+        _thread_state.parser = parser
+    return parser
+
+
+class _TreeSitterCollector:
+    """Single traversal of the tree-sitter TSX syntax tree."""
+
+    def __init__(self, context: ValidationContext):
+        self.context = context
+        self.source = context.code.encode("utf-8")
+        self._char_offsets: Optional[List[int]] = None
+        if not context.code.isascii():
+            offsets = []
+            for index, char in enumerate(context.code):
+                offsets.extend([index] * len(char.encode("utf-8")))
+            offsets.append(len(context.code))
+            self._char_offsets = offsets
+
+    def offset(self, byte_offset: int) -> int:
+        return byte_offset if self._char_offsets is None else self._char_offsets[byte_offset]
+
+    def text(self, node) -> str:
+        return self.source[node.start_byte:node.end_byte].decode("utf-8", "replace")
+
+    def collect(self):
+        tree = _tsx_parser().parse(self.source)
+        imports, elements, class_names, hooks = [], [], [], []
+        # Callback byte range -> (parameter names, parameter list span)
+        map_callbacks: Dict[Tuple[int, int], Tuple[Tuple[str, ...], Optional[Tuple[int, int, bool]]]] = {}
+
+        # (node, (parameters, parameter span) of the .map callback whose returned element
+        # is still ahead, whether that element is reachable: true in an expression body
+        # or under a return statement, false elsewhere in a statement body)
+        stack = [(tree.root_node, None, False)]
+        while stack:
+            node, map_info, returned = stack.pop()
+            kind = node.type
+            children = node.children
+
+            if kind == "import_statement":
+                imports.append(self._import(node))
+                continue
+
+            if kind in ("arrow_function", "function", "function_expression"):
+                map_info = map_callbacks.get((node.start_byte, node.end_byte))
+                body = node.child_by_field_name("body")
+                returned = body is not None and body.type != "statement_block"
+            elif kind == "return_statement":
+                returned = True
+            elif kind == "call_expression":
+                self._call(node, hooks, map_callbacks)
+            elif kind == "jsx_element":
+                # Only the opening tag is the element the callback returns
+                opening = children[0] if children else None
+                stack.extend(
+                    (child, map_info, returned) if child is opening else (child, None, False)
+                    for child in reversed(children)
+                )
+                continue
+            elif kind in ("jsx_opening_element", "jsx_self_closing_element"):
+                elements.append(self._element(node, map_info if returned else None, class_names))
+                map_info, returned = None, False
+
+            stack.extend((child, map_info, returned) for child in reversed(children))
+
+        elements.sort(key=lambda element: element.start)
+        return imports, elements, class_names, hooks
+
+    def _import(self, node) -> ImportNode:
+        source = node.child_by_field_name("source")
+        result = ImportNode(
+            source=self.text(source)[1:-1] if source is not None else "",
+            line=node.start_point[0] + 1,
+            end_line=node.end_point[0] + 1,
+            type_only=any(child.type == "type" for child in node.children),
+        )
+        for clause in node.children:
+            if clause.type != "import_clause":
+                continue
+            for part in clause.named_children:
+                if part.type == "identifier":
+                    result.default = self.text(part)
+                elif part.type == "namespace_import":
+                    names = [c for c in part.named_children if c.type == "identifier"]
+                    if names:
+                        result.namespace = self.text(names[-1])
+                elif part.type == "named_imports":
+                    for spec in part.named_children:
+                        if spec.type != "import_specifier":
+                            continue
+                        bound = spec.child_by_field_name("alias") or spec.child_by_field_name("name")
+                        if bound is not None:
+                            result.names.append(self.text(bound))
+        return result
+
+    def _call(self, node, hooks: List[HookCall], map_callbacks: Dict[Tuple[int, int], Any]):
+        function = node.child_by_field_name("function")
+        if function is None:
+            return
+        name_node = function
+        if function.type == "member_expression":
+            name_node = function.child_by_field_name("property")
+        if name_node is None:
+            return
+        name = self.text(name_node)
+        if _HOOK_NAME_PATTERN.match(name) and name_node.type in ("identifier", "property_identifier"):
+            hooks.append(HookCall(name, node.start_point[0] + 1))
+        elif name == "map" and function.type == "member_expression":
+            arguments = node.child_by_field_name("arguments")
+            callback = arguments.named_children[0] if arguments is not None and arguments.named_children else None
+            if callback is not None and callback.type in ("arrow_function", "function", "function_expression"):
+                map_callbacks[(callback.start_byte, callback.end_byte)] = self._params(callback)
+
+    def _params(self, function) -> Tuple[Tuple[str, ...], Optional[Tuple[int, int, bool]]]:
+        """Parameter names and the parameter list span (inside its parentheses)."""
+        single = function.child_by_field_name("parameter")
+        if single is not None:
+            return (self.text(single),), (self.offset(single.start_byte), self.offset(single.end_byte), False)
+        params = function.child_by_field_name("parameters")
+        if params is None:
+            return (), None
+        names = []
+        for param in params.named_children:
+            pattern = param.child_by_field_name("pattern") or param
+            names.append(self.text(pattern) if pattern.type == "identifier" else "")
+        span = (self.offset(params.start_byte) + 1, self.offset(params.end_byte) - 1, True)
+        return tuple(names), span
+
+    def _element(self, node, map_info, class_names: List[ClassNameLiteral]) -> JSXElementNode:
+        name = node.child_by_field_name("name")
+        start = self.offset(node.start_byte)
+        element = JSXElementNode(
+            tag=self.text(name) if name is not None else "",
+            line=node.start_point[0] + 1,
+            start=start,
+            name_end=self.offset(name.end_byte) if name is not None else start + 1,
+            end=self.offset(node.end_byte),
+            self_closing=node.type == "jsx_self_closing_element",
+            in_map=map_info is not None,
+            map_params=map_info[0] if map_info is not None else (),
+            map_params_span=map_info[1] if map_info is not None else None,
+        )
+        for attribute in node.named_children:
+            if attribute.type == "jsx_expression":
+                element.has_spread = element.has_spread or self.text(attribute)[1:].lstrip().startswith("...")
+                continue
+            if attribute.type != "jsx_attribute" or not attribute.named_children:
+                continue
+            parts = attribute.named_children
+            attr_name = self.text(parts[0])
+            value = self.text(parts[-1]) if len(parts) > 1 else None
+            element.attributes[attr_name] = value
+            if attr_name == "className" and value:
+                line = attribute.start_point[0] + 1
+                class_names.extend(ClassNameLiteral(literal, line) for literal in _class_literals(value))
+        return element
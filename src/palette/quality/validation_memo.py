@@ -0,0 +1,106 @@
+"""
+Memoized validation results for refinement loops.
+
+``ComponentValidator.iterative_refinement`` and ``ZeroFixPipeline.process``
+validate, fix and re-validate the same component several times, usually after
+a fix that touched a few lines. ``ValidationMemo`` keeps each check's result
+under the content hash of the code it read:
+
+- static validators are keyed by the code region they inspect (the import
+  prologue, the body after it, or the whole file), so fixing an import line
+  only re-runs the validators that read imports
+- compilation, rendering and remote validations are keyed by the whole file
+
+A memo lives for one refinement run, so project state (installed packages,
+tsconfig) cannot go stale between runs.
+"""
+
+import hashlib
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_VALIDATION_MEMO_SIZE = 256
+
+
+def default_memo_size() -> int:
+    """Entry limit from ``PALETTE_VALIDATION_MEMO_SIZE`` (default 256)."""
+    try:
+        return max(1, int(os.getenv("PALETTE_VALIDATION_MEMO_SIZE", DEFAULT_VALIDATION_MEMO_SIZE)))
+    except ValueError:
+        return DEFAULT_VALIDATION_MEMO_SIZE
+
+
+def content_hash(text: str) -> str:
+    """Short stable digest of a code string or region."""
+    return hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=16).hexdigest()
+
+
+class ValidationMemo:
+    """
+    Bounded LRU of check results keyed by ``(check, content hash)``.
+
+    Args:
+        max_entries: Results kept (default: ``PALETTE_VALIDATION_MEMO_SIZE``)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or default_memo_size()
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def lookup(self, check: str, digest: str) -> Tuple[bool, Any]:
+        """``(found, value)`` for one check over one content hash."""
+        key = (check, digest)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits[check] += 1
+                return True, self._entries[key]
+            self.misses[check] += 1
+            return False, None
+
+    def store(self, check: str, digest: str, value: Any):
+        with self._lock:
+            self._entries[(check, digest)] = value
+            self._entries.move_to_end((check, digest))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def memoize(self, check: str, digest: str, compute: Callable[[], Any],
+                should_store: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Cached result of ``check``, computing and storing it on a miss."""
+        found, value = self.lookup(check, digest)
+        if found:
+            return value
+        value = compute()
+        if should_store is None or should_store(value):
+            self.store(check, digest, value)
+        return value
+
+    async def memoize_async(self, check: str, digest: str, compute: Callable[[], Awaitable[Any]],
+                            should_store: Optional[Callable[[Any], bool]] = None) -> Any:
+        """``memoize`` for coroutine checks such as remote validations."""
+        found, value = self.lookup(check, digest)
+        if found:
+            return value
+        value = await compute()
+        if should_store is None or should_store(value):
+            self.store(check, digest, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            checks = sorted(set(self.hits) | set(self.misses))
+            return {
+                "entries": len(self._entries),
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "checks": {
+                    check: {"hits": self.hits[check], "misses": self.misses[check]}
+                    for check in checks
+                },
+            }
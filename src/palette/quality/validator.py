@@ -8,11 +8,27 @@ import os
 import re
 import subprocess
 import tempfile
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from .ts_check_service import TypeScriptUnavailableError, get_ts_check_pool
+from .validation_context import ValidationContext, get_validation_context
+from .validation_memo import ValidationMemo, content_hash
+
+ANY_TYPE_PATTERN = re.compile(r":\s*any\b")
+CONSOLE_LOG_PATTERN = re.compile(r"console\.log\(")
+
+# Color utilities missing their shade (bg-gray, not bg-gray-100) and merged
+# text/line-height classes; variant prefixes such as hover: are skipped
+INVALID_TAILWIND_CLASS_PATTERN = re.compile(
+    r"^(?:[\w-]+:)*(?:"
+    r"(?:bg-gray|text-gray|bg-sky|text-blue|bg-blue|text-emerald|bg-emerald)(?:-(?![0-9])|$)"
+    r"|text-(?:sm|base)line-height$)"
+)
+
 
 class ValidationLevel(Enum):
     """Validation severity levels."""
@@ -48,6 +64,9 @@ class QualityReport:
     rendering_success: bool
     accessibility_score: float
     performance_score: float
+    iterations: int = 0
+    time_to_clean_ms: Optional[float] = None  # None when never clean
+    validation_cache: Dict[str, Any] = field(default_factory=dict)
 
 
 class ComponentValidator:
@@ -272,36 +291,59 @@ class ComponentValidator:
         return 500  # Default middle intensity
 
     def validate_component(
-        self, component_code: str, target_path: str
+        self,
+        component_code: str,
+        target_path: str,
+        memo: Optional[ValidationMemo] = None,
     ) -> QualityReport:
-        """Run comprehensive validation on generated component."""
+        """
+        Run comprehensive validation on generated component.
+
+        With a ``memo`` (one per refinement run), checks whose input did not
+        change since an earlier call reuse that call's result.
+        """
         issues = []
         passed_checks = []
         failed_checks = []
 
         print("🔍 Running comprehensive quality validation...")
 
+        digest = content_hash(component_code) if memo is not None else ""
+
+        def checked(check: str, compute):
+            if memo is None:
+                return compute()
+            return memo.memoize(f"{check}:{target_path}", digest, compute)
+
         # Stage 1: Static Analysis
-        static_issues = self._run_static_validation(component_code, target_path)
+        static_issues = self._run_static_validation(component_code, target_path, memo)
         issues.extend(static_issues)
 
         # Stage 2: Compilation Check
-        compilation_success = self._check_compilation(component_code, target_path)
+        compilation_success = checked(
+            "compilation", lambda: self._check_compilation(component_code, target_path)
+        )
         if compilation_success:
             passed_checks.append("TypeScript Compilation")
         else:
             failed_checks.append("TypeScript Compilation")
 
         # Stage 3: Runtime Validation
-        rendering_success = self._check_component_rendering(component_code, target_path)
+        rendering_success = checked(
+            "rendering", lambda: self._check_component_rendering(component_code, target_path)
+        )
         if rendering_success:
             passed_checks.append("Component Rendering")
         else:
             failed_checks.append("Component Rendering")
 
         # Stage 4: Quality Metrics
-        accessibility_score = self._calculate_accessibility_score(component_code)
-        performance_score = self._calculate_performance_score(component_code)
+        accessibility_score = checked(
+            "accessibility_score", lambda: self._calculate_accessibility_score(component_code)
+        )
+        performance_score = checked(
+            "performance_score", lambda: self._calculate_performance_score(component_code)
+        )
 
         # Calculate overall quality score
         quality_score = self._calculate_quality_score(
@@ -354,24 +396,46 @@ class ComponentValidator:
     def iterative_refinement(
         self, component_code: str, target_path: str, max_iterations: int = 3
     ) -> Tuple[str, QualityReport]:
-        """Iteratively refine component until quality threshold is met."""
+        """
+        Iteratively refine component until quality threshold is met.
+
+        Validation is incremental: after a fix only the checks whose input
+        changed are re-run, and a fix that reproduces an already validated
+        version of the code ends the loop.
+        """
         current_code = component_code
         iteration = 0
+        memo = ValidationMemo()
+        seen_hashes = {content_hash(current_code)}
+        fixes_so_far: List[str] = []
+        started = time.perf_counter()
 
         print(f"🔄 Starting iterative refinement (max {max_iterations} iterations)...")
 
+        def finish(report: QualityReport, clean: bool) -> QualityReport:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            report.auto_fixes_applied = list(fixes_so_far)
+            report.iterations = iteration
+            report.time_to_clean_ms = round(elapsed_ms, 1) if clean else None
+            report.validation_cache = memo.stats()
+            return report
+
         while iteration < max_iterations:
             iteration += 1
             print(f"\n📋 Iteration {iteration}/{max_iterations}")
 
             # Validate current code
-            report = self.validate_component(current_code, target_path)
+            report = self.validate_component(current_code, target_path, memo)
 
             print(f"Quality Score: {report.score:.1f}/100")
 
             # If quality is acceptable, we're done
             if report.score >= 85.0 and report.compilation_success:
-                print(f"✅ Quality threshold met in {iteration} iterations!")
+                report = finish(report, clean=True)
+                print(
+                    f"✅ Quality threshold met in {iteration} iterations "
+                    f"({report.time_to_clean_ms:.0f} ms)!"
+                )
                 return current_code, report
 
             # Apply auto-fixes
@@ -380,30 +444,62 @@ class ComponentValidator:
                     current_code, report
                 )
 
-                if fixes_applied:
-                    current_code = fixed_code
-                    report.auto_fixes_applied.extend(fixes_applied)
-                else:
+                if not fixes_applied:
                     print("⚠️ No more auto-fixes available")
                     break
 
-        # Final validation
-        final_report = self.validate_component(current_code, target_path)
+                digest = content_hash(fixed_code)
+                if digest in seen_hashes:
+                    print("⚠️ Auto-fixes reproduced an already validated version, stopping")
+                    break
+                seen_hashes.add(digest)
+                current_code = fixed_code
+                fixes_so_far.extend(fixes_applied)
+
+        # Final validation (served from the memo when the code did not change)
+        final_report = self.validate_component(current_code, target_path, memo)
+        clean = final_report.score >= 85.0 and final_report.compilation_success
+        final_report = finish(final_report, clean)
         print(f"\n🏁 Final Quality Score: {final_report.score:.1f}/100")
 
         return current_code, final_report
 
     def _run_static_validation(
-        self, code: str, target_path: str
+        self, code: str, target_path: str, memo: Optional[ValidationMemo] = None
     ) -> List[ValidationIssue]:
-        """Run all static validators."""
+        """
+        Run all static validators over one shared parse of the code.
+
+        With a ``memo``, a validator whose code region (see
+        ``ValidationContext.regions``) is unchanged reuses its earlier issues,
+        moved to the region's current line numbers.
+        """
         issues = []
+        context = get_validation_context(code)
 
         for validator in self.validators:
             try:
-                validator_issues = validator.validate(
-                    code, target_path, self.project_path
-                )
+                if memo is None:
+                    validator_issues = validator.validate(
+                        code, target_path, self.project_path, context=context
+                    )
+                else:
+                    region = context.regions[getattr(validator, "region", "full")]
+                    offset = region.start_line - 1
+                    relative_issues = memo.memoize(
+                        validator.__class__.__name__,
+                        region.digest,
+                        lambda: [
+                            replace(issue, line=issue.line - offset) if issue.line else issue
+                            for issue in validator.validate(
+                                code, target_path, self.project_path, context=context
+                            )
+                        ],
+                    )
+                    validator_issues = [
+                        replace(issue, line=issue.line + offset) if issue.line else replace(issue)
+                        for issue in relative_issues
+                    ]
                 issues.extend(validator_issues)
             except Exception as e:
                 issues.append(
@@ -418,6 +514,20 @@ class ComponentValidator:
 
     def _check_compilation(self, code: str, target_path: str) -> bool:
         """Check if component compiles successfully."""
+        pool = get_ts_check_pool(str(self.project_path))
+        if pool.available:
+            try:
+                diagnostics = pool.check(code, target_path)
+                return not any(d.get("category") == "error" for d in diagnostics)
+            except TypeScriptUnavailableError:
+                pass  # Fall back to the TypeScript CLI below
+            except Exception:
+                return False
+
+        return self._check_compilation_with_tsc(code)
+
+    def _check_compilation_with_tsc(self, code: str) -> bool:
+        """Check compilation with a cold ``npx tsc`` run."""
         try:
             # Create temporary file and check TypeScript compilation
             with tempfile.NamedTemporaryFile(
@@ -725,29 +835,36 @@ class ComponentValidator:
 class TypeScriptValidator:
     """Validates TypeScript syntax and types."""
 
+    # Code region the checks read ("header", "body" or "full"), so refinement
+    # re-runs a validator only when that region changed
+    region = "full"
+
     def validate(
-        self, code: str, target_path: str, project_path: Path
+        self,
+        code: str,
+        target_path: str,
+        project_path: Path,
+        context: Optional[ValidationContext] = None,
     ) -> List[ValidationIssue]:
         issues = []
+        context = context or get_validation_context(code)
 
-        # Check for duplicate imports
-        import_lines = [
-            line for line in code.split("\n") if line.strip().startswith("import")
-        ]
-        react_imports = [
-            line
-            for line in import_lines
-            if "from 'react'" in line or 'from "react"' in line
-        ]
-
-        if len(react_imports) > 1:
+        # Check for duplicate imports (one declaration per module source)
+        for source, nodes in context.duplicate_imports().items():
+            if source == "react":
+                message = "Duplicate React import statements detected"
+                suggestion = "Consolidate React imports into a single statement"
+            else:
+                message = f"Duplicate import statements from '{source}'"
+                suggestion = f"Merge the imports from '{source}' into a single statement"
             issues.append(
                 ValidationIssue(
                     level=ValidationLevel.ERROR,
                     category="typescript",
-                    message="Duplicate React import statements detected",
-                    auto_fixable=True,
-                    suggestion="Consolidate React imports into a single statement",
+                    message=message,
+                    line=nodes[1].line,
+                    auto_fixable=source == "react",
+                    suggestion=suggestion,
                 )
             )
 
@@ -764,12 +881,14 @@ class TypeScriptValidator:
             )
 
         # Check for any type
-        if re.search(r":\s*any\b", code):
+        any_match = ANY_TYPE_PATTERN.search(code)
+        if any_match:
             issues.append(
                 ValidationIssue(
                     level=ValidationLevel.WARNING,
                     category="typescript",
                     message="Avoid using 'any' type for better type safety",
+                    line=context.line_of(any_match.start()),
                     auto_fixable=True,
                 )
             )
@@ -780,18 +899,27 @@ class TypeScriptValidator:
 class ESLintValidator:
     """Validates code against ESLint rules."""
 
+    region = "full"  # Searches the raw code, not only parsed nodes
+
     def validate(
-        self, code: str, target_path: str, project_path: Path
+        self,
+        code: str,
+        target_path: str,
+        project_path: Path,
+        context: Optional[ValidationContext] = None,
     ) -> List[ValidationIssue]:
         issues = []
+        context = context or get_validation_context(code)
 
         # Check for console.log
-        if re.search(r"console\.log\(", code):
+        console_match = CONSOLE_LOG_PATTERN.search(code)
+        if console_match:
             issues.append(
                 ValidationIssue(
                     level=ValidationLevel.WARNING,
                     category="eslint",
                     message="Remove console.log statements",
+                    line=context.line_of(console_match.start()),
                     auto_fixable=True,
                 )
             )
@@ -813,21 +941,21 @@ class ESLintValidator:
 class ImportValidator:
     """Validates import statements and paths."""
 
+    region = "header"
+
     def validate(
-        self, code: str, target_path: str, project_path: Path
+        self,
+        code: str,
+        target_path: str,
+        project_path: Path,
+        context: Optional[ValidationContext] = None,
     ) -> List[ValidationIssue]:
         issues = []
+        context = context or get_validation_context(code)
 
         # Check for use client directive placement
-        lines = code.split("\n")
-        use_client_index = -1
-        first_import_index = -1
-
-        for i, line in enumerate(lines):
-            if '"use client"' in line or "'use client'" in line:
-                use_client_index = i
-            if line.strip().startswith("import") and first_import_index == -1:
-                first_import_index = i
+        use_client_index = context.directives.get("use client", -1)
+        first_import_index = context.imports[0].line - 1 if context.imports else -1
 
         if (
             use_client_index > 0
@@ -839,6 +967,7 @@ class ImportValidator:
                     level=ValidationLevel.ERROR,
                     category="imports",
                     message="'use client' directive must be at the top of the file",
+                    line=use_client_index + 1,
                     auto_fixable=True,
                 )
             )
@@ -849,31 +978,31 @@ class ImportValidator:
 class ComponentStructureValidator:
     """Validates React component structure and patterns."""
 
+    region = "full"  # Searches the raw code, not only parsed nodes
+
     def validate(
-        self, code: str, target_path: str, project_path: Path
+        self,
+        code: str,
+        target_path: str,
+        project_path: Path,
+        context: Optional[ValidationContext] = None,
     ) -> List[ValidationIssue]:
         issues = []
+        context = context or get_validation_context(code)
 
-        # Check for invalid Tailwind classes
-        invalid_classes = [
-            "text-smline-height",
-            "text-baseline-height",
-            "bg-gray(?!-[0-9])",
-            "text-gray(?!-[0-9])",
-            "bg-sky(?!-[0-9])",
-            "text-blue(?!-[0-9])",
-            "bg-blue(?!-[0-9])",
-            "text-emerald(?!-[0-9])",
-            "bg-emerald(?!-[0-9])",
-        ]
-
-        for invalid_class in invalid_classes:
-            if re.search(rf"\b{invalid_class}\b", code):
+        # Check for invalid Tailwind classes in className literals
+        for literal in context.class_names:
+            invalid_class = next(
+                (cls for cls in literal.classes if INVALID_TAILWIND_CLASS_PATTERN.match(cls)),
+                None,
+            )
+            if invalid_class:
                 issues.append(
                     ValidationIssue(
                         level=ValidationLevel.ERROR,
                         category="structure",
-                        message=f"Invalid Tailwind CSS class detected",
+                        message=f"Invalid Tailwind CSS class detected: {invalid_class}",
+                        line=literal.line,
                         auto_fixable=True,
                     )
                 )
@@ -896,18 +1025,31 @@ class ComponentStructureValidator:
 class AccessibilityValidator:
     """Validates accessibility compliance."""
 
+    region = "body"
+
     def validate(
-        self, code: str, target_path: str, project_path: Path
+        self,
+        code: str,
+        target_path: str,
+        project_path: Path,
+        context: Optional[ValidationContext] = None,
     ) -> List[ValidationIssue]:
         issues = []
+        context = context or get_validation_context(code)
 
         # Check for images without alt
-        if re.search(r"<img(?![^>]*alt=)", code):
+        missing_alt = [
+            element
+            for element in context.elements("img")
+            if "alt" not in element.attributes and not element.has_spread
+        ]
+        if missing_alt:
             issues.append(
                 ValidationIssue(
                     level=ValidationLevel.WARNING,
                     category="accessibility",
                     message="Images should have alt attributes",
+                    line=missing_alt[0].line,
                     auto_fixable=True,
                     suggestion="Add alt attribute to img elements",
                 )
@@ -919,18 +1061,34 @@ class AccessibilityValidator:
 class PerformanceValidator:
     """Validates performance best practices."""
 
+    region = "body"
+
     def validate(
-        self, code: str, target_path: str, project_path: Path
+        self,
+        code: str,
+        target_path: str,
+        project_path: Path,
+        context: Optional[ValidationContext] = None,
     ) -> List[ValidationIssue]:
         issues = []
+        context = context or get_validation_context(code)
 
-        # Check for inline object/function creation
-        if re.search(r"onClick=\{.*=>.*\}", code):
+        # Check for inline function creation in click handlers
+        inline_handler = next(
+            (
+                element
+                for element in context.jsx_elements
+                if "=>" in (element.attributes.get("onClick") or "")
+            ),
+            None,
+        )
+        if inline_handler:
             issues.append(
                 ValidationIssue(
                     level=ValidationLevel.INFO,
                     category="performance",
                     message="Consider using useCallback for event handlers",
+                    line=inline_handler.line,
                     auto_fixable=False,
                     suggestion="Wrap event handlers with useCallback",
                 )
@@ -6,8 +6,9 @@ Combines OpenAI, MCP, and real project validation for guaranteed perfect compone
 import asyncio
 import json
 import tempfile
+import time
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from ..openai_integration.assistant import PaletteAssistant
@@ -18,6 +19,7 @@ from ..openai_integration.structured_output import (
 )
 from ..openai_integration.function_calling import FunctionCallingSystem
 from ..mcp.client import MCPClient
+from .validation_memo import ValidationMemo, content_hash
 from .validator import ComponentValidator, QualityReport
 
 
@@ -35,6 +37,8 @@ class ZeroFixResult:
     openai_fixes: List[str]
     success: bool
     error: Optional[str] = None
+    time_to_clean_ms: Optional[float] = None  # None when never error-free
+    validation_cache: Dict[str, Any] = field(default_factory=dict)
 
 
 class ZeroFixPipeline:
@@ -77,6 +81,10 @@ class ZeroFixPipeline:
         3. MCP design system compliance
         4. Real project validation (TypeScript, linting, tests)
         5. AI-powered final polish
+
+        Remote validations are memoized by code hash for the run, so stages
+        that did not change the code are not validated twice, and a fix that
+        reproduces an earlier version of the code ends the fixing loop.
         """
 
         validation_reports = []
@@ -84,6 +92,15 @@ class ZeroFixPipeline:
         openai_fixes = []
         current_code = component_code
         iteration = 0
+        memo = ValidationMemo()
+        seen_hashes = {content_hash(current_code)}
+        started = time.perf_counter()
+        time_to_clean_ms = None
+
+        def mark_clean(validation: Dict[str, Any]):
+            nonlocal time_to_clean_ms
+            if time_to_clean_ms is None and not validation.get("errors"):
+                time_to_clean_ms = round((time.perf_counter() - started) * 1000, 1)
 
         try:
             print("🚀 Starting Zero-Fix Pipeline...")
@@ -111,12 +128,11 @@ class ZeroFixPipeline:
 
             # Stage 1: Initial OpenAI validation
             self._print_stage_progress(1, "OpenAI Code Interpreter validation")
-            initial_validation = await self.openai_assistant.validate_with_interpreter(
-                current_code
-            )
+            initial_validation = await self._validate_with_interpreter(current_code, memo)
             validation_reports.append(
                 {"stage": "openai_initial", "result": initial_validation}
             )
+            mark_clean(initial_validation)
 
             original_issues = len(initial_validation.get("errors", []))
             print(f"   Found {original_issues} initial issues")
@@ -145,14 +161,17 @@ class ZeroFixPipeline:
                 )
 
                 if fixed_code != current_code:
+                    digest = content_hash(fixed_code)
+                    if digest in seen_hashes:
+                        print("   ⚠️ Fix reproduced an earlier version, stopping iterations")
+                        break
+                    seen_hashes.add(digest)
                     current_code = fixed_code
                     openai_fixes.append(f"Iteration {iteration}: {fix_metadata}")
 
                     # Validate the fixed code
-                    validation_result = (
-                        await self.openai_assistant.validate_with_interpreter(
-                            current_code
-                        )
+                    validation_result = await self._validate_with_interpreter(
+                        current_code, memo
                     )
                     validation_reports.append(
                         {
@@ -160,6 +179,7 @@ class ZeroFixPipeline:
                             "result": validation_result,
                         }
                     )
+                    mark_clean(validation_result)
 
                     remaining_errors = len(validation_result.get("errors", []))
                     print(f"   📉 Reduced errors to {remaining_errors}")
@@ -173,7 +193,7 @@ class ZeroFixPipeline:
             # Stage 3: MCP Design System Compliance
             if self.enable_mcp_validation and self.mcp_client:
                 self._print_stage_progress(3, "MCP Design System Compliance")
-                mcp_result = await self._validate_with_mcp(current_code, context)
+                mcp_result = await self._validate_with_mcp(current_code, context, memo)
                 mcp_validations.append(mcp_result)
 
                 if not mcp_result.get("compliant", True):
@@ -184,7 +204,7 @@ class ZeroFixPipeline:
 
                     # Re-validate with MCP
                     mcp_revalidation = await self._validate_with_mcp(
-                        current_code, context
+                        current_code, context, memo
                     )
                     mcp_validations.append(mcp_revalidation)
 
@@ -192,7 +212,7 @@ class ZeroFixPipeline:
             if self.enable_real_project_tests:
                 self._print_stage_progress(4, "Real Project Validation")
                 real_validation = await self._validate_in_real_project(
-                    current_code, target_path or "Component.tsx"
+                    current_code, target_path or "Component.tsx", memo
                 )
                 validation_reports.append(
                     {"stage": "real_project", "result": real_validation}
@@ -206,7 +226,7 @@ class ZeroFixPipeline:
 
                     # Re-validate
                     final_real_validation = await self._validate_in_real_project(
-                        current_code, target_path or "Component.tsx"
+                        current_code, target_path or "Component.tsx", memo
                     )
                     validation_reports.append(
                         {"stage": "real_project_final", "result": final_real_validation}
@@ -218,11 +238,13 @@ class ZeroFixPipeline:
                 current_code, validation_reports, mcp_validations, context
             )
 
-            # Final validation
-            final_validation = await self.openai_assistant.validate_with_interpreter(
-                final_code
-            )
+            # Final validation (no remote call when polishing changed nothing)
+            final_validation = await self._validate_with_interpreter(final_code, memo)
             validation_reports.append({"stage": "final", "result": final_validation})
+            if final_validation.get("errors"):
+                time_to_clean_ms = None  # Polish reintroduced errors
+            else:
+                mark_clean(final_validation)
 
             final_issues = len(final_validation.get("errors", []))
             confidence_score = self._calculate_confidence_score(
@@ -234,7 +256,8 @@ class ZeroFixPipeline:
             )
 
             self._print_completion_summary(
-                original_issues, final_issues, confidence_score, success
+                original_issues, final_issues, confidence_score, success,
+                iteration, time_to_clean_ms, memo,
             )
 
             return ZeroFixResult(
@@ -247,6 +270,8 @@ class ZeroFixPipeline:
                 mcp_validations=mcp_validations,
                 openai_fixes=openai_fixes,
                 success=success,
+                time_to_clean_ms=time_to_clean_ms,
+                validation_cache=memo.stats(),
             )
 
         except Exception as e:
@@ -262,6 +287,7 @@ class ZeroFixPipeline:
                 openai_fixes=openai_fixes,
                 success=False,
                 error=str(e),
+                validation_cache=memo.stats(),
             )
 
     async def _fix_with_structured_output(
@@ -304,14 +330,39 @@ class ZeroFixPipeline:
             print(f"   ⚠️ Structured fix failed: {e}")
             return code, f"Fix failed: {str(e)}"
 
+    async def _validate_with_interpreter(
+        self, code: str, memo: Optional[ValidationMemo] = None
+    ) -> Dict[str, Any]:
+        """Validate with the OpenAI Code Interpreter, once per distinct code."""
+
+        if memo is None:
+            return await self.openai_assistant.validate_with_interpreter(code)
+        return await memo.memoize_async(
+            "openai_interpreter",
+            content_hash(code),
+            lambda: self.openai_assistant.validate_with_interpreter(code),
+        )
+
     async def _validate_with_mcp(
-        self, code: str, context: Dict[str, Any]
+        self,
+        code: str,
+        context: Dict[str, Any],
+        memo: Optional[ValidationMemo] = None,
     ) -> Dict[str, Any]:
         """Validate component using MCP design system server."""
 
         if not self.mcp_client:
             return {"error": "MCP client not available"}
 
+        if memo is not None:
+            # Failed calls are retried rather than remembered
+            return await memo.memoize_async(
+                "mcp_design_system",
+                content_hash(code),
+                lambda: self._validate_with_mcp(code, context),
+                should_store=lambda result: "error" not in result,
+            )
+
         try:
             # Call MCP design system validation
             result = await self.mcp_client.call_tool(
@@ -377,10 +428,18 @@ class ZeroFixPipeline:
             return code
 
     async def _validate_in_real_project(
-        self, code: str, file_name: str
+        self, code: str, file_name: str, memo: Optional[ValidationMemo] = None
     ) -> Dict[str, Any]:
         """Validate component in the actual project environment."""
 
+        if memo is not None:
+            return await memo.memoize_async(
+                f"real_project:{file_name}",
+                content_hash(code),
+                lambda: self._validate_in_real_project(code, file_name),
+                should_store=self._tool_calls_succeeded,
+            )
+
         validation_results = {
             "typescript": None,
             "eslint": None,
@@ -424,6 +483,18 @@ class ZeroFixPipeline:
             validation_results["error"] = str(e)
             return validation_results
 
+    @staticmethod
+    def _tool_calls_succeeded(validation_results: Dict[str, Any]) -> bool:
+        """Whether TypeScript and ESLint both ran (their verdicts may still fail).
+
+        Runs where a tool call itself failed are not memoized, so a flaky tool
+        is retried on the next validation of the same code.
+        """
+        return "error" not in validation_results and all(
+            (validation_results.get(tool) or {}).get("success")
+            for tool in ("typescript", "eslint")
+        )
+
     async def _validate_imports(self, code: str) -> List[Dict[str, Any]]:
         """Validate all imports in the component."""
 
@@ -681,6 +752,9 @@ class ZeroFixPipeline:
         final_issues: int,
         confidence_score: float,
         success: bool,
+        iterations: int = 0,
+        time_to_clean_ms: Optional[float] = None,
+        memo: Optional[ValidationMemo] = None,
     ):
         """Print the final completion summary."""
         print("\n" + "=" * 60)
@@ -703,6 +777,17 @@ class ZeroFixPipeline:
         )
         print(f"📊 Confidence: {confidence_score:.2%} [{confidence_bar}]")
 
+        # Refinement cost
+        clean_text = (
+            f"clean after {time_to_clean_ms / 1000:.1f}s"
+            if time_to_clean_ms is not None
+            else "never error-free"
+        )
+        print(f"🔄 Iterations: {iterations} ({clean_text})")
+        if memo is not None:
+            stats = memo.stats()
+            print(f"♻️ Validations reused: {stats['hits']} of {stats['hits'] + stats['misses']}")
+
         # Success indicator
         if success:
             print("✅ Status: SUCCESS - Component ready for production!")
@@ -719,6 +804,7 @@ class ZeroFixPipeline:
 
         successful = [r for r in results if r.success]
         failed = [r for r in results if not r.success]
+        cleaned = [r for r in results if r.time_to_clean_ms is not None]
 
         return {
             "total_processed": len(results),
@@ -735,4 +821,9 @@ class ZeroFixPipeline:
                 r.original_issues - r.final_issues for r in results
             ),
             "zero_issue_components": len([r for r in results if r.final_issues == 0]),
+            "average_time_to_clean_ms": (
+                sum(r.time_to_clean_ms for r in cleaned) / len(cleaned)
+                if cleaned
+                else None
+            ),
         }
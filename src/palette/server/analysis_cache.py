@@ -0,0 +1,375 @@
+"""
+Server-side cache for ``/api/analyze`` results.
+
+Results are cached per project and analysis type and stamped with an ETag
+derived from their content. A filesystem watcher per project (watchdog's
+inotify/FSEvents observer when installed, a polling snapshot otherwise) drops
+only the analysis types whose input files changed, so repeated analyze calls
+from the VS Code extension are answered from memory or with a 304.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from palette.analysis.file_inventory import DEFAULT_EXCLUDED_DIRS, ProjectFileInventory
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+try:
+    from .session_registry import SessionRegistry, env_int
+except ImportError:
+    # Fallback for when the server runs as a script
+    from session_registry import SessionRegistry, env_int
+
+SOURCE_EXTENSIONS = {".tsx", ".jsx", ".ts", ".js", ".mjs", ".cjs", ".vue", ".svelte", ".html"}
+STYLE_EXTENSIONS = {".css", ".scss", ".sass", ".less"}
+MANIFEST_FILES = {
+    "package.json",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "bun.lockb",
+    "tsconfig.json",
+    "components.json",
+}
+CONFIG_PREFIXES = ("tailwind.config.", "vite.config.", "next.config.", "webpack.config.", "postcss.config.")
+
+
+def _is_manifest(rel_path: str) -> bool:
+    name = rel_path.rsplit("/", 1)[-1]
+    return name in MANIFEST_FILES or name.startswith(CONFIG_PREFIXES)
+
+
+def _is_source(rel_path: str) -> bool:
+    return os.path.splitext(rel_path)[1] in SOURCE_EXTENSIONS
+
+
+def _is_style(rel_path: str) -> bool:
+    return os.path.splitext(rel_path)[1] in STYLE_EXTENSIONS
+
+
+# Files each analysis type depends on; a change invalidates only matching types
+ANALYSIS_TYPE_DEPENDENCIES: Dict[str, Callable[[str], bool]] = {
+    "quick": _is_manifest,
+    "frameworks": _is_manifest,
+    "components": lambda p: _is_manifest(p) or _is_source(p),
+    "design_tokens": lambda p: _is_manifest(p) or _is_style(p) or _is_source(p),
+    "quality": lambda p: _is_manifest(p) or _is_source(p),
+    "full": lambda p: _is_manifest(p) or _is_style(p) or _is_source(p),
+}
+
+
+def affected_analysis_types(rel_paths: Iterable[str]) -> Set[str]:
+    """
+    Analysis types whose results depend on any of the changed files.
+
+    A path ending in ``/`` stands for a directory whose contents are unknown
+    (e.g. it was deleted or moved away) and affects every type.
+    """
+    affected = set()
+    for rel_path in rel_paths:
+        if rel_path.endswith("/"):
+            return set(ANALYSIS_TYPE_DEPENDENCIES)
+        for analysis_type, depends_on in ANALYSIS_TYPE_DEPENDENCIES.items():
+            if analysis_type not in affected and depends_on(rel_path):
+                affected.add(analysis_type)
+    return affected
+
+
+def compute_etag(payload: Any) -> str:
+    """Strong ETag for a JSON-serializable payload."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return '"' + hashlib.sha1(encoded).hexdigest()[:20] + '"'
+
+
+@dataclass
+class CachedAnalysis:
+    """One cached analysis result."""
+    result: Dict[str, Any]
+    etag: str
+    created_at: float
+    hits: int = 0
+
+
+class ProjectWatcher:
+    """
+    Reports changed project-relative paths to a callback.
+
+    Uses a watchdog observer when available, otherwise compares polling
+    snapshots of the project's file inventory every ``poll_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        project_path: str,
+        on_change: Callable[[Set[str]], None],
+        poll_interval: float = 2.0,
+    ):
+        self.project_path = os.path.abspath(project_path)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.mode = "watchdog" if WATCHDOG_AVAILABLE else "polling"
+
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+
+    def start(self):
+        if self.mode == "watchdog":
+            try:
+                self._start_observer()
+                return
+            except Exception as e:
+                # e.g. inotify watch limit reached
+                print(f"Warning: File watcher unavailable ({e}), polling {self.project_path}")
+                self.mode = "polling"
+
+        self._snapshot = self._take_snapshot()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
+
+    def _start_observer(self):
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    # Moving or deleting a directory reports no per-file events
+                    if event.event_type == "modified":
+                        return
+                    changed = watcher._directory_change(
+                        event.src_path, getattr(event, "dest_path", None)
+                    )
+                else:
+                    paths = [event.src_path, getattr(event, "dest_path", None)]
+                    changed = {
+                        rel_path
+                        for rel_path in (watcher._rel_path(path) for path in paths if path)
+                        if rel_path is not None
+                    }
+                if changed:
+                    watcher.on_change(changed)
+
+        self._observer = Observer()
+        self._observer.schedule(Handler(), self.project_path, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def _directory_change(self, src_path, dest_path=None) -> Set[str]:
+        """
+        Changed paths for a directory created, deleted or moved as a whole.
+
+        Files now under the directory are listed under both their new and old
+        locations. A directory that is gone (deleted or moved out of the
+        project) is reported as ``"<dir>/"``, since its files are unknown.
+        """
+        changed: Set[str] = set()
+        src_rel = self._rel_path(src_path)
+        dest_rel = self._rel_path(dest_path) if dest_path else None
+        current = dest_path if dest_path else src_path
+        current_rel = dest_rel if dest_path else src_rel
+
+        if os.path.isdir(current) and current_rel is not None:
+            for file_rel, _ in ProjectFileInventory(os.fsdecode(current)).iter_files():
+                changed.add(f"{current_rel}/{file_rel}")
+                if dest_path and src_rel is not None:
+                    changed.add(f"{src_rel}/{file_rel}")
+        elif src_rel is not None:
+            changed.add(src_rel + "/")
+        if dest_path and src_rel is not None and dest_rel is None:
+            # Moved out of the project (or into an excluded directory)
+            changed.add(src_rel + "/")
+        return changed
+
+    def _rel_path(self, path: str) -> Optional[str]:
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        if not path.startswith(self.project_path + os.sep):
+            return None
+        rel_path = path[len(self.project_path) + 1:].replace(os.sep, "/")
+        if any(part in DEFAULT_EXCLUDED_DIRS for part in rel_path.split("/")):
+            return None
+        return rel_path
+
+    def _poll(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                snapshot = self._take_snapshot()
+            except Exception as e:
+                print(f"Warning: Polling {self.project_path} failed: {e}")
+                continue
+
+            changed = {
+                rel_path
+                for rel_path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(rel_path) != self._snapshot.get(rel_path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                self.on_change(changed)
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        inventory = ProjectFileInventory(self.project_path)
+        return {
+            rel_path: (stat.st_mtime_ns, stat.st_size)
+            for rel_path, stat in inventory.iter_files()
+        }
+
+
+class ProjectAnalysisCache:
+    """Cached results of one project, invalidated by its watcher."""
+
+    def __init__(self, project_path: str, poll_interval: float):
+        self.project_path = project_path
+        self.results: Dict[str, CachedAnalysis] = {}
+        self.invalidations = 0
+        # Bumped on every relevant change so results computed across a change are not stored
+        self.generation = 0
+        self._lock = threading.Lock()
+        self.watcher = ProjectWatcher(project_path, self.invalidate_paths, poll_interval)
+        self.watcher.start()
+
+    def get(self, analysis_type: str) -> Optional[CachedAnalysis]:
+        with self._lock:
+            cached = self.results.get(analysis_type)
+            if cached is not None:
+                cached.hits += 1
+            return cached
+
+    def put(
+        self, analysis_type: str, result: Dict[str, Any], generation: Optional[int] = None
+    ) -> CachedAnalysis:
+        cached = CachedAnalysis(result=result, etag=compute_etag(result), created_at=time.time())
+        with self._lock:
+            if generation is None or generation == self.generation:
+                self.results[analysis_type] = cached
+        return cached
+
+    def invalidate_paths(self, rel_paths: Set[str]):
+        affected = affected_analysis_types(rel_paths)
+        if not affected:
+            return
+        with self._lock:
+            self.generation += 1
+            for analysis_type in list(self.results):
+                # Unknown analysis types fall back to the "full" dependency set
+                key = analysis_type if analysis_type in ANALYSIS_TYPE_DEPENDENCIES else "full"
+                if key in affected:
+                    del self.results[analysis_type]
+                    self.invalidations += 1
+
+    def close(self):
+        self.watcher.stop()
+
+
+class AnalysisResultCache:
+    """Analysis results for every project the server has seen recently."""
+
+    def __init__(
+        self,
+        max_projects: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.name = "analysis_cache"
+        self.poll_interval = poll_interval or float(os.getenv("PALETTE_WATCH_INTERVAL", "2"))
+        self._projects: SessionRegistry[ProjectAnalysisCache] = SessionRegistry(
+            "analysis_cache",
+            max_entries=max_projects or env_int("PALETTE_MAX_CACHED_PROJECTS", 16),
+            ttl_seconds=ttl_seconds or env_int("PALETTE_ANALYSIS_CACHE_TTL", 3600),
+            on_evict=lambda _, project: project.close(),
+            track_memory=True,
+        )
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, project_path: str, analysis_type: str) -> Optional[CachedAnalysis]:
+        project = self._projects.get(self._key(project_path))
+        cached = project.get(analysis_type) if project is not None else None
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def begin(self, project_path: str) -> int:
+        """
+        Start watching a project before computing a result for it.
+
+        Returns:
+            Generation token to pass to ``put``; the result is only cached if
+            no relevant file changed while it was being computed
+        """
+        return self._project(project_path).generation
+
+    def put(
+        self,
+        project_path: str,
+        analysis_type: str,
+        result: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> CachedAnalysis:
+        return self._project(project_path).put(analysis_type, result, generation)
+
+    def invalidate(self, project_path: Optional[str] = None):
+        """Drop one project's results (and its watcher), or everything."""
+        if project_path is None:
+            self._projects.clear()
+            return
+        project = self._projects.pop(self._key(project_path))
+        if project is not None:
+            project.close()
+
+    def sweep(self) -> int:
+        return self._projects.sweep()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / total, 3) if total else 0.0,
+            "watcher": "watchdog" if WATCHDOG_AVAILABLE else "polling",
+            "projects": {
+                key: {
+                    "cachedTypes": sorted(project.results),
+                    "invalidations": project.invalidations,
+                    "watchMode": project.watcher.mode,
+                }
+                for key, project in self._projects.items()
+            },
+            "registry": self._projects.get_stats(),
+        }
+
+    def _project(self, project_path: str) -> ProjectAnalysisCache:
+        key = self._key(project_path)
+        return self._projects.get_or_create(
+            key, lambda: ProjectAnalysisCache(key, self.poll_interval)
+        )
+
+    @staticmethod
+    def _key(project_path: str) -> str:
+        return os.path.abspath(project_path)
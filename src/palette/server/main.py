@@ -6,17 +6,19 @@ Serves as the entry point for uvicorn and provides the unified API
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, AsyncGenerator
+from typing import Dict, List, Optional, AsyncGenerator, Tuple
 import asyncio
 import uuid
 import json
 from datetime import datetime
 import subprocess
 import re
+import time
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
 
@@ -27,14 +29,24 @@ sys.path.insert(0, str(src_path))
 
 from palette.analysis.context import ProjectAnalyzer
 from palette.conversation.conversation_engine import ConversationEngine
+from palette.generation.generator import UIGenerator
+from palette.generation.llm_streaming import StreamMetrics, stream_metrics
 from palette.quality.validator import ComponentValidator
 
 # Import fallback wrapper for analysis methods
 try:
     from .analysis_wrapper import AnalysisWrapper
+    from .session_registry import SessionRegistry, current_rss_bytes, env_int
+    from .analysis_cache import AnalysisResultCache, CachedAnalysis, compute_etag
+    from .stream_channel import StreamChannel, ThreadBridge, parse_event_id
+    from ..mcp.session_pool import get_mcp_session_pool
 except ImportError:
     # Fallback for when running as script directly
     from analysis_wrapper import AnalysisWrapper
+    from session_registry import SessionRegistry, current_rss_bytes, env_int
+    from analysis_cache import AnalysisResultCache, CachedAnalysis, compute_etag
+    from stream_channel import StreamChannel, ThreadBridge, parse_event_id
+    from palette.mcp.session_pool import get_mcp_session_pool
 
 
 # Pydantic models for API requests/responses
@@ -119,54 +131,159 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global state
-active_streams: Dict[str, asyncio.Queue] = {}
-conversation_engines: Dict[str, ConversationEngine] = {}
-project_analyzers: Dict[str, ProjectAnalyzer] = {}
+def _end_stream(conversation_id: str, channel: StreamChannel) -> None:
+    """Wake a waiting SSE consumer so an evicted stream closes cleanly"""
+    _cancel_generation(conversation_id)
+    channel.close(discard=True)
+
+
+def _expire_stream(conversation_id: str, channel: StreamChannel) -> None:
+    """Drop a stream once its client is done or did not reconnect in time"""
+    if active_streams.get(conversation_id) is not channel:
+        # A new stream reuses the conversation id
+        channel.close(discard=True)
+        return
+    active_streams.pop(conversation_id)
+    _cancel_generation(conversation_id)
+    channel.close(discard=True)
+
+
+def _cancel_generation(conversation_id: str) -> None:
+    """Stop the producer of a stream whose consumer is gone"""
+    task = generation_tasks.pop(conversation_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+
+
+def start_stream(conversation_id: str, producer) -> None:
+    """Register a bounded event channel and run its producer coroutine"""
+    # Bounded so a slow SSE client makes the producer wait (backpressure)
+    active_streams[conversation_id] = StreamChannel(
+        maxsize=STREAM_QUEUE_SIZE, replay_size=STREAM_REPLAY_SIZE, frame_chars=STREAM_FRAME_CHARS
+    )
+    task = asyncio.create_task(producer)
+    generation_tasks[conversation_id] = task
+    task.add_done_callback(
+        lambda t: generation_tasks.pop(conversation_id, None) if generation_tasks.get(conversation_id) is t else None
+    )
+
+
+# Global state (bounded; tune with PALETTE_MAX_* / PALETTE_*_TTL environment variables)
+active_streams: SessionRegistry[StreamChannel] = SessionRegistry(
+    "streams",
+    max_entries=env_int("PALETTE_MAX_STREAMS", 256),
+    ttl_seconds=env_int("PALETTE_STREAM_TTL", 600),
+    on_evict=_end_stream,
+    track_memory=False,
+)
+conversation_engines: SessionRegistry[ConversationEngine] = SessionRegistry(
+    "engines",
+    max_entries=env_int("PALETTE_MAX_ENGINES", 8),
+    ttl_seconds=env_int("PALETTE_ENGINE_TTL", 1800),
+    max_bytes=env_int("PALETTE_ENGINE_MAX_MB", 512) * 1024 * 1024,
+)
+project_analyzers: SessionRegistry[ProjectAnalyzer] = SessionRegistry(
+    "analyzers",
+    max_entries=env_int("PALETTE_MAX_ANALYZERS", 16),
+    ttl_seconds=env_int("PALETTE_ANALYZER_TTL", 3600),
+)
+ui_generators: SessionRegistry[UIGenerator] = SessionRegistry(
+    "generators",
+    max_entries=env_int("PALETTE_MAX_GENERATORS", 4),
+    ttl_seconds=env_int("PALETTE_GENERATOR_TTL", 1800),
+)
+
+# Producer task of each stream, cancelled when its client disconnects
+generation_tasks: Dict[str, asyncio.Task] = {}
+
+# Events buffered per stream before producers wait for the client
+STREAM_QUEUE_SIZE = env_int("PALETTE_STREAM_QUEUE_SIZE", 256)
+
+# Delivered events kept per stream for Last-Event-ID resumption
+STREAM_REPLAY_SIZE = env_int("PALETTE_STREAM_REPLAY_SIZE", 512)
+
+# Largest generation_chunk frame built by merging chunks for a lagging client
+STREAM_FRAME_CHARS = env_int("PALETTE_STREAM_FRAME_CHARS", 512)
+
+# Seconds a disconnected stream waits for its client to reconnect
+STREAM_RESUME_GRACE = env_int("PALETTE_STREAM_RESUME_GRACE", 30)
+
+# /api/analyze results, invalidated by per-project file watchers
+analysis_cache = AnalysisResultCache()
+
+# Seconds between sweeps of idle registry entries
+REGISTRY_SWEEP_INTERVAL = 60
+registry_sweeper: Optional[asyncio.Task] = None
+server_started_at = datetime.now()
+
+
+async def sweep_registries() -> None:
+    """Periodically drop idle engines, analyzers and abandoned streams"""
+    while True:
+        await asyncio.sleep(REGISTRY_SWEEP_INTERVAL)
+        for registry in (active_streams, conversation_engines, project_analyzers, ui_generators, analysis_cache):
+            try:
+                evicted = registry.sweep()
+                if evicted:
+                    print(f"Info: Evicted {evicted} idle {registry.name}")
+            except Exception as e:
+                print(f"Warning: Sweeping {registry.name} failed: {e}")
 
 
 def get_or_create_analyzer(project_path: str) -> ProjectAnalyzer:
     """Get or create a project analyzer for the given path"""
-    if project_path not in project_analyzers:
-        analyzer = ProjectAnalyzer()
-        # Set the project path for analysis
-        analyzer.project_path = project_path
-        
-        # Add missing methods from wrapper as fallback
-        wrapper = AnalysisWrapper(project_path)
-        if not hasattr(analyzer, 'detect_framework'):
-            analyzer.detect_framework = wrapper.detect_framework
-        if not hasattr(analyzer, 'detect_styling_library'):
-            analyzer.detect_styling_library = wrapper.detect_styling_library
-        if not hasattr(analyzer, 'has_typescript'):
-            analyzer.has_typescript = wrapper.has_typescript
-        if not hasattr(analyzer, 'detect_tailwind'):
-            analyzer.detect_tailwind = wrapper.detect_tailwind
-        if not hasattr(analyzer, 'detect_build_tool'):
-            analyzer.detect_build_tool = wrapper.detect_build_tool
-        if not hasattr(analyzer, 'detect_package_manager'):
-            analyzer.detect_package_manager = wrapper.detect_package_manager
-        
-        project_analyzers[project_path] = analyzer
-    return project_analyzers[project_path]
+    return project_analyzers.get_or_create(project_path, lambda: _create_analyzer(project_path))
+
+
+def _create_analyzer(project_path: str) -> ProjectAnalyzer:
+    analyzer = ProjectAnalyzer()
+    # Set the project path for analysis
+    analyzer.project_path = project_path
+    
+    # Add missing methods from wrapper as fallback
+    wrapper = AnalysisWrapper(project_path)
+    if not hasattr(analyzer, 'detect_framework'):
+        analyzer.detect_framework = wrapper.detect_framework
+    if not hasattr(analyzer, 'detect_styling_library'):
+        analyzer.detect_styling_library = wrapper.detect_styling_library
+    if not hasattr(analyzer, 'has_typescript'):
+        analyzer.has_typescript = wrapper.has_typescript
+    if not hasattr(analyzer, 'detect_tailwind'):
+        analyzer.detect_tailwind = wrapper.detect_tailwind
+    if not hasattr(analyzer, 'detect_build_tool'):
+        analyzer.detect_build_tool = wrapper.detect_build_tool
+    if not hasattr(analyzer, 'detect_package_manager'):
+        analyzer.detect_package_manager = wrapper.detect_package_manager
+    
+    return analyzer
 
 
 def get_or_create_engine(project_path: str) -> ConversationEngine:
     """Get or create a conversation engine for the given path"""
-    if project_path not in conversation_engines:
-        conversation_engines[project_path] = ConversationEngine(project_path)
-    return conversation_engines[project_path]
+    return conversation_engines.get_or_create(
+        project_path, lambda: ConversationEngine(project_path)
+    )
+
+
+def get_or_create_generator(project_path: str) -> UIGenerator:
+    """Get or create a UI generator for the given path"""
+    return ui_generators.get_or_create(
+        project_path, lambda: UIGenerator(project_path=project_path, quality_assurance=False)
+    )
 
 
 async def send_stream_event(conversation_id: str, event_type: str, data: Dict) -> None:
-    """Send an event to a stream if it exists"""
-    if conversation_id in active_streams:
-        event = StreamEvent(
-            event=event_type,
-            data=data,
-            id=str(uuid.uuid4())
-        )
-        await active_streams[conversation_id].put(event)
+    """Send an event to a stream if it exists (waits while the stream's buffer is full)"""
+    channel = active_streams.get(conversation_id)
+    if channel is not None:
+        await channel.publish(event_type, data)
+
+
+def end_stream_events(conversation_id: str) -> None:
+    """Mark a stream as finished; its client drains the buffered events and stops"""
+    channel = active_streams.get(conversation_id)
+    if channel is not None:
+        channel.close()
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -180,109 +297,148 @@ async def health_check():
     )
 
 
-@app.post("/api/analyze")
-async def analyze_project(request: AnalysisRequest):
-    """Analyze project structure, frameworks, and dependencies"""
-    try:
-        analyzer = get_or_create_analyzer(request.projectPath)
-        
-        if request.analysisType == "quick":
-            # Quick analysis - just framework detection
-            result = {
-                "framework": analyzer.detect_framework(),
-                "styling": analyzer.detect_styling_library(),
-                "hasTypeScript": analyzer.has_typescript(),
-                "timestamp": datetime.now().isoformat()
-            }
-        elif request.analysisType == "frameworks":
-            # Framework-focused analysis
-            result = {
-                "framework": analyzer.detect_framework(),
-                "styling": analyzer.detect_styling_library(),
-                "hasTypeScript": analyzer.has_typescript(),
-                "hasTailwind": analyzer.detect_tailwind(),
-                "buildTool": analyzer.detect_build_tool(),
-                "packageManager": analyzer.detect_package_manager(),
-                "timestamp": datetime.now().isoformat()
-            }
-        elif request.analysisType == "components":
-            # Component-focused analysis
-            analysis_result = analyzer.analyze_project(request.projectPath)
-            components_data = analysis_result.get("components", {})
-            result = {
-                "totalComponents": len(components_data.get("files", [])),
-                "componentsByType": components_data.get("by_type", {}),
-                "reusableComponents": components_data.get("reusable", []),
-                "pageComponents": components_data.get("pages", []),
-                "uiLibraryComponents": components_data.get("ui_library", []),
-                "customComponents": components_data.get("custom", []),
-                "componentPatterns": components_data.get("patterns", {}),
-                "timestamp": datetime.now().isoformat()
-            }
-        elif request.analysisType == "design_tokens":
-            # Design tokens and theming analysis
-            analysis_result = analyzer.analyze_project(request.projectPath)
-            design_data = analysis_result.get("design_tokens", {})
+def compute_analysis(request: AnalysisRequest) -> Tuple[Dict, bool]:
+    """Run one analysis type; returns the result and whether it may be cached"""
+    cacheable = True
+    analyzer = get_or_create_analyzer(request.projectPath)
+    
+    if request.analysisType == "quick":
+        # Quick analysis - just framework detection
+        result = {
+            "framework": analyzer.detect_framework(),
+            "styling": analyzer.detect_styling_library(),
+            "hasTypeScript": analyzer.has_typescript(),
+            "timestamp": datetime.now().isoformat()
+        }
+    elif request.analysisType == "frameworks":
+        # Framework-focused analysis
+        result = {
+            "framework": analyzer.detect_framework(),
+            "styling": analyzer.detect_styling_library(),
+            "hasTypeScript": analyzer.has_typescript(),
+            "hasTailwind": analyzer.detect_tailwind(),
+            "buildTool": analyzer.detect_build_tool(),
+            "packageManager": analyzer.detect_package_manager(),
+            "timestamp": datetime.now().isoformat()
+        }
+    elif request.analysisType == "components":
+        # Component-focused analysis
+        analysis_result = analyzer.analyze_project(request.projectPath)
+        components_data = analysis_result.get("components", {})
+        result = {
+            "totalComponents": len(components_data.get("files", [])),
+            "componentsByType": components_data.get("by_type", {}),
+            "reusableComponents": components_data.get("reusable", []),
+            "pageComponents": components_data.get("pages", []),
+            "uiLibraryComponents": components_data.get("ui_library", []),
+            "customComponents": components_data.get("custom", []),
+            "componentPatterns": components_data.get("patterns", {}),
+            "timestamp": datetime.now().isoformat()
+        }
+    elif request.analysisType == "design_tokens":
+        # Design tokens and theming analysis
+        analysis_result = analyzer.analyze_project(request.projectPath)
+        design_data = analysis_result.get("design_tokens", {})
+        result = {
+            "colorPalette": design_data.get("colors", {}),
+            "typography": design_data.get("typography", {}),
+            "spacing": design_data.get("spacing", {}),
+            "breakpoints": design_data.get("breakpoints", {}),
+            "customCss": design_data.get("custom_css", []),
+            "tailwindConfig": design_data.get("tailwind_config", {}),
+            "designSystem": design_data.get("design_system", {}),
+            "timestamp": datetime.now().isoformat()
+        }
+    elif request.analysisType == "quality":
+        # Quality analysis - validation and suggestions
+        try:
+            validator = ComponentValidator(request.projectPath)
+            quality_result = validator.validate_project_quality()
             result = {
-                "colorPalette": design_data.get("colors", {}),
-                "typography": design_data.get("typography", {}),
-                "spacing": design_data.get("spacing", {}),
-                "breakpoints": design_data.get("breakpoints", {}),
-                "customCss": design_data.get("custom_css", []),
-                "tailwindConfig": design_data.get("tailwind_config", {}),
-                "designSystem": design_data.get("design_system", {}),
+                "qualityScore": quality_result.get("score", 0),
+                "issues": quality_result.get("issues", []),
+                "suggestions": quality_result.get("suggestions", []),
+                "codeMetrics": quality_result.get("metrics", {}),
+                "bestPractices": quality_result.get("best_practices", {}),
                 "timestamp": datetime.now().isoformat()
             }
-        elif request.analysisType == "quality":
-            # Quality analysis - validation and suggestions
-            try:
-                validator = ComponentValidator(request.projectPath)
-                quality_result = validator.validate_project_quality()
-                result = {
-                    "qualityScore": quality_result.get("score", 0),
-                    "issues": quality_result.get("issues", []),
-                    "suggestions": quality_result.get("suggestions", []),
-                    "codeMetrics": quality_result.get("metrics", {}),
-                    "bestPractices": quality_result.get("best_practices", {}),
-                    "timestamp": datetime.now().isoformat()
-                }
-            except Exception as e:
-                # Fallback if ComponentValidator fails
-                result = {
-                    "qualityScore": 75,  # Default reasonable score
-                    "issues": [f"Quality analysis partially failed: {str(e)}"],
-                    "suggestions": ["Enable comprehensive quality checking", "Ensure all dependencies are installed"],
-                    "timestamp": datetime.now().isoformat()
-                }
-        else:
-            # Full analysis - comprehensive project understanding
-            analysis_result = analyzer.analyze_project(request.projectPath)
+        except Exception as e:
+            # Fallback if ComponentValidator fails (not cached, so the next call retries)
+            cacheable = False
             result = {
-                "framework": analysis_result.get("framework", "unknown"),
-                "styling": analysis_result.get("styling", "unknown"),
-                "hasTypeScript": analysis_result.get("typescript", False),
-                "hasTailwind": analysis_result.get("tailwind", False),
-                "components": analysis_result.get("components", {}),
-                "structure": analysis_result.get("structure", {}),
-                "dependencies": analysis_result.get("dependencies", {}),
-                "designTokens": analysis_result.get("design_tokens", {}),
-                "codebaseInsights": {
-                    "totalFiles": len(analysis_result.get("structure", {}).get("files", [])),
-                    "linesOfCode": analysis_result.get("metrics", {}).get("total_lines", 0),
-                    "complexity": analysis_result.get("metrics", {}).get("complexity", "medium"),
-                    "maintainability": analysis_result.get("metrics", {}).get("maintainability", "good")
-                },
-                "recommendations": analysis_result.get("recommendations", []),
+                "qualityScore": 75,  # Default reasonable score
+                "issues": [f"Quality analysis partially failed: {str(e)}"],
+                "suggestions": ["Enable comprehensive quality checking", "Ensure all dependencies are installed"],
                 "timestamp": datetime.now().isoformat()
             }
-        
-        return {
-            "success": True,
-            "analysis": result,
-            "analysisType": request.analysisType,
-            "projectPath": request.projectPath,
-            "cacheKey": f"{request.projectPath}_{request.analysisType}_{int(datetime.now().timestamp())}"
+    else:
+        # Full analysis - comprehensive project understanding
+        analysis_result = analyzer.analyze_project(request.projectPath)
+        result = {
+            "framework": analysis_result.get("framework", "unknown"),
+            "styling": analysis_result.get("styling", "unknown"),
+            "hasTypeScript": analysis_result.get("typescript", False),
+            "hasTailwind": analysis_result.get("tailwind", False),
+            "components": analysis_result.get("components", {}),
+            "structure": analysis_result.get("structure", {}),
+            "dependencies": analysis_result.get("dependencies", {}),
+            "designTokens": analysis_result.get("design_tokens", {}),
+            "codebaseInsights": {
+                "totalFiles": len(analysis_result.get("structure", {}).get("files", [])),
+                "linesOfCode": analysis_result.get("metrics", {}).get("total_lines", 0),
+                "complexity": analysis_result.get("metrics", {}).get("complexity", "medium"),
+                "maintainability": analysis_result.get("metrics", {}).get("maintainability", "good")
+            },
+            "recommendations": analysis_result.get("recommendations", []),
+            "timestamp": datetime.now().isoformat()
         }
+    
+    return result, cacheable
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        (tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates
+    )
+
+
+@app.post("/api/analyze")
+async def analyze_project(request: AnalysisRequest, http_request: Request):
+    """Analyze project structure, frameworks, and dependencies"""
+    try:
+        analysis_type = request.analysisType or "full"
+        cached = analysis_cache.get(request.projectPath, analysis_type)
+        from_cache = cached is not None
+        
+        if cached is None:
+            generation = analysis_cache.begin(request.projectPath)
+            result, cacheable = compute_analysis(request)
+            # Encode once so cache hits are served without re-encoding
+            result = jsonable_encoder(result)
+            if cacheable:
+                cached = analysis_cache.put(request.projectPath, analysis_type, result, generation)
+            else:
+                cached = CachedAnalysis(result=result, etag=compute_etag(result), created_at=time.time())
+        
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+        if etag_matches(http_request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=headers)
+        
+        return JSONResponse(
+            content={
+                "success": True,
+                "analysis": cached.result,
+                "analysisType": request.analysisType,
+                "projectPath": request.projectPath,
+                "cacheKey": cached.etag,
+                "cached": from_cache
+            },
+            headers=headers
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
@@ -293,11 +449,8 @@ async def start_generation(request: GenerationRequest):
     """Start a new generation with streaming response"""
     conversation_id = request.conversationId or str(uuid.uuid4())
     
-    # Create stream queue
-    active_streams[conversation_id] = asyncio.Queue()
-    
-    # Start generation in background
-    asyncio.create_task(process_generation(request, conversation_id))
+    # Create stream channel and start generation in background
+    start_stream(conversation_id, process_generation(request, conversation_id))
     
     return {
         "conversationId": conversation_id,
@@ -307,71 +460,103 @@ async def start_generation(request: GenerationRequest):
 
 
 @app.get("/api/generate/stream/{conversation_id}")
-async def stream_generation(conversation_id: str):
+async def stream_generation(conversation_id: str, request: Request):
     """Server-Sent Events endpoint for streaming generation results"""
-    if conversation_id not in active_streams:
+    channel = active_streams.get(conversation_id)
+    if channel is None:
         raise HTTPException(status_code=404, detail="Stream not found")
     
-    return EventSourceResponse(sse_generator(conversation_id))
+    last_event_id = parse_event_id(request.headers.get("last-event-id"))
+    return EventSourceResponse(sse_generator(conversation_id, channel, last_event_id))
 
 
-async def sse_generator(conversation_id: str) -> AsyncGenerator[Dict, None]:
-    """Generate Server-Sent Events for a conversation"""
+async def sse_generator(conversation_id: str, channel: StreamChannel,
+                        last_event_id: Optional[int] = None) -> AsyncGenerator[Dict, None]:
+    """Generate Server-Sent Events for a conversation, resuming after ``last_event_id``"""
+    # Supersedes an earlier connection of the same client
+    token = channel.attach()
+    finished = False
     try:
-        queue = active_streams[conversation_id]
-        
-        # Send connection established event
+        # Send connection established event (no id, so the client keeps its Last-Event-ID)
         yield {
             "event": "connected",
             "data": json.dumps({
                 "conversationId": conversation_id,
+                "resumedAfter": last_event_id,
                 "timestamp": datetime.now().isoformat()
-            }),
-            "id": str(uuid.uuid4())
+            })
         }
         
-        # Process events from queue
+        # Resend what the client missed while reconnecting
+        if last_event_id is not None:
+            missed = channel.replay_after(last_event_id)
+            if missed is None:
+                yield {
+                    "event": "resume_gap",
+                    "data": json.dumps({
+                        "lastEventId": last_event_id,
+                        "message": "Some events are no longer buffered; continuing with live events"
+                    })
+                }
+                missed = []
+            for frame in missed:
+                yield {"event": frame.event, "data": json.dumps(frame.data), "id": frame.id}
+                if frame.event in ["complete", "error"]:
+                    finished = True
+                    return
+        
+        # Process events from the channel
         while True:
             try:
                 # Wait for next event with timeout for keepalive
-                event = await asyncio.wait_for(queue.get(), timeout=30.0)
+                frame = await channel.get(token, timeout=30.0)
                 
-                if event is None:  # End of stream
+                if frame is None:  # End of stream, or a newer connection took over
+                    finished = channel.finished
                     break
                 
-                # Send the event
+                # Send the event; its sequence number lets the client resume
                 yield {
-                    "event": event.event,
-                    "data": json.dumps(event.data),
-                    "id": event.id or str(uuid.uuid4())
+                    "event": frame.event,
+                    "data": json.dumps(frame.data),
+                    "id": frame.id
                 }
                 
                 # Check for completion
-                if event.event in ["complete", "error"]:
+                if frame.event in ["complete", "error"]:
+                    finished = True
                     break
                     
             except asyncio.TimeoutError:
+                # A connected client keeps its stream alive while generation runs
+                active_streams.touch(conversation_id)
+
                 # Send keepalive to prevent connection timeout
                 yield {
                     "event": "keepalive",
-                    "data": json.dumps({"timestamp": datetime.now().isoformat()}),
-                    "id": str(uuid.uuid4())
+                    "data": json.dumps({"timestamp": datetime.now().isoformat()})
                 }
                 
     except Exception as e:
         # Send error event
+        finished = True
         yield {
             "event": "error",
             "data": json.dumps({
                 "error": str(e),
                 "timestamp": datetime.now().isoformat()
-            }),
-            "id": str(uuid.uuid4())
+            })
         }
     finally:
-        # Cleanup
-        if conversation_id in active_streams:
-            del active_streams[conversation_id]
+        if not channel.is_current(token):
+            # A reconnect owns the stream now
+            pass
+        elif finished:
+            # Cleanup on completion
+            _expire_stream(conversation_id, channel)
+        else:
+            # Client disconnect: keep generating for a while so it can resume
+            channel.detach(token, STREAM_RESUME_GRACE, lambda: _expire_stream(conversation_id, channel))
 
 
 async def process_generation(request: GenerationRequest, conversation_id: str):
@@ -480,20 +665,25 @@ Project Analysis Context:
         # Get or create conversation engine
         engine = get_or_create_engine(request.projectPath)
         
+        # The engine runs in a worker thread; the bridge hands each callback to
+        # this loop in order and blocks the thread while the stream is full
+        stream_bridge = ThreadBridge(enhanced_stream_callback, maxsize=STREAM_QUEUE_SIZE)
+        
         # Process the message - this will be run in a thread pool
         def sync_process():
-            def sync_callback(chunk: str, metadata: Optional[Dict] = None):
-                # Schedule the async callback
-                asyncio.create_task(enhanced_stream_callback(chunk, metadata))
-            
             return engine.process_message(
                 request.message,
                 history,
-                sync_callback
+                stream_bridge
             )
         
         # Run in thread pool to avoid blocking
-        result = await asyncio.to_thread(sync_process)
+        try:
+            result = await asyncio.to_thread(sync_process)
+            # Deliver the chunks before anything that follows them
+            await stream_bridge.flush()
+        finally:
+            stream_bridge.close()
         
         # Perform quality validation for complex requests
         quality_results = None
@@ -562,8 +752,76 @@ Project Analysis Context:
         })
     finally:
         # Signal end of stream
-        if conversation_id in active_streams:
-            await active_streams[conversation_id].put(None)
+        end_stream_events(conversation_id)
+
+
+@app.post("/api/generate/tokens")
+async def start_token_generation(request: GenerationRequest):
+    """Start a single-component generation streamed token by token from the LLM"""
+    conversation_id = request.conversationId or str(uuid.uuid4())
+    start_stream(conversation_id, process_token_generation(request, conversation_id))
+    
+    return {
+        "conversationId": conversation_id,
+        "streamUrl": f"/api/generate/stream/{conversation_id}",
+        "status": "started"
+    }
+
+
+async def process_token_generation(request: GenerationRequest, conversation_id: str):
+    """Stream provider tokens as generation_chunk events as soon as they arrive"""
+    metrics: Optional[StreamMetrics] = None
+    try:
+        await send_stream_event(conversation_id, "generation_start", {
+            "phase": "generating_code",
+            "message": "Generating your design...",
+            "estimated_files": 1
+        })
+        
+        generator = await asyncio.to_thread(get_or_create_generator, request.projectPath)
+        context = await asyncio.to_thread(lambda: generator.project_context)
+        
+        parts = []
+        metrics = StreamMetrics(provider="", model=generator.model)
+        chunks = generator.stream_generate_component(request.message, context, metrics)
+        try:
+            async for delta in chunks:
+                parts.append(delta)
+                await send_stream_event(conversation_id, "generation_chunk", {
+                    "content": delta,
+                    "file_path": None,
+                    "metadata": {"index": len(parts) - 1}
+                })
+        finally:
+            # Closes the provider stream if the client went away mid-generation
+            await chunks.aclose()
+        
+        code = generator.clean_response("".join(parts))
+        await send_stream_event(conversation_id, "generation_complete", {
+            "response": code,
+            "metadata": {"streaming": metrics.to_dict() if metrics else None},
+            "files": [],
+            "success": True
+        })
+        
+        await send_stream_event(conversation_id, "complete", {
+            "conversationId": conversation_id,
+            "total_files": 0,
+            "timestamp": datetime.now().isoformat()
+        })
+        
+    except asyncio.CancelledError:
+        if metrics is not None:
+            print(f"Info: Token stream {conversation_id} cancelled after {metrics.chunks} chunks")
+        raise
+    except Exception as e:
+        await send_stream_event(conversation_id, "error", {
+            "error": str(e),
+            "conversationId": conversation_id,
+            "timestamp": datetime.now().isoformat()
+        })
+    finally:
+        end_stream_events(conversation_id)
 
 
 @app.on_event("startup")
@@ -587,23 +845,38 @@ async def startup_event():
         else:
             print(f"✅ Found: {dir_path}")
 
+    global registry_sweeper
+    registry_sweeper = asyncio.create_task(sweep_registries())
+    
+    # Optionally warm the knowledge base embedding model off the request path
+    if os.getenv("PALETTE_PRELOAD_EMBEDDINGS", "").lower() in ("1", "true", "yes"):
+        from palette.knowledge import preload_embedding_model
+        preload_embedding_model()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
     print("🛑 Palette Intelligence Server shutting down...")
     
-    # Cleanup active streams
-    for conversation_id in list(active_streams.keys()):
-        try:
-            await active_streams[conversation_id].put(None)
-        except:
-            pass
+    if registry_sweeper is not None:
+        registry_sweeper.cancel()
+    
+    # Stop in-flight generations
+    for conversation_id in list(generation_tasks):
+        _cancel_generation(conversation_id)
+    
+    # Stop persistent MCP servers
+    await get_mcp_session_pool().close_all()
+    
+    # Cleanup active streams (eviction wakes every waiting consumer)
     active_streams.clear()
     
-    # Cleanup engines and analyzers
+    # Cleanup engines, analyzers and cached analysis (stops file watchers)
     conversation_engines.clear()
     project_analyzers.clear()
+    ui_generators.clear()
+    analysis_cache.invalidate()
     
     print("✅ Cleanup completed")
 
@@ -612,20 +885,43 @@ async def shutdown_event():
 @app.get("/api/status")
 async def get_status():
     """Get server status and statistics"""
+    rss_bytes = current_rss_bytes()
     return {
         "server": "running",
         "activeStreams": len(active_streams),
         "conversationEngines": len(conversation_engines),
         "projectAnalyzers": len(project_analyzers),
         "uptime": datetime.now().isoformat(),
+        "uptimeSeconds": round((datetime.now() - server_started_at).total_seconds(), 1),
         "memoryUsage": {
             "streams": f"{len(active_streams)} active",
             "engines": f"{len(conversation_engines)} cached",
-            "analyzers": f"{len(project_analyzers)} cached"
-        }
+            "analyzers": f"{len(project_analyzers)} cached",
+            "rssMb": round(rss_bytes / (1024 * 1024), 1) if rss_bytes else None,
+        },
+        "registries": {
+            "streams": active_streams.get_stats(),
+            "engines": conversation_engines.get_stats(),
+            "analyzers": project_analyzers.get_stats(),
+            "generators": ui_generators.get_stats(),
+        },
+        "mcpSessions": get_mcp_session_pool().get_stats(),
+        "analysisCache": analysis_cache.get_stats(),
+        "generationStreams": stream_metrics.get_stats(),
+        "streamChannels": _stream_channel_stats()
     }
 
 
+def _stream_channel_stats() -> Dict[str, int]:
+    """Buffered, published and coalesced event totals over the active streams"""
+    totals = {"buffered": 0, "published": 0, "coalesced": 0, "delivered": 0}
+    for channel in active_streams.values():
+        stats = channel.get_stats()
+        for key in totals:
+            totals[key] += stats[key]
+    return totals
+
+
 @app.post("/api/quality/validate")
 async def validate_quality(request: QualityValidationRequest):
     """Validate code quality for specific files or code content"""
@@ -722,10 +1018,9 @@ IMPORTANT: Use shadcn/ui components exclusively. Available components based on p
         
         # Start enhanced generation
         conversation_id = request.conversationId or str(uuid.uuid4())
-        active_streams[conversation_id] = asyncio.Queue()
         
         # Process with MCP enhancements
-        asyncio.create_task(process_mcp_generation(enhanced_request, conversation_id))
+        start_stream(conversation_id, process_mcp_generation(enhanced_request, conversation_id))
         
         return {
             "conversationId": conversation_id,
@@ -1200,49 +1495,20 @@ async def call_mcp_tool(tool_name: str, arguments: Dict, project_path: str) -> D
     try:
         mcp_server_path = project_root / "mcp-servers" / "react-router" / "dist" / "server.js"
         
-        # Prepare the MCP request
-        mcp_request = {
-            "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        
-        # Run the MCP server with the request
-        process = await asyncio.create_subprocess_exec(
-            "node", str(mcp_server_path),
+        # One persistent server per project; started lazily and restarted if it exits
+        pool = get_mcp_session_pool()
+        session = pool.acquire(
+            command="node",
+            args=[str(mcp_server_path)],
             cwd=project_path,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            name="react-router",
         )
         
-        # Send request and get response
-        request_json = json.dumps(mcp_request)
-        print(f"🔧 Sending MCP request: {request_json}")
-        stdout, stderr = await process.communicate(request_json.encode())
-        
-        print(f"🔧 MCP response - stdout: {stdout.decode()}")
-        print(f"🔧 MCP response - stderr: {stderr.decode()}")
-        print(f"🔧 MCP return code: {process.returncode}")
-        
-        if process.returncode != 0:
-            raise Exception(f"MCP server error: {stderr.decode() if stderr else 'Unknown error'}")
-        
-        stdout_text = stdout.decode().strip()
-        if not stdout_text:
-            raise Exception("MCP server returned empty response")
-        
-        # Parse response
-        response = json.loads(stdout_text)
-        
-        if "error" in response:
-            raise Exception(f"MCP tool error: {response['error']}")
-            
-        return response.get("result", {})
+        try:
+            print(f"🔧 Calling MCP tool {tool_name} (server pid: {session.get_stats()['pid'] or 'starting'})")
+            return await session.call_tool(tool_name, arguments)
+        finally:
+            pool.release(session)
         
     except Exception as e:
         raise Exception(f"Failed to call MCP tool {tool_name}: {str(e)}")
@@ -1251,9 +1517,11 @@ async def call_mcp_tool(tool_name: str, arguments: Dict, project_path: str) -> D
 @app.delete("/api/cleanup")
 async def cleanup_resources():
     """Clean up cached resources"""
-    # Cleanup conversation engines and analyzers
+    # Cleanup conversation engines, analyzers and cached analysis
     conversation_engines.clear()
     project_analyzers.clear()
+    ui_generators.clear()
+    analysis_cache.invalidate()
     
     return {
         "message": "Resources cleaned up",
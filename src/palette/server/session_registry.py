@@ -0,0 +1,370 @@
+"""
+Bounded session registries for the Palette server.
+
+Conversation engines, project analyzers and stream queues used to live in
+plain module-level dicts that were never evicted. ``SessionRegistry`` keeps
+them in LRU order, drops entries idle for longer than a TTL or beyond a count
+/ estimated-memory budget, and reports what it holds for ``/api/status``.
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+# Shared by every object, so never counted towards an entry's footprint
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+)
+
+# Upper bound on objects visited when estimating one entry's memory footprint
+SIZE_ESTIMATE_MAX_OBJECTS = 50000
+
+# Seconds an entry's size estimate is reused before it is measured again
+SIZE_ESTIMATE_MAX_AGE = 60.0
+
+
+def estimate_size(obj: Any, max_objects: int = SIZE_ESTIMATE_MAX_OBJECTS) -> int:
+    """
+    Approximate deep size of an object graph in bytes.
+
+    Follows ``gc.get_referents`` breadth-first, skipping modules, classes and
+    functions (shared by everything) and stopping after ``max_objects``.
+    """
+    seen = set()
+    pending = [obj]
+    total = 0
+
+    while pending and len(seen) < max_objects:
+        next_pending = []
+        for item in pending:
+            if id(item) in seen or isinstance(item, _SHARED_TYPES):
+                continue
+            seen.add(id(item))
+            try:
+                total += sys.getsizeof(item)
+            except TypeError:
+                continue
+            next_pending.extend(gc.get_referents(item))
+            if len(seen) >= max_objects:
+                break
+        pending = next_pending
+
+    return total
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, if the platform exposes it."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # Peak RSS: kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    created_at: float
+    last_access: float
+    size_bytes: Optional[int] = None
+    sized_at: float = 0.0
+    hits: int = field(default=0)
+
+
+class _Pending:
+    """A value being created by ``get_or_create``; other callers wait for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = _MISSING
+        self.error: Optional[BaseException] = None
+
+
+class SessionRegistry(Generic[V]):
+    """
+    Thread-safe LRU/TTL registry keyed by string.
+
+    Args:
+        name: Name used in stats and log messages
+        max_entries: Most entries kept; the least recently used is evicted first
+        ttl_seconds: Entries idle for longer are dropped by ``sweep()``/access
+        max_bytes: Optional budget for the summed size estimates
+        on_evict: Called with ``(key, value)`` for every evicted entry
+        track_memory: Estimate entry sizes (needed for ``max_bytes``)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        on_evict: Optional[Callable[[str, V], None]] = None,
+        track_memory: bool = True,
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.track_memory = track_memory or max_bytes is not None
+
+        self._entries: "OrderedDict[str, _Entry[V]]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Keys whose factory is running, built outside the lock
+        self._pending: Dict[str, _Pending] = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "ttl": 0, "memory": 0, "explicit": 0}
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry, time.time())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, key: str) -> V:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: V):
+        self.put(key, value)
+
+    def __delitem__(self, key: str):
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def values(self) -> List[V]:
+        with self._lock:
+            return [entry.value for entry in self._entries.values()]
+
+    def items(self) -> Iterator[Tuple[str, V]]:
+        with self._lock:
+            return iter([(key, entry.value) for key, entry in self._entries.items()])
+
+    def get(self, key: str, default: Optional[V] = None) -> Optional[V]:
+        """Get a value and mark it as recently used."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if self._is_expired(entry, now):
+                self._evict(key, "ttl")
+                self.misses += 1
+                return default
+
+            entry.last_access = now
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: str, value: V, size_bytes: Optional[int] = None):
+        """Insert or replace a value, evicting others if over budget."""
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous.value is not value:
+                self._evict(key, "explicit")
+            entry = _Entry(value=value, created_at=now, last_access=now)
+            if size_bytes is not None:
+                entry.size_bytes, entry.sized_at = size_bytes, now
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._enforce_limits(protect=key)
+
+    def get_or_create(self, key: str, factory: Callable[[], V]) -> V:
+        """
+        Get a value, creating it with ``factory`` on a miss.
+
+        The factory (and the new value's size estimate) runs outside the
+        registry lock, so a slow build only blocks callers of the same key;
+        they wait for it and share its value or exception.
+        """
+        with self._lock:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._pending[key] = _Pending()
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            value = factory()
+            size_bytes = estimate_size(value) if self.track_memory else None
+            self.put(key, value, size_bytes)
+            pending.value = value
+            return value
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.done.set()
+
+    def touch(self, key: str):
+        """Refresh an entry's idle timer without counting a hit."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_access = time.time()
+                self._entries.move_to_end(key)
+
+    def pop(self, key: str, default: Optional[V] = None) -> Optional[V]:
+        """Remove an entry without calling ``on_evict``."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry.value if entry is not None else default
+
+    def clear(self):
+        """Evict every entry."""
+        with self._lock:
+            for key in list(self._entries.keys()):
+                self._evict(key, "explicit")
+
+    def sweep(self) -> int:
+        """Drop expired entries and re-check the memory budget. Returns evictions."""
+        now = time.time()
+        evicted = 0
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if self._is_expired(entry, now):
+                    self._evict(key, "ttl")
+                    evicted += 1
+            if self.max_bytes is not None:
+                self._refresh_sizes(now)
+            evicted += self._enforce_limits()
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counts, hit rate, evictions and (optionally) estimated memory."""
+        now = time.time()
+        with self._lock:
+            if self.track_memory:
+                self._refresh_sizes(now)
+            total_requests = self.hits + self.misses
+            stats: Dict[str, Any] = {
+                "name": self.name,
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / total_requests, 3) if total_requests else 0.0,
+                "evictions": dict(self.evictions),
+                "keys": [
+                    {
+                        "key": key,
+                        "idleSeconds": round(now - entry.last_access, 1),
+                        "ageSeconds": round(now - entry.created_at, 1),
+                        "sizeBytes": entry.size_bytes,
+                    }
+                    for key, entry in self._entries.items()
+                ],
+            }
+            if self.track_memory:
+                stats["estimatedBytes"] = self._total_bytes()
+                stats["maxBytes"] = self.max_bytes
+            return stats
+
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry.last_access > self.ttl_seconds
+
+    def _evict(self, key: str, reason: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.evictions[reason] += 1
+        if self.on_evict is not None:
+            try:
+                self.on_evict(key, entry.value)
+            except Exception as e:
+                print(f"Warning: {self.name} eviction hook failed for {key}: {e}")
+
+    def _enforce_limits(self, protect: Optional[str] = None) -> int:
+        """Evict least recently used entries until within count and memory budgets."""
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            key = self._oldest_key(protect)
+            if key is None:
+                break
+            self._evict(key, "lru")
+            evicted += 1
+
+        if self.max_bytes is not None:
+            self._refresh_sizes(time.time())
+            while self._total_bytes() > self.max_bytes and len(self._entries) > 1:
+                key = self._oldest_key(protect)
+                if key is None:
+                    break
+                self._evict(key, "memory")
+                evicted += 1
+
+        return evicted
+
+    def _oldest_key(self, protect: Optional[str]) -> Optional[str]:
+        for key in self._entries:
+            if key != protect:
+                return key
+        return None
+
+    def _refresh_sizes(self, now: float):
+        for entry in self._entries.values():
+            if entry.size_bytes is None or now - entry.sized_at > SIZE_ESTIMATE_MAX_AGE:
+                entry.size_bytes = estimate_size(entry.value)
+                entry.sized_at = now
+
+    def _total_bytes(self) -> int:
+        return sum(entry.size_bytes or 0 for entry in self._entries.values())
+
+
+def env_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment."""
+    try:
+        value = int(os.getenv(name, default))
+        return value if value > 0 else default
+    except ValueError:
+        return default
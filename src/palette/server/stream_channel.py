@@ -0,0 +1,482 @@
+"""
+Per-stream event channels for the Palette server's SSE endpoints.
+
+A ``StreamChannel`` lives on the server's event loop and sits between a
+generation producer and the SSE consumer of one conversation:
+
+- bounded: producers wait while ``maxsize`` frames are buffered
+- coalescing: consecutive ``generation_chunk`` events for the same file are
+  merged into one frame (up to ``frame_chars``) while the client is behind,
+  so a slow client receives fewer, larger frames instead of a backlog
+- sequenced: every frame gets a per-stream sequence number that is sent as
+  the SSE ``id``; delivered frames are kept in a replay buffer so a client
+  reconnecting with ``Last-Event-ID`` resumes where it left off
+
+Generation that runs in a worker thread (``asyncio.to_thread``) must not touch
+the channel directly. A ``ThreadBridge`` wraps a coroutine callback so the
+thread can call it: calls are handed to the loop with
+``loop.call_soon_threadsafe`` and run there in order, and the thread only
+blocks once the bridge's own bounded buffer is full.
+
+Usage:
+    python -m palette.server.stream_channel [--streams 200] [--events 500]
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_FRAME_CHARS = 512
+DEFAULT_REPLAY_SIZE = 512
+
+# Metadata keys that may differ between chunks merged into one frame
+_COALESCABLE_METADATA = {"index"}
+
+
+@dataclass
+class ChannelEvent:
+    """One frame of a stream."""
+    seq: int
+    event: str
+    data: Dict[str, Any]
+    # Number of published events merged into this frame
+    parts: int = 1
+
+    @property
+    def id(self) -> str:
+        return str(self.seq)
+
+
+def parse_event_id(value: Optional[str]) -> Optional[int]:
+    """Sequence number from a ``Last-Event-ID`` header (None if absent or foreign)."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class StreamChannel:
+    """
+    Bounded, coalescing, replayable event buffer for one stream.
+
+    Must be created and used on the event loop thread; worker threads go
+    through a ``ThreadBridge``.
+
+    Args:
+        maxsize: Frames buffered before ``publish`` waits
+        replay_size: Delivered frames kept for ``Last-Event-ID`` resumption
+        frame_chars: Largest ``generation_chunk`` content built by coalescing
+    """
+
+    def __init__(self, maxsize: int = 256, replay_size: int = DEFAULT_REPLAY_SIZE,
+                 frame_chars: int = DEFAULT_FRAME_CHARS):
+        self.maxsize = max(1, maxsize)
+        self.frame_chars = frame_chars
+        self._loop = asyncio.get_running_loop()
+        self._pending: Deque[ChannelEvent] = deque()
+        self._replay: Deque[ChannelEvent] = deque(maxlen=max(0, replay_size))
+        self._waiters: List[asyncio.Future] = []
+        self._seq = 0
+        # Highest sequence number dropped from the replay buffer
+        self._evicted_seq = 0
+        self._closed = False
+
+        # Only the most recently attached consumer reads from the channel
+        self._consumer = 0
+        self._expiry: Optional[asyncio.TimerHandle] = None
+
+        self.published = 0
+        self.coalesced = 0
+        self.delivered = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def finished(self) -> bool:
+        """Closed and every frame delivered."""
+        return self._closed and not self._pending
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    # Producer side
+
+    async def publish(self, event: str, data: Dict[str, Any]) -> Optional[int]:
+        """
+        Buffer an event, waiting while the channel is full.
+
+        Returns:
+            Sequence number of the frame holding the event, or None if the
+            channel is closed
+        """
+        while True:
+            if self._closed:
+                return None
+            frame = self._coalesce(event, data)
+            if frame is not None:
+                self.published += 1
+                self.coalesced += 1
+                return frame.seq
+            if len(self._pending) < self.maxsize:
+                break
+            await self._wait()
+
+        self._seq += 1
+        frame = ChannelEvent(self._seq, event, data)
+        self._pending.append(frame)
+        self.published += 1
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._notify()
+        return frame.seq
+
+    def close(self, discard: bool = False):
+        """
+        End the stream; consumers drain what is buffered and then stop.
+
+        Args:
+            discard: Drop buffered frames as well (stream evicted)
+        """
+        self._closed = True
+        if discard:
+            self._pending.clear()
+            if self._expiry is not None:
+                self._expiry.cancel()
+                self._expiry = None
+        self._notify()
+
+    def _coalesce(self, event: str, data: Dict[str, Any]) -> Optional[ChannelEvent]:
+        """Merge a chunk into the newest undelivered frame if it is compatible."""
+        if event != "generation_chunk" or not self._pending:
+            return None
+        tail = self._pending[-1]
+        if tail.event != "generation_chunk" or tail.data.get("file_path") != data.get("file_path"):
+            return None
+
+        content, tail_content = data.get("content"), tail.data.get("content")
+        if not isinstance(content, str) or not isinstance(tail_content, str):
+            return None
+        if len(tail_content) + len(content) > self.frame_chars:
+            return None
+
+        metadata = data.get("metadata") or {}
+        tail_metadata = tail.data.get("metadata") or {}
+        if not set(metadata) <= _COALESCABLE_METADATA or not set(tail_metadata) - {"coalesced"} <= _COALESCABLE_METADATA:
+            return None
+
+        tail.parts += 1
+        tail.data = {
+            **tail.data,
+            "content": tail_content + content,
+            "metadata": {**tail_metadata, **metadata, "coalesced": tail.parts},
+        }
+        return tail
+
+    # Consumer side
+
+    def attach(self) -> int:
+        """
+        Register a new consumer, superseding any earlier one.
+
+        Returns:
+            Token to pass to ``get`` and ``detach``
+        """
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        self._consumer += 1
+        self._notify()
+        return self._consumer
+
+    def detach(self, token: int, grace: float, on_expire: Callable[[], None]):
+        """
+        Consumer went away; call ``on_expire`` unless it reconnects within ``grace`` seconds.
+        """
+        if token != self._consumer:
+            return
+        if self._expiry is not None:
+            self._expiry.cancel()
+        self._expiry = self._loop.call_later(grace, on_expire)
+
+    def is_current(self, token: int) -> bool:
+        return token == self._consumer
+
+    async def get(self, token: int, timeout: Optional[float] = None) -> Optional[ChannelEvent]:
+        """
+        Next frame for the consumer.
+
+        Returns:
+            The frame, or None once the channel is finished or the consumer
+            was superseded by a reconnect
+
+        Raises:
+            asyncio.TimeoutError: Nothing arrived within ``timeout`` seconds
+        """
+        deadline = None if timeout is None else self._loop.time() + timeout
+        while not self._pending:
+            if self._closed or token != self._consumer:
+                return None
+            remaining = None if deadline is None else deadline - self._loop.time()
+            if remaining is not None and remaining <= 0:
+                raise asyncio.TimeoutError()
+            await self._wait(remaining)
+        if token != self._consumer:
+            return None
+
+        frame = self._pending.popleft()
+        if self._replay.maxlen and len(self._replay) == self._replay.maxlen:
+            self._evicted_seq = self._replay[0].seq
+        self._replay.append(frame)
+        self.delivered += 1
+        # Room for a waiting producer
+        self._notify()
+        return frame
+
+    def replay_after(self, last_seq: int) -> Optional[List[ChannelEvent]]:
+        """
+        Delivered frames after ``last_seq``.
+
+        Returns:
+            The frames to resend, or None if some of them already left the
+            replay buffer
+        """
+        if last_seq < self._evicted_seq:
+            return None
+        return [frame for frame in self._replay if frame.seq > last_seq]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._pending),
+            "lastSeq": self._seq,
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered,
+            "maxDepth": self.max_depth,
+            "closed": self._closed,
+        }
+
+    def _notify(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _wait(self, timeout: Optional[float] = None):
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+
+class ThreadBridge:
+    """
+    Lets worker threads call a coroutine callback running on the event loop.
+
+    Calling the bridge from a thread hands the call to the loop with
+    ``loop.call_soon_threadsafe`` and returns immediately; a single drain
+    task awaits the calls one after another, so they run in call order. At
+    most ``maxsize`` calls wait in the bridge. Past that the thread blocks
+    until the loop catches up, so a stalled stream slows the thread down.
+
+    Args:
+        async_callback: Coroutine function to run for each call
+        loop: Loop to run it on (default: the running loop)
+        maxsize: Calls buffered before the calling thread blocks
+        timeout: Seconds a thread waits for room before dropping the call
+    """
+
+    def __init__(self, async_callback: Callable[..., Awaitable[Any]],
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 maxsize: int = 256, timeout: Optional[float] = None):
+        self._callback = async_callback
+        self._loop = loop or asyncio.get_running_loop()
+        self._slots = threading.BoundedSemaphore(max(1, maxsize))
+        self.timeout = timeout
+        # Only touched on the loop thread
+        self._calls: Deque[Tuple[tuple, dict]] = deque()
+        self._drainer: Optional[asyncio.Task] = None
+        self._closed = False
+        self.dropped = 0
+
+    def __call__(self, *args, **kwargs):
+        if self._closed or self._loop.is_closed():
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            raise RuntimeError("ThreadBridge called on the event loop thread; await the callback instead")
+
+        if not self._slots.acquire(timeout=self.timeout):
+            self.dropped += 1
+            print(f"Warning: Stream event not buffered within {self.timeout}s, dropping it")
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, args, kwargs)
+        except RuntimeError:
+            # Loop closed in the meantime
+            self._slots.release()
+
+    def _enqueue(self, args: tuple, kwargs: dict):
+        if self._closed:
+            self._slots.release()
+            return
+        self._calls.append((args, kwargs))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = self._loop.create_task(self._drain())
+
+    async def _drain(self):
+        while self._calls:
+            args, kwargs = self._calls.popleft()
+            try:
+                await self._callback(*args, **kwargs)
+            except Exception as e:
+                print(f"Warning: Stream callback failed: {e}")
+            finally:
+                self._slots.release()
+
+    async def flush(self):
+        """
+        Wait until every call handed over so far has run.
+
+        Calls made by a thread before it finished are already queued on the
+        loop by the time ``await asyncio.to_thread(...)`` returns.
+        """
+        # Let calls scheduled just before this point reach the queue
+        await asyncio.sleep(0)
+        while self._drainer is not None and not self._drainer.done():
+            await asyncio.shield(self._drainer)
+
+    def close(self):
+        """Drop pending calls and unblock the thread; later calls are ignored."""
+        self._closed = True
+        while self._calls:
+            self._calls.popleft()
+            self._slots.release()
+        if self._drainer is not None and not self._drainer.done():
+            self._drainer.cancel()
+
+
+async def _benchmark(streams: int, events: int, chunk_chars: int, consumer_delay: float,
+                     maxsize: int) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    channels = [StreamChannel(maxsize=maxsize) for _ in range(streams)]
+    chunk = "x" * chunk_chars
+    errors: List[str] = []
+
+    def produce(bridge: ThreadBridge):
+        for index in range(events):
+            bridge("generation_chunk", {"content": chunk, "file_path": None, "metadata": {"index": index}})
+        bridge("complete", {})
+
+    async def run_producer(channel: StreamChannel, executor: concurrent.futures.Executor):
+        # Same shape as the server: generate in a thread, flush, close
+        bridge = ThreadBridge(channel.publish, loop, maxsize=maxsize)
+        try:
+            await loop.run_in_executor(executor, produce, bridge)
+            await bridge.flush()
+        finally:
+            bridge.close()
+            channel.close()
+
+    async def consume(number: int, channel: StreamChannel) -> int:
+        token = channel.attach()
+        frames, characters, last_seq = 0, 0, 0
+        while True:
+            frame = await channel.get(token)
+            if frame is None:
+                break
+            if frame.seq <= last_seq:
+                errors.append(f"stream {number}: sequence {frame.seq} after {last_seq}")
+            last_seq = frame.seq
+            frames += 1
+            if frame.event == "generation_chunk":
+                characters += len(frame.data["content"])
+            if consumer_delay:
+                await asyncio.sleep(consumer_delay)
+        if characters != events * chunk_chars:
+            errors.append(f"stream {number}: received {characters} of {events * chunk_chars} characters")
+        return frames
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=streams, thread_name_prefix="palette-bench") as executor:
+        producers = [asyncio.ensure_future(run_producer(channel, executor)) for channel in channels]
+        frames = await asyncio.gather(*(consume(i, channel) for i, channel in enumerate(channels)))
+        elapsed = time.perf_counter() - started
+        await asyncio.gather(*producers)
+
+    total_events = streams * (events + 1)
+    return {
+        "streams": streams,
+        "events": total_events,
+        "frames": sum(frames),
+        "coalesce_ratio": round(total_events / max(sum(frames), 1), 2),
+        "events_per_second": round(total_events / elapsed),
+        "max_depth": max(channel.max_depth for channel in channels),
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "errors": errors,
+    }
+
+
+def benchmark_stream_channels(streams: int = 200, events: int = 500, chunk_chars: int = 4,
+                              consumer_delay: float = 0.0, maxsize: int = 256) -> Dict[str, Any]:
+    """
+    Throughput of many concurrent streams fed from worker threads.
+
+    Each stream has its own producer thread publishing ``events`` tiny chunks
+    through a ``ThreadBridge`` and an async consumer on one event loop,
+    like the server's SSE generators. Checks that every stream arrives
+    complete and in sequence order.
+
+    Args:
+        streams: Concurrent streams
+        events: Chunks per stream
+        chunk_chars: Characters per chunk
+        consumer_delay: Seconds each consumer sleeps per frame (a slow client)
+        maxsize: Channel buffer size
+
+    Returns:
+        Event/frame counts, throughput and any ordering or loss errors
+    """
+    return asyncio.run(_benchmark(streams, events, chunk_chars, consumer_delay, maxsize))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SSE stream channels")
+    parser.add_argument("--streams", type=int, default=200, help="Concurrent streams")
+    parser.add_argument("--events", type=int, default=500, help="Chunks per stream")
+    parser.add_argument("--chunk-chars", type=int, default=4, help="Characters per chunk")
+    parser.add_argument("--consumer-delay", type=float, default=0.0, help="Seconds per frame in each consumer")
+    options = parser.parse_args(argv)
+
+    result = benchmark_stream_channels(options.streams, options.events, options.chunk_chars, options.consumer_delay)
+    print(
+        f"{result['streams']} streams, {result['events']} events in {result['frames']} frames "
+        f"(x{result['coalesce_ratio']}), {result['events_per_second']} events/s, "
+        f"max depth {result['max_depth']}, {result['elapsed_ms']} ms"
+    )
+    for error in result["errors"][:10]:
+        print(f"Warning: {error}")
+    return 0 if not result["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
 """Utility modules for file management and parsing."""
 
 from .file_manager import FileManager
+from .tailwind_worker import TailwindConfigWorker, TailwindWorkerError, get_tailwind_worker
 
-__all__ = ["FileManager"]
+__all__ = [
+    "FileManager",
+    "TailwindConfigWorker",
+    "TailwindWorkerError",
+    "get_tailwind_worker",
+]
@@ -0,0 +1,179 @@
+"""
+Long-lived Node.js sidecar processes speaking line-delimited JSON.
+
+A worker is started lazily, receives one JSON request per line on stdin
+(``{"id": n, "method": ..., ...}``) and answers with one JSON line per request
+carrying the same ``id``. Crashed or hung workers are replaced on the next
+request.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class NodeWorkerError(Exception):
+    """Raised when a Node.js worker cannot produce a result."""
+    pass
+
+
+class NodeJsonWorker:
+    """Line-delimited JSON client for a Node.js script run in server mode."""
+
+    def __init__(
+        self,
+        script: str,
+        args: Optional[List[str]] = None,
+        node_command: str = "node",
+        cwd: Optional[str] = None,
+    ):
+        self.script = script
+        self.args = list(args or [])
+        self.node_command = node_command
+        self.cwd = cwd
+
+        self._process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr_tail: deque = deque(maxlen=20)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._started = False
+
+        # Statistics
+        self.restarts = 0
+        self.requests = 0
+
+    def call(self, request: Dict[str, Any], timeout: float, retry: bool = True) -> Dict[str, Any]:
+        """
+        Send a request and return the worker's response object.
+
+        Raises:
+            FileNotFoundError: Node.js is not installed
+            TimeoutError: The worker did not answer in time (it is restarted)
+            NodeWorkerError: The worker exited (after one retry when ``retry``)
+        """
+        with self._lock:
+            try:
+                return self._request(request, timeout)
+            except NodeWorkerError:
+                if not retry:
+                    raise
+                # The worker died mid-request; restart once and retry
+                self._stop()
+                return self._request(request, timeout)
+
+    def ping(self, timeout: float = 5) -> bool:
+        """Check that the worker is alive and responsive."""
+        try:
+            return self.call({"method": "ping"}, timeout, retry=False).get("result") == "pong"
+        except (NodeWorkerError, TimeoutError, FileNotFoundError):
+            return False
+
+    def close(self):
+        """Stop the worker process."""
+        with self._lock:
+            self._stop()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pid": self._process.pid if self._process else None,
+            "requests": self.requests,
+            "restarts": self.restarts,
+        }
+
+    def _request(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request and wait for its response (caller holds the lock)."""
+        process = self._ensure_started()
+
+        self._next_id += 1
+        request_id = self._next_id
+        payload = json.dumps({"id": request_id, **request}) + "\n"
+
+        try:
+            process.stdin.write(payload)
+            process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise NodeWorkerError(f"Node worker pipe closed: {e}")
+
+        self.requests += 1
+        while True:
+            try:
+                line = self._responses.get(timeout=timeout)
+            except queue.Empty:
+                # A hung worker would answer out of order later; replace it
+                self._stop()
+                raise TimeoutError("Node worker did not respond in time")
+
+            if line is None:
+                stderr = " | ".join(self._stderr_tail)
+                self._stop()
+                raise NodeWorkerError(f"Node worker exited unexpectedly: {stderr}")
+
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Stray console output from user code
+
+            if response.get("id") == request_id:
+                return response
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self.running:
+            return self._process
+
+        self._stop()
+        if self._started:
+            self.restarts += 1
+        self._started = True
+
+        self._responses = queue.Queue()
+        self._process = subprocess.Popen(
+            [self.node_command, self.script, *self.args],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=self.cwd,
+        )
+
+        threading.Thread(
+            target=self._pump_stdout, args=(self._process, self._responses), daemon=True
+        ).start()
+        threading.Thread(
+            target=self._pump_stderr, args=(self._process,), daemon=True
+        ).start()
+
+        return self._process
+
+    def _pump_stdout(self, process: subprocess.Popen, responses: "queue.Queue[Optional[str]]"):
+        for line in process.stdout:
+            responses.put(line)
+        responses.put(None)  # EOF: the worker exited
+
+    def _pump_stderr(self, process: subprocess.Popen):
+        # Drain stderr so the worker never blocks on a full pipe
+        for line in process.stderr:
+            self._stderr_tail.append(line.rstrip())
+
+    def _stop(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except Exception:
+            pass
+        try:
+            process.terminate()
+            process.wait(timeout=2)
+        except Exception:
+            process.kill()
@@ -8,16 +8,40 @@
  * 
  * Usage: node tailwind_parser.js <path_to_tailwind_config>
  * Output: JSON object with theme configuration
+ *
+ * Server mode: node tailwind_parser.js --serve
+ * Reads line-delimited JSON requests from stdin and writes one JSON response
+ * line per request to stdout, keeping resolveConfig loaded between requests:
+ *   -> {"id": 1, "method": "resolve", "configPath": "/abs/tailwind.config.js", "hash": "<sha1>"}
+ *   <- {"id": 1, "result": {...}, "cached": false}
+ *   -> {"id": 2, "method": "ping"}
+ *   <- {"id": 2, "result": "pong"}
  */
 
 const fs = require('fs');
 const path = require('path');
 const os = require('os');
 
+// resolveConfig lookups per config directory (server mode keeps these warm)
+const resolveConfigCache = new Map();
+
+// Resolved themes keyed by config path + content hash (server mode only)
+const resultCache = new Map();
+const MAX_CACHED_RESULTS = 64;
+
 // Function to try importing resolveConfig from different locations
 function tryImportResolveConfig(configPath) {
     // Try from the config's directory first
     const configDir = path.dirname(path.resolve(configPath));
+    if (resolveConfigCache.has(configDir)) {
+        return resolveConfigCache.get(configDir);
+    }
+    const resolveConfig = findResolveConfig(configDir);
+    resolveConfigCache.set(configDir, resolveConfig);
+    return resolveConfig;
+}
+
+function findResolveConfig(configDir) {
     const projectPaths = [
         // Try from project's node_modules
         path.join(configDir, 'node_modules', 'tailwindcss', 'resolveConfig'),
@@ -237,10 +261,79 @@ function extractConfigManually(content) {
     }
 }
 
+function writeResponse(response) {
+    process.stdout.write(JSON.stringify(response) + '\n');
+}
+
+async function handleRequest(line) {
+    if (!line.trim()) {
+        return;
+    }
+
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (error) {
+        writeResponse({ id: null, error: `Invalid request: ${error.message}` });
+        return;
+    }
+
+    const { id, method = 'resolve', configPath, hash } = request;
+
+    if (method === 'ping') {
+        writeResponse({ id, result: 'pong' });
+        return;
+    }
+
+    if (method !== 'resolve') {
+        writeResponse({ id, error: `Unknown method: ${method}` });
+        return;
+    }
+
+    const cacheKey = `${configPath}:${hash || ''}`;
+    if (hash && resultCache.has(cacheKey)) {
+        writeResponse({ id, result: resultCache.get(cacheKey), cached: true });
+        return;
+    }
+
+    try {
+        const result = await parseConfig(configPath);
+        if (hash && !result.error) {
+            // Evict the oldest entry (Map preserves insertion order)
+            if (resultCache.size >= MAX_CACHED_RESULTS) {
+                resultCache.delete(resultCache.keys().next().value);
+            }
+            resultCache.set(cacheKey, result);
+        }
+        writeResponse({ id, result, cached: false });
+    } catch (error) {
+        writeResponse({ id, error: error.message });
+    }
+}
+
+function serve() {
+    const readline = require('readline');
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+
+    // Handle requests strictly in order so responses line up with requests
+    let pending = Promise.resolve();
+    rl.on('line', (line) => {
+        pending = pending.then(() => handleRequest(line));
+    });
+    rl.on('close', () => {
+        pending.then(() => process.exit(0));
+    });
+}
+
 // Main execution
 async function main() {
     const configPath = process.argv[2];
     
+    if (configPath === '--serve') {
+        serve();
+        return;
+    }
+    
     if (!configPath) {
         console.error('Usage: node tailwind_parser.js <path_to_tailwind_config>');
         process.exit(1);
@@ -0,0 +1,84 @@
+"""
+Persistent Node.js sidecar for Tailwind config resolution.
+
+Instead of spawning ``node tailwind_parser.js`` for every analysis, a single
+long-lived ``tailwind_parser.js --serve`` process is kept per Python process.
+It speaks line-delimited JSON over stdio, keeps ``resolveConfig`` loaded and
+caches resolved themes keyed by the config file's content hash, so a warm
+re-resolution costs one pipe round-trip. The worker is restarted
+automatically if it crashes or stops responding.
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from .node_worker import NodeJsonWorker, NodeWorkerError
+
+PARSER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tailwind_parser.js")
+
+
+class TailwindWorkerError(NodeWorkerError):
+    """Raised when the Tailwind worker cannot produce a result."""
+    pass
+
+
+class TailwindConfigWorker(NodeJsonWorker):
+    """Line-delimited JSON client for ``tailwind_parser.js --serve``."""
+
+    def __init__(self, node_command: str = "node", parser_script: str = PARSER_SCRIPT):
+        super().__init__(parser_script, ["--serve"], node_command=node_command)
+        self.cache_hits = 0
+
+    def resolve(self, config_path: str, timeout: float = 15) -> Dict[str, Any]:
+        """
+        Resolve a Tailwind config file to its theme.
+
+        Args:
+            config_path: Path to tailwind.config.{js,ts,mjs}
+            timeout: Seconds to wait for the worker
+
+        Returns:
+            The parser's JSON output (``_resolved`` tells whether defaults were merged)
+
+        Raises:
+            FileNotFoundError: Node.js is not installed
+            TimeoutError: The worker did not answer in time (it is restarted)
+            TailwindWorkerError: The worker crashed twice or returned an error
+        """
+        abs_config_path = os.path.abspath(config_path)
+        with open(abs_config_path, "rb") as f:
+            config_hash = hashlib.sha1(f.read()).hexdigest()
+
+        request = {"method": "resolve", "configPath": abs_config_path, "hash": config_hash}
+        try:
+            response = self.call(request, timeout)
+        except NodeWorkerError as e:
+            raise TailwindWorkerError(str(e))
+
+        if "error" in response:
+            raise TailwindWorkerError(response["error"])
+        if response.get("cached"):
+            self.cache_hits += 1
+        return response.get("result", {})
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["cache_hits"] = self.cache_hits
+        return stats
+
+
+_worker: Optional[TailwindConfigWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_tailwind_worker() -> TailwindConfigWorker:
+    """Get the process-wide Tailwind worker, creating it on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = TailwindConfigWorker()
+            atexit.register(_worker.close)
+        return _worker
@@ -0,0 +1,209 @@
+#!/usr/bin/env node
+
+/**
+ * TypeScript Compile-Check Service
+ *
+ * Keeps a TypeScript LanguageService warm for one project and type-checks
+ * in-memory source text without writing temp files or spawning tsc.
+ *
+ * Usage: node ts_check_service.js --project <project_path>
+ *
+ * Reads line-delimited JSON requests from stdin and writes one JSON response
+ * line per request to stdout:
+ *   -> {"id": 1, "method": "check", "fileName": "/abs/src/Button.tsx", "code": "..."}
+ *   <- {"id": 1, "result": {"diagnostics": [...], "elapsedMs": 42}}
+ *   -> {"id": 2, "method": "ping"}
+ *   <- {"id": 2, "result": "pong"}
+ *
+ * If the project has no resolvable `typescript` package every check answers
+ * {"id": n, "error": "...", "code": "typescript_not_found"}.
+ */
+
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+
+function parseArgs(argv) {
+    const index = argv.indexOf('--project');
+    return {
+        projectPath: path.resolve(index !== -1 && argv[index + 1] ? argv[index + 1] : process.cwd()),
+    };
+}
+
+function loadTypeScript(projectPath) {
+    // Prefer the project's own compiler so results match its build
+    try {
+        return require(require.resolve('typescript', { paths: [projectPath] }));
+    } catch (e) {
+        try {
+            return require('typescript');
+        } catch (e2) {
+            return null;
+        }
+    }
+}
+
+function loadCompilerOptions(ts, projectPath) {
+    const defaults = {
+        jsx: ts.JsxEmit.ReactJSX,
+        target: ts.ScriptTarget.ES2020,
+        module: ts.ModuleKind.ESNext,
+        moduleResolution: ts.ModuleResolutionKind.NodeJs,
+        esModuleInterop: true,
+        allowJs: true,
+        strict: false,
+    };
+
+    const configPath = ts.findConfigFile(projectPath, ts.sys.fileExists, 'tsconfig.json');
+    let options = defaults;
+    if (configPath) {
+        const configFile = ts.readConfigFile(configPath, ts.sys.readFile);
+        if (!configFile.error) {
+            const parsed = ts.parseJsonConfigFileContent(
+                configFile.config, ts.sys, path.dirname(configPath)
+            );
+            options = Object.assign({}, defaults, parsed.options);
+        }
+    }
+
+    // Only diagnostics are needed
+    return Object.assign(options, {
+        noEmit: true,
+        skipLibCheck: true,
+        incremental: false,
+        composite: false,
+    });
+}
+
+function createChecker(ts, projectPath) {
+    const options = loadCompilerOptions(ts, projectPath);
+
+    // In-memory files being checked; everything else is read from disk
+    const virtualFiles = new Map();
+    // Disk snapshots keyed by file name, reused while the mtime is unchanged
+    const diskSnapshots = new Map();
+
+    function diskVersion(fileName) {
+        try {
+            return String(fs.statSync(fileName).mtimeMs);
+        } catch (e) {
+            return '0';
+        }
+    }
+
+    const host = {
+        getScriptFileNames: () => Array.from(virtualFiles.keys()),
+        getScriptVersion: (fileName) => {
+            const virtual = virtualFiles.get(fileName);
+            return virtual ? String(virtual.version) : diskVersion(fileName);
+        },
+        getScriptSnapshot: (fileName) => {
+            const virtual = virtualFiles.get(fileName);
+            if (virtual) {
+                return ts.ScriptSnapshot.fromString(virtual.code);
+            }
+            const version = diskVersion(fileName);
+            const cached = diskSnapshots.get(fileName);
+            if (cached && cached.version === version) {
+                return cached.snapshot;
+            }
+            const text = ts.sys.readFile(fileName);
+            if (text === undefined) {
+                return undefined;
+            }
+            const snapshot = ts.ScriptSnapshot.fromString(text);
+            diskSnapshots.set(fileName, { version, snapshot });
+            return snapshot;
+        },
+        getCurrentDirectory: () => projectPath,
+        getCompilationSettings: () => options,
+        getDefaultLibFileName: (opts) => ts.getDefaultLibFilePath(opts),
+        fileExists: (fileName) => virtualFiles.has(fileName) || ts.sys.fileExists(fileName),
+        readFile: (fileName) => {
+            const virtual = virtualFiles.get(fileName);
+            return virtual ? virtual.code : ts.sys.readFile(fileName);
+        },
+        readDirectory: ts.sys.readDirectory,
+        directoryExists: ts.sys.directoryExists,
+        getDirectories: ts.sys.getDirectories,
+    };
+
+    const service = ts.createLanguageService(host, ts.createDocumentRegistry());
+    let version = 0;
+
+    function toDiagnostic(diagnostic) {
+        const result = {
+            code: diagnostic.code,
+            category: ts.DiagnosticCategory[diagnostic.category].toLowerCase(),
+            message: ts.flattenDiagnosticMessageText(diagnostic.messageText, '\n'),
+        };
+        if (diagnostic.file && diagnostic.start !== undefined) {
+            const position = diagnostic.file.getLineAndCharacterOfPosition(diagnostic.start);
+            result.line = position.line + 1;
+            result.column = position.character + 1;
+        }
+        return result;
+    }
+
+    return function check(fileName, code) {
+        const start = Date.now();
+
+        // Only one virtual file is live at a time so the program stays small
+        virtualFiles.clear();
+        virtualFiles.set(fileName, { code, version: ++version });
+
+        const diagnostics = service
+            .getSyntacticDiagnostics(fileName)
+            .concat(service.getSemanticDiagnostics(fileName))
+            .map(toDiagnostic);
+
+        return { diagnostics, elapsedMs: Date.now() - start };
+    };
+}
+
+function serve() {
+    const { projectPath } = parseArgs(process.argv.slice(2));
+    const ts = loadTypeScript(projectPath);
+    const check = ts ? createChecker(ts, projectPath) : null;
+
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+    rl.on('line', (line) => {
+        if (!line.trim()) {
+            return;
+        }
+
+        let request;
+        try {
+            request = JSON.parse(line);
+        } catch (e) {
+            return;
+        }
+
+        let response;
+        try {
+            if (request.method === 'ping') {
+                response = { id: request.id, result: 'pong' };
+            } else if (request.method === 'check') {
+                if (!check) {
+                    response = {
+                        id: request.id,
+                        error: `TypeScript not found for ${projectPath}`,
+                        code: 'typescript_not_found',
+                    };
+                } else {
+                    const fileName = path.resolve(projectPath, request.fileName);
+                    response = { id: request.id, result: check(fileName, request.code || '') };
+                }
+            } else {
+                response = { id: request.id, error: `Unknown method: ${request.method}` };
+            }
+        } catch (e) {
+            response = { id: request.id, error: e.message };
+        }
+
+        process.stdout.write(JSON.stringify(response) + '\n');
+    });
+    rl.on('close', () => process.exit(0));
+}
+
+serve();